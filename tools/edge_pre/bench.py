@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Runs the benchmarks of edge_pre.
+##
+import sys
+import logging
+import argparse
+import edge_pre.run.Pipeline
+import edge_pre.run.Bench
+
+if __name__ == "__main__":
+  logging.basicConfig( level=logging.INFO,
+                       format='%(asctime)s - %(name)s - %(levelname)s - %(message)s' )
+
+  l_parser = argparse.ArgumentParser( description='Benchmarks of the operator generation of EDGEpre.' )
+
+  l_parser.add_argument( '-b', '--benches',
+                         dest     = 'benches',
+                         nargs    = '+',
+                         default  = None,
+                         help     = 'benchmarks or their prefixes, e.g., mass or grid; all if not given: ' + ' '.join( edge_pre.run.Bench.BENCHES.keys() ) )
+  l_parser.add_argument( '-t', '--types',
+                         dest     = 'types',
+                         nargs    = '+',
+                         default  = list( edge_pre.run.Pipeline.TYPES.keys() ),
+                         choices  = list( edge_pre.run.Pipeline.TYPES.keys() ),
+                         help     = 'element types' )
+  l_parser.add_argument( '-d', '--degs',
+                         dest     = 'degs',
+                         nargs    = '+',
+                         type     = int,
+                         default  = list( range(7) ),
+                         help     = 'polynomial degrees' )
+  l_parser.add_argument( '--backend',
+                         dest     = 'backend',
+                         default  = 'symbolic',
+                         choices  = [ 'symbolic', 'quadrature', 'monomial', 'float' ],
+                         help     = 'integration backend of the pipeline stages, float runs them in floating point arithmetic' )
+  l_parser.add_argument( '-n', '--reps',
+                         dest     = 'reps',
+                         type     = int,
+                         default  = 3,
+                         help     = 'maximum number of repetitions, the median time is used for comparisons' )
+  l_parser.add_argument( '--budget',
+                         dest     = 'budget',
+                         type     = float,
+                         default  = 60,
+                         help     = 'time budget in seconds per benchmark, type and degree; no further repetitions are started once exceeded and higher degrees are skipped if a single repetition exceeds it' )
+  l_parser.add_argument( '-o', '--history',
+                         dest     = 'history',
+                         default  = 'bench_history',
+                         help     = 'directory of the history, every run adds a JSON file' )
+  l_parser.add_argument( '-c', '--compare',
+                         dest     = 'compare',
+                         default  = None,
+                         help     = 'baseline: history file or directory, whose latest file is used' )
+  l_parser.add_argument( '--threshold',
+                         dest     = 'threshold',
+                         type     = float,
+                         default  = 0.2,
+                         help     = 'relative change, which is flagged as regression or improvement' )
+  l_parser.add_argument( '--floor',
+                         dest     = 'floor',
+                         type     = float,
+                         default  = 1E-3,
+                         help     = 'absolute change in seconds, below which results are considered unchanged' )
+  l_args = vars(l_parser.parse_args())
+
+  l_names = edge_pre.run.Bench.select( l_args['benches'] )
+  assert( len(l_names) > 0 ), 'no benchmarks selected'
+
+  # run the benchmarks and store the results in the history
+  l_res = edge_pre.run.Bench.run( l_names,
+                                  l_args['types'],
+                                  l_args['degs'],
+                                  l_args['backend'],
+                                  l_args['reps'],
+                                  l_args['budget'] )
+  l_path = edge_pre.run.Bench.write( l_args['history'], l_res, l_args )
+  logging.info( 'wrote results: ' + l_path )
+
+  # compare against the baseline
+  if( l_args['compare'] != None ):
+    l_base = edge_pre.run.Bench.read( l_args['compare'], l_path )
+    l_comps = edge_pre.run.Bench.compare( l_base, l_res, l_args['threshold'], l_args['floor'] )
+
+    l_nRegs = 0
+    for l_key, l_old, l_new, l_rel, l_verd in l_comps:
+      logging.info( '{:<16} {:<8} {:>2} {:>12.6f} s {:>12.6f} s {:>+8.1%} {}'.format( l_key[0], l_key[1], l_key[2], l_old, l_new, l_rel, l_verd ) )
+      if( l_verd == 'regression' ):
+        l_nRegs = l_nRegs + 1
+
+    logging.info( 'compared ' + str(len(l_comps)) + ' results, ' + str(l_nRegs) + ' regressions' )
+    if( l_nRegs > 0 ):
+      sys.exit( 1 )
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Inspects and prunes the cache of EDGEpre.
+##
+import logging
+import argparse
+import time
+import edge_pre.io.Cache
+
+# set up logger
+logging.basicConfig( level=logging.INFO,
+                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s' )
+
+# parse command line options
+l_parser = argparse.ArgumentParser( description='Inspection and pruning of EDGEpre\'s cache.' )
+
+l_parser.add_argument( 'action',
+                       choices  = ['inspect', 'prune'],
+                       help     = 'inspect lists the entries, prune removes entries' )
+l_parser.add_argument( '-d', '--dir',
+                       dest     = 'dir',
+                       required = True,
+                       type     = str,
+                       help     = 'directory of the cache' )
+l_parser.add_argument( '-m', '--max_mb',
+                       dest     = 'max_mb',
+                       required = False,
+                       type     = float,
+                       default  = None,
+                       help     = 'prune: maximum size of the cache in MiB, least recently used entries are evicted first' )
+l_parser.add_argument( '-s', '--stale',
+                       dest     = 'stale',
+                       action   = 'store_true',
+                       help     = 'prune: remove entries of other versions of the sources' )
+l_parser.add_argument( '-a', '--all',
+                       dest     = 'all',
+                       action   = 'store_true',
+                       help     = 'prune: remove all entries' )
+l_args = vars(l_parser.parse_args())
+
+l_cache = edge_pre.io.Cache.Cache( l_args['dir'] )
+
+if( l_args['action'] == 'inspect' ):
+  l_entries = l_cache.entries()
+  l_size = 0
+  for l_en in l_entries:
+    l_stale = '' if l_en.get('version') == l_cache.m_version else ' (stale)'
+    logging.info( '%s %8s %3s %-12s %-10s %10d B, accessed %s%s' % ( l_en['key'][0:12],
+                                                                   l_en.get('type', '?'),
+                                                                   str(l_en.get('deg', '?')),
+                                                                   l_en.get('op', '?'),
+                                                                   l_en.get('backend', '?'),
+                                                                   l_en['size'],
+                                                                   time.strftime( '%Y-%m-%d %H:%M:%S', time.localtime( l_en['access'] ) ),
+                                                                   l_stale ) )
+    l_size = l_size + l_en['size']
+  logging.info( 'entries: ' + str(len(l_entries)) + ', size (bytes): ' + str(l_size) )
+else:
+  l_maxBytes = None
+  if( l_args['all'] ):
+    l_maxBytes = 0
+  elif( l_args['max_mb'] != None ):
+    l_maxBytes = int( l_args['max_mb'] * 1024**2 )
+
+  l_nRm = l_cache.prune( l_maxBytes, l_args['stale'] )
+  logging.info( 'removed entries: ' + str(l_nRm) )
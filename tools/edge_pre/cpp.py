@@ -20,8 +20,60 @@
 #
 # @section DESCRIPTION
 # Standalone tool which converts an EDGEpre CSV-array to C++, defining the data in the namespace edge::pre.
+#   In tree mode all arrays of an EDGEpre output directory are converted in parallel, unchanged arrays are skipped.
+#   Besides brace-initializers of decimal literals, the data is optionally emitted through the assembler as the bit patterns of the entries, which compiles much faster.
 ##
+import io
+import os
+import json
+import hashlib
+import logging
+import tempfile
 import argparse
+import concurrent.futures
+
+# umask of the process, applied to the permissions of the written files
+UMASK = os.umask( 0 )
+os.umask( UMASK )
+
+# little-endian binary layouts of the C++ types, used when emitting the data through the assembler
+LAYOUTS = { 'double':             '<f8',
+            'float':              '<f4',
+            'char':               '<i1',
+            'signed char':        '<i1',
+            'unsigned char':      '<u1',
+            'short':              '<i2',
+            'unsigned short':     '<u2',
+            'int':                '<i4',
+            'unsigned int':       '<u4',
+            'long':               '<i8',
+            'unsigned long':      '<u8',
+            'long long':          '<i8',
+            'unsigned long long': '<u8',
+            'std::size_t':        '<u8' }
+
+# assembler directives of the entries' bit patterns, per size in bytes
+DIRECTIVES = { 1: '.byte',
+               2: '.2byte',
+               4: '.4byte',
+               8: '.8byte' }
+
+# C++ types and replacements of EDGEpre's arrays in tree mode, matching the build of EDGE
+TYPES = { 'mass':        ( 'double', [] ),
+          'stiffT':      ( 'double', [] ),
+          'stiffV':      ( 'double', [] ),
+          'fluxL':       ( 'double', [] ),
+          'fluxN':       ( 'double', [] ),
+          'fluxT':       ( 'double', [] ),
+          'svcrds':      ( 'double', [] ),
+          'gather':      ( 'double', [] ),
+          'scatter':     ( 'double', [] ),
+          'scattersurf': ( 'double', [] ),
+          'sfint':       ( 'double', [] ),
+          'scsv':        ( 'unsigned short', [ [ '-1', 'std::numeric_limits< unsigned short >::max()' ] ] ),
+          'scsfsc':      ( 'unsigned short', [ [ '-1', 'std::numeric_limits< unsigned short >::max()' ] ] ),
+          'sctysf':      ( 'unsigned short', [ [ '-1', 'std::numeric_limits< unsigned short >::max()' ] ] ),
+          'scdgad':      ( 'unsigned short', [ [ '-1', 'std::numeric_limits< unsigned short >::max()' ] ] ) }
 
 ##
 # Replaces the given sub-strings in the input string.
@@ -39,147 +91,514 @@ def replace( i_str,
 
   return l_str
 
+##
+# Converts a NumPy-array of EDGEpre's binary output to the layout of EDGEpre's CSV-arrays.
+#
+# @param i_npyFile NumPy file.
+# @return CSV string.
+##
+def npyToCsv( i_npyFile ):
+  # numpy is only required for binary input
+  import numpy
+
+  l_arr = numpy.load( i_npyFile, allow_pickle=False )
+  assert( l_arr.ndim in [2, 3] )
+
+  # floating point entries are formatted as in the CSV-output
+  l_fmt = str
+  if( l_arr.dtype.kind == 'f' ):
+    l_fmt = lambda i_en: str( float(i_en) )
+
+  l_csv = io.StringIO()
+  for l_ma in l_arr.reshape( (-1,) + l_arr.shape[-2:] ):
+    for l_ro in l_ma.tolist():
+      l_csv.write( ','.join( [ l_fmt(l_en) for l_en in l_ro ] ) + ',\n' )
+    if( l_arr.ndim == 3 ):
+      l_csv.write( '\n' )
+
+  return l_csv.getvalue()
+
+##
+# Loads an EDGEpre-array as CSV string.
+#
+# @param i_inFile CSV file or NumPy file (.npy).
+# @return CSV string.
+##
+def load( i_inFile ):
+  if( i_inFile.endswith('.npy') ):
+    return npyToCsv( i_inFile )
+
+  with open( i_inFile, 'r' ) as l_reader:
+    return l_reader.read()
+
+##
+# Splits a CSV string of EDGEpre into its rows.
+#
+# @param i_csv CSV string.
+# @return 1) dimensions (fastest first), the slowest is 0 for 2d arrays, 2) rows: [*][]: matrix, [][*]: row (string).
+##
+def parse( i_csv ):
+  # split the rows, matrices of 3d arrays are separated by empty rows
+  l_rows = i_csv.split('\n')
+  assert( l_rows[-1] == '' )
+  l_rows = l_rows[:-1]
+
+  l_mats = [ [] ]
+  for l_ro in l_rows:
+    if( l_ro == '' ):
+      l_mats.append( [] )
+    else:
+      l_mats[-1].append( l_ro )
+
+  # determine the dimensions
+  l_dim = [0,0,0]
+  l_dim[0] = len( l_rows[0].split(',') )-1
+  l_dim[1] = len( l_mats[0] )
+  l_dim[2] = len( l_mats ) - 1
+
+  # check for dims 0 and 1
+  assert( l_dim[0] > 0 )
+  assert( l_dim[1] > 0 )
+
+  return l_dim, l_mats[ 0:max(l_dim[2],1) ]
+
+##
+# Packs the entries of the rows as little-endian bytes.
+#   The replacements are applied to every entry, resulting entries are either numbers (decimal or hexadecimal, e.g., of csv_hex) or limits of the type (e.g., std::numeric_limits< unsigned short >::max()).
+#
+# @param i_mats rows, as derived by parse.
+# @param i_objType C++ type of the entries.
+# @param i_reps replacements.
+# @return bytes.
+##
+def pack( i_mats,
+          i_objType,
+          i_reps ):
+  # numpy is only required for the emission of bytes
+  import numpy
+
+  assert( i_objType in LAYOUTS ), 'no binary layout for type: ' + i_objType
+  l_dtype = numpy.dtype( LAYOUTS[i_objType] )
+
+  # limits of the type
+  l_info = numpy.finfo( l_dtype ) if l_dtype.kind == 'f' else numpy.iinfo( l_dtype )
+  l_lims = { 'max':    l_info.max,
+             'min':    l_info.tiny if l_dtype.kind == 'f' else l_info.min,
+             'lowest': l_info.min }
+
+  l_vals = []
+  for l_ma in i_mats:
+    for l_ro in l_ma:
+      for l_en in l_ro.split(',')[:-1]:
+        l_en = replace( l_en, i_reps ).strip()
+
+        if( l_en.startswith('std::numeric_limits') ):
+          l_li = l_en.replace( ' ', '' ).split('::')[-1]
+          assert( l_li in [ 'max()', 'min()', 'lowest()' ] ), 'unsupported entry: ' + l_en
+          l_vals.append( l_lims[ l_li[:-2] ] )
+        elif( l_dtype.kind == 'f' ):
+          if( '0x' in l_en.lower() ):
+            l_vals.append( float.fromhex( l_en ) )
+          else:
+            l_vals.append( float( l_en ) )
+        else:
+          l_vals.append( int( l_en, 0 ) )
+
+  return numpy.array( l_vals, dtype=l_dtype ).tobytes()
+
+##
+# Derives the mangled name of a variable in the namespace edge::pre::<i_objSpace> (Itanium C++ ABI).
+#
+# @param i_objSpace name space (below edge::pre).
+# @param i_var name of the variable.
+# @return mangled name.
+##
+def mangle( i_objSpace,
+            i_var ):
+  l_mangled = '_ZN'
+  for l_na in [ 'edge', 'pre' ] + i_objSpace.split('::') + [ i_var ]:
+    l_mangled = l_mangled + str( len(l_na) ) + l_na
+  return l_mangled + 'E'
+
+##
+# Converts the given CSV string to C++.
+#
+# @param i_csv CSV string.
+# @param i_objSpace name space (below edge::pre) which will be used.
+# @param i_objName name of the C++ matrix (will be appended by 'g_'). Additionally a raw pointer to the first entry and a size entry are created ('g_' + [...] + 'Raw', 'g_' + [...] + 'Size').
+# @param i_objType type of the C++ matrix.
+# @param i_reps replacements, applied to the C++ code and the entries.
+# @param i_emit emission of the data: 'init' (brace-initializer of decimal literals), 'bytes' (assembler directives of the entries' bit patterns, ELF only) or 'incbin' (assembler .incbin of a binary file, ELF only).
+# @param i_pathBin path of the binary file, which is included by the assembler; required for 'incbin' only. Only the file name is referenced, the assembler has to search the file's directory, e.g., through -Wa,-I<dir>.
+# @return 1) C++ code, 2) contents of the binary file (None if not 'incbin').
+##
+def generate( i_csv,
+              i_objSpace,
+              i_objName,
+              i_objType,
+              i_reps = [],
+              i_emit = 'init',
+              i_pathBin = None ):
+  assert( i_emit in [ 'init', 'bytes', 'incbin' ] )
+
+  l_dim, l_mats = parse( i_csv )
+
+  # assemble C++ variable
+  l_ext = ''
+  if( l_dim[2] > 0 ):
+    l_ext = l_ext + '[' + str(l_dim[2]) + ']'
+  l_ext = l_ext + '[' + str(l_dim[1]) + '][' + str(l_dim[0]) + ']'
+  l_var = 'g_' + i_objName + l_ext
+
+  # assemble namespace
+  l_ns = 'edge::pre::' + i_objSpace
+
+  # assemble C++ header
+  l_head = '#include <cstddef>\n'
+  l_head = l_head + '#include <limits>\n'
+  l_head = l_head + 'namespace edge {\n'
+  l_head = l_head + '  namespace pre {\n'
+  l_head = l_head + '    namespace ' + i_objSpace + ' {\n'
+  l_head = l_head + '      extern ' + i_objType + ' const   '    + l_var + ';\n'
+  l_head = l_head + '      extern ' + i_objType + ' const * g_' + i_objName + 'Raw;\n'
+  l_head = l_head + '      extern std::size_t const g_' + i_objName + 'Size;\n'
+  l_head = l_head + '    }\n'
+  l_head = l_head + '  }\n'
+  l_head = l_head + '}\n'
+
+  # definition of the data
+  l_bin = None
+  if( i_emit == 'init' ):
+    l_data = [ i_objType + ' const' ]
+    l_data.append( ' ' + l_ns + '::' )
+    l_data.append( l_var + ' = ' )
+
+    # generate code for initilization of the matrix
+    l_data.append( '{\n' )
+    for l_d2 in range(max(l_dim[2],1)):
+      if( l_dim[2] > 0 ): l_data.append( '  {\n' )
+
+      for l_d1 in range(l_dim[1]):
+        l_data.append( '    {  ' + l_mats[l_d2][l_d1] + '  },\n' )
+
+      if( l_dim[2] > 0 ): l_data.append( '  },\n' )
+    l_data.append( '}' )
+    l_data.append( ';\n' )
+  else:
+    l_bytes = pack( l_mats, i_objType, i_reps )
+
+    # the array is an object of the assembler, its constant initialization avoids static-init-order issues
+    l_sym = mangle( i_objSpace, 'g_' + i_objName )
+    l_data = [ '__asm__( ".section .rodata\\n"\n' ]
+    l_data.append( '         ".balign 16\\n"\n' )
+    l_data.append( '         ".global ' + l_sym + '\\n"\n' )
+    l_data.append( '         ".type ' + l_sym + ', @object\\n"\n' )
+    l_data.append( '         ".size ' + l_sym + ', ' + str(len(l_bytes)) + '\\n"\n' )
+    l_data.append( '         "' + l_sym + ':\\n"\n' )
+
+    if( i_emit == 'bytes' ):
+      # integer literals of the bit patterns, the assembler takes care of the byte order
+      l_size = len( pack( [ [ '0,' ] ], i_objType, [] ) )
+      l_pats = [ int.from_bytes( l_bytes[l_by:l_by+l_size], 'little' ) for l_by in range( 0, len(l_bytes), l_size ) ]
+      for l_pa in range( 0, len(l_pats), 8 ):
+        l_data.append( '         "' + DIRECTIVES[l_size] + ' ' + ','.join( [ hex(l_en) for l_en in l_pats[l_pa:l_pa+8] ] ) + '\\n"\n' )
+    else:
+      assert( i_pathBin != None )
+      l_bin = l_bytes
+      l_data.append( '         ".incbin \\"' + os.path.basename( i_pathBin ) + '\\"\\n"\n' )
+
+    l_data.append( '         ".previous\\n" );\n' )
+
+  # raw pointer and size
+  l_raw = i_objType + ' const * ' + l_ns + '::g_' + i_objName + 'Raw = &' + l_ns + '::g_' + i_objName + '[0]'
+  if( l_dim[1] > 0 ): l_raw = l_raw + '[0]'
+  if( l_dim[2] > 0 ): l_raw = l_raw + '[0]'
+  l_raw = l_raw + ';\n'
+  l_nEnt = l_dim[0] * l_dim[1] * max(l_dim[2], 1)
+  l_raw = l_raw + 'std::size_t const ' + l_ns + '::g_' + i_objName + 'Size = ' + str(l_nEnt) + ';\n'
+
+  # the replacements of bytes were applied to the entries already
+  if( i_emit == 'init' ):
+    l_cpp = replace( l_head + ''.join( l_data ) + l_raw, i_reps )
+  else:
+    l_cpp = replace( l_head, i_reps ) + ''.join( l_data ) + replace( l_raw, i_reps )
+
+  return l_cpp, l_bin
+
 ##
 # Converts the given CSV to C++.
 #
-# @param i_csvFile CSV file which gets converted.
+# @param i_csvFile CSV file which gets converted, NumPy files (.npy) are supported as well.
 # @param i_objSpace name space (below edge::pre) which will be used.
 # @param i_objName name of the C++ matrix (will be appended by 'g_'). Additionally a raw pointer to the first entry and a size entry are created ('g_' + [...] + 'Raw', 'g_' + [...] + 'Size').
 # @param i_objType type of the C++ matrix.
+# @param i_reps replacements, applied to the C++ code and the entries.
+# @param i_emit emission of the data, see generate.
+# @param i_pathBin path of the binary file for 'incbin'.
+# @return 1) C++ code, 2) contents of the binary file (None if not 'incbin').
 ##
 def convert( i_csvFile,
              i_objSpace,
              i_objName,
-             i_objType ):
-  # read the file contents
-  with open( i_csvFile, 'r' ) as l_reader:
-    # determine the dimensions
-    l_dim = [0,0,0]
-    for l_ro in l_reader:
-      if l_dim[1] == 0:
-        l_dim[0] = len( l_ro.split(',') )-1
+             i_objType,
+             i_reps = [],
+             i_emit = 'init',
+             i_pathBin = None ):
+  return generate( load( i_csvFile ),
+                   i_objSpace,
+                   i_objName,
+                   i_objType,
+                   i_reps,
+                   i_emit,
+                   i_pathBin )
+
+##
+# Writes the given string or bytes atomically by replacing the file with a completely written temporary file.
+#   Follows edge_pre.io.Files.writeAtomic, which is not imported to keep the tool standalone.
+#
+# @param i_path path of the file.
+# @param i_data string or bytes.
+##
+def writeAtomic( i_path,
+                 i_data ):
+  if( isinstance( i_data, str ) ):
+    i_data = i_data.encode()
+
+  l_fd, l_tmp = tempfile.mkstemp( dir=os.path.dirname( os.path.abspath(i_path) ), prefix='.tmp_' )
+  try:
+    # mkstemp creates owner-only files, use the permissions of open instead
+    os.fchmod( l_fd, 0o666 & ~UMASK )
+    with os.fdopen( l_fd, 'wb' ) as l_fi:
+      l_fi.write( i_data )
+    os.replace( l_tmp, i_path )
+  finally:
+    # only present if the file was not written completely
+    if( os.path.exists( l_tmp ) ):
+      os.remove( l_tmp )
+
+##
+# Writes the result of a conversion.
+#
+# @param i_pathCpp path of the C++ file.
+# @param i_pathBin path of the binary file.
+# @param i_conv result of the conversion: 1) C++ code, 2) contents of the binary file (None if not required).
+##
+def write( i_pathCpp,
+           i_pathBin,
+           i_conv ):
+  # the binary file has to be present when compiling the C++ file
+  if( i_conv[1] != None ):
+    writeAtomic( i_pathBin, i_conv[1] )
+  writeAtomic( i_pathCpp, i_conv[0] )
 
-      if l_ro != '\n' and l_dim[2] == 0:
-        l_dim[1] = l_dim[1]+1
+##
+# Derives the version of the conversion, used to invalidate previously converted files.
+#
+# @return hash of this script.
+##
+def version():
+  with open( os.path.abspath(__file__), 'rb' ) as l_fi:
+    return hashlib.sha256( l_fi.read() ).hexdigest()
+
+##
+# Converts a single file of a tree, if its content or the conversion changed.
+#
+# @param i_job conversion: 1) input file, 2) output file, 3) namespace, 4) name, 5) type, 6) replacements, 7) emission, 8) previous hash (None if not available), 9) version of the conversion.
+# @return 1) hash of the conversion, 2) true if the file was converted, false if skipped.
+##
+def convertJob( i_job ):
+  l_in, l_out, l_ons, l_on, l_ot, l_reps, l_emit, l_hashPrev, l_version = i_job
+  l_bin = os.path.splitext( l_out )[0] + '.bin'
 
-      if l_ro == '\n':
-        l_dim[2] = l_dim[2]+1
+  l_csv = load( l_in )
 
-    # check for dims 0 and 1
-    assert( l_dim[0] > 0 )
-    assert( l_dim[1] > 0 )
+  l_hash = hashlib.sha256()
+  l_hash.update( json.dumps( [ l_version, l_ons, l_on, l_ot, l_reps, l_emit ] ).encode() )
+  l_hash.update( l_csv.encode() )
+  l_hash = l_hash.hexdigest()
 
-    # reset reader
-    l_reader.seek(0)
+  if( l_hash == l_hashPrev and os.path.exists( l_out ) and ( l_emit != 'incbin' or os.path.exists( l_bin ) ) ):
+    return l_hash, False
 
-    # generate code for initilization of the matrix
-    l_init = '{\n'
-    for l_d2 in range(max(l_dim[2],1)):
-      if( l_dim[2] > 0 ): l_init = l_init + '  {\n'
+  os.makedirs( os.path.dirname( l_out ), exist_ok=True )
+  write( l_out,
+         l_bin,
+         generate( l_csv, l_ons, l_on, l_ot, l_reps, l_emit, l_bin ) )
 
-      for l_d1 in range(l_dim[1]):
-        l_init = l_init + '    {  '
-        l_init = l_init + l_reader.readline()[:-1]
-        l_init = l_init + '  },\n'
-
-      if( l_dim[2] > 0 ):
-        l_reader.readline()
-        l_init = l_init + '  },\n'
-    l_init = l_init + '}'
-
-    # assemble C++ variable
-    l_var = 'g_' + i_objName
-    if( l_dim[2] > 0 ):
-      l_var = l_var + '[' + str(l_dim[2]) + ']'
-    l_var = l_var + '[' + str(l_dim[1]) + '][' + str(l_dim[0]) + ']'
-
-    # assemble namespace
-    l_ns = 'edge::pre::' + i_objSpace
-
-    # assemble C++ header
-    l_head = '#include <cstddef>\n'
-    l_head = l_head + '#include <limits>\n'
-    l_head = l_head + 'namespace edge {\n'
-    l_head = l_head + '  namespace pre {\n'
-    l_head = l_head + '    namespace ' + i_objSpace + ' {\n'
-    l_head = l_head + '      extern ' + i_objType + ' const   '    + l_var + ';\n'
-    l_head = l_head + '      extern ' + i_objType + ' const * g_' + i_objName + 'Raw;\n'
-    l_head = l_head + '      extern std::size_t const g_' + i_objName + 'Size;\n'
-    l_head = l_head + '    }\n'
-    l_head = l_head + '  }\n'
-    l_head = l_head + '}\n'
-
-    # assemble C++ wrapper
-    l_wrap = l_head + i_objType + ' const';
-    l_wrap = l_wrap + ' ' + l_ns + '::'
-    l_wrap = l_wrap + l_var + ' = '
-
-    l_wrap = l_wrap + l_init + ';\n'
-    l_wrap = l_wrap + i_objType + ' const * ' + l_ns + '::g_' + i_objName + 'Raw = &' + l_ns + '::g_' + i_objName + '[0]'
-    if( l_dim[1] > 0 ): l_wrap = l_wrap + '[0]'
-    if( l_dim[2] > 0 ): l_wrap = l_wrap + '[0]'
-    l_wrap = l_wrap + ';\n'
-    l_nEnt = l_dim[0] * l_dim[1] * max(l_dim[2], 1)
-    l_wrap = l_wrap + 'std::size_t const ' + l_ns + '::g_' + i_objName + 'Size = ' + str(l_nEnt) + ';\n'
-
-    return l_wrap
+  return l_hash, True
+
+##
+# Converts all arrays of an EDGEpre output tree in parallel.
+#   Files are expected at <namespace>/<element type>/<degree>/<element type>_<degree>_<name>.(csv|npy), e.g., dg/tria3/2/tria3_2_mass.csv.
+#   The C++ types and replacements are derived from the names.
+#
+# @param i_inDir root of the tree.
+# @param i_outDir output directory, the C++ files are written to the same relative paths.
+# @param i_jobs number of worker processes.
+# @param i_emit emission of the data, see generate.
+# @return manifest: dictionary, mapping the relative paths of the C++ files to their description.
+##
+def tree( i_inDir,
+          i_outDir,
+          i_jobs,
+          i_emit = 'init' ):
+  l_pathMani = os.path.join( i_outDir, 'manifest.json' )
+
+  # previous manifest
+  l_mani = {}
+  if( os.path.exists( l_pathMani ) ):
+    with open( l_pathMani, 'r' ) as l_fi:
+      l_mani = json.load( l_fi )
+
+  # collect the conversions
+  l_version = version()
+  l_jobs = []
+  l_outs = set()
+  for l_dir, l_subs, l_files in os.walk( i_inDir ):
+    l_subs.sort()
+    for l_fi in sorted( l_files ):
+      l_base, l_ext = os.path.splitext( l_fi )
+      l_on = l_base.split('_')[-1]
+      if( l_ext not in [ '.csv', '.npy' ] or l_on not in TYPES ):
+        continue
+
+      l_rel = os.path.relpath( os.path.join( l_dir, l_fi ), i_inDir )
+      l_relOut = os.path.splitext( l_rel )[0] + '.cpp'
+
+      # CSV files take precedence over NumPy files of the same array
+      if( l_relOut in l_outs ):
+        continue
+      l_outs.add( l_relOut )
+      l_ons = l_rel.split( os.sep )[0]
+      l_ot, l_reps = TYPES[l_on]
+
+      l_hashPrev = None
+      if( l_relOut in l_mani ):
+        l_hashPrev = l_mani[l_relOut]['hash']
+
+      l_jobs = l_jobs + [ ( os.path.join( i_inDir, l_rel ),
+                            os.path.join( i_outDir, l_relOut ),
+                            l_ons, l_on, l_ot, l_reps,
+                            i_emit,
+                            l_hashPrev,
+                            l_version ) ]
+
+  # convert in parallel
+  with concurrent.futures.ProcessPoolExecutor( max_workers=i_jobs ) as l_pool:
+    l_res = list( l_pool.map( convertJob, l_jobs, chunksize=8 ) )
+
+  l_mani = {}
+  l_nConv = 0
+  for l_jo, l_re in zip( l_jobs, l_res ):
+    l_mani[ os.path.relpath( l_jo[1], i_outDir ) ] = { 'source':    os.path.relpath( l_jo[0], i_inDir ),
+                                                       'namespace': l_jo[2],
+                                                       'name':      l_jo[3],
+                                                       'type':      l_jo[4],
+                                                       'emit':      l_jo[6],
+                                                       'hash':      l_re[0] }
+    if( l_re[1] ):
+      l_nConv = l_nConv + 1
+
+  os.makedirs( i_outDir, exist_ok=True )
+  writeAtomic( l_pathMani, json.dumps( l_mani, indent=2, sort_keys=True ) )
+
+  logging.info( 'converted ' + str(l_nConv) + ' of ' + str(len(l_jobs)) + ' files, ' + str(len(l_jobs)-l_nConv) + ' unchanged' )
+
+  return l_mani
 
 ##
 # Main
 ##
-# parse command line options
-l_parser = argparse.ArgumentParser( description='Converts EDGEpre\'s CSV-files to C++.' )
-
-l_parser.add_argument( '-i', '--in_csv',
-                       dest     = 'in_csv',
-                       required = True,
-                       type     = str,
-                       help     = 'Input: CSV-file of EDGEpre')
-
-l_parser.add_argument( '-s', '--obj_name_space',
-                       dest     = 'obj_name_space',
-                       required = True,
-                       type     = str,
-                       help     = 'C++ namespace of the object')
-
-l_parser.add_argument( '-n', '--obj_name',
-                       dest     = 'obj_name',
-                       required = True,
-                       type     = str,
-                       help     = 'C++ name of the object')
-
-l_parser.add_argument( '-t', '--obj_type',
-                       dest     = 'obj_type',
-                       required = True,
-                       type     = str,
-                       help     = 'C++ type of the object')
-
-l_parser.add_argument( '-r', '--rep',
-                       dest     = 'rep',
-                       required = False,
-                       type     = str,
-                       nargs    = '*',
-                       help     = 'Optional string replacements applied as last step to the C++-content. Expected is a list of tuples. For example, \'--reg "-1" abc "-2" def\' would replace all occurences of "-1" with "abc" and all of "-2" with "def".' )
-
-l_parser.add_argument( '-o', '--out_cpp',
-                       dest     = 'out_cpp',
-                       required = True,
-                       type     = str,
-                       help     = 'Output: C++-file')
-
-l_args = vars(l_parser.parse_args())
-
-# derive replacements
-l_reps = []
-if l_args['rep']:
-  for l_re in range(0, len(l_args['rep']), 2 ):
-    l_reps = l_reps + [[ l_args['rep'][l_re], l_args['rep'][l_re+1] ]]
-
-with open( l_args['out_cpp'], 'w' ) as l_fi:
-  l_fi.write( replace(
-                convert( l_args['in_csv'],
-                         l_args['obj_name_space'],
-                         l_args['obj_name'],
-                         l_args['obj_type'] ),
-                l_reps )
-            )
+if __name__ == "__main__":
+  logging.basicConfig( level=logging.INFO,
+                       format='%(asctime)s - %(name)s - %(levelname)s - %(message)s' )
+
+  # parse command line options
+  l_parser = argparse.ArgumentParser( description='Converts EDGEpre\'s CSV-files to C++.' )
+
+  l_parser.add_argument( '-i', '--in_csv',
+                         dest     = 'in_csv',
+                         required = False,
+                         type     = str,
+                         help     = 'Input: CSV-file of EDGEpre, alternatively a NumPy-file (.npy) of EDGEpre\'s binary output')
+
+  l_parser.add_argument( '--tree',
+                         dest     = 'tree',
+                         required = False,
+                         type     = str,
+                         help     = 'Input: EDGEpre output directory, all arrays are converted to C++-files in the output directory. The C++ namespaces, names and types are derived from the paths and names of the files.')
+
+  l_parser.add_argument( '-s', '--obj_name_space',
+                         dest     = 'obj_name_space',
+                         required = False,
+                         type     = str,
+                         help     = 'C++ namespace of the object')
+
+  l_parser.add_argument( '-n', '--obj_name',
+                         dest     = 'obj_name',
+                         required = False,
+                         type     = str,
+                         help     = 'C++ name of the object')
+
+  l_parser.add_argument( '-t', '--obj_type',
+                         dest     = 'obj_type',
+                         required = False,
+                         type     = str,
+                         help     = 'C++ type of the object')
+
+  l_parser.add_argument( '-r', '--rep',
+                         dest     = 'rep',
+                         required = False,
+                         type     = str,
+                         nargs    = '*',
+                         help     = 'Optional string replacements applied as last step to the C++-content. Expected is a list of tuples. For example, \'--reg "-1" abc "-2" def\' would replace all occurences of "-1" with "abc" and all of "-2" with "def".' )
+
+  l_parser.add_argument( '-j', '--jobs',
+                         dest     = 'jobs',
+                         required = False,
+                         type     = int,
+                         default  = os.cpu_count(),
+                         help     = 'Number of worker processes in tree mode.' )
+
+  l_parser.add_argument( '-e', '--emit',
+                         dest     = 'emit',
+                         required = False,
+                         type     = str,
+                         default  = 'init',
+                         choices  = [ 'init', 'bytes', 'incbin' ],
+                         help     = 'Emission of the data: brace-initializer of decimal literals (init), assembler directives of the entries\' bit patterns (bytes, ELF only) or assembler .incbin of a binary file next to the C++-file (incbin, ELF only), whose directory has to be searched by the assembler, e.g., -Wa,-I<dir>. The symbols and replacements are the same for all.' )
+
+  l_parser.add_argument( '-o', '--out_cpp',
+                         dest     = 'out_cpp',
+                         required = True,
+                         type     = str,
+                         help     = 'Output: C++-file, output directory in tree mode')
+
+  l_args = vars(l_parser.parse_args())
+
+  if( l_args['tree'] ):
+    tree( l_args['tree'],
+          l_args['out_cpp'],
+          l_args['jobs'],
+          l_args['emit'] )
+  else:
+    for l_ar in [ 'in_csv', 'obj_name_space', 'obj_name', 'obj_type' ]:
+      if( l_args[l_ar] == None ):
+        l_parser.error( 'argument --' + l_ar + ' is required without --tree' )
+
+    # derive replacements
+    l_reps = []
+    if l_args['rep']:
+      for l_re in range(0, len(l_args['rep']), 2 ):
+        l_reps = l_reps + [[ l_args['rep'][l_re], l_args['rep'][l_re+1] ]]
+
+    l_pathBin = os.path.splitext( l_args['out_cpp'] )[0] + '.bin'
+    write( l_args['out_cpp'],
+           l_pathBin,
+           convert( l_args['in_csv'],
+                    l_args['obj_name_space'],
+                    l_args['obj_name'],
+                    l_args['obj_type'],
+                    l_reps,
+                    l_args['emit'],
+                    l_pathBin ) )
@@ -21,646 +21,184 @@
 # @section DESCRIPTION
 # This is the entry point of EDGEpre.
 ##
+import os
+import time
 import logging
 import argparse
-import os
-import sympy
 from sympy.core.cache import *
 import edge_pre.io.Config
-import edge_pre.int.Matrices
-import edge_pre.sc.ops.Project
-import edge_pre.io.ArrStr
-import edge_pre.io.Matrices
-import edge_pre.dg.basis.Mod
-import edge_pre.dg.basis.Line
-import edge_pre.sc.grid.Line
-import edge_pre.dg.basis.Quad
-import edge_pre.sc.grid.Quad
-import edge_pre.dg.basis.Tria
-import edge_pre.sc.grid.Tria
-import edge_pre.dg.basis.Hex
-import edge_pre.sc.grid.Hex
-import edge_pre.types.Tet
-import edge_pre.dg.basis.Tet
-import edge_pre.sc.grid.Tet
-
-# set up logger
-logging.basicConfig( level=logging.DEBUG,
-                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s' )
-
-# welcome our users
-logging.info( '##########################################################################' )
-logging.info( '##############   ##############            ###############  ##############' )
-logging.info( '##############   ###############         ################   ##############' )
-logging.info( '#####            #####       #####      ######                       #####' )
-logging.info( '#####            #####        #####    #####                         #####' )
-logging.info( '#############    #####         #####  #####                  #############' )
-logging.info( '#############    #####         #####  #####      #########   #############' )
-logging.info( '#####            #####         #####  #####      #########           #####' )
-logging.info( '#####            #####        #####    #####        ######           #####' )
-logging.info( '#####            #####       #####      #####       #####            #####' )
-logging.info( '###############  ###############         ###############   ###############' )
-logging.info( '###############  ##############           #############    ###############' )
-logging.info( '#######################################################################pre' )
-logging.info( 'you reached EDGEpre, the pre-processing engine of EDGE' )
-
-# parse command line options
-l_parser = argparse.ArgumentParser( description='Generation of pre-processed data structures for EDGE.' )
-
-l_parser.add_argument( '-x', '--xml',
-                       dest     = 'xml',
-                       required = True,
-                       type     = str,
-                       help     = 'XML configuration of EDGEpre')
-l_args = vars(l_parser.parse_args())
-
-# parse XML-config
-l_conf = edge_pre.io.Config.Config( l_args['xml'] )
-
-# iterate over element types
-for l_ty in l_conf.m_types:
-  logging.info( 'processing element type: '+ l_ty )
-
-  # iterate over polynomial degrees
-  for l_de in l_conf.m_degs:
-    logging.info( '  polynomial degree: '+ str(l_de) )
-
-    # create dirs
-    l_dirExt = '/' + l_ty + '/' + str(l_de) + '/'
-    for l_out in l_conf.m_out.keys():
-      l_dir = l_conf.m_out[l_out] + l_dirExt
-      if not os.path.exists(l_dir):
-        os.makedirs(l_dir)
-
-    #
-    # clear sympy cache to avoid memory issues
-    #
-    clear_cache()
-
-    #
-    # line elements
-    #
-    if( l_ty == 'line' ):
-      # element type
-      l_elTy = edge_pre.types.Line.Line( l_de )
-
-      # set pseudo data
-      l_symsFa = None
-      l_basisFa = None
-      l_intFa = None
-
-      # get basis
-      l_symsEl, l_basisEl = edge_pre.dg.basis.Line.gen( l_de )
-
-      # get element integration interval
-      l_intEl = l_elTy.intEl( l_symsEl[0] )
-
-      # get face trafos
-      l_faToFa = l_elTy.faToFa( l_symsFa )
-      l_faToEl = l_elTy.faToEl( l_symsFa )
-
-      # set dummy sub-cell reordering
-      l_scDgAd = [ [0] ]
-
-      # get sub-cell integration intervals and trafos
-      l_mapsSc, l_detsSc = edge_pre.sc.grid.Line.intSc( l_de, l_symsEl )
-
-      # get sub-face integration matrices
-      l_sfInt = []
-      for l_fa in [0,1]:
-        l_sfInt = l_sfInt + [ edge_pre.int.Matrices.subs( [(l_symsEl[0], l_elTy.ves[l_fa][0])],
-                                                          l_basisEl ) ]
-
-      # sub-cell adjacency
-      l_scSfScIn, l_scSfScSend, l_scSfScRecv = edge_pre.sc.grid.Line.scSfSc( l_de )
-
-      # type of sub-cell's faces
-      l_scTySfIn, l_scTySfSend =  edge_pre.sc.grid.Line.scTySf( l_de )
-
-      # plot basis
-      l_path = l_conf.m_out['plots'] + l_dirExt + l_ty + '_' + str(l_de) + '_basis.pdf'
-      edge_pre.dg.basis.Line.plot( l_path,
-                                   l_symsEl,
-                                   l_basisEl )
-
-      # vertices of sub-cells
-      l_veCrds = edge_pre.sc.grid.Line.svs( l_de )
-      l_scSvIn, l_scSvSend, l_scSvRecv = edge_pre.sc.grid.Line.scSv( l_de )
-      l_path = l_conf.m_out['plots'] + l_dirExt + l_ty + '_' + str(l_de) + '_subgrid.pdf'
-      edge_pre.sc.grid.Line.plot( l_path,
-                                  l_veCrds,
-                                  l_scSvIn,
-                                  l_scSvSend)
-
-      # get scatter matrix for DG surface sub-cells
-      l_scatterSurf = []
-      # local face
-      for l_fa in range(2):
-        l_scatterSurf = l_scatterSurf + [ edge_pre.sc.ops.Project.scatter( l_symsEl,\
-                                                                           l_basisEl,\
-                                                                           l_intEl,\
-                                                                           l_mapsSc[2][l_fa],\
-                                                                           l_detsSc[2][l_fa] ) ]
-
-      # remote face
-      for l_ve in range(1):
-        for l_fa in range(2):
-          # derive reordered lists
-          l_maRe = [ l_mapsSc[2][l_fa][l_sc] for l_sc in l_scDgAd[l_ve] ]
-          l_deRe = [ l_detsSc[2][l_fa][l_sc] for l_sc in l_scDgAd[l_ve] ]
-          l_scatterSurf = l_scatterSurf + [ edge_pre.sc.ops.Project.scatter( l_symsEl,\
-                                                                             l_basisEl,\
-                                                                             l_intEl,\
-                                                                             l_maRe,\
-                                                                             l_deRe ) ]
-
-    #
-    # quadrilaterals
-    #
-    if( l_ty == 'quad4r' ):
-      # element type
-      l_elTy = edge_pre.types.Quad.Quad( l_de )
-
-      # get face basis
-      l_symsFa, l_basisFa = edge_pre.dg.basis.Line.gen( l_de )
-
-      # get element basis
-      l_symsEl, l_basisEl = edge_pre.dg.basis.Quad.gen( l_de )
-
-      # unify bases
-      l_symsEl, l_basisEl = edge_pre.dg.basis.Mod.unify( l_symsFa, l_basisFa, l_symsEl, l_basisEl )
-
-      # get face integration interval
-      l_intFa = edge_pre.types.Line.Line( l_de ).intEl( l_symsFa )
-
-      # get element integration interval
-      l_intEl = l_elTy.intEl( l_symsEl )
-
-      # get face trafos
-      l_faToFa = l_elTy.faToFa( l_symsFa )
-      l_faToEl = l_elTy.faToEl( l_symsFa )
-
-      # get sub-cell reorderings
-      l_scDgAd = edge_pre.sc.grid.Quad.scDgAd( l_de )
-
-      # get sub-cell integration intervals and trafos
-      l_mapsSc, l_detsSc = edge_pre.sc.grid.Quad.intSc( l_de, l_symsEl )
-
-      # get sub-face integration matrices
-      l_subsSfDg, l_intSfDg = edge_pre.sc.grid.Quad.intSfDg( l_de, [sympy.symbols('chi_0')], l_symsEl )
-
-      l_sfInt = []
-      for l_fa in range(4):
-        l_basisElSubs = edge_pre.int.Matrices.subsAll( l_subsSfDg[l_fa], l_basisEl )
-        l_sfInt = l_sfInt + [ edge_pre.int.Matrices.intL( l_intSfDg[l_fa], l_basisElSubs ) ]
-
-      # vertices of sub-cells
-      l_veCrds = edge_pre.sc.grid.Quad.svs( l_de )
-      l_scSvIn, l_scSvSend, l_scSvRecv = edge_pre.sc.grid.Quad.scSv( l_de )
-
-      # sub-cell adjacency
-      l_scSfScIn, l_scSfScSend, l_scSfScRecv = edge_pre.sc.grid.Quad.scSfSc( l_de )
-
-      # type of sub-cell's faces
-      l_scTySfIn, l_scTySfSend =  edge_pre.sc.grid.Quad.scTySf( l_de )
-
-      # plot basis
-      l_path = l_conf.m_out['plots'] + l_dirExt + l_ty + '_' + str(l_de) + '_basis.pdf'
-      edge_pre.dg.basis.Quad.plot( l_path,
-                                   l_symsEl,
-                                   l_basisEl )
-
-      # plot sub-grid
-      l_path = l_conf.m_out['plots'] + l_dirExt + l_ty + '_' + str(l_de) + '_subgrid.pdf'
-      edge_pre.sc.grid.Quad.plot( l_path,
-                                  l_veCrds,
-                                  l_scSvIn,
-                                  l_scSvSend )
-
-      # get scatter matrix for DG surface sub-cells
-      l_scatterSurf = []
-      # local face
-      for l_fa in range(4):
-        l_scatterSurf = l_scatterSurf + [ edge_pre.sc.ops.Project.scatter( l_symsEl,\
-                                                                           l_basisEl,\
-                                                                           l_intEl,\
-                                                                           l_mapsSc[2][l_fa],\
-                                                                           l_detsSc[2][l_fa] ) ]
-
-      # remote face
-      for l_ve in range(1):
-        for l_fa in range(4):
-          # derive reordered lists
-          l_maRe = [ l_mapsSc[2][l_fa][l_sc] for l_sc in l_scDgAd[l_ve] ]
-          l_deRe = [ l_detsSc[2][l_fa][l_sc] for l_sc in l_scDgAd[l_ve] ]
-          l_scatterSurf = l_scatterSurf + [ edge_pre.sc.ops.Project.scatter( l_symsEl,\
-                                                                             l_basisEl,\
-                                                                             l_intEl,\
-                                                                             l_maRe,\
-                                                                             l_deRe ) ]
-
-    #
-    # triangles
-    #
-    if( l_ty == 'tria3' ):
-      # element type
-      l_elTy = edge_pre.types.Tria.Tria( l_de )
-
-      # get face basis
-      l_symsFa, l_basisFa = edge_pre.dg.basis.Line.gen( l_de )
-
-      # get basis
-      l_symsEl, l_basisEl = edge_pre.dg.basis.Tria.gen( l_de )
-
-      # unify bases
-      l_symsEl, l_basisEl = edge_pre.dg.basis.Mod.unify( l_symsFa, l_basisFa, l_symsEl, l_basisEl )
-
-      # get face integration interval
-      l_intFa = edge_pre.types.Line.Line( l_de ).intEl( l_symsFa )
-
-      # get element integration interval
-      l_intEl = l_elTy.intEl( l_symsEl )
-
-      # get face trafos
-      l_faToFa = l_elTy.faToFa( l_symsFa )
-      l_faToEl = l_elTy.faToEl( l_symsFa )
-
-      # get sub-cell reorderings
-      l_scDgAd = edge_pre.sc.grid.Tria.scDgAd( l_de )
-
-      # get sub-cell integration intervals and trafos
-      l_mapsSc, l_detsSc = edge_pre.sc.grid.Tria.intSc( l_de, l_symsEl )
-
-      # get sub-face integration matrices
-      l_subsSfDg, l_intSfDg = edge_pre.sc.grid.Tria.intSfDg( l_de, [sympy.symbols('chi_0')], l_symsEl )
-
-      l_sfInt = []
-      for l_fa in range(3):
-        l_basisElSubs = edge_pre.int.Matrices.subsAll( l_subsSfDg[l_fa], l_basisEl )
-        l_sfInt = l_sfInt + [ edge_pre.int.Matrices.intL( l_intSfDg[l_fa], l_basisElSubs ) ]
-
-      # vertices of sub-cells
-      l_veCrds = edge_pre.sc.grid.Tria.svs( l_de )
-      l_scSvIn, l_scSvSend, l_scSvRecv = edge_pre.sc.grid.Tria.scSv( l_de )
-
-      # sub-cell adjacency
-      l_scSfScIn, l_scSfScSend, l_scSfScRecv = edge_pre.sc.grid.Tria.scSfSc( l_de )
-
-      # type of sub-cell's faces
-      l_scTySfIn, l_scTySfSend =  edge_pre.sc.grid.Tria.scTySf( l_de )
-
-      # plot basis
-      l_path = l_conf.m_out['plots'] + l_dirExt + l_ty + '_' + str(l_de) + '_basis.pdf'
-      edge_pre.dg.basis.Tria.plot( l_path,
-                                   l_symsEl,
-                                   l_basisEl )
-
-      # plot sub-grid
-      l_path = l_conf.m_out['plots'] + l_dirExt + l_ty + '_' + str(l_de) + '_subgrid.pdf'
-      edge_pre.sc.grid.Tria.plot( l_path,
-                                  l_veCrds,
-                                  l_scSvIn,
-                                  l_scSvSend)
-
-      # get scatter matrix for DG surface sub-cells
-      l_scatterSurf = []
-      # local face
-      for l_fa in range(3):
-        l_scatterSurf = l_scatterSurf + [ edge_pre.sc.ops.Project.scatter( l_symsEl,\
-                                                                           l_basisEl,\
-                                                                           l_intEl,\
-                                                                           l_mapsSc[2][l_fa],\
-                                                                           l_detsSc[2][l_fa] ) ]
-
-      # remote face
-      for l_ve in range(1):
-        for l_fa in range(3):
-          # derive reordered lists
-          l_maRe = [ l_mapsSc[2][l_fa][l_sc] for l_sc in l_scDgAd[l_ve] ]
-          l_deRe = [ l_detsSc[2][l_fa][l_sc] for l_sc in l_scDgAd[l_ve] ]
-          l_scatterSurf = l_scatterSurf + [ edge_pre.sc.ops.Project.scatter( l_symsEl,\
-                                                                             l_basisEl,\
-                                                                             l_intEl,\
-                                                                             l_maRe,\
-                                                                             l_deRe ) ]
-
-    #
-    # hexes
-    #
-    if( l_ty == 'hex8r' ):
-      # element type
-      l_elTy = edge_pre.types.Hex.Hex( l_de )
-
-      # get face basis
-      l_symsFa, l_basisFa = edge_pre.dg.basis.Quad.gen( l_de )
-
-      # get element basis
-      l_symsEl, l_basisEl = edge_pre.dg.basis.Hex.gen( l_de )
-
-      # unify bases
-      l_symsEl, l_basisEl = edge_pre.dg.basis.Mod.unify( l_symsFa, l_basisFa, l_symsEl, l_basisEl )
-
-      # get face integration intervals
-      l_intFa = edge_pre.types.Quad.Quad( l_de ).intEl( l_symsFa )
-
-      # get element integration interval
-      l_intEl = l_elTy.intEl( l_symsEl )
-
-      # get face trafos
-      l_faToFa = l_elTy.faToFa( l_symsFa )
-      l_faToEl = l_elTy.faToEl( l_symsFa )
-
-      # get sub-cell reorderings
-      l_scDgAd = edge_pre.sc.grid.Hex.scDgAd( l_de )
-
-      # get sub-cell integration intervals and trafos
-      l_mapsSc, l_detsSc = edge_pre.sc.grid.Hex.intSc( l_de, l_symsEl )
-
-      # get sub-face integration matrices
-      l_subsSfDg, l_intSfDg = edge_pre.sc.grid.Hex.intSfDg( l_de, [sympy.symbols('chi_0'), sympy.symbols('chi_1')], l_symsEl )
-
-      l_sfInt = []
-      for l_fa in range(6):
-        l_basisElSubs = edge_pre.int.Matrices.subsAll( l_subsSfDg[l_fa], l_basisEl )
-        l_sfInt = l_sfInt + [ edge_pre.int.Matrices.intL( l_intSfDg[l_fa], l_basisElSubs ) ]
-
-      # vertices of sub-cells
-      l_veCrds = edge_pre.sc.grid.Hex.svs( l_de )
-      l_scSvIn, l_scSvSend, l_scSvRecv = edge_pre.sc.grid.Hex.scSv( l_de )
-
-      # sub-cell adjacency
-      l_scSfScIn, l_scSfScSend, l_scSfScRecv = edge_pre.sc.grid.Hex.scSfSc( l_de )
-
-      # type of sub-cell's faces
-      l_scTySfIn, l_scTySfSend =  edge_pre.sc.grid.Hex.scTySf( l_de )
-
-      # plot sub-grid
-      l_path = l_conf.m_out['plots'] + l_dirExt + l_ty + '_' + str(l_de) + '_subgrid.pdf'
-      edge_pre.sc.grid.Hex.plot( l_path,
-                                 l_de )
-
-      # get scatter matrix for DG surface sub-cells
-      l_scatterSurf = []
-      # local face
-      for l_fa in range(6):
-        l_scatterSurf = l_scatterSurf + [ edge_pre.sc.ops.Project.scatter( l_symsEl,\
-                                                                           l_basisEl,\
-                                                                           l_intEl,\
-                                                                           l_mapsSc[2][l_fa],\
-                                                                           l_detsSc[2][l_fa] ) ]
-
-      # remote face
-      for l_ve in range(4):
-        for l_fa in range(6):
-          # derive reordered lists
-          l_maRe = [ l_mapsSc[2][l_fa][l_sc] for l_sc in l_scDgAd[l_ve] ]
-          l_deRe = [ l_detsSc[2][l_fa][l_sc] for l_sc in l_scDgAd[l_ve] ]
-          l_scatterSurf = l_scatterSurf + [ edge_pre.sc.ops.Project.scatter( l_symsEl,\
-                                                                             l_basisEl,\
-                                                                             l_intEl,\
-                                                                             l_maRe,\
-                                                                             l_deRe ) ]
-
-    #
-    # tets
-    #
-    if( l_ty == 'tet4' ):
-      # element type
-      l_elTy = edge_pre.types.Tet.Tet( l_de )
-
-      # get face basis
-      l_symsFa, l_basisFa = edge_pre.dg.basis.Tria.gen( l_de )
-
-      # get element basis
-      l_symsEl, l_basisEl = edge_pre.dg.basis.Tet.gen( l_de )
-
-      # unify bases
-      l_symsEl, l_basisEl = edge_pre.dg.basis.Mod.unify( l_symsFa, l_basisFa, l_symsEl, l_basisEl )
-
-      # get face integration intervals
-      l_intFa = edge_pre.types.Tria.Tria( l_de ).intEl( l_symsFa )
-
-      # get element integration intervals
-      l_intEl = l_elTy.intEl( l_symsEl )
-
-      # get face trafos
-      l_faToFa = l_elTy.faToFa( l_symsFa )
-      l_faToEl = l_elTy.faToEl( l_symsFa )
-
-      # get sub-cell reordering
-      l_scDgAd = edge_pre.sc.grid.Tet.scDgAd( l_de )
-
-      # get sub-cell integration intervals and trafos
-      l_mapsSc, l_detsSc = edge_pre.sc.grid.Tet.intSc( l_de, l_symsEl )
-
-      # get sub-face integration matrices
-      l_subsSfDg, l_intSfDg = edge_pre.sc.grid.Tet.intSfDg( l_de, [sympy.symbols('chi_0'), sympy.symbols('chi_1')], l_symsEl )
-
-      l_sfInt = []
-      for l_fa in range(4):
-        l_basisElSubs = edge_pre.int.Matrices.subsAll( l_subsSfDg[l_fa], l_basisEl )
-        l_sfInt = l_sfInt + [ edge_pre.int.Matrices.intL( l_intSfDg[l_fa], l_basisElSubs ) ]
-
-      # vertices of sub-cells
-      l_veCrds = edge_pre.sc.grid.Tet.svs( l_de )
-      l_scSvIn, l_scSvSend, l_scSvRecv = edge_pre.sc.grid.Tet.scSv( l_de )
-
-      # sub-cell adjacency
-      l_scSfScIn, l_scSfScSend, l_scSfScRecv = edge_pre.sc.grid.Tet.scSfSc( l_de )
-
-      # type of sub-cell's faces
-      l_scTySfIn, l_scTySfSend =  edge_pre.sc.grid.Tet.scTySf( l_de )
-
-
-      # get scatter matrix for DG surface sub-cells
-      l_scatterSurf = []
-      # local face
-      for l_fa in range(4):
-        l_scatterSurf = l_scatterSurf + [ edge_pre.sc.ops.Project.scatter( l_symsEl,\
-                                                                           l_basisEl,\
-                                                                           l_intEl,\
-                                                                           l_mapsSc[2][l_fa],\
-                                                                           l_detsSc[2][l_fa] ) ]
-
-      # remote face
-      for l_ve in range(3):
-        for l_fa in range(4):
-          # derive reordered lists
-          l_maRe = [ l_mapsSc[2][l_fa][l_sc] for l_sc in l_scDgAd[l_ve] ]
-          l_deRe = [ l_detsSc[2][l_fa][l_sc] for l_sc in l_scDgAd[l_ve] ]
-          l_scatterSurf = l_scatterSurf + [ edge_pre.sc.ops.Project.scatter( l_symsEl,\
-                                                                             l_basisEl,\
-                                                                             l_intEl,\
-                                                                             l_maRe,\
-                                                                             l_deRe ) ]
-
-    #
-    # Generic DG structures
-    #
-    # get mass matrix
-    l_mass = edge_pre.int.Matrices.mass( l_intEl, l_basisEl )
-
-    # get stiffness matrices
-    l_stiff = edge_pre.int.Matrices.stiff( l_symsEl,
-                                           l_basisEl,
-                                           l_intEl )
-
-    # stiffness time matrices, transposed stiffness matrices multiplied by inverse mass matrix (after transposing)
-    l_stiffT = []
-    for l_di in range(len(l_stiff)):
-      l_stiffT = l_stiffT + [ l_stiff[l_di].transpose()*l_mass.inv() ]
-
-    # stifness volume matrices, stiffness matrices multiplied by inverse mass matrix
-    l_stiffV = []
-    for l_di in range(len(l_stiff)):
-      l_stiffV = l_stiffV + [ l_stiff[l_di]*l_mass.inv() ]
-
-    # get flux matrices
-    l_flux = edge_pre.int.Matrices.flux( l_basisFa,
-                                         l_basisEl,
-                                         l_symsFa,
-                                         l_symsEl,
-                                         l_intFa,
-                                         l_faToFa,
-                                         l_faToEl )
-
-    # derive single step projection and surface int for local contribution
-    l_fluxL = [ l_mat*l_flux[1] for l_mat in l_flux[0] ] # premultiply first projection with diagonal face mass matrix
-
-    # derive single step projection and surface int for neigh contribution
-    l_fluxN = []
-    # Remark: vertices are slowest dim, since our adjacency ordering prevents all but the first case for non-periodic meshes
-    for l_ve in range( len(l_flux[2]) ):
-      for l_fa in range( len(l_flux[0]) ):
-        l_fluxN = l_fluxN + [ l_flux[0][l_fa] * l_flux[2][l_ve] ]
-
-    # pre-multiply back basis-change by inverse mass matrix
-    l_fluxT = [ l_mat.transpose()*l_mass.inv() for l_mat in l_flux[0] ]
-
-    # save mass matrix
-    l_path = l_conf.m_out['dg'] + l_dirExt + l_ty + '_' + str(l_de) + '_mass.csv'
-    with open( l_path, 'w' ) as l_fi:
-      l_fi.write( edge_pre.io.ArrStr.float2d( l_mass.tolist() ) )
-
-    # save stiffness matrices
-    l_path = l_conf.m_out['dg'] + l_dirExt + l_ty + '_' + str(l_de) + '_stiffV.csv'
-    with open( l_path, 'w' ) as l_fi:
-      l_fi.write( edge_pre.io.ArrStr.float3d( [ l_ma.tolist() for l_ma in l_stiffV ] ) )
-
-    l_path = l_conf.m_out['dg'] + l_dirExt + l_ty + '_' + str(l_de) + '_stiffT.csv'
-    with open( l_path, 'w' ) as l_fi:
-      l_fi.write( edge_pre.io.ArrStr.float3d( [ l_ma.tolist() for l_ma in l_stiffT ] ) )
-
-    # save flux matrices
-    l_path = l_conf.m_out['dg'] + l_dirExt + l_ty + '_' + str(l_de) + '_fluxL.csv'
-    with open( l_path, 'w' ) as l_fi:
-      l_fi.write( edge_pre.io.ArrStr.float3d( [ l_ma.tolist() for l_ma in l_fluxL ] ) )
-
-    l_path = l_conf.m_out['dg'] + l_dirExt + l_ty + '_' + str(l_de) + '_fluxN.csv'
-    with open( l_path, 'w' ) as l_fi:
-      l_fi.write( edge_pre.io.ArrStr.float3d( [ l_ma.tolist() for l_ma in l_fluxN ] ) )
-
-    l_path = l_conf.m_out['dg'] + l_dirExt + l_ty + '_' + str(l_de) + '_fluxT.csv'
-    with open( l_path, 'w' ) as l_fi:
-      l_fi.write( edge_pre.io.ArrStr.float3d( [ l_ma.tolist() for l_ma in l_fluxT ] ) )
-
-    # plot mass matrix
-    l_path = l_conf.m_out['plots'] + l_dirExt + l_ty + '_' + str(l_de) + '_mass.pdf'
-    edge_pre.io.Matrices.sparsity( l_mass,
-                                   l_path )
-
-    # plot stiffness matrices (volume kernel)
-    for l_ma in range( len(l_stiff) ):
-      l_path = l_conf.m_out['plots'] + l_dirExt + l_ty + '_' + str(l_de) + '_stiffV'+str(l_ma)+'.pdf'
-      edge_pre.io.Matrices.sparsity( l_stiffV[l_ma],
-                                     l_path )
-
-    # plot stiffness matrices (time kernel)
-    for l_ma in range( len(l_stiff) ):
-      l_path = l_conf.m_out['plots'] + l_dirExt + l_ty + '_' + str(l_de) + '_stiffT'+str(l_ma)+'.pdf'
-      edge_pre.io.Matrices.sparsity( l_stiffT[l_ma],
-                                     l_path )
-
-    # plot flux matrices
-    for l_ma in range( len(l_fluxL) ):
-      l_path = l_conf.m_out['plots'] + l_dirExt + l_ty + '_' + str(l_de) + '_fluxL'+str(l_ma)+'.pdf'
-      edge_pre.io.Matrices.sparsity( l_fluxL[l_ma],
-                                     l_path )
-
-    for l_ma in range( len(l_fluxN) ):
-      l_path = l_conf.m_out['plots'] + l_dirExt + l_ty + '_' + str(l_de) + '_fluxN'+str(l_ma)+'.pdf'
-      edge_pre.io.Matrices.sparsity( l_fluxN[l_ma],
-                                     l_path )
-
-    for l_ma in range( len(l_fluxT) ):
-      l_path = l_conf.m_out['plots'] + l_dirExt + l_ty + '_' + str(l_de) + '_fluxT'+str(l_ma)+'.pdf'
-      edge_pre.io.Matrices.sparsity( l_fluxT[l_ma],
-                                     l_path )
-
-    #
-    # Generic sub-cell structures
-    #
-    # get scatter matrix
-    l_scatter = edge_pre.sc.ops.Project.scatter( l_symsEl,\
-                                                 l_basisEl,\
-                                                 l_intEl,\
-                                                 l_mapsSc[0]+l_mapsSc[1],\
-                                                 l_detsSc[0]+l_detsSc[1] )
-
-    # get gather matrix
-    l_gather = edge_pre.sc.ops.Project.gather( l_symsEl,\
-                                               l_basisEl,\
-                                               l_intEl,\
-                                               l_mapsSc[0]+l_mapsSc[1],\
-                                               l_detsSc[0]+l_detsSc[1] )
-
-    # scale face int with inverse mass matrix
-    for l_fa in range(len(l_sfInt)):
-     l_sfInt[l_fa] = l_sfInt[l_fa] * l_mass.inv()
-
-    # save vertex cords
-    l_path = l_conf.m_out['subcell'] + l_dirExt + l_ty + '_' + str(l_de) + '_svcrds.csv'
-    with open( l_path, 'w' ) as l_fi:
-      l_fi.write(  edge_pre.io.ArrStr.float2d( l_veCrds ) )
-
-    # save sCsV
-    l_path = l_conf.m_out['subcell'] + l_dirExt + l_ty + '_' + str(l_de) + '_scsv.csv'
-    with open( l_path, 'w' ) as l_fi:
-      l_fi.write(  edge_pre.io.ArrStr.int2d( l_scSvIn+l_scSvSend+l_scSvRecv ) )
-
-    # save sub-cell scSfSc
-    l_path = l_conf.m_out['subcell'] + l_dirExt + l_ty + '_' + str(l_de) + '_scsfsc.csv'
-    with open( l_path, 'w' ) as l_fi:
-      l_fi.write(  edge_pre.io.ArrStr.int2d( l_scSfScIn+l_scSfScSend+l_scSfScRecv ) )
-
-    # save type of sub-cells' faces
-    l_path = l_conf.m_out['subcell'] + l_dirExt + l_ty + '_' + str(l_de) + '_sctysf.csv'
-    with open( l_path, 'w' ) as l_fi:
-      l_fi.write(  edge_pre.io.ArrStr.int2d( l_scTySfIn+l_scTySfSend ) )
-
-    # save sub-cell reordering
-    l_path = l_conf.m_out['subcell'] + l_dirExt + l_ty + '_' + str(l_de) + '_scdgad.csv'
-    with open( l_path, 'w' ) as l_fi:
-      l_fi.write(  edge_pre.io.ArrStr.int2d( l_scDgAd ) )
-
-    # save scatter matrix
-    l_path = l_conf.m_out['subcell'] + l_dirExt + l_ty + '_' + str(l_de) + '_scatter.csv'
-    with open( l_path, 'w' ) as l_fi:
-      l_fi.write( edge_pre.io.ArrStr.float2d( l_scatter.tolist() ) )
-
-    # save scatter surf matrix
-    l_path = l_conf.m_out['subcell'] + l_dirExt + l_ty + '_' + str(l_de) + '_scattersurf.csv'
-    with open( l_path, 'w' ) as l_fi:
-      l_fi.write( edge_pre.io.ArrStr.float3d( [ l_ss.tolist() for l_ss in l_scatterSurf ] ) )
-
-    # save gather matrix
-    l_path = l_conf.m_out['subcell'] + l_dirExt + l_ty + '_' + str(l_de) + '_gather.csv'
-    with open( l_path, 'w' ) as l_fi:
-      l_fi.write( edge_pre.io.ArrStr.float2d( l_gather.tolist() ) )
-
-    # save sub-face integration matrices
-    l_path = l_conf.m_out['subcell'] + l_dirExt + l_ty + '_' + str(l_de) + '_sfint.csv'
-    with open( l_path, 'w' ) as l_fi:
-      l_fi.write( edge_pre.io.ArrStr.float3d( [ l_sf.tolist() for l_sf in l_sfInt ] ) )
-
-  logging.info( 'we are done' )
\ No newline at end of file
+import edge_pre.io.Cache
+import edge_pre.run.Pipeline
+import edge_pre.run.Parallel
+import edge_pre.run.Profile
+import edge_pre.run.Validate
+
+if __name__ == "__main__":
+  # set up logger
+  logging.basicConfig( level=logging.DEBUG,
+                       format='%(asctime)s - %(name)s - %(levelname)s - %(message)s' )
+
+  # welcome our users
+  logging.info( '##########################################################################' )
+  logging.info( '##############   ##############            ###############  ##############' )
+  logging.info( '##############   ###############         ################   ##############' )
+  logging.info( '#####            #####       #####      ######                       #####' )
+  logging.info( '#####            #####        #####    #####                         #####' )
+  logging.info( '#############    #####         #####  #####                  #############' )
+  logging.info( '#############    #####         #####  #####      #########   #############' )
+  logging.info( '#####            #####         #####  #####      #########           #####' )
+  logging.info( '#####            #####        #####    #####        ######           #####' )
+  logging.info( '#####            #####       #####      #####       #####            #####' )
+  logging.info( '###############  ###############         ###############   ###############' )
+  logging.info( '###############  ##############           #############    ###############' )
+  logging.info( '#######################################################################pre' )
+  logging.info( 'you reached EDGEpre, the pre-processing engine of EDGE' )
+
+  # parse command line options
+  l_parser = argparse.ArgumentParser( description='Generation of pre-processed data structures for EDGE.' )
+
+  l_parser.add_argument( '-x', '--xml',
+                         dest     = 'xml',
+                         required = True,
+                         type     = str,
+                         help     = 'XML configuration of EDGEpre')
+  l_parser.add_argument( '-j', '--jobs',
+                         dest     = 'jobs',
+                         required = False,
+                         type     = int,
+                         default  = 1,
+                         help     = 'number of worker processes, independent operators of all element types and degrees are generated in parallel if larger than 1')
+  l_parser.add_argument( '-p', '--plot',
+                         dest     = 'plot',
+                         action   = 'store_true',
+                         help     = 'plots the basis, sub-grids and sparsity patterns of the matrices, overrides the XML configuration')
+  l_parser.add_argument( '-r', '--report',
+                         dest     = 'report',
+                         required = False,
+                         type     = str,
+                         help     = 'directory of the report, containing wall time, CPU time, peak memory and size of sympy\'s cache per stage, overrides the XML configuration')
+  l_parser.add_argument( '--profile',
+                         dest     = 'profile',
+                         action   = 'store_true',
+                         help     = 'dumps cProfile stats per stage to the directory prof of the report')
+  l_args = vars(l_parser.parse_args())
+
+  # parse XML-config
+  l_conf = edge_pre.io.Config.Config( l_args['xml'] )
+  if( l_args['plot'] ):
+    l_conf.m_out['plot'] = True
+  assert( not l_conf.m_out['plot'] or 'plots' in l_conf.m_out ), 'plotting requires the output directory of the plots'
+  if( l_args['report'] != None ):
+    l_conf.m_out['report'] = l_args['report']
+  assert( not l_args['profile'] or 'report' in l_conf.m_out ), 'profiling requires the directory of the report'
+
+  # set up the profiler of the stages
+  l_wall = time.perf_counter()
+  l_dirProf = None
+  if( l_args['profile'] ):
+    l_dirProf = os.path.join( l_conf.m_out['report'], 'prof' )
+  l_prof = edge_pre.run.Profile.Profiler( l_dirProf )
+
+  # set up the cache
+  l_cache = None
+  if 'dir' in l_conf.m_cache:
+    l_cache = edge_pre.io.Cache.Cache( l_conf.m_cache['dir'],
+                                       l_conf.m_cache.get( 'max_bytes', None ) )
+
+  if( l_args['jobs'] > 1 ):
+    edge_pre.run.Parallel.run( l_conf.m_types,
+                               l_conf.m_degs,
+                               l_conf.m_backend,
+                               l_cache,
+                               l_conf.m_out,
+                               l_args['jobs'],
+                               l_prof )
+  else:
+    # plotting jobs, executed once all operators are written
+    l_plots = []
+
+    # iterate over element types
+    for l_ty in l_conf.m_types:
+      logging.info( 'processing element type: '+ l_ty )
+
+      # pipeline of the previous degree, whose integrals are reused by the hierarchical bases
+      l_prev = None
+
+      # iterate over polynomial degrees
+      for l_de in l_conf.m_degs:
+        logging.info( '  polynomial degree: '+ str(l_de) )
+
+        #
+        # clear sympy cache to avoid memory issues
+        #
+        clear_cache()
+
+        if( l_prev != None and l_prev.m_deg >= l_de ):
+          l_prev = None
+
+        l_pipe = edge_pre.run.Pipeline.Pipeline( l_ty,
+                                                 l_de,
+                                                 l_conf.m_backend,
+                                                 l_cache,
+                                                 l_prev,
+                                                 l_prof )
+
+        # write DG and sub-cell structures
+        l_pipe.writeDg( l_conf.m_out['dg'],      l_conf.m_out['format'] )
+        l_pipe.writeSc( l_conf.m_out['subcell'], l_conf.m_out['format'] )
+
+        # jobs, plotting basis, sub-grid and matrices
+        if( l_conf.m_out['plot'] ):
+          l_plots = l_plots + l_pipe.plots( l_conf.m_out['plots'] )
+
+        # drop the chain of lower degrees, all stages are evaluated
+        l_pipe.m_prev = None
+        l_prev = l_pipe
+
+    # plot basis, sub-grids and matrices
+    if( l_conf.m_out['plot'] ):
+      edge_pre.run.Parallel.plot( l_plots, 1 )
+
+  # compare the float mode to the exact backend
+  l_valid = None
+  if( 'degs' in l_conf.m_validate ):
+    l_valid = edge_pre.run.Validate.run( l_conf.m_types,
+                                         l_conf.m_validate['degs'],
+                                         l_conf.m_validate['backend'],
+                                         l_cache )
+    logging.info( 'validation of the float mode (max errors w.r.t. the ' + l_conf.m_validate['backend'] + ' backend):' )
+    for l_li in edge_pre.run.Validate.summary( l_valid ):
+      logging.info( '  ' + l_li )
+    if( not all( [ l_row['ok'] for l_row in l_valid ] ) ):
+      logging.warning( 'relative errors of the float mode exceed ' + str( edge_pre.run.Validate.TOL ) )
+
+  # report the stages
+  l_wall = time.perf_counter() - l_wall
+  logging.info( 'stages (times exclude nested stages, peak memory includes them):' )
+  for l_li in l_prof.summary():
+    logging.info( '  ' + l_li )
+  logging.info( 'total wall time (s): ' + '{:.3f}'.format( l_wall ) )
+
+  if( 'report' in l_conf.m_out ):
+    os.makedirs( l_conf.m_out['report'], exist_ok=True )
+    l_stamp = time.strftime( '%Y%m%d_%H%M%S' )
+    l_path = os.path.join( l_conf.m_out['report'], 'edge_pre_' + l_stamp )
+    l_prof.write( l_path, { 'xml':     os.path.abspath( l_args['xml'] ),
+                            'types':   l_conf.m_types,
+                            'degs':    l_conf.m_degs,
+                            'backend': l_conf.m_backend,
+                            'format':  l_conf.m_out['format'],
+                            'jobs':    l_args['jobs'],
+                            'wall':    l_wall } )
+    logging.info( 'wrote report: ' + l_path + '.{json,csv}' )
+
+    if( l_valid != None ):
+      l_path = os.path.join( l_conf.m_out['report'], 'validate_' + l_stamp )
+      edge_pre.run.Validate.write( l_path, l_valid, { 'xml':     os.path.abspath( l_args['xml'] ),
+                                                      'types':   l_conf.m_types,
+                                                      'degs':    l_conf.m_validate['degs'],
+                                                      'backend': l_conf.m_validate['backend'],
+                                                      'tol':     edge_pre.run.Validate.TOL } )
+      logging.info( 'wrote validation: ' + l_path + '.{json,csv}' )
+
+  logging.info( 'we are done' )
@@ -21,10 +21,6 @@
 # Basis for hexes.
 ##
 import sympy
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot
-from matplotlib.backends.backend_pdf import PdfPages
 from . import Line
 
 ##
@@ -48,4 +44,40 @@ def gen( i_deg ):
                               l_lineB[l_d2].subs( l_lineS[0], l_syms[1] ) *
                               l_lineB[l_d3].subs( l_lineS[0], l_syms[2] ) ]
 
-  return l_syms, l_basis
\ No newline at end of file
+  return l_syms, l_basis
+
+##
+# Derives the positions of the basis functions of a lower degree in the basis.
+#   The tensor-product basis contains the lower-degree functions, first dimension is the fastest.
+#
+# @param i_degLo lower polynomial degree.
+# @param i_deg polynomial degree.
+# @return positions, one per basis function of the lower degree.
+##
+def embed( i_degLo,
+           i_deg ):
+  assert( i_degLo <= i_deg )
+
+  l_ids = []
+  for l_d3 in range(i_degLo+1):
+    for l_d2 in range(i_degLo+1):
+      for l_d1 in range(i_degLo+1):
+        l_ids = l_ids + [ l_d1 + l_d2*(i_deg+1) + l_d3*(i_deg+1)**2 ]
+
+  return l_ids
+
+##
+# Derives the orthogonality of the basis functions.
+#   A tensor product of Legendre polynomials with degrees (d1, d2, d3) is orthogonal to all monomials, whose degree is lower in at least one dimension.
+#
+# @param i_deg polynomial degree.
+# @return one list per basis function, containing tuples (w, c): the function is orthogonal to all monomials xi^e with w.e < c.
+##
+def orth( i_deg ):
+  l_orth = []
+  for l_d3 in range(i_deg+1):
+    for l_d2 in range(i_deg+1):
+      for l_d1 in range(i_deg+1):
+        l_orth = l_orth + [ [ ( (1, 0, 0), l_d1 ), ( (0, 1, 0), l_d2 ), ( (0, 0, 1), l_d3 ) ] ]
+
+  return l_orth
@@ -20,10 +20,9 @@
 # @section DESCRIPTION
 # Basis for line elements.
 ##
+import numpy
 import sympy
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot
+import edge_pre.io.Plot
 
 ##
 # Generates basis functions for the line elements.
@@ -46,6 +45,30 @@ def gen( i_deg ):
   l_syms = [l_xi]
   return l_syms, l_pols
 
+##
+# Derives the positions of the basis functions of a lower degree in the basis.
+#   The basis is hierarchical, functions of lower degree are leading.
+#
+# @param i_degLo lower polynomial degree.
+# @param i_deg polynomial degree.
+# @return positions, one per basis function of the lower degree.
+##
+def embed( i_degLo,
+           i_deg ):
+  assert( i_degLo <= i_deg )
+
+  return list( range(i_degLo+1) )
+
+##
+# Derives the orthogonality of the basis functions.
+#   The shifted Legendre polynomial of degree d is orthogonal to all monomials of lower degree.
+#
+# @param i_deg polynomial degree.
+# @return one list per basis function, containing tuples (w, c): the function is orthogonal to all monomials xi^e with w.e < c.
+##
+def orth( i_deg ):
+  return [ [ ( (1,), l_de ) ] for l_de in range(i_deg+1) ]
+
 ##
 # Plots basis functions for line elements.
 #
@@ -55,6 +78,15 @@ def gen( i_deg ):
 ##
 def plot( i_out, i_syms, i_funs ):
   assert( len(i_syms) == 1 )
-  l_plot = sympy.plot( *i_funs, (i_syms[0], 0, 1) )
-  l_plot.save( i_out )
-  matplotlib.pyplot.close()
\ No newline at end of file
+
+  l_mpl = edge_pre.io.Plot.matplotlib()
+
+  l_xi = numpy.linspace( 0, 1, 201 )
+  l_vals = edge_pre.io.Plot.sample( i_syms, i_funs, [ l_xi ] )
+
+  l_ax = l_mpl.pyplot.figure().gca()
+  for l_va in l_vals:
+    l_ax.plot( l_xi, l_va )
+
+  l_mpl.pyplot.savefig( i_out )
+  l_mpl.pyplot.close()
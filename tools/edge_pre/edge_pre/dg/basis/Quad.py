@@ -20,12 +20,10 @@
 # @section DESCRIPTION
 # Basis for quadrilaterals.
 ##
+import numpy
 import sympy
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot
-from matplotlib.backends.backend_pdf import PdfPages
 from . import Line
+import edge_pre.io.Plot
 
 ##
 # Generates basis functions for quadrilaterals.
@@ -48,6 +46,40 @@ def gen( i_deg ):
 
   return l_syms, l_basis
 
+##
+# Derives the positions of the basis functions of a lower degree in the basis.
+#   The tensor-product basis contains the lower-degree functions, first dimension is the fastest.
+#
+# @param i_degLo lower polynomial degree.
+# @param i_deg polynomial degree.
+# @return positions, one per basis function of the lower degree.
+##
+def embed( i_degLo,
+           i_deg ):
+  assert( i_degLo <= i_deg )
+
+  l_ids = []
+  for l_d2 in range(i_degLo+1):
+    for l_d1 in range(i_degLo+1):
+      l_ids = l_ids + [ l_d1 + l_d2*(i_deg+1) ]
+
+  return l_ids
+
+##
+# Derives the orthogonality of the basis functions.
+#   A tensor product of Legendre polynomials with degrees (d1, d2) is orthogonal to all monomials, whose degree is lower in at least one dimension.
+#
+# @param i_deg polynomial degree.
+# @return one list per basis function, containing tuples (w, c): the function is orthogonal to all monomials xi^e with w.e < c.
+##
+def orth( i_deg ):
+  l_orth = []
+  for l_d2 in range(i_deg+1):
+    for l_d1 in range(i_deg+1):
+      l_orth = l_orth + [ [ ( (1, 0), l_d1 ), ( (0, 1), l_d2 ) ] ]
+
+  return l_orth
+
 ##
 # Plots basis functions for quadrilaterals
 #
@@ -58,9 +90,15 @@ def gen( i_deg ):
 def plot( i_out, i_syms, i_funs ):
   assert( len(i_syms) == 2 )
 
+  l_mpl = edge_pre.io.Plot.matplotlib()
+
+  l_xi1, l_xi2 = numpy.meshgrid( numpy.linspace( 0, 1, 50 ), numpy.linspace( 0, 1, 50 ) )
+  l_vals = edge_pre.io.Plot.sample( i_syms, i_funs, [ l_xi1, l_xi2 ] )
+
   # open pdf
-  with PdfPages(i_out) as l_pdf:
-    for l_fu in i_funs:
-      l_plot = sympy.plotting.plot3d( l_fu, (i_syms[0], 0, 1), (i_syms[1], 0, 1) )
+  with l_mpl.backends.backend_pdf.PdfPages(i_out) as l_pdf:
+    for l_va in l_vals:
+      l_ax = l_mpl.pyplot.figure().add_subplot( projection='3d' )
+      l_ax.plot_surface( l_xi1, l_xi2, l_va, cmap='viridis', rasterized=True )
       l_pdf.savefig()
-      matplotlib.pyplot.close()
+      l_mpl.pyplot.close()
@@ -21,6 +21,7 @@
 # Basis for tetrahedrons.
 ##
 import sympy
+from .Tria import jacobiHom
 
 ##
 # Generates basis functions for tetrahedrons.
@@ -33,9 +34,14 @@ def gen( i_deg ):
   l_xi2 = sympy.symbols('xi_2') # second tetrahedral coord
   l_xi3 = sympy.symbols('xi_3') # third tetrahedral coord
 
-  l_eta1 = sympy.symbols('eta_1') # first collapsed coord
-  l_eta2 = sympy.symbols('eta_2') # second collapsed coord
-  l_eta3 = sympy.symbols('eta_3') # third collapsed coord
+  # coordinates of the tet with x, y, z in [-1,1]
+  l_x = sympy.Poly( 2*l_xi1-1, l_xi1, l_xi2, l_xi3, domain='QQ' )
+  l_y = sympy.Poly( 2*l_xi2-1, l_xi1, l_xi2, l_xi3, domain='QQ' )
+  l_z = sympy.Poly( 2*l_xi3-1, l_xi1, l_xi2, l_xi3, domain='QQ' )
+  l_one = l_x**0
+
+  # first principal functions, multiplied by the denominators (-y-z)^p1 of the collapsed coordinate eta_1
+  l_psiA = jacobiHom( i_deg, 0, 2+2*l_x+l_y+l_z, -l_y-l_z )
 
   # basis
   l_basis = []
@@ -43,34 +49,45 @@ def gen( i_deg ):
   # derive basis functions
   for l_de in range(0, i_deg+1):
     for l_p1 in range(0, l_de+1):
-      # first principal function
-      l_psiA = sympy.jacobi( l_p1, 0, 0, l_eta1 )
+      for l_p2 in range(0, l_de-l_p1+1):
+        # build hierarchical basis following pascals triangle
+        l_p3 = l_de - l_p1 - l_p2
 
-      for l_p2 in range(0, l_de+1):
-        # second principal function
-        l_psiB = ( ( (1-l_eta2)/2 )**l_p1 * sympy.jacobi( l_p2, 2*l_p1+1, 0, l_eta2 ) )
+        # second principal function, multiplied by the denominator (1-z)^p2 of eta_2
+        l_psiB = jacobiHom( l_p2, 2*l_p1+1, 1+2*l_y+l_z, 1-l_z )[l_p2]
 
-        for l_p3 in range(0, l_de+1):
-          if( l_p1 + l_p2 + l_p3 == l_de ): # build hierarchical basis following pascals triangle
-            # third principal function
-            l_psiC = ( (1-l_eta3)/2 )**(l_p1 + l_p2) * sympy.jacobi( l_p3, 2*l_p1+2*l_p2+2, 0, l_eta3 )
+        # third principal function
+        l_psiC = jacobiHom( l_p3, 2*l_p1+2*l_p2+2, l_z, l_one )[l_p3]
 
-            l_basis = l_basis + [l_psiA * l_psiB * l_psiC]
-            
-            # insert tetrahedral coordinates
-            l_basis[-1] = l_basis[-1].subs( l_eta1, 2*(1+l_xi1) / (-l_xi2-l_xi3) - 1 )
-            l_basis[-1] = l_basis[-1].subs( l_eta2, 2*(1+l_xi2) / (1-l_xi3)      - 1 )
-            l_basis[-1] = l_basis[-1].subs( l_eta3, l_xi3                            )
+        # remaining factors of the collapsing ((1-eta_2)/2)^p1 * ((1-eta_3)/2)^(p1+p2) cancel the denominators
+        l_basis = l_basis + [ ( l_psiA[l_p1] * l_psiB * l_psiC * sympy.Rational(1, 2**(l_p1+l_p2)) ).as_expr() ]
 
-            # use tets with xi1, xi2, xi3 in [0,1]
-            l_basis[-1] = l_basis[-1].subs(l_xi1, 2*l_xi1-1)
-            l_basis[-1] = l_basis[-1].subs(l_xi2, 2*l_xi2-1)
-            l_basis[-1] = l_basis[-1].subs(l_xi3, 2*l_xi3-1)
-        
-            # simplify basis
-            l_basis[-1] = sympy.simplify( l_basis[-1] )
+  return [l_xi1, l_xi2, l_xi3], l_basis
 
-            # cancel denominators
-            l_basis[-1] = sympy.cancel( l_basis[-1] )
+##
+# Derives the positions of the basis functions of a lower degree in the basis.
+#   The basis is hierarchical, functions of lower degree are leading.
+#
+# @param i_degLo lower polynomial degree.
+# @param i_deg polynomial degree.
+# @return positions, one per basis function of the lower degree.
+##
+def embed( i_degLo,
+           i_deg ):
+  assert( i_degLo <= i_deg )
 
-  return [l_xi1, l_xi2, l_xi3], l_basis
+  return list( range( (i_degLo+1)*(i_degLo+2)*(i_degLo+3)//6 ) )
+
+##
+# Derives the orthogonality of the basis functions.
+#   A Dubiner function of total degree d is orthogonal to all monomials of lower total degree.
+#
+# @param i_deg polynomial degree.
+# @return one list per basis function, containing tuples (w, c): the function is orthogonal to all monomials xi^e with w.e < c.
+##
+def orth( i_deg ):
+  l_orth = []
+  for l_de in range(0, i_deg+1):
+    l_orth = l_orth + [ [ ( (1, 1, 1), l_de ) ] ] * ( (l_de+1)*(l_de+2)//2 )
+
+  return l_orth
@@ -20,12 +20,39 @@
 # @section DESCRIPTION
 # Basis for triangles.
 ##
+import numpy
 import sympy
 import fractions
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot
-from matplotlib.backends.backend_pdf import PdfPages
+import edge_pre.io.Plot
+
+##
+# Derives homogenized Jacobi polynomials b^n * P_n^(alpha,0)(a/b) through the three-term recurrence.
+#   The homogenization absorbs the denominators of the collapsed coordinates, such that no rational functions occur.
+#
+# @param i_deg maximum degree n.
+# @param i_alpha parameter alpha of the Jacobi polynomials.
+# @param i_a polynomial a.
+# @param i_b polynomial b.
+# @return list with the polynomials for the degrees 0, ..., i_deg.
+##
+def jacobiHom( i_deg,
+               i_alpha,
+               i_a,
+               i_b ):
+  l_hom = [ i_a**0 ]
+  if( i_deg > 0 ):
+    l_hom = l_hom + [ ( i_a * (i_alpha+2) + i_b * i_alpha ) * sympy.Rational(1, 2) ]
+
+  for l_n in range(1, i_deg):
+    l_c0 = 2 * (l_n+1) * (l_n+i_alpha+1) * (2*l_n+i_alpha)
+    l_c1 = (2*l_n+i_alpha+1) * (2*l_n+i_alpha+2) * (2*l_n+i_alpha)
+    l_c2 = (2*l_n+i_alpha+1) * i_alpha**2
+    l_c3 = 2 * l_n * (l_n+i_alpha) * (2*l_n+i_alpha+2)
+
+    l_hom = l_hom + [ (   ( i_a * l_c1 + i_b * l_c2 ) * l_hom[l_n]
+                        - i_b**2 * l_hom[l_n-1] * l_c3 ) * sympy.Rational(1, l_c0) ]
+
+  return l_hom
 
 ##
 # Generates basis functions for triangles.
@@ -37,8 +64,12 @@ def gen( i_deg ):
   l_xi1 = sympy.symbols('xi_1') # first triangular coords
   l_xi2 = sympy.symbols('xi_2') # second triangular coord
 
-  l_eta1 = sympy.symbols('eta_1') # first collapsed coord
-  l_eta2 = sympy.symbols('eta_2') # scond collapsed coord
+  # coordinates of the triangle with x, y in [-1,1]
+  l_x = sympy.Poly( 2*l_xi1-1, l_xi1, l_xi2, domain='QQ' )
+  l_y = sympy.Poly( 2*l_xi2-1, l_xi1, l_xi2, domain='QQ' )
+
+  # first principal functions, multiplied by the collapsing factor ((1-eta_2)/2)^p = ((1-y)/2)^p
+  l_psiA = jacobiHom( i_deg, 0, 1+2*l_x+l_y, 1-l_y )
 
   # basis
   l_basis = []
@@ -46,30 +77,44 @@ def gen( i_deg ):
   # derive basis functions
   for l_de in range(0, i_deg+1):
     for l_p in range(0, l_de+1):
-      # first principal function
-      l_psiA = sympy.jacobi( l_p, 0, 0, l_eta1 )
-      
-      for l_q in range(0, l_de+1):
-        if( l_p + l_q == l_de ): # build hierarchical basis following pascals triangle
-          # second principal function
-          l_psiB = ( ( (1-l_eta2)/2 )**l_p * sympy.jacobi( l_q, 2*l_p+1, 0, l_eta2 ) )
-
-          l_basis = l_basis + [l_psiA * l_psiB]
-          
-          # insert triangular coords
-          l_basis[-1] = l_basis[-1].subs( l_eta1, 2*(1+l_xi1)/(1-l_xi2) - 1 ).subs(l_eta2, l_xi2)
-          
-          # use triangle with xi1 in [0,1], xi2 in [0,1-xi1]
-          l_basis[-1] = l_basis[-1].subs(l_xi1, 2*l_xi1-1).subs(l_xi2, 2*l_xi2 - 1)
-          
-          # simplify the basis
-          l_basis[-1] = sympy.simplify( l_basis[-1] )
-
-          # cancel denominators
-          l_basis[-1] = sympy.cancel( l_basis[-1] )
+      # build hierarchical basis following pascals triangle
+      l_q = l_de - l_p
+
+      # second principal function
+      l_psiB = jacobiHom( l_q, 2*l_p+1, l_y, l_y**0 )[l_q]
+
+      l_basis = l_basis + [ ( l_psiA[l_p] * l_psiB * sympy.Rational(1, 2**l_p) ).as_expr() ]
 
   return [l_xi1, l_xi2], l_basis
 
+##
+# Derives the positions of the basis functions of a lower degree in the basis.
+#   The basis is hierarchical, functions of lower degree are leading.
+#
+# @param i_degLo lower polynomial degree.
+# @param i_deg polynomial degree.
+# @return positions, one per basis function of the lower degree.
+##
+def embed( i_degLo,
+           i_deg ):
+  assert( i_degLo <= i_deg )
+
+  return list( range( (i_degLo+1)*(i_degLo+2)//2 ) )
+
+##
+# Derives the orthogonality of the basis functions.
+#   A Dubiner function of total degree d is orthogonal to all monomials of lower total degree.
+#
+# @param i_deg polynomial degree.
+# @return one list per basis function, containing tuples (w, c): the function is orthogonal to all monomials xi^e with w.e < c.
+##
+def orth( i_deg ):
+  l_orth = []
+  for l_de in range(0, i_deg+1):
+    l_orth = l_orth + [ [ ( (1, 1), l_de ) ] ] * (l_de+1)
+
+  return l_orth
+
 ##
 # Plots basis functions for quadrilaterals
 #
@@ -80,16 +125,17 @@ def gen( i_deg ):
 def plot( i_out, i_syms, i_funs ):
   assert( len(i_syms) == 2 )
 
-  # scaling for the parametric plot
-  l_sca = (1-i_syms[1])
+  l_mpl = edge_pre.io.Plot.matplotlib()
+
+  # collapse the unit square to the triangle
+  l_u, l_xi2 = numpy.meshgrid( numpy.linspace( 0, 1, 50 ), numpy.linspace( 0, 1, 50 ) )
+  l_xi1 = l_u * (1-l_xi2)
+  l_vals = edge_pre.io.Plot.sample( i_syms, i_funs, [ l_xi1, l_xi2 ] )
 
   # open pdf
-  with PdfPages(i_out) as l_pdf:
-    for l_fu in i_funs:
-      sympy.plotting.plot3d_parametric_surface(  i_syms[0]*l_sca,
-                                                 i_syms[1],
-                                                 l_fu.subs( i_syms[0], i_syms[0]*l_sca ),
-                                                (i_syms[0], 0, 1),
-                                                (i_syms[1], 0, 1) )
+  with l_mpl.backends.backend_pdf.PdfPages(i_out) as l_pdf:
+    for l_va in l_vals:
+      l_ax = l_mpl.pyplot.figure().add_subplot( projection='3d' )
+      l_ax.plot_surface( l_xi1, l_xi2, l_va, cmap='viridis', rasterized=True )
       l_pdf.savefig()
-      matplotlib.pyplot.close()
+      l_mpl.pyplot.close()
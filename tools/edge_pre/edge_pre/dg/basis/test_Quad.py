@@ -53,3 +53,16 @@ class TestQuad( unittest.TestCase ):
                                  (2*l_xi1-1)*( Fra(3,2) * (2*l_xi2-1)**2 - Fra(1,2) ),
                                    ( ( Fra(3,2) * (2*l_xi2-1)**2 - Fra(1,2) ) )
                                  * ( ( Fra(3,2) * (2*l_xi1-1)**2 - Fra(1,2) ) ) ] )
+
+  ##
+  # Tests the positions of lower-degree basis functions.
+  ##
+  def test_embed(self):
+    self.assertEqual( Quad.embed( 0, 2 ), [ 0 ] )
+    self.assertEqual( Quad.embed( 1, 2 ), [ 0, 1, 3, 4 ] )
+    self.assertEqual( Quad.embed( 2, 2 ), list( range(9) ) )
+
+    l_basisLo = Quad.gen( 1 )[1]
+    l_basis = Quad.gen( 3 )[1]
+    for l_ba, l_id in zip( l_basisLo, Quad.embed( 1, 3 ) ):
+      self.assertEqual( sympy.expand( l_ba - l_basis[l_id] ), 0 )
@@ -78,3 +78,19 @@ class TestTria( unittest.TestCase ):
     self.assertEqual( len(l_basis), 15 )
     for l_ba in range(15):
       self.assertEqual( sympy.simplify( l_basis[l_ba]-l_basisUt[l_ba] ), 0 )
+
+  ##
+  # Tests the homogenized Jacobi polynomials.
+  ##
+  def test_jacobiHom(self):
+    l_x, l_a, l_b = sympy.symbols( 'x a b' )
+    l_pA = sympy.Poly( l_a, l_a, l_b, domain='QQ' )
+    l_pB = sympy.Poly( l_b, l_a, l_b, domain='QQ' )
+
+    for l_al in [ 0, 1, 4 ]:
+      l_hom = Tria.jacobiHom( 5, l_al, l_pA, l_pB )
+      self.assertEqual( len(l_hom), 6 )
+
+      for l_de in range(6):
+        l_ref = l_b**l_de * sympy.jacobi( l_de, l_al, 0, l_x ).subs( l_x, l_a/l_b )
+        self.assertEqual( sympy.simplify( l_hom[l_de].as_expr() - l_ref ), 0 )
@@ -0,0 +1,144 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Exact and floating point linear algebra for the inversion of mass matrices.
+##
+import numpy
+import scipy.linalg
+import sympy
+
+##
+# Derives the blocks of a matrix with block-diagonal sparsity pattern (up to symmetric permutations).
+#   Two rows belong to the same block if they are coupled through a non-zero entry.
+#
+# @param i_mat square matrix.
+# @return list of blocks, each given by the sorted ids of its rows (and columns).
+##
+def blocks( i_mat ):
+  l_n = i_mat.shape[0]
+
+  # adjacency through non-zero off-diagonal entries
+  l_adj = [ [] for l_ro in range(l_n) ]
+  for l_ro in range(l_n):
+    for l_co in range(l_n):
+      if( l_ro != l_co and ( i_mat[l_ro, l_co] != 0 or i_mat[l_co, l_ro] != 0 ) ):
+        l_adj[l_ro] = l_adj[l_ro] + [l_co]
+
+  # connected components
+  l_blocks = []
+  l_done = [ False ] * l_n
+  for l_ro in range(l_n):
+    if( l_done[l_ro] ):
+      continue
+
+    l_done[l_ro] = True
+    l_block = [ l_ro ]
+    l_front = [ l_ro ]
+    while( len(l_front) > 0 ):
+      l_ne = l_front.pop()
+      for l_co in l_adj[l_ne]:
+        if( not l_done[l_co] ):
+          l_done[l_co] = True
+          l_block = l_block + [ l_co ]
+          l_front = l_front + [ l_co ]
+
+    l_blocks = l_blocks + [ sorted(l_block) ]
+
+  return l_blocks
+
+##
+# Inverts an exact matrix through a fraction-free LU decomposition P A = L D^-1 U.
+#
+# @param i_mat sympy matrix.
+# @return inverse.
+##
+def invFf( i_mat ):
+  if( i_mat.shape == (1, 1) ):
+    return sympy.Matrix( [ [ 1 / i_mat[0, 0] ] ] )
+
+  l_p, l_l, l_d, l_u = i_mat.LUdecompositionFF()
+
+  # A^-1 = U^-1 D L^-1 P
+  return l_u.upper_triangular_solve( l_d * l_l.lower_triangular_solve( l_p ) )
+
+class Factor:
+  ##
+  # Factorizes a matrix for repeated multiplications with its inverse.
+  #   Exact (sympy) matrices are split into the blocks of their sparsity pattern, which are diagonal for orthogonal bases.
+  #   Floating point (numpy) matrices are factorized through a LU decomposition with partial pivoting.
+  #
+  # @param i_mat square matrix.
+  ##
+  def __init__( self,
+                i_mat ):
+    self.m_n = i_mat.shape[0]
+
+    if( isinstance( i_mat, numpy.ndarray ) ):
+      self.m_lu = scipy.linalg.lu_factor( i_mat )
+      self.m_blocks = None
+    else:
+      self.m_lu = None
+      self.m_blocks = [ ( l_ids, invFf( i_mat.extract( l_ids, l_ids ) ) ) for l_ids in blocks( i_mat ) ]
+
+  ##
+  # Checks if the factorized matrix is diagonal.
+  #
+  # @return true if diagonal, false otherwise.
+  ##
+  def diagonal( self ):
+    return self.m_blocks != None and len(self.m_blocks) == self.m_n
+
+  ##
+  # Multiplies the given matrix with the inverse of the factorized one from the right.
+  #
+  # @param i_rhs matrix, which is multiplied.
+  # @return i_rhs * A^-1.
+  ##
+  def mulInv( self,
+              i_rhs ):
+    assert( i_rhs.shape[1] == self.m_n )
+
+    # X A^-1 = Y <=> A^T Y^T = X^T
+    if( self.m_lu != None ):
+      return scipy.linalg.lu_solve( self.m_lu, numpy.array( i_rhs, dtype=numpy.float64 ).T, trans=1 ).T
+
+    l_nRos = i_rhs.shape[0]
+    l_res = sympy.zeros( l_nRos, self.m_n )
+
+    for l_ids, l_inv in self.m_blocks:
+      # diagonal entry: column scaling
+      if( len(l_ids) == 1 ):
+        l_res[:, l_ids[0]] = i_rhs[:, l_ids[0]] * l_inv[0, 0]
+      else:
+        l_sub = i_rhs.extract( list(range(l_nRos)), l_ids ) * l_inv
+        for l_co in range( len(l_ids) ):
+          l_res[:, l_ids[l_co]] = l_sub[:, l_co]
+
+    return l_res
+
+  ##
+  # Derives the inverse of the factorized matrix.
+  #
+  # @return inverse.
+  ##
+  def inv( self ):
+    if( self.m_lu != None ):
+      return self.mulInv( numpy.eye( self.m_n ) )
+    return self.mulInv( sympy.eye( self.m_n ) )
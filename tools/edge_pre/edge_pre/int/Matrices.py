@@ -20,8 +20,11 @@
 # @section DESCRIPTION
 # Derives matrices based on integrations.
 ##
+import logging
 import sympy
 from . import Scalar
+from . import Restrict
+from . import LinAlg
 
 ##
 # Substitues the given symbols in the functions.
@@ -36,11 +39,11 @@ def subs( i_subs,
   l_subs = sympy.zeros( len(i_subs), len(i_funs) )
 
   for l_ro in range(len(i_subs)):
+    # substitute
+    l_funs = Restrict.restrict( i_funs, [ i_subs[l_ro][0] ], [ i_subs[l_ro][1] ] )
+
     for l_co in range(len(i_funs)):
-      # copy fun
-      l_subs[l_ro, l_co] = i_funs[l_co]
-      # substitute
-      l_subs[l_ro, l_co] = l_subs[l_ro, l_co].subs( i_subs[l_ro][0], i_subs[l_ro][1] )
+      l_subs[l_ro, l_co] = l_funs[l_co]
 
   return l_subs
 
@@ -49,21 +52,13 @@ def subs( i_subs,
 #
 # @param i_subs list of tuples describing the substitutions.
 # @param i_funs functions.
-# @return list with substitued functions. All substitutions are applied to every function.
+# @return list with substitued functions. All substitutions are applied (simultaneously) to every function.
 ##
 def subsAll( i_subs,
              i_funs ):
-  l_subs = []
-
-  for l_ba in i_funs:
-    # add fun
-    l_subs = l_subs + [ sympy.sympify(l_ba) ]
-
-    # apply substitutions
-    for l_su in i_subs:
-      l_subs[-1] = l_subs[-1].subs( l_su[0], l_su[1] )
-
-  return l_subs
+  return Restrict.restrict( i_funs,
+                            [ l_su[0] for l_su in i_subs ],
+                            [ l_su[1] for l_su in i_subs ] )
 
 ##
 # Integrates the functions for multiple integration intervals.
@@ -83,19 +78,105 @@ def intL( i_ints,
 
   return l_intL
 
+##
+# Derives a lookup for the entries of a previously computed matrix.
+#   This is used to reuse the integrals of hierarchical bases, whose lower-degree functions are part of the higher-degree ones.
+#
+# @param i_idsRo positions of the previous rows in the new matrix.
+# @param i_idsCo positions of the previous columns in the new matrix.
+# @param i_mat previously computed matrix.
+# @return dictionary, mapping tuples (row, column) of the new matrix to the entries.
+##
+def reuse( i_idsRo,
+           i_idsCo,
+           i_mat ):
+  l_reuse = {}
+
+  for l_r0, l_r1 in enumerate(i_idsRo):
+    for l_c0, l_c1 in enumerate(i_idsCo):
+      l_reuse[(l_r1, l_c1)] = i_mat[l_r0, l_c0]
+
+  return l_reuse
+
+##
+# Derives a lookup of structurally zero integrals, whose integrations are skipped.
+#   The integral of a basis function times a polynomial vanishes, if the basis function is orthogonal to every monomial of the polynomial.
+#
+# @param i_syms symbols of the polynomials, ordered as the weights of the orthogonality.
+# @param i_orth orthogonality of the basis functions, as derived by orth of the basis.
+# @param i_funs polynomials, which are multiplied with the basis functions.
+# @param i_trans if true, the rows of the matrix correspond to the polynomials and the columns to the basis functions; vice versa otherwise.
+# @return dictionary, mapping tuples (row, column) of the zero entries to zero.
+##
+def zeros( i_syms,
+           i_orth,
+           i_funs,
+           i_trans = False ):
+  l_zeros = {}
+
+  for l_fu in range( len(i_funs) ):
+    l_poly = sympy.Poly( i_funs[l_fu], *i_syms )
+    l_monos = [] if l_poly.is_zero else l_poly.monoms()
+
+    for l_ba in range( len(i_orth) ):
+      # check that every monomial is orthogonal to the basis function
+      l_zero = True
+      for l_mo in l_monos:
+        l_zero = l_zero and any( [ sum( [ l_w*l_e for l_w, l_e in zip(l_we, l_mo) ] ) < l_bo for l_we, l_bo in i_orth[l_ba] ] )
+
+      if( l_zero ):
+        l_zeros[ (l_fu, l_ba) if i_trans else (l_ba, l_fu) ] = sympy.Integer(0)
+
+  return l_zeros
+
+##
+# Merges structurally zero entries into the lookup of previously integrated entries.
+#
+# @param i_reuse lookup of previously integrated entries, as derived by reuse.
+# @param i_zeros lookup of zero entries, as derived by zeros.
+# @return 1) merged lookup, 2) number of integrations, which are skipped because of the zero entries.
+##
+def skip( i_reuse,
+          i_zeros ):
+  l_skip = { l_en: l_va for l_en, l_va in i_zeros.items() if l_en not in i_reuse }
+  l_skip.update( i_reuse )
+
+  return l_skip, len(l_skip) - len(i_reuse)
+
 ##
 # Computes the mass matrix.
 #
 # @param i_ints integration intervals.
 # @param i_funs functions
+# @param i_prev optional previous result for a lower-degree subset of the functions: 1) positions of the subset, 2) mass matrix of the subset.
+# @param i_orth optional orthogonality of the functions, as derived by orth of the basis, used to skip integrations of zero entries.
 ##
 def mass( i_ints,
-          i_funs ):
+          i_funs,
+          i_prev = None,
+          i_orth = None ):
+  # previously integrated entries
+  l_reuse = {}
+  if( i_prev != None ):
+    l_reuse = reuse( i_prev[0], i_prev[0], i_prev[1] )
+
+  # structurally zero entries
+  if( i_orth != None ):
+    l_zeros = zeros( [ l_in[0] for l_in in i_ints ], i_orth, i_funs )
+    # the mass matrix is symmetric
+    l_zeros.update( { (l_co, l_ro): l_va for (l_ro, l_co), l_va in l_zeros.items() } )
+    l_reuse, l_skip = skip( l_reuse, l_zeros )
+    logging.info( 'skipping ' + str(l_skip) + ' zero integrations of the mass matrix' )
+
   # mass matrix
   l_mass = sympy.zeros( len(i_funs), len(i_funs) )
 
   for l_ro in range(len(i_funs)):
     for l_co in range(len(i_funs)):
+      if( (l_ro, l_co) in l_reuse ):
+        l_mass[l_ro, l_co] = l_reuse[(l_ro, l_co)]
+        continue
+
       l_prod = i_funs[l_ro] * i_funs[l_co]
       l_mass[l_ro, l_co] = Scalar.int( l_prod, i_ints )[0]
 
@@ -107,30 +188,70 @@ def mass( i_ints,
 # @param i_syms symbols, used for the derivative computation.
 # @param i_basis element basis.
 # @param i_int integration intervals for the element.
+# @param i_prev optional previous result for a lower-degree subset of the basis: 1) positions of the subset, 2) stiffness matrices of the subset.
+# @param i_orth optional orthogonality of the basis, as derived by orth of the basis, used to skip integrations of zero entries.
 #
 # @return stiffness matrices, one per given symbol.
 ##
 def stiff( i_syms,
            i_basis,
-           i_int ):
+           i_int,
+           i_prev = None,
+           i_orth = None ):
   l_stiff = []
+  l_skip = 0
+
+  for l_sy in range( len(i_syms) ):
+    # previously integrated entries
+    l_reuse = {}
+    if( i_prev != None ):
+      l_reuse = reuse( i_prev[0], i_prev[0], i_prev[1][l_sy] )
 
-  for l_sy in i_syms:
     # derivative computation
-    l_der = lambda bf: sympy.diff( bf, l_sy)
+    l_ders = [ sympy.diff( l_ba, i_syms[l_sy] ) for l_ba in i_basis ]
+
+    # structurally zero entries
+    if( i_orth != None ):
+      l_reuse, l_sk = skip( l_reuse, zeros( [ l_in[0] for l_in in i_int ], i_orth, l_ders ) )
+      l_skip = l_skip + l_sk
 
-    # integration
-    l_int = lambda bf: Scalar.int( bf, i_int )[0]
+    l_stiff = l_stiff + [ sympy.zeros( len(i_basis), len(i_basis) ) ]
+    for l_ro in range( len(i_basis) ):
+      for l_co in range( len(i_basis) ):
+        if( (l_ro, l_co) in l_reuse ):
+          l_stiff[-1][l_ro, l_co] = l_reuse[(l_ro, l_co)]
+        else:
+          l_stiff[-1][l_ro, l_co] = Scalar.int( i_basis[l_ro] * l_ders[l_co], i_int )[0]
 
-    l_stiff = l_stiff + [[]]
-    l_stiff[-1] = sympy.Matrix.transpose( sympy.Matrix( i_basis ) )
-    l_stiff[-1] = l_stiff[-1].applyfunc( l_der )
-    l_stiff[-1] = sympy.Matrix( i_basis ) * l_stiff[-1]
-    l_stiff[-1] = l_stiff[-1].applyfunc( l_int )
+  if( i_orth != None ):
+    logging.info( 'skipping ' + str(l_skip) + ' zero integrations of the stiffness matrices' )
 
   # return stiffness matrices
   return l_stiff
 
+##
+# Integrates a row of integrands, previously integrated entries are reused.
+#
+# @param i_int integration intervals.
+# @param i_funs integrands of the row.
+# @param i_ro id of the row.
+# @param i_reuse lookup of previously integrated entries, as derived by reuse.
+# @return list with the integrated row.
+##
+def intRow( i_int,
+            i_funs,
+            i_ro,
+            i_reuse ):
+  l_row = []
+
+  for l_co in range( len(i_funs) ):
+    if( (i_ro, l_co) in i_reuse ):
+      l_row = l_row + [ i_reuse[(i_ro, l_co)] ]
+    else:
+      l_row = l_row + [ Scalar.int( i_funs[l_co], i_int )[0] ]
+
+  return l_row
+
 ##
 # Computes the flux matrices.
 #   Remkark: For line elements standard flux matrices are written to the projections.
@@ -143,6 +264,8 @@ def stiff( i_syms,
 # @param i_intFa integration intervals for the faces.
 # @param i_faToFa mapping of face coordinates to adjacent element in dependency of the vertex orientation.
 # @param i_faToEl mapping from face-coordinate to volune coordinates in dependency of the face.
+# @param i_prev optional previous result for lower-degree subsets of the bases: 1) positions of the element subset, 2) positions of the face subset, 3) flux matrices of the subsets.
+# @param i_orthFa optional orthogonality of the face basis, as derived by orth of the basis, used to skip integrations of zero entries.
 #
 # @return three lists, 1) matrices for the projection to/from face-basis, 2) face mass-matrix, 3) matrices for neighboring face-orientation and mirroring.
 ##
@@ -152,7 +275,9 @@ def flux( i_basisFa,
           i_symsEl,
           i_intFa,
           i_faToFa,
-          i_faToEl ):
+          i_faToEl,
+          i_prev = None,
+          i_orthFa = None ):
   # special handling for line elements (nothing to reduce)
   if( len(i_symsEl) == 1 ):
     assert( i_basisFa     == None )
@@ -164,8 +289,7 @@ def flux( i_basisFa,
     # evaluation of basis function ats
     l_eval = [[],[]]
     for l_sd in range(2):
-      for l_ba in i_basisEl:
-        l_eval[l_sd] = l_eval[l_sd] + [l_ba.subs(i_symsEl[0], i_faToEl[l_sd][0])]
+      l_eval[l_sd] = Restrict.restrict( i_basisEl, i_symsEl, i_faToEl[l_sd] )
       # convert to sympy matrix
       l_eval[l_sd] = sympy.Matrix( l_eval[l_sd] )
 
@@ -182,21 +306,38 @@ def flux( i_basisFa,
   # derive number of faces
   l_nFas = len(i_faToEl)
 
+  # previously integrated entries, projections are recovered by undoing the multiplication with the inverse mass matrix
+  l_reuseProj = [ {} for l_fa in range(l_nFas) ]
+  l_reuseOri  = [ {} for l_ve in range(l_nVes) ]
+  l_prevMassFa = None
+  if( i_prev != None ):
+    l_idsEl, l_idsFa, l_prev = i_prev
+    l_reuseProj = [ reuse( l_idsEl, l_idsFa, l_pr * l_prev[1] ) for l_pr in l_prev[0] ]
+    l_reuseOri  = [ reuse( l_idsFa, l_idsFa, l_or ) for l_or in l_prev[2] ]
+    l_prevMassFa = ( l_idsFa, l_prev[1] )
+
+  # symbols of the face integration
+  l_symsInt = [ l_in[0] for l_in in i_intFa ]
+  l_skip = 0
+
   # assemble integrands for projection
   l_proj = []
   for l_fa in range(l_nFas):
     # add new matrix
     l_proj = l_proj + [[]]
 
-    for l_ro in i_basisEl:
+    # restrict the element basis to the face
+    l_basisElFa = Restrict.restrict( i_basisEl, i_symsEl, i_faToEl[l_fa] )
+
+    # structurally zero entries
+    if( i_orthFa != None ):
+      l_reuseProj[l_fa], l_sk = skip( l_reuseProj[l_fa], zeros( l_symsInt, i_orthFa, l_basisElFa, True ) )
+      l_skip = l_skip + l_sk
+
+    for l_in in l_basisElFa:
       # add a new row
       l_proj[-1] = l_proj[-1] + [[]]
 
-      l_in = l_ro
-      # replace symbols
-      for l_sy in range( len(i_symsEl) ):
-        l_in = l_in.subs( i_symsEl[l_sy], i_faToEl[l_fa][l_sy] )
-
       for l_co in i_basisFa:
         # add entry
         l_proj[-1][-1] = l_proj[-1][-1] + [l_co*l_in]
@@ -204,16 +345,17 @@ def flux( i_basisFa,
   # do the integrations
   for l_fa in range(l_nFas):
     for l_ro in range( len(l_proj[l_fa]) ):
-      l_proj[l_fa][l_ro] = list( intL( [i_intFa], l_proj[l_fa][l_ro] ) )
+      l_proj[l_fa][l_ro] = intRow( i_intFa, l_proj[l_fa][l_ro], l_ro, l_reuseProj[l_fa] )
     # create sympy matrix
     l_proj[l_fa] = sympy.Matrix( l_proj[l_fa] )
 
   # derive face mass matrix
-  l_massFa = mass( i_intFa, i_basisFa )
+  l_massFa = mass( i_intFa, i_basisFa, l_prevMassFa, i_orthFa )
 
   # multiply with inverse mass matrix
+  l_massFaFact = LinAlg.Factor( l_massFa )
   for l_fa in range(l_nFas):
-    l_proj[l_fa] = l_proj[l_fa] * l_massFa.inv()
+    l_proj[l_fa] = l_massFaFact.mulInv( l_proj[l_fa] )
 
   # compute matrices accounting for vertex orientation (and mirroring)
   l_ori = []
@@ -221,19 +363,17 @@ def flux( i_basisFa,
     # add new matrix
     l_ori = l_ori + [[]]
 
-    for l_ro in i_basisFa:
-      # add row
-      l_ori[-1] = l_ori[-1] + [[]]
-
-      # init integrand
-      l_in = l_ro
+    # simultaneous replacement of the face coords avoids replacing conflicts
+    l_basisFaVe = Restrict.restrict( i_basisFa, i_symsFa, i_faToFa[l_ve] )
 
-      # replace coords with temporary symbols to avoid replacing conflicts
-      for l_sy in range( len(i_symsFa) ):
-        l_in = l_in.subs( i_symsFa[l_sy], sympy.symbols('tmp_'+str(l_sy)) )
+    # structurally zero entries
+    if( i_orthFa != None ):
+      l_reuseOri[l_ve], l_sk = skip( l_reuseOri[l_ve], zeros( l_symsInt, i_orthFa, l_basisFaVe, True ) )
+      l_skip = l_skip + l_sk
 
-      for l_sy in range( len(i_symsFa) ):
-        l_in = l_in.subs( sympy.symbols('tmp_'+str(l_sy)),  i_faToFa[l_ve][l_sy]  )
+    for l_in in l_basisFaVe:
+      # add row
+      l_ori[-1] = l_ori[-1] + [[]]
 
       for l_co in i_basisFa:
         # add entry
@@ -242,8 +382,11 @@ def flux( i_basisFa,
   # perform the integrations
   for l_ve in range(l_nVes):
     for l_ro in range( len(l_ori[l_ve]) ):
-      l_ori[l_ve][l_ro] = list( intL( [i_intFa], l_ori[l_ve][l_ro] ) )
+      l_ori[l_ve][l_ro] = intRow( i_intFa, l_ori[l_ve][l_ro], l_ro, l_reuseOri[l_ve] )
     # create sympy matrix
     l_ori[l_ve] = sympy.Matrix( l_ori[l_ve] )
 
+  if( i_orthFa != None ):
+    logging.info( 'skipping ' + str(l_skip) + ' zero integrations of the flux matrices' )
+
   return l_proj, l_massFa, l_ori
\ No newline at end of file
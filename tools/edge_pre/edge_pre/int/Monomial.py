@@ -0,0 +1,300 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Exact integration of polynomials through closed-form integrals of monomials.
+##
+import sympy
+import fractions
+import functools
+from . import Matrices
+from . import Restrict
+from . import LinAlg
+
+##
+# Expands the given functions in monomials of the given symbols.
+#
+# @param i_syms symbols.
+# @param i_funs polynomial functions.
+# @return list with one dictionary per function, mapping the exponents to the coefficients.
+##
+def expand( i_syms,
+            i_funs ):
+  l_polys = []
+
+  for l_fu in i_funs:
+    l_poly = sympy.Poly( sympy.cancel( sympy.sympify(l_fu) ), *i_syms )
+
+    l_polys = l_polys + [{}]
+    for l_ex, l_co in l_poly.as_dict().items():
+      l_co = sympy.Rational( l_co )
+      l_polys[-1][l_ex] = fractions.Fraction( int(l_co.p), int(l_co.q) )
+
+  return l_polys
+
+##
+# Derives the polynomial's derivative w.r.t. to the given dimension.
+#
+# @param i_poly polynomial (exponents mapped to coefficients).
+# @param i_di dimension.
+# @return derivative.
+##
+def diff( i_poly,
+          i_di ):
+  l_diff = {}
+
+  for l_ex, l_co in i_poly.items():
+    if( l_ex[i_di] > 0 ):
+      l_exDi = l_ex[:i_di] + (l_ex[i_di]-1,) + l_ex[i_di+1:]
+      l_diff[l_exDi] = l_co * l_ex[i_di]
+
+  return l_diff
+
+##
+# Integrates the monomial with the given exponents over the reference element.
+#
+# @param i_ty element type (line, quad4r, tria3, hex8r or tet4).
+# @param i_ex exponents of the monomial.
+# @return integral.
+##
+@functools.lru_cache( maxsize=None )
+def moment( i_ty,
+            i_ex ):
+  if( i_ty in ['line', 'quad4r', 'hex8r'] ):
+    # products of 1D integrals: 1/(a+1)
+    l_mom = fractions.Fraction( 1 )
+    for l_ex in i_ex:
+      l_mom = l_mom * fractions.Fraction( 1, l_ex+1 )
+  elif( i_ty in ['tria3', 'tet4'] ):
+    # Beta-function form: a! b! / (a+b+2)! or a! b! c! / (a+b+c+3)!
+    l_num = 1
+    for l_ex in i_ex:
+      l_num = l_num * int( sympy.factorial( l_ex ) )
+    l_mom = fractions.Fraction( l_num, int( sympy.factorial( sum(i_ex) + len(i_ex) ) ) )
+  else:
+    assert( False ), 'unknown element type: ' + str(i_ty)
+
+  return l_mom
+
+##
+# Integrates all products of two sets of polynomials over the reference element.
+#
+# @param i_ty element type.
+# @param i_polys0 first set of polynomials.
+# @param i_polys1 second set of polynomials.
+# @return matrix (#polys0 x #polys1) with the integrated products.
+##
+def prods( i_ty,
+           i_polys0,
+           i_polys1 ):
+  # collect the exponents of the second set
+  l_exs1 = set()
+  for l_po in i_polys1:
+    l_exs1.update( l_po.keys() )
+
+  l_prods = sympy.zeros( len(i_polys0), len(i_polys1) )
+
+  for l_ro in range( len(i_polys0) ):
+    # integrate the first polynomial against all monomials of the second set
+    l_moms = {}
+    for l_ex1 in l_exs1:
+      l_mom = 0
+      for l_ex0, l_co0 in i_polys0[l_ro].items():
+        l_mom = l_mom + l_co0 * moment( i_ty, tuple( l_e0 + l_e1 for l_e0, l_e1 in zip(l_ex0, l_ex1) ) )
+      l_moms[l_ex1] = l_mom
+
+    for l_co in range( len(i_polys1) ):
+      l_val = 0
+      for l_ex1, l_co1 in i_polys1[l_co].items():
+        l_val = l_val + l_co1 * l_moms[l_ex1]
+      l_val = fractions.Fraction( l_val )
+      l_prods[l_ro, l_co] = sympy.Rational( l_val.numerator, l_val.denominator )
+
+  return l_prods
+
+##
+# Computes the mass matrix.
+#
+# @param i_ty element type.
+# @param i_syms symbols.
+# @param i_funs functions.
+# @return mass matrix.
+##
+def mass( i_ty,
+          i_syms,
+          i_funs ):
+  l_polys = expand( i_syms, i_funs )
+
+  return prods( i_ty, l_polys, l_polys )
+
+##
+# Computes the stiffness matrices.
+#
+# @param i_ty element type.
+# @param i_syms symbols, used for the derivative computation.
+# @param i_basis element basis.
+# @param i_dis dimensions of the derivatives, None for all.
+# @return stiffness matrices, one per dimension.
+##
+def stiff( i_ty,
+           i_syms,
+           i_basis,
+           i_dis = None ):
+  if( i_dis == None ):
+    i_dis = range( len(i_syms) )
+
+  l_polys = expand( i_syms, i_basis )
+
+  l_stiff = []
+  for l_di in i_dis:
+    l_ders = [ diff( l_po, l_di ) for l_po in l_polys ]
+    l_stiff = l_stiff + [ prods( i_ty, l_polys, l_ders ) ]
+
+  return l_stiff
+
+##
+# Computes the flux matrices.
+#   The interface and results follow edge_pre.int.Matrices.flux.
+#
+# @param i_basisFa face basis.
+# @param i_basisEl element basis.
+# @param i_symsFa symbols for the faces.
+# @param i_symsEl symbols for the element. If only one, special handling for line elements is triggered.
+# @param i_tyFa type of the faces.
+# @param i_faToFa mapping of face coordinates to adjacent element in dependency of the vertex orientation.
+# @param i_faToEl mapping from face-coordinate to volume coordinates in dependency of the face.
+#
+# @return three lists, 1) matrices for the projection to/from face-basis, 2) face mass-matrix, 3) matrices for neighboring face-orientation and mirroring.
+##
+def flux( i_basisFa,
+          i_basisEl,
+          i_symsFa,
+          i_symsEl,
+          i_tyFa,
+          i_faToFa,
+          i_faToEl ):
+  # special handling for line elements (nothing to integrate)
+  if( len(i_symsEl) == 1 ):
+    assert( i_tyFa == None )
+    return Matrices.flux( i_basisFa, i_basisEl, i_symsFa, i_symsEl, None, i_faToFa, i_faToEl )
+
+  l_polysFa = expand( i_symsFa, i_basisFa )
+
+  # face mass matrix
+  l_massFa = prods( i_tyFa, l_polysFa, l_polysFa )
+  l_massFaFact = LinAlg.Factor( l_massFa )
+
+  # projections
+  l_proj = []
+  for l_fa in i_faToEl:
+    l_polysEl = expand( i_symsFa, Restrict.restrict( i_basisEl, i_symsEl, l_fa ) )
+    l_proj = l_proj + [ l_massFaFact.mulInv( prods( i_tyFa, l_polysEl, l_polysFa ) ) ]
+
+  # vertex orientation (and mirroring)
+  l_ori = []
+  for l_ve in i_faToFa:
+    l_polysVe = expand( i_symsFa, Restrict.restrict( i_basisFa, i_symsFa, l_ve ) )
+    l_ori = l_ori + [ prods( i_tyFa, l_polysVe, l_polysFa ) ]
+
+  return l_proj, l_massFa, l_ori
+
+##
+# Integrates the polynomial functions for multiple integration intervals.
+#   The interface and results follow edge_pre.int.Matrices.intL.
+#
+# @param i_ints list of lists of integration intervals. Bounds of an interval might depend on the symbols of the following intervals.
+# @param i_funs polynomial functions which are integrated.
+# @return matrix (#ints x #funs) with integrated functions.
+##
+def intL( i_ints,
+          i_funs ):
+  l_intL = sympy.zeros( len(i_ints), len(i_funs) )
+
+  for l_ro in range(len(i_ints)):
+    for l_co in range(len(i_funs)):
+      l_int = sympy.sympify( i_funs[l_co] )
+
+      # iterated integration, innermost interval first
+      for l_sy, l_lo, l_up in i_ints[l_ro]:
+        l_anti = sympy.Poly( l_int, l_sy ).integrate().as_expr()
+        l_int = sympy.expand(   l_anti.xreplace( { l_sy: sympy.sympify(l_up) } )
+                              - l_anti.xreplace( { l_sy: sympy.sympify(l_lo) } ) )
+
+      l_intL[l_ro, l_co] = l_int
+
+  return l_intL
+
+##
+# Derives the scatter operator (DG -> sub-cell) exactly.
+#   The monomials of the basis are averaged over every sub-cell through the closed-form moments of the reference element.
+#   The interface and results follow edge_pre.sc.ops.Project.scatter, the reference integration intervals are replaced by the element type.
+#
+# @param i_ty element type.
+# @param i_syms volume symbols.
+# @param i_basis basis functions.
+# @param i_maps polynomial mappings from reference element to sub-cells.
+# @param i_aDets absolute determinants of the Jacobians.
+# @return scatter matrix (#basis x #sub-cells).
+##
+def scatter( i_ty,
+             i_syms,
+             i_basis,
+             i_maps,
+             i_aDets ):
+  l_polys = expand( i_syms, i_basis )
+  l_nDims = len(i_syms)
+
+  # exponents of the basis
+  l_exs = set()
+  for l_po in l_polys:
+    l_exs.update( l_po.keys() )
+
+  # volume of the reference element
+  l_vol = moment( i_ty, (0,)*l_nDims )
+
+  l_mat = sympy.zeros( len(i_basis), len(i_maps) )
+
+  for l_co in range(len(i_maps)):
+    # powers of the mapped coordinates
+    l_ims = [ sympy.Poly( i_maps[l_co][l_di], *i_syms, domain='QQ' ) for l_di in range(l_nDims) ]
+    l_pows = [ {0: l_im**0} for l_im in l_ims ]
+
+    # averages of the monomials over the sub-cell
+    l_avgs = {}
+    for l_ex in l_exs:
+      l_im = l_ims[0]**0
+      for l_di in range(l_nDims):
+        if( l_ex[l_di] not in l_pows[l_di] ):
+          l_pows[l_di][l_ex[l_di]] = l_ims[l_di]**l_ex[l_di]
+        l_im = l_im * l_pows[l_di][l_ex[l_di]]
+
+      l_avg = 0
+      for l_ex2, l_co2 in l_im.as_dict().items():
+        l_co2 = sympy.Rational( l_co2 )
+        l_avg = l_avg + fractions.Fraction( int(l_co2.p), int(l_co2.q) ) * moment( i_ty, l_ex2 )
+      l_avgs[l_ex] = l_avg / l_vol
+
+    for l_ro in range(len(i_basis)):
+      l_val = 0
+      for l_ex, l_co2 in l_polys[l_ro].items():
+        l_val = l_val + l_co2 * l_avgs[l_ex]
+      l_val = fractions.Fraction( l_val )
+      l_mat[l_ro, l_co] = sympy.Rational( l_val.numerator, l_val.denominator )
+
+  return l_mat
@@ -0,0 +1,359 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Numerical integration through quadrature rules, evaluated in NumPy.
+##
+import numpy
+import scipy.special
+import sympy
+from . import LinAlg
+
+##
+# Derives a Gauss-Jacobi rule on [0,1] for the weight (1-x)^alpha.
+#
+# @param i_nPts number of quadrature points.
+# @param i_alpha exponent of the weight function.
+# @return 1) points, 2) weights.
+##
+def gaussJacobi( i_nPts,
+                 i_alpha = 0 ):
+  # rule on [-1,1] for the weight (1-x)^alpha
+  if( i_alpha == 0 ):
+    l_pts, l_wgts = numpy.polynomial.legendre.leggauss( i_nPts )
+  else:
+    l_pts, l_wgts = scipy.special.roots_jacobi( i_nPts, i_alpha, 0 )
+
+  # map to [0,1], the weight contributes a factor of 2^-alpha
+  l_pts  = (l_pts + 1) / 2
+  l_wgts = l_wgts / 2**(i_alpha+1)
+
+  return l_pts, l_wgts
+
+##
+# Derives a quadrature rule for the reference element of the given type.
+#   Tensor Gauss-Legendre rules are used for lines, quads and hexes.
+#   Collapsed coordinates with Gauss-Jacobi rules absorbing the Duffy-Jacobian are used for triangles and tets.
+#
+# @param i_ty element type (line, quad4r, tria3, hex8r or tet4).
+# @param i_deg polynomial degree which is integrated exactly.
+# @return 1) points [*][]: point, [][*]: dimension, 2) weights.
+##
+def rule( i_ty,
+          i_deg ):
+  # number of points per dimension
+  l_nPts = i_deg // 2 + 1
+
+  # 1D rules
+  l_gl  = gaussJacobi( l_nPts, 0 )
+  l_gj1 = gaussJacobi( l_nPts, 1 )
+  l_gj2 = gaussJacobi( l_nPts, 2 )
+
+  if( i_ty == 'line' ):
+    l_pts  = l_gl[0].reshape( (-1, 1) )
+    l_wgts = l_gl[1]
+  elif( i_ty == 'quad4r' ):
+    # first dimension is the fastest
+    l_x2, l_x1 = numpy.meshgrid( l_gl[0], l_gl[0], indexing='ij' )
+    l_w2, l_w1 = numpy.meshgrid( l_gl[1], l_gl[1], indexing='ij' )
+    l_pts  = numpy.stack( [ l_x1.ravel(), l_x2.ravel() ], axis=1 )
+    l_wgts = (l_w1 * l_w2).ravel()
+  elif( i_ty == 'hex8r' ):
+    l_x3, l_x2, l_x1 = numpy.meshgrid( l_gl[0], l_gl[0], l_gl[0], indexing='ij' )
+    l_w3, l_w2, l_w1 = numpy.meshgrid( l_gl[1], l_gl[1], l_gl[1], indexing='ij' )
+    l_pts  = numpy.stack( [ l_x1.ravel(), l_x2.ravel(), l_x3.ravel() ], axis=1 )
+    l_wgts = (l_w1 * l_w2 * l_w3).ravel()
+  elif( i_ty == 'tria3' ):
+    # collapsed coords: xi1 = u*(1-v), xi2 = v
+    l_v, l_u = numpy.meshgrid( l_gj1[0], l_gl[0], indexing='ij' )
+    l_wv, l_wu = numpy.meshgrid( l_gj1[1], l_gl[1], indexing='ij' )
+    l_pts  = numpy.stack( [ (l_u * (1-l_v)).ravel(), l_v.ravel() ], axis=1 )
+    l_wgts = (l_wu * l_wv).ravel()
+  elif( i_ty == 'tet4' ):
+    # collapsed coords: xi1 = u*(1-v)*(1-w), xi2 = v*(1-w), xi3 = w
+    l_w, l_v, l_u = numpy.meshgrid( l_gj2[0], l_gj1[0], l_gl[0], indexing='ij' )
+    l_ww, l_wv, l_wu = numpy.meshgrid( l_gj2[1], l_gj1[1], l_gl[1], indexing='ij' )
+    l_pts  = numpy.stack( [ (l_u * (1-l_v) * (1-l_w)).ravel(),
+                            (l_v * (1-l_w)).ravel(),
+                             l_w.ravel() ], axis=1 )
+    l_wgts = (l_wu * l_wv * l_ww).ravel()
+  else:
+    assert( False ), 'unknown element type: ' + str(i_ty)
+
+  return l_pts, l_wgts
+
+##
+# Evaluates the given functions at the given points.
+#
+# @param i_syms symbols of the functions.
+# @param i_funs functions.
+# @param i_pts points [*][]: point, [][*]: dimension.
+# @return values [*][]: function, [][*]: point.
+##
+def evaluate( i_syms,
+              i_funs,
+              i_pts ):
+  l_nPts = i_pts.shape[0]
+
+  l_lam = sympy.lambdify( i_syms, list(i_funs), 'numpy' )
+  l_vals = l_lam( *[ i_pts[:, l_di] for l_di in range(len(i_syms)) ] )
+
+  # constant functions are returned as scalars
+  return numpy.array( [ numpy.broadcast_to( l_va, (l_nPts,) ) for l_va in l_vals ],
+                      dtype=numpy.float64 ).reshape( (len(i_funs), l_nPts) )
+
+##
+# Maps the given points.
+#
+# @param i_syms symbols of the mapping.
+# @param i_map mapping, one expression per dimension of the image.
+# @param i_pts points [*][]: point, [][*]: dimension.
+# @return mapped points [*][]: point, [][*]: dimension.
+##
+def mapPts( i_syms,
+            i_map,
+            i_pts ):
+  return evaluate( i_syms, i_map, i_pts ).transpose().copy()
+
+##
+# Integrates all products of two sets of evaluated functions.
+#
+# @param i_vals0 values of the first set [*][]: function, [][*]: point.
+# @param i_vals1 values of the second set [*][]: function, [][*]: point.
+# @param i_wgts quadrature weights.
+# @return matrix (#funs0 x #funs1) with the integrated products.
+##
+def prods( i_vals0,
+           i_vals1,
+           i_wgts ):
+  return numpy.einsum( 'iq,jq,q->ij', i_vals0, i_vals1, i_wgts )
+
+##
+# Computes the mass matrix.
+#
+# @param i_syms symbols.
+# @param i_funs functions.
+# @param i_rule quadrature rule: 1) points, 2) weights.
+# @return mass matrix.
+##
+def mass( i_syms,
+          i_funs,
+          i_rule ):
+  l_vals = evaluate( i_syms, i_funs, i_rule[0] )
+
+  return prods( l_vals, l_vals, i_rule[1] )
+
+##
+# Computes the stiffness matrices.
+#
+# @param i_syms symbols, used for the derivative computation.
+# @param i_basis element basis.
+# @param i_rule quadrature rule of the element: 1) points, 2) weights.
+# @param i_dis dimensions of the derivatives, None for all.
+# @return stiffness matrices, one per dimension.
+##
+def stiff( i_syms,
+           i_basis,
+           i_rule,
+           i_dis = None ):
+  if( i_dis == None ):
+    i_dis = range( len(i_syms) )
+
+  l_vals = evaluate( i_syms, i_basis, i_rule[0] )
+
+  l_stiff = []
+  for l_sy in [ i_syms[l_di] for l_di in i_dis ]:
+    l_ders = [ sympy.diff( l_ba, l_sy ) for l_ba in i_basis ]
+    l_ders = evaluate( i_syms, l_ders, i_rule[0] )
+
+    l_stiff = l_stiff + [ prods( l_vals, l_ders, i_rule[1] ) ]
+
+  return l_stiff
+
+##
+# Computes the flux matrices.
+#   The interface and results follow edge_pre.int.Matrices.flux.
+#
+# @param i_basisFa face basis.
+# @param i_basisEl element basis.
+# @param i_symsFa symbols for the faces.
+# @param i_symsEl symbols for the element. If only one, special handling for line elements is triggered.
+# @param i_ruleFa quadrature rule of the faces: 1) points, 2) weights.
+# @param i_faToFa mapping of face coordinates to adjacent element in dependency of the vertex orientation.
+# @param i_faToEl mapping from face-coordinate to volume coordinates in dependency of the face.
+#
+# @return three lists, 1) matrices for the projection to/from face-basis, 2) face mass-matrix, 3) matrices for neighboring face-orientation and mirroring.
+##
+def flux( i_basisFa,
+          i_basisEl,
+          i_symsFa,
+          i_symsEl,
+          i_ruleFa,
+          i_faToFa,
+          i_faToEl ):
+  # special handling for line elements (nothing to reduce)
+  if( len(i_symsEl) == 1 ):
+    assert( i_basisFa     == None )
+    assert( i_symsFa      == None )
+    assert( i_ruleFa      == None )
+    assert( len(i_faToEl) == 2    )
+    assert( i_faToFa      == None )
+
+    l_eval = []
+    for l_sd in range(2):
+      l_pt = numpy.array( [ [ float(l_co) for l_co in i_faToEl[l_sd] ] ] )
+      l_eval = l_eval + [ evaluate( i_symsEl, i_basisEl, l_pt ) ]
+
+    return l_eval, numpy.eye( 1 ), [ numpy.eye( 1 ) ]
+
+  l_pts, l_wgts = i_ruleFa
+
+  # face basis at the quadrature points
+  l_valsFa = evaluate( i_symsFa, i_basisFa, l_pts )
+
+  # face mass matrix
+  l_massFa = prods( l_valsFa, l_valsFa, l_wgts )
+  l_massFaFact = LinAlg.Factor( l_massFa )
+
+  # projections
+  l_proj = []
+  for l_fa in i_faToEl:
+    l_valsEl = evaluate( i_symsEl, i_basisEl, mapPts( i_symsFa, l_fa, l_pts ) )
+    l_proj = l_proj + [ l_massFaFact.mulInv( prods( l_valsEl, l_valsFa, l_wgts ) ) ]
+
+  # vertex orientation (and mirroring)
+  l_ori = []
+  for l_ve in i_faToFa:
+    l_valsVe = evaluate( i_symsFa, i_basisFa, mapPts( i_symsFa, l_ve, l_pts ) )
+    l_ori = l_ori + [ prods( l_valsVe, l_valsFa, l_wgts ) ]
+
+  return l_proj, l_massFa, l_ori
+
+##
+# Derives the scatter operator (DG -> sub-cell).
+#   The reference rule is mapped to all sub-cells at once by their affine mappings and the basis is evaluated in a single call on the stacked points.
+#   The results follow edge_pre.sc.ops.Project.scatter, the reference integration intervals are replaced by the rule.
+#
+# @param i_syms volume symbols.
+# @param i_basis basis functions.
+# @param i_rule quadrature rule of the reference element: 1) points, 2) weights.
+# @param i_As matrices A of the affine mappings x = A xi + b from reference element to sub-cells. [*][][]: sub-cell.
+# @param i_bs vectors b of the affine mappings. [*][]: sub-cell.
+# @return scatter matrix (#basis x #sub-cells).
+##
+def scatter( i_syms,
+             i_basis,
+             i_rule,
+             i_As,
+             i_bs ):
+  l_pts, l_wgts = i_rule
+  l_nDims = len(i_syms)
+  l_nScs = len(i_bs)
+
+  l_As = numpy.array( i_As, dtype=numpy.float64 ).reshape( (l_nScs, l_nDims, l_nDims) )
+  l_bs = numpy.array( i_bs, dtype=numpy.float64 ).reshape( (l_nScs, l_nDims) )
+
+  # map the rule to all sub-cells: [*][][]: sub-cell, [][*][]: point, [][][*]: dimension
+  l_ptsSc = numpy.einsum( 'sij,qj->sqi', l_As, l_pts ) + l_bs[:, numpy.newaxis, :]
+
+  # evaluate the basis on the stacked points
+  l_vals = evaluate( i_syms, i_basis, l_ptsSc.reshape( (-1, l_nDims) ) ).reshape( (len(i_basis), l_nScs, -1) )
+
+  # averages, the determinants of the Jacobians cancel
+  return numpy.einsum( 'bsq,q->bs', l_vals, l_wgts ) / numpy.sum( l_wgts )
+
+##
+# Derives a quadrature rule for nested integration intervals with affine limits, e.g., those of the sub-faces.
+#   A tensor Gauss-Legendre rule on the unit cube is mapped interval by interval, starting with the outermost one.
+#   The weights are scaled by the lengths of the intervals, which are affine in the outer symbols.
+#
+# @param i_ints integration intervals: tuples (symbol, lower limit, upper limit), innermost first.
+# @param i_deg polynomial degree which is integrated exactly.
+# @return 1) points [*][]: point, [][*]: symbol of the intervals, 2) weights.
+##
+def ruleInts( i_ints,
+              i_deg ):
+  l_nDims = len(i_ints)
+
+  # every length of an inner interval raises the degree in the outer symbols by at most one
+  l_nPts = ( i_deg + l_nDims - 1 ) // 2 + 1
+  l_gl = gaussJacobi( l_nPts, 0 )
+
+  # tensor rule on the unit cube, first dimension is the fastest
+  l_us = numpy.meshgrid( *( [ l_gl[0] ] * l_nDims ), indexing='ij' )
+  l_ws = numpy.meshgrid( *( [ l_gl[1] ] * l_nDims ), indexing='ij' )
+  l_us = numpy.stack( [ l_us[l_di].ravel() for l_di in reversed( range(l_nDims) ) ], axis=1 )
+  l_wgts = numpy.prod( numpy.stack( [ l_ws[l_di].ravel() for l_di in range(l_nDims) ], axis=1 ), axis=1 )
+
+  # map the intervals, the outer points are known when evaluating the limits of an inner interval
+  l_pts = numpy.zeros( l_us.shape )
+  for l_di in reversed( range(l_nDims) ):
+    l_lims = [ sympy.sympify( l_li ) for l_li in i_ints[l_di][1:3] ]
+    if( any( [ len( l_li.free_symbols ) > 0 for l_li in l_lims ] ) ):
+      l_lims = evaluate( [ l_in[0] for l_in in i_ints[l_di+1:] ],
+                         l_lims,
+                         l_pts[:, l_di+1:] )
+    else:
+      l_lims = [ float( l_li ) for l_li in l_lims ]
+
+    l_pts[:, l_di] = l_lims[0] + ( l_lims[1] - l_lims[0] ) * l_us[:, l_di]
+    l_wgts = l_wgts * ( l_lims[1] - l_lims[0] )
+
+  return l_pts, l_wgts
+
+##
+# Integrates the basis over the sub-faces of a DG face.
+#   The results follow edge_pre.int.Matrices.intL, applied to the basis restricted to the face.
+#
+# @param i_syms volume symbols.
+# @param i_basis basis functions.
+# @param i_subs substitutions of the volume symbols by expressions of the face symbols: tuples (volume symbol, expression).
+# @param i_ints integration intervals of the sub-faces in the face symbols, as used by ruleInts.
+# @param i_deg polynomial degree of the basis.
+# @return matrix (#sub-faces x #basis) with the integrated basis functions.
+##
+def sfInt( i_syms,
+           i_basis,
+           i_subs,
+           i_ints,
+           i_deg ):
+  l_subs = dict( [ ( sympy.sympify( l_su[0] ), sympy.sympify( l_su[1] ) ) for l_su in i_subs ] )
+  l_map = [ l_subs[l_sy] for l_sy in i_syms ]
+
+  # rules of the sub-faces, stacked to evaluate the basis in a single call
+  l_rules = [ ruleInts( l_ints, i_deg ) for l_ints in i_ints ]
+
+  # face points in the order of the first sub-face's symbols
+  l_symsSf = [ l_in[0] for l_in in i_ints[0] ]
+  l_pts = []
+  for l_ints, l_ru in zip( i_ints, l_rules ):
+    l_ids = [ l_symsSf.index( l_in[0] ) for l_in in l_ints ]
+    l_pts = l_pts + [ l_ru[0][:, numpy.argsort( l_ids )] ]
+  l_pts = mapPts( l_symsSf, l_map, numpy.concatenate( l_pts ) )
+
+  l_vals = evaluate( i_syms, i_basis, l_pts )
+
+  l_sfInt = numpy.zeros( (len(i_ints), len(i_basis)) )
+  l_first = 0
+  for l_sf, l_ru in enumerate( l_rules ):
+    l_nPts = l_ru[1].shape[0]
+    l_sfInt[l_sf, :] = l_vals[:, l_first:l_first+l_nPts] @ l_ru[1]
+    l_first = l_first + l_nPts
+
+  return l_sfInt
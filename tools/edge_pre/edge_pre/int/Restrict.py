@@ -0,0 +1,58 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Memoized restriction of functions to faces, sub-faces and sub-cells.
+##
+import sympy
+import functools
+
+##
+# Restricts functions by simultaneously substituting the given symbols.
+#   The results are memoized, such that repeated restrictions of a basis to the same face, sub-face or sub-cell are free.
+#
+# @param i_funs tuple of functions.
+# @param i_subs tuple of tuples (symbol, expression) describing the substitutions.
+# @return tuple with the restricted functions.
+##
+@functools.lru_cache( maxsize=8192 )
+def memo( i_funs,
+          i_subs ):
+  l_subs = dict( [ ( sympy.sympify(l_su[0]), sympy.sympify(l_su[1]) ) for l_su in i_subs ] )
+
+  return tuple( [ sympy.sympify(l_fu).xreplace( l_subs ) for l_fu in i_funs ] )
+
+##
+# Restricts functions by simultaneously substituting the given symbols.
+#
+# @param i_funs functions.
+# @param i_syms symbols, which are substituted.
+# @param i_exprs expressions, one per symbol, which replace the symbols.
+# @return list with the restricted functions.
+##
+def restrict( i_funs,
+              i_syms,
+              i_exprs ):
+  assert( len(i_syms) == len(i_exprs) )
+
+  # canonicalize the keys
+  l_funs = tuple( [ sympy.sympify(l_fu) for l_fu in i_funs ] )
+  l_subs = tuple( [ ( sympy.sympify(l_sy), sympy.sympify(l_ex) ) for l_sy, l_ex in zip( i_syms, i_exprs ) ] )
+
+  return list( memo( l_funs, l_subs ) )
@@ -0,0 +1,304 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Sum-factorized operators of tensor-product bases.
+##
+import sympy
+import functools
+import edge_pre.dg.basis.Line
+from . import LinAlg
+
+##
+# Derives the 1D operators of the line basis.
+#
+# @param i_deg polynomial degree.
+# @return dictionary with the symbol (sym), basis (basis), mass matrix (mass), stiffness matrix (stiff),
+#         mass matrix with the first basis reflected (massRe) and antiderivatives (anti).
+##
+@functools.lru_cache( maxsize=None )
+def ops1d( i_deg ):
+  l_syms, l_basis = edge_pre.dg.basis.Line.gen( i_deg )
+  l_xi = l_syms[0]
+
+  l_polys = [ sympy.Poly( l_ba, l_xi ) for l_ba in l_basis ]
+  l_polysRe = [ sympy.Poly( l_ba.subs( l_xi, 1-l_xi ), l_xi ) for l_ba in l_basis ]
+
+  # integrates the product of two polynomials over [0,1]
+  l_int = lambda i_p0, i_p1: ( i_p0 * i_p1 ).integrate().eval( 1 ) - ( i_p0 * i_p1 ).integrate().eval( 0 )
+
+  l_ops = { 'sym': l_xi, 'basis': l_basis }
+  l_ops['mass']   = sympy.Matrix( i_deg+1, i_deg+1, lambda i_ro, i_co: l_int( l_polys[i_ro],   l_polys[i_co] ) )
+  l_ops['stiff']  = sympy.Matrix( i_deg+1, i_deg+1, lambda i_ro, i_co: l_int( l_polys[i_ro],   l_polys[i_co].diff() ) )
+  l_ops['massRe'] = sympy.Matrix( i_deg+1, i_deg+1, lambda i_ro, i_co: l_int( l_polysRe[i_ro], l_polys[i_co] ) )
+  l_ops['anti']   = [ l_po.integrate() for l_po in l_polys ]
+
+  return l_ops
+
+##
+# Forms the Kronecker product of the given 1D matrices.
+#
+# @param i_mats matrices, one per dimension. The first dimension is the fastest.
+# @return Kronecker product.
+##
+def kron( i_mats ):
+  if( len(i_mats) == 1 ):
+    return i_mats[0]
+
+  return sympy.kronecker_product( *reversed(i_mats) )
+
+##
+# Derives the 1D indices of a tensor-product basis function.
+#
+# @param i_deg polynomial degree.
+# @param i_nDims number of dimensions.
+# @param i_id id of the basis function.
+# @return 1D indices, first dimension first.
+##
+def multi( i_deg,
+           i_nDims,
+           i_id ):
+  l_ids = []
+  for l_di in range(i_nDims):
+    l_ids = l_ids + [ i_id % (i_deg+1) ]
+    i_id = i_id // (i_deg+1)
+
+  return l_ids
+
+##
+# Classifies a component of a mapping from face coordinates.
+#
+# @param i_symsFa symbols of the face.
+# @param i_comp component of the mapping.
+# @return ('const', value) or ('chi', id of the face dimension, true if reflected).
+##
+def classify( i_symsFa,
+              i_comp ):
+  i_comp = sympy.sympify( i_comp )
+
+  if( i_comp.is_number ):
+    return ( 'const', i_comp )
+
+  for l_sy in range( len(i_symsFa) ):
+    if( i_comp == i_symsFa[l_sy] ):
+      return ( 'chi', l_sy, False )
+    if( i_comp == 1-i_symsFa[l_sy] ):
+      return ( 'chi', l_sy, True )
+
+  assert( False ), 'unsupported face mapping: ' + str(i_comp)
+
+##
+# Computes the mass matrix of the tensor-product basis.
+#
+# @param i_deg polynomial degree.
+# @param i_nDims number of dimensions.
+# @return mass matrix.
+##
+def mass( i_deg,
+          i_nDims ):
+  return kron( [ ops1d( i_deg )['mass'] ] * i_nDims )
+
+##
+# Computes the stiffness matrices of the tensor-product basis.
+#
+# @param i_deg polynomial degree.
+# @param i_nDims number of dimensions.
+# @param i_dis dimensions of the derivatives, None for all.
+# @return stiffness matrices, one per dimension.
+##
+def stiff( i_deg,
+           i_nDims,
+           i_dis = None ):
+  if( i_dis == None ):
+    i_dis = range( i_nDims )
+
+  l_ops = ops1d( i_deg )
+
+  l_stiff = []
+  for l_di in i_dis:
+    l_mats = [ l_ops['mass'] ] * i_nDims
+    l_mats[l_di] = l_ops['stiff']
+    l_stiff = l_stiff + [ kron( l_mats ) ]
+
+  return l_stiff
+
+##
+# Integrates the products of the tensor-product basis, restricted to a face, with the face's tensor-product basis.
+#
+# @param i_deg polynomial degree.
+# @param i_nDimsFa number of dimensions of the face.
+# @param i_comps classified components of the face mapping, one per dimension of the restricted basis.
+# @return matrix (#basis x #basisFa).
+##
+def trace( i_deg,
+           i_nDimsFa,
+           i_comps ):
+  l_ops = ops1d( i_deg )
+  l_nBasis   = (i_deg+1)**len(i_comps)
+  l_nBasisFa = (i_deg+1)**i_nDimsFa
+
+  # values of the 1D basis at the constant coordinates
+  l_vals = {}
+  for l_co in i_comps:
+    if( l_co[0] == 'const' ):
+      l_vals[l_co[1]] = [ l_ba.subs( l_ops['sym'], l_co[1] ) for l_ba in l_ops['basis'] ]
+
+  l_trace = sympy.zeros( l_nBasis, l_nBasisFa )
+  for l_ro in range(l_nBasis):
+    l_idsRo = multi( i_deg, len(i_comps), l_ro )
+    for l_co in range(l_nBasisFa):
+      l_idsCo = multi( i_deg, i_nDimsFa, l_co )
+
+      l_val = 1
+      for l_di in range( len(i_comps) ):
+        l_cp = i_comps[l_di]
+        if( l_cp[0] == 'const' ):
+          l_val = l_val * l_vals[l_cp[1]][ l_idsRo[l_di] ]
+        elif( l_cp[2] ):
+          l_val = l_val * l_ops['massRe'][ l_idsRo[l_di], l_idsCo[l_cp[1]] ]
+        else:
+          l_val = l_val * l_ops['mass'][ l_idsRo[l_di], l_idsCo[l_cp[1]] ]
+      l_trace[l_ro, l_co] = l_val
+
+  return l_trace
+
+##
+# Computes the flux matrices of the tensor-product basis.
+#   The results follow edge_pre.int.Matrices.flux.
+#
+# @param i_deg polynomial degree.
+# @param i_symsFa symbols for the faces.
+# @param i_faToFa mapping of face coordinates to adjacent element in dependency of the vertex orientation.
+# @param i_faToEl mapping from face-coordinate to volume coordinates in dependency of the face.
+#
+# @return three lists, 1) matrices for the projection to/from face-basis, 2) face mass-matrix, 3) matrices for neighboring face-orientation and mirroring.
+##
+def flux( i_deg,
+          i_symsFa,
+          i_faToFa,
+          i_faToEl ):
+  l_nDimsFa = len(i_symsFa)
+
+  # face mass matrix
+  l_massFa = mass( i_deg, l_nDimsFa )
+  l_massFaFact = LinAlg.Factor( l_massFa )
+
+  # projections
+  l_proj = []
+  for l_fa in i_faToEl:
+    l_comps = [ classify( i_symsFa, l_cp ) for l_cp in l_fa ]
+    l_proj = l_proj + [ l_massFaFact.mulInv( trace( i_deg, l_nDimsFa, l_comps ) ) ]
+
+  # vertex orientation (and mirroring)
+  l_ori = []
+  for l_ve in i_faToFa:
+    l_comps = [ classify( i_symsFa, l_cp ) for l_cp in l_ve ]
+    l_ori = l_ori + [ trace( i_deg, l_nDimsFa, l_comps ) ]
+
+  return l_proj, l_massFa, l_ori
+
+##
+# Derives the scatter operator (DG -> sub-cell) of the tensor-product basis for axis-aligned sub-cells.
+#   The interface and results follow edge_pre.sc.ops.Project.scatter.
+#
+# @param i_syms volume symbols.
+# @param i_basis tensor-product basis functions, as generated by edge_pre.dg.basis.Quad.gen or edge_pre.dg.basis.Hex.gen.
+# @param i_int reference integration interval.
+# @param i_maps mappings from reference element to sub-cells.
+# @param i_aDets absolute determinants of the Jacobians.
+##
+def scatter( i_syms,
+             i_basis,
+             i_int,
+             i_maps,
+             i_aDets ):
+  l_nDims = len(i_syms)
+  l_deg = int( round( len(i_basis)**(1.0/l_nDims) ) ) - 1
+  assert( (l_deg+1)**l_nDims == len(i_basis) )
+  l_anti = ops1d( l_deg )['anti']
+
+  l_mat = sympy.zeros( len(i_basis), len(i_maps) )
+
+  for l_co in range(len(i_maps)):
+    # 1D averages of the sub-cell's extent in every dimension
+    l_avgs = []
+    for l_di in range(l_nDims):
+      l_map = sympy.sympify( i_maps[l_co][l_di] )
+      for l_d2 in range(l_nDims):
+        assert( l_d2 == l_di or sympy.diff( l_map, i_syms[l_d2] ) == 0 )
+
+      l_lo = l_map.subs( i_syms[l_di], 0 )
+      l_up = l_map.subs( i_syms[l_di], 1 )
+      l_avgs = l_avgs + [ [ ( l_an.eval( l_up ) - l_an.eval( l_lo ) ) / ( l_up - l_lo ) for l_an in l_anti ] ]
+
+    for l_ro in range(len(i_basis)):
+      l_ids = multi( l_deg, l_nDims, l_ro )
+
+      l_val = 1
+      for l_di in range(l_nDims):
+        l_val = l_val * l_avgs[l_di][ l_ids[l_di] ]
+      l_mat[l_ro, l_co] = l_val
+
+  return l_mat
+
+##
+# Integrates the tensor-product basis over the sub-faces of a DG-face.
+#   The results follow edge_pre.int.Matrices.intL, applied to the substituted basis.
+#
+# @param i_deg polynomial degree.
+# @param i_syms volume symbols.
+# @param i_subs substitutions of the volume symbols by face symbols or constants.
+# @param i_ints sub-face integration intervals of the face symbols.
+# @return matrix (#sub-faces x #basis) with the integrated basis functions.
+##
+def sfInt( i_deg,
+           i_syms,
+           i_subs,
+           i_ints ):
+  l_ops = ops1d( i_deg )
+  l_nDims = len(i_syms)
+  l_nBasis = (i_deg+1)**l_nDims
+
+  # substitutes in order of the volume symbols
+  l_subs = dict( i_subs )
+  l_subs = [ sympy.sympify( l_subs[l_sy] ) for l_sy in i_syms ]
+
+  l_sfInt = sympy.zeros( len(i_ints), l_nBasis )
+
+  for l_ro in range( len(i_ints) ):
+    l_bnds = dict( [ ( l_in[0], sympy.sympify( l_in[1:] ) ) for l_in in i_ints[l_ro] ] )
+
+    # 1D integrals or values
+    l_vals = []
+    for l_di in range(l_nDims):
+      if( l_subs[l_di].is_number ):
+        l_vals = l_vals + [ [ l_ba.subs( l_ops['sym'], l_subs[l_di] ) for l_ba in l_ops['basis'] ] ]
+      else:
+        l_lo, l_up = l_bnds[ l_subs[l_di] ]
+        l_vals = l_vals + [ [ l_an.eval( l_up ) - l_an.eval( l_lo ) for l_an in l_ops['anti'] ] ]
+
+    for l_co in range(l_nBasis):
+      l_ids = multi( i_deg, l_nDims, l_co )
+
+      l_val = 1
+      for l_di in range(l_nDims):
+        l_val = l_val * l_vals[l_di][ l_ids[l_di] ]
+      l_sfInt[l_ro, l_co] = l_val
+
+  return l_sfInt
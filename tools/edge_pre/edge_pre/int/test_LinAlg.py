@@ -0,0 +1,71 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Tests the linear algebra for the inversion of mass matrices.
+##
+import unittest
+import numpy
+import sympy
+from fractions import Fraction as Fra
+from . import LinAlg
+
+class TestLinAlg( unittest.TestCase ):
+  ##
+  # Tests the detection of blocks.
+  ##
+  def test_blocks(self):
+    l_mat = sympy.Matrix( [ [ 2, 0, 1, 0 ],
+                            [ 0, 3, 0, 0 ],
+                            [ 1, 0, 5, 0 ],
+                            [ 0, 0, 0, 7 ] ] )
+    self.assertEqual( LinAlg.blocks( l_mat ), [ [0, 2], [1], [3] ] )
+    self.assertEqual( LinAlg.blocks( sympy.eye(3) ), [ [0], [1], [2] ] )
+
+  ##
+  # Tests the fraction-free inversion.
+  ##
+  def test_invFf(self):
+    l_mat = sympy.Matrix( [ [ 4,         3, 2 ],
+                            [ 3,         5, 1 ],
+                            [ 2, Fra(1,3), 6 ] ] )
+    self.assertEqual( LinAlg.invFf( l_mat ), l_mat.inv() )
+
+  ##
+  # Tests multiplications with the inverse.
+  ##
+  def test_mulInv(self):
+    l_mat = sympy.Matrix( [ [ 2, 0, 1, 0 ],
+                            [ 0, 3, 0, 0 ],
+                            [ 1, 0, 5, 0 ],
+                            [ 0, 0, 0, 7 ] ] )
+    l_rhs = sympy.Matrix( 3, 4, lambda i, j: i - 2*j + 1 )
+
+    # exact
+    l_fact = LinAlg.Factor( l_mat )
+    self.assertFalse( l_fact.diagonal() )
+    self.assertEqual( l_fact.inv(), l_mat.inv() )
+    self.assertEqual( l_fact.mulInv( l_rhs ), l_rhs * l_mat.inv() )
+
+    self.assertTrue( LinAlg.Factor( sympy.diag( 1, Fra(1,3), Fra(1,5) ) ).diagonal() )
+
+    # floating point
+    l_fact = LinAlg.Factor( numpy.array( l_mat.tolist(), dtype=numpy.float64 ) )
+    l_ref = numpy.array( (l_rhs * l_mat.inv()).tolist(), dtype=numpy.float64 )
+    self.assertTrue( numpy.allclose( l_fact.mulInv( numpy.array( l_rhs.tolist(), dtype=numpy.float64 ) ), l_ref ) )
@@ -119,6 +119,38 @@ class TestMatrices( unittest.TestCase ):
                              ] )
     self.assertEqual( l_mass, l_massUt )
 
+  ##
+  # Tests the prediction of structurally zero entries.
+  ##
+  def test_zeros(self):
+    l_xi  = sympy.symbols('xi_1')
+    l_int = [(l_xi, 0, 1)]
+    l_basis = [ 1,
+                2*l_xi-1,
+                Fra(3,2) * (2*l_xi -1)**2 - Fra(1,2) ]
+    l_orth = [ [ ( (1,), 0 ) ],
+               [ ( (1,), 1 ) ],
+               [ ( (1,), 2 ) ] ]
+
+    # mass matrix, functions of lower degree are orthogonal
+    l_zeros = Matrices.zeros( [l_xi], l_orth, l_basis )
+    self.assertEqual( sorted( l_zeros.keys() ), [ (1, 0), (2, 0), (2, 1) ] )
+
+    l_zeros = Matrices.zeros( [l_xi], l_orth, l_basis, True )
+    self.assertEqual( sorted( l_zeros.keys() ), [ (0, 1), (0, 2), (1, 2) ] )
+
+    # stiffness matrix, derivatives reduce the degree
+    l_ders = [ sympy.diff( l_ba, l_xi ) for l_ba in l_basis ]
+    l_zeros = Matrices.zeros( [l_xi], l_orth, l_ders )
+    self.assertEqual( sorted( l_zeros.keys() ), [ (0, 0), (1, 0), (1, 1), (2, 0), (2, 1), (2, 2) ] )
+
+    # skipped integrations give the same matrices
+    l_massUt = Matrices.mass( l_int, l_basis )
+    self.assertEqual( Matrices.mass( l_int, l_basis, None, l_orth ), l_massUt )
+
+    l_stiffUt = Matrices.stiff( [l_xi], l_basis, l_int )
+    self.assertEqual( Matrices.stiff( [l_xi], l_basis, l_int, None, l_orth ), l_stiffUt )
+
   ##
   # Tests the derivation of stiffness matrices.
   ##
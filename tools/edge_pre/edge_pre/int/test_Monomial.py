@@ -0,0 +1,156 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Tests the integration through monomials.
+##
+import unittest
+from . import Monomial
+from . import Matrices
+import sympy
+from fractions import Fraction as Fra
+import edge_pre.dg.basis.Line
+import edge_pre.dg.basis.Quad
+import edge_pre.dg.basis.Tria
+import edge_pre.dg.basis.Tet
+import edge_pre.types.Line
+import edge_pre.types.Quad
+import edge_pre.types.Tria
+import edge_pre.types.Tet
+import edge_pre.sc.grid.Tria
+import edge_pre.sc.ops.Project
+
+class TestMonomial( unittest.TestCase ):
+  ##
+  # Tests the expansion in monomials and the derivatives.
+  ##
+  def test_expand(self):
+    l_xi1, l_xi2 = sympy.symbols('xi_1 xi_2')
+
+    l_polys = Monomial.expand( [l_xi1, l_xi2], [ 1, 3*l_xi1*l_xi2**2 - Fra(1,2)*l_xi2 ] )
+    self.assertEqual( l_polys[0], { (0,0): 1 } )
+    self.assertEqual( l_polys[1], { (1,2): 3, (0,1): Fra(-1,2) } )
+
+    self.assertEqual( Monomial.diff( l_polys[1], 0 ), { (0,2): 3 } )
+    self.assertEqual( Monomial.diff( l_polys[1], 1 ), { (1,1): 6, (0,0): Fra(-1,2) } )
+
+  ##
+  # Tests the integrals of the monomials.
+  ##
+  def test_moment(self):
+    self.assertEqual( Monomial.moment( 'line',   (3,)      ), Fra(1,4)   )
+    self.assertEqual( Monomial.moment( 'quad4r', (1,2)     ), Fra(1,6)   )
+    self.assertEqual( Monomial.moment( 'hex8r',  (0,1,2)   ), Fra(1,6)   )
+    self.assertEqual( Monomial.moment( 'tria3',  (0,0)     ), Fra(1,2)   )
+    self.assertEqual( Monomial.moment( 'tria3',  (1,1)     ), Fra(1,24)  )
+    self.assertEqual( Monomial.moment( 'tet4',   (0,0,0)   ), Fra(1,6)   )
+    self.assertEqual( Monomial.moment( 'tet4',   (1,1,1)   ), Fra(1,720) )
+
+  ##
+  # Tests the mass and stiffness matrices against symbolic integration.
+  ##
+  def test_massStiff(self):
+    for l_ty, l_gen, l_elTy, l_degs in [ ('line',   edge_pre.dg.basis.Line.gen, edge_pre.types.Line.Line, range(4) ),
+                                         ('quad4r', edge_pre.dg.basis.Quad.gen, edge_pre.types.Quad.Quad, range(3) ),
+                                         ('tria3',  edge_pre.dg.basis.Tria.gen, edge_pre.types.Tria.Tria, range(3) ),
+                                         ('tet4',   edge_pre.dg.basis.Tet.gen,  edge_pre.types.Tet.Tet,   range(2) ) ]:
+      for l_de in l_degs:
+        l_syms, l_basis = l_gen( l_de )
+        l_int = l_elTy( l_de ).intEl( l_syms if l_ty != 'line' else l_syms[0] )
+
+        self.assertEqual( Monomial.mass( l_ty, l_syms, l_basis ),
+                          Matrices.mass( l_int, l_basis ) )
+
+        l_stiffMo = Monomial.stiff( l_ty, l_syms, l_basis )
+        l_stiffSy = Matrices.stiff( l_syms, l_basis, l_int )
+        for l_di in range( len(l_syms) ):
+          self.assertEqual( l_stiffMo[l_di], l_stiffSy[l_di] )
+
+  ##
+  # Tests the flux matrices against symbolic integration.
+  ##
+  def test_flux(self):
+    for l_tyFa, l_genFa, l_elTyFa, l_gen, l_elTy in [ ('line',  edge_pre.dg.basis.Line.gen, edge_pre.types.Line.Line,
+                                                                edge_pre.dg.basis.Quad.gen, edge_pre.types.Quad.Quad ),
+                                                      ('line',  edge_pre.dg.basis.Line.gen, edge_pre.types.Line.Line,
+                                                                edge_pre.dg.basis.Tria.gen, edge_pre.types.Tria.Tria ),
+                                                      ('tria3', edge_pre.dg.basis.Tria.gen, edge_pre.types.Tria.Tria,
+                                                                edge_pre.dg.basis.Tet.gen,  edge_pre.types.Tet.Tet ) ]:
+      l_de = 1
+      l_symsFa, l_basisFa = l_genFa( l_de )
+      l_symsEl, l_basisEl = l_gen( l_de )
+      l_symsFa = [ sympy.symbols('chi_'+str(l_sy)) for l_sy in range(len(l_symsFa)) ]
+      l_basisFa = Matrices.subsAll( list( zip( l_genFa( l_de )[0], l_symsFa ) ), l_basisFa )
+      l_typ = l_elTy( l_de )
+      l_intFa = l_elTyFa( l_de ).intEl( l_symsFa if l_tyFa != 'line' else l_symsFa[0] )
+
+      l_fluxMo = Monomial.flux( l_basisFa,
+                                l_basisEl,
+                                l_symsFa,
+                                l_symsEl,
+                                l_tyFa,
+                                l_typ.faToFa( l_symsFa ),
+                                l_typ.faToEl( l_symsFa ) )
+      l_fluxSy = Matrices.flux( l_basisFa,
+                                l_basisEl,
+                                l_symsFa,
+                                l_symsEl,
+                                l_intFa,
+                                l_typ.faToFa( l_symsFa ),
+                                l_typ.faToEl( l_symsFa ) )
+
+      for l_re in range(3):
+        self.assertEqual( l_fluxMo[l_re], l_fluxSy[l_re] )
+
+  ##
+  # Tests the sub-face integration against symbolic integration.
+  ##
+  def test_intL(self):
+    l_syms, l_basis = edge_pre.dg.basis.Tria.gen( 2 )
+    l_chi = sympy.symbols('chi_0')
+    l_subs, l_ints = edge_pre.sc.grid.Tria.intSfDg( 2, [l_chi], l_syms )
+
+    for l_fa in range(3):
+      l_basisSubs = Matrices.subsAll( l_subs[l_fa], l_basis )
+      self.assertEqual( Monomial.intL( l_ints[l_fa], l_basisSubs ),
+                        Matrices.intL( l_ints[l_fa], l_basisSubs ) )
+
+    # dependent bounds: reference triangle
+    l_ints = [ edge_pre.types.Tria.Tria( 2 ).intEl( l_syms ) ]
+    self.assertEqual( Monomial.intL( l_ints, l_basis ),
+                      Matrices.intL( l_ints, l_basis ) )
+
+  ##
+  # Tests the exact scatter operator against the symbolic one.
+  ##
+  def test_scatter(self):
+    l_syms, l_basis = edge_pre.dg.basis.Tria.gen( 2 )
+    l_xi1, l_xi2 = l_syms
+    l_int = edge_pre.types.Tria.Tria( 2 ).intEl( l_syms )
+
+    # four sub-triangles of a uniform refinement
+    l_maps = [ [ l_xi1/2,                     l_xi2/2                 ],
+               [ l_xi1/2 + sympy.Rational(1,2), l_xi2/2                 ],
+               [ l_xi1/2,                     l_xi2/2 + sympy.Rational(1,2) ],
+               [ sympy.Rational(1,2) - l_xi1/2, sympy.Rational(1,2) - l_xi2/2 ] ]
+    l_dets = [ sympy.Rational(1,4) ] * 4
+
+    l_sym = edge_pre.sc.ops.Project.scatter( l_syms, l_basis, l_int, l_maps, l_dets )
+    l_mon = Monomial.scatter( 'tria3', l_syms, l_basis, l_maps, l_dets )
+    self.assertEqual( l_mon, l_sym )
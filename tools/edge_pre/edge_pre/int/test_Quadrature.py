@@ -0,0 +1,175 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Tests the quadrature-based integrations.
+##
+import unittest
+from . import Quadrature
+from . import Matrices
+import numpy
+import sympy
+import edge_pre.dg.basis.Line
+import edge_pre.dg.basis.Quad
+import edge_pre.dg.basis.Tria
+import edge_pre.dg.basis.Tet
+import edge_pre.types.Line
+import edge_pre.types.Quad
+import edge_pre.types.Tria
+import edge_pre.types.Tet
+import edge_pre.sc.ops.Project
+
+class TestQuadrature( unittest.TestCase ):
+  ##
+  # Asserts that the numerical matrix matches the symbolic one.
+  #
+  # @param i_num numerical matrix.
+  # @param i_sym symbolic matrix.
+  ##
+  def assertMatch( self, i_num, i_sym ):
+    l_sym = numpy.array( i_sym.tolist(), dtype=numpy.float64 )
+    self.assertEqual( i_num.shape, l_sym.shape )
+    self.assertTrue( numpy.allclose( i_num, l_sym, rtol=1E-12, atol=1E-12 ) )
+
+  ##
+  # Tests the quadrature rules through the volume of the reference elements.
+  ##
+  def test_rule(self):
+    for l_ty, l_vol in [ ('line', 1.0), ('quad4r', 1.0), ('hex8r', 1.0), ('tria3', 1.0/2), ('tet4', 1.0/6) ]:
+      for l_de in range(4):
+        l_pts, l_wgts = Quadrature.rule( l_ty, l_de )
+        self.assertAlmostEqual( numpy.sum( l_wgts ), l_vol )
+        self.assertTrue( numpy.all( l_pts >= 0 ) )
+        self.assertTrue( numpy.all( numpy.sum( l_pts, axis=1 ) <= 1 ) or l_ty in ['quad4r', 'hex8r'] )
+
+    # integrate monomials of the tet exactly: a!b!c! / (a+b+c+3)!
+    l_pts, l_wgts = Quadrature.rule( 'tet4', 6 )
+    for l_ex in [ (0,0,0), (2,1,0), (1,2,3), (0,0,6) ]:
+      l_int = numpy.sum( l_wgts * l_pts[:,0]**l_ex[0] * l_pts[:,1]**l_ex[1] * l_pts[:,2]**l_ex[2] )
+      l_ref = sympy.factorial(l_ex[0]) * sympy.factorial(l_ex[1]) * sympy.factorial(l_ex[2])
+      l_ref = l_ref / sympy.factorial( sum(l_ex)+3 )
+      self.assertAlmostEqual( l_int, float(l_ref) )
+
+  ##
+  # Tests the mass and stiffness matrices against symbolic integration.
+  ##
+  def test_massStiff(self):
+    for l_ty, l_gen, l_elTy in [ ('line',   edge_pre.dg.basis.Line.gen, edge_pre.types.Line.Line ),
+                                 ('quad4r', edge_pre.dg.basis.Quad.gen, edge_pre.types.Quad.Quad ),
+                                 ('tria3',  edge_pre.dg.basis.Tria.gen, edge_pre.types.Tria.Tria ) ]:
+      for l_de in range(3):
+        l_syms, l_basis = l_gen( l_de )
+        l_int = l_elTy( l_de ).intEl( l_syms if l_ty != 'line' else l_syms[0] )
+        l_rule = Quadrature.rule( l_ty, 2*l_de )
+
+        self.assertMatch( Quadrature.mass( l_syms, l_basis, l_rule ),
+                          Matrices.mass( l_int, l_basis ) )
+
+        l_stiffQu = Quadrature.stiff( l_syms, l_basis, l_rule )
+        l_stiffSy = Matrices.stiff( l_syms, l_basis, l_int )
+        for l_di in range( len(l_syms) ):
+          self.assertMatch( l_stiffQu[l_di], l_stiffSy[l_di] )
+
+  ##
+  # Tests the flux matrices against symbolic integration.
+  ##
+  def test_flux(self):
+    # line elements
+    l_syms, l_basis = edge_pre.dg.basis.Line.gen( 2 )
+    l_faToEl = edge_pre.types.Line.Line( 2 ).faToEl( None )
+    l_fluxQu = Quadrature.flux( None, l_basis, None, l_syms, None, None, l_faToEl )
+    l_fluxSy = Matrices.flux(   None, l_basis, None, l_syms, None, None, l_faToEl )
+    for l_fa in range(2):
+      self.assertMatch( l_fluxQu[0][l_fa], l_fluxSy[0][l_fa] )
+
+    # quads and triangles
+    for l_ty, l_gen, l_elTy in [ ('quad4r', edge_pre.dg.basis.Quad.gen, edge_pre.types.Quad.Quad ),
+                                 ('tria3',  edge_pre.dg.basis.Tria.gen, edge_pre.types.Tria.Tria ) ]:
+      for l_de in range(3):
+        l_symsFa, l_basisFa = edge_pre.dg.basis.Line.gen( l_de )
+        l_symsEl, l_basisEl = l_gen( l_de )
+        l_typ = l_elTy( l_de )
+
+        l_fluxQu = Quadrature.flux( l_basisFa,
+                                    l_basisEl,
+                                    l_symsFa,
+                                    l_symsEl,
+                                    Quadrature.rule( 'line', 2*l_de ),
+                                    l_typ.faToFa( l_symsFa ),
+                                    l_typ.faToEl( l_symsFa ) )
+        l_fluxSy = Matrices.flux( l_basisFa,
+                                  l_basisEl,
+                                  l_symsFa,
+                                  l_symsEl,
+                                  edge_pre.types.Line.Line( l_de ).intEl( l_symsFa[0] ),
+                                  l_typ.faToFa( l_symsFa ),
+                                  l_typ.faToEl( l_symsFa ) )
+
+        for l_fa in range( len(l_fluxSy[0]) ):
+          self.assertMatch( l_fluxQu[0][l_fa], l_fluxSy[0][l_fa] )
+        self.assertMatch( l_fluxQu[1], l_fluxSy[1] )
+        for l_ve in range( len(l_fluxSy[2]) ):
+          self.assertMatch( l_fluxQu[2][l_ve], l_fluxSy[2][l_ve] )
+
+  ##
+  # Tests the batched scatter operator against the symbolic one.
+  ##
+  def test_scatter(self):
+    l_syms, l_basis = edge_pre.dg.basis.Tria.gen( 2 )
+    l_xi1, l_xi2 = l_syms
+    l_int = edge_pre.types.Tria.Tria( 2 ).intEl( l_syms )
+
+    # four sub-triangles of a uniform refinement
+    l_maps = [ [ l_xi1/2,                     l_xi2/2                 ],
+               [ l_xi1/2 + sympy.Rational(1,2), l_xi2/2                 ],
+               [ l_xi1/2,                     l_xi2/2 + sympy.Rational(1,2) ],
+               [ sympy.Rational(1,2) - l_xi1/2, sympy.Rational(1,2) - l_xi2/2 ] ]
+    l_dets = [ sympy.Rational(1,4) ] * 4
+
+    # affine representation of the mappings
+    l_As = [ [ [ 0.5, 0 ], [ 0, 0.5 ] ] ] * 3 + [ [ [ -0.5, 0 ], [ 0, -0.5 ] ] ]
+    l_bs = [ [ 0, 0 ], [ 0.5, 0 ], [ 0, 0.5 ], [ 0.5, 0.5 ] ]
+
+    l_sym = edge_pre.sc.ops.Project.scatter( l_syms, l_basis, l_int, l_maps, l_dets )
+    l_num = Quadrature.scatter( l_syms, l_basis, Quadrature.rule( 'tria3', 2 ), l_As, l_bs )
+    self.assertMatch( l_num, l_sym )
+
+  ##
+  # Tests the rules of nested integration intervals and the sub-face integration against symbolic integration.
+  ##
+  def test_sfInt(self):
+    l_chi0, l_chi1 = sympy.symbols( 'chi_0 chi_1' )
+
+    # triangle with an upper limit depending on the outer symbol
+    l_ints = [ ( l_chi0, sympy.Rational(1,3) - l_chi1, sympy.Rational(1,3) ),
+               ( l_chi1, 0, sympy.Rational(1,3) ) ]
+    l_pts, l_wgts = Quadrature.ruleInts( l_ints, 3 )
+    self.assertAlmostEqual( numpy.sum( l_wgts ), 1.0/18 )
+    l_int = numpy.sum( l_wgts * l_pts[:,0]**2 * l_pts[:,1] )
+    self.assertAlmostEqual( l_int, float( sympy.integrate( l_chi0**2 * l_chi1, *l_ints ) ) )
+
+    # tet basis, restricted to the face xi_3 = 0
+    l_syms, l_basis = edge_pre.dg.basis.Tet.gen( 2 )
+    l_subs = ( ( l_syms[0], l_chi1 ), ( l_syms[1], l_chi0 ), ( l_syms[2], 0 ) )
+    l_sfs = [ l_ints,
+              [ ( l_chi1, 0, sympy.Rational(1,3) - l_chi0 ), ( l_chi0, 0, sympy.Rational(1,3) ) ] ]
+
+    l_sym = Matrices.intL( l_sfs, Matrices.subsAll( l_subs, l_basis ) )
+    l_num = Quadrature.sfInt( l_syms, l_basis, l_subs, l_sfs, 2 )
+    self.assertMatch( l_num, l_sym )
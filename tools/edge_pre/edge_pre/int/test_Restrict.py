@@ -0,0 +1,47 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Tests the memoized restriction of functions.
+##
+import unittest
+import sympy
+from . import Restrict
+
+class TestRestrict( unittest.TestCase ):
+  ##
+  # Tests the restriction of functions.
+  ##
+  def test_restrict(self):
+    l_xi1, l_xi2, l_chi = sympy.symbols( 'xi_1 xi_2 chi' )
+    l_funs = [ 1, l_xi1, l_xi1*l_xi2**2 ]
+
+    # restriction to a face
+    l_res = Restrict.restrict( l_funs, [ l_xi1, l_xi2 ], [ l_chi, 0 ] )
+    self.assertEqual( l_res, [ 1, l_chi, 0 ] )
+
+    # simultaneous substitution
+    l_res = Restrict.restrict( l_funs, [ l_xi1, l_xi2 ], [ l_xi2, 1-l_xi1 ] )
+    self.assertEqual( l_res, [ 1, l_xi2, l_xi2*(1-l_xi1)**2 ] )
+
+    # repeated restrictions are memoized
+    l_hits = Restrict.memo.cache_info().hits
+    l_res = Restrict.restrict( l_funs, [ 'xi_1', 'xi_2' ], [ 'xi_2', '1-xi_1' ] )
+    self.assertEqual( l_res, [ 1, l_xi2, l_xi2*(1-l_xi1)**2 ] )
+    self.assertEqual( Restrict.memo.cache_info().hits, l_hits+1 )
@@ -0,0 +1,127 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Tests the sum-factorized operators.
+##
+import unittest
+from . import Tensor
+from . import Matrices
+import sympy
+from fractions import Fraction as Fra
+import edge_pre.dg.basis.Mod
+import edge_pre.dg.basis.Line
+import edge_pre.dg.basis.Quad
+import edge_pre.dg.basis.Hex
+import edge_pre.types.Line
+import edge_pre.types.Quad
+import edge_pre.types.Hex
+import edge_pre.sc.grid.Generic
+import edge_pre.sc.grid.Quad
+import edge_pre.sc.grid.Hex
+import edge_pre.sc.ops.Project
+
+class TestTensor( unittest.TestCase ):
+  ##
+  # Tests the 1D operators.
+  ##
+  def test_ops1d(self):
+    l_ops = Tensor.ops1d( 2 )
+
+    self.assertEqual( l_ops['mass'], sympy.diag( 1, Fra(1,3), Fra(1,5) ) )
+    self.assertEqual( l_ops['stiff'], sympy.Matrix( [ [ 0, 2, 0 ],
+                                                      [ 0, 0, 2 ],
+                                                      [ 0, 0, 0 ] ] ) )
+    self.assertEqual( l_ops['massRe'], sympy.diag( 1, -Fra(1,3), Fra(1,5) ) )
+
+  ##
+  # Tests the multi-indices of the tensor-product basis.
+  ##
+  def test_multi(self):
+    self.assertEqual( Tensor.multi( 2, 2, 5 ), [2, 1] )
+    self.assertEqual( Tensor.multi( 1, 3, 6 ), [0, 1, 1] )
+
+  ##
+  # Tests the mass, stiffness and flux matrices against symbolic integration.
+  ##
+  def test_dg(self):
+    for l_de, l_nDims, l_genFa, l_genEl, l_elTyFa, l_elTy in [ ( 1, 2, edge_pre.dg.basis.Line.gen, edge_pre.dg.basis.Quad.gen,
+                                                                       edge_pre.types.Line.Line,   edge_pre.types.Quad.Quad ),
+                                                               ( 2, 2, edge_pre.dg.basis.Line.gen, edge_pre.dg.basis.Quad.gen,
+                                                                       edge_pre.types.Line.Line,   edge_pre.types.Quad.Quad ),
+                                                               ( 1, 3, edge_pre.dg.basis.Quad.gen, edge_pre.dg.basis.Hex.gen,
+                                                                       edge_pre.types.Quad.Quad,   edge_pre.types.Hex.Hex ) ]:
+      l_symsFa, l_basisFa = l_genFa( l_de )
+      l_symsEl, l_basisEl = l_genEl( l_de )
+      l_symsEl, l_basisEl = edge_pre.dg.basis.Mod.unify( l_symsFa, l_basisFa, l_symsEl, l_basisEl )
+      l_typ = l_elTy( l_de )
+      l_intEl = l_typ.intEl( l_symsEl )
+      l_intFa = l_elTyFa( l_de ).intEl( l_symsFa if l_nDims == 3 else l_symsFa[0] )
+
+      self.assertEqual( Tensor.mass( l_de, l_nDims ), Matrices.mass( l_intEl, l_basisEl ) )
+      self.assertEqual( Tensor.stiff( l_de, l_nDims ), Matrices.stiff( l_symsEl, l_basisEl, l_intEl ) )
+
+      l_fluxTe = Tensor.flux( l_de,
+                              l_symsFa,
+                              l_typ.faToFa( l_symsFa ),
+                              l_typ.faToEl( l_symsFa ) )
+      l_fluxSy = Matrices.flux( l_basisFa,
+                                l_basisEl,
+                                l_symsFa,
+                                l_symsEl,
+                                l_intFa,
+                                l_typ.faToFa( l_symsFa ),
+                                l_typ.faToEl( l_symsFa ) )
+      for l_re in range(3):
+        self.assertEqual( l_fluxTe[l_re], l_fluxSy[l_re] )
+
+  ##
+  # Tests the scatter operator against symbolic integration.
+  ##
+  def test_scatter(self):
+    l_syms, l_basis = edge_pre.dg.basis.Quad.gen( 2 )
+    l_int = edge_pre.types.Quad.Quad( 2 ).intEl( l_syms )
+    l_shape = [ ( 1 - l_syms[0] ) * ( 1 - l_syms[1] ),
+                  l_syms[0]       * ( 1 - l_syms[1] ),
+                  l_syms[0]       *   l_syms[1],
+                ( 1 - l_syms[0] ) *   l_syms[1] ]
+
+    l_svs = edge_pre.sc.grid.Quad.svs( 2 )
+    l_maps = []
+    l_dets = []
+    for l_sc in edge_pre.sc.grid.Quad.scSv( 2 )[1]:
+      l_maps = l_maps + [ edge_pre.sc.grid.Generic.refToPhy( [ l_svs[l_sv] for l_sv in l_sc ], l_shape ) ]
+      l_dets = l_dets + [ edge_pre.sc.grid.Generic.absJacDet( l_syms, l_maps[-1] ) ]
+
+    self.assertEqual( Tensor.scatter( l_syms, l_basis, l_int, l_maps, l_dets ),
+                      edge_pre.sc.ops.Project.scatter( l_syms, l_basis, l_int, l_maps, l_dets ) )
+
+  ##
+  # Tests the sub-face integration against symbolic integration.
+  ##
+  def test_sfInt(self):
+    for l_de, l_gen, l_grid, l_symsS in [ ( 2, edge_pre.dg.basis.Quad.gen, edge_pre.sc.grid.Quad, sympy.symbols('chi_0:1') ),
+                                          ( 1, edge_pre.dg.basis.Hex.gen,  edge_pre.sc.grid.Hex,  sympy.symbols('chi_0:2') ) ]:
+      l_syms, l_basis = l_gen( l_de )
+      l_subs, l_ints = l_grid.intSfDg( l_de, list(l_symsS), l_syms )
+
+      for l_fa in range( len(l_subs) ):
+        l_basisSubs = Matrices.subsAll( l_subs[l_fa], l_basis )
+        self.assertEqual( Tensor.sfInt( l_de, l_syms, l_subs[l_fa], l_ints[l_fa] ),
+                          Matrices.intL( l_ints[l_fa], l_basisSubs ) )
@@ -19,86 +19,118 @@
 #
 # @section DESCRIPTION
 # Converts array info to string.
+#   The arrays are either returned as strings or streamed row by row to an open file.
 ##
+import io
 
 ##
-# Converts 2d float input to a comma-separated (fastest dim) and newline-separated string.
+# Formats a floating point number by the shortest representation, which round-trips.
 #
-# @param i_in 2d input.
+# @param i_en number.
 # @return string representation.
 ##
-def float2d( i_in ):
-  # output string
-  l_outStr = ''
-
-  # iterate first dim
-  for l_d1 in i_in:
-    # iterate second dim
-    for l_d2 in l_d1:
-      l_outStr = l_outStr + str(float(l_d2)) + ','
-    l_outStr = l_outStr + '\n'
+def fmtFloat( i_en ):
+  return repr( float(i_en) )
 
-  return l_outStr
+##
+# Formats a floating point number exactly as hexadecimal floating point literal (C99, C++17).
+#
+# @param i_en number.
+# @return string representation.
+##
+def fmtHex( i_en ):
+  return float(i_en).hex()
 
 ##
-# Converts 2d integal input to a comma-separated (fastest dim) and newline-separated string.
+# Formats an integral number.
 #
-# @param i_in 2d input.
+# @param i_en number.
 # @return string representation.
 ##
-def int2d( i_in ):
-  # output string
-  l_outStr = ''
+def fmtInt( i_en ):
+  return str( int(i_en) )
 
-  # iterate over first dim
-  for l_d1 in i_in:
-    # iterate over second dim
-    for l_d2 in l_d1:
-      l_outStr = l_outStr + str(l_d2) + ','
-    l_outStr = l_outStr + '\n'
+##
+# Writes a 2d or 3d input to the given output, comma-separated (fastest dim), newline-separated (second fastest) and double-newline-separated (3d only).
+#   Every row is formatted and written separately, such that the memory stays constant and the time linear in the size of the output.
+#
+# @param i_in 2d or 3d input.
+# @param i_nDims number of dimensions of the input (2 or 3).
+# @param i_fmt function, formatting a single entry.
+# @param i_out open file, the input is written to. If None, a string is returned.
+# @return string representation if no output is given, None otherwise.
+##
+def write( i_in,
+           i_nDims,
+           i_fmt,
+           i_out = None ):
+  assert( i_nDims in [2, 3] )
+
+  l_out = i_out
+  if( l_out == None ):
+    l_out = io.StringIO()
 
-  return l_outStr
+  l_mats = i_in
+  if( i_nDims == 2 ):
+    l_mats = [ i_in ]
+
+  for l_ma in l_mats:
+    for l_ro in l_ma:
+      # python scalars are formatted faster than numpy's
+      if( hasattr( l_ro, 'tolist' ) ):
+        l_ro = l_ro.tolist()
+      l_out.write( ','.join( [ i_fmt(l_en) for l_en in l_ro ] ) + ',\n' )
+
+    if( i_nDims == 3 ):
+      l_out.write( '\n' )
+
+  if( i_out == None ):
+    return l_out.getvalue()
 
 ##
-# Converts 3d integral input to a comma-separated string (fastest dim), newline-separated (second fastest) and double-newline-separated string.
+# Converts 2d float input to a comma-separated (fastest dim) and newline-separated string.
 #
-# @param i_in 3d input.
-# @return string representation.
+# @param i_in 2d input.
+# @param i_out optional open file, the input is streamed to.
+# @param i_hex if true, the numbers are written as hexadecimal floating point literals.
+# @return string representation if no output is given.
 ##
-def int3d( i_in ):
-  # output string
-  l_outStr = ''
+def float2d( i_in,
+             i_out = None,
+             i_hex = False ):
+  return write( i_in, 2, fmtHex if i_hex else fmtFloat, i_out )
 
-  # iterate over first dim
-  for l_d1 in i_in:
-    # iterate over second dim
-    for l_d2 in l_d1:
-      # iterate over third dim
-      for l_d3 in l_d2:
-        l_outStr = l_outStr + str(l_d3) + ','
-      l_outStr = l_outStr + '\n'
-    l_outStr = l_outStr + '\n'
+##
+# Converts 2d integal input to a comma-separated (fastest dim) and newline-separated string.
+#
+# @param i_in 2d input.
+# @param i_out optional open file, the input is streamed to.
+# @return string representation if no output is given.
+##
+def int2d( i_in,
+           i_out = None ):
+  return write( i_in, 2, fmtInt, i_out )
 
-  return l_outStr
+##
+# Converts 3d integral input to a comma-separated string (fastest dim), newline-separated (second fastest) and double-newline-separated string.
+#
+# @param i_in 3d input.
+# @param i_out optional open file, the input is streamed to.
+# @return string representation if no output is given.
+##
+def int3d( i_in,
+           i_out = None ):
+  return write( i_in, 3, fmtInt, i_out )
 
 ##
 # Converts 3d float input to a comma-separated string (fastest dim), newline-separated (second fastest) and double-newline-separated string. 
 #
 # @param i_in 3d input.
-# @return string representation.
+# @param i_out optional open file, the input is streamed to.
+# @param i_hex if true, the numbers are written as hexadecimal floating point literals.
+# @return string representation if no output is given.
 ##
-def float3d( i_in ):
-  # output string
-  l_outStr = ''
-
-  # iterate over first dim
-  for l_d1 in i_in:
-    # iterate over second dim
-    for l_d2 in l_d1:
-      # iterate over third dim
-      for l_d3 in l_d2:
-        l_outStr = l_outStr + str(float(l_d3)) + ','
-      l_outStr = l_outStr + '\n'
-    l_outStr = l_outStr + '\n'
-
-  return l_outStr
+def float3d( i_in,
+             i_out = None,
+             i_hex = False ):
+  return write( i_in, 3, fmtHex if i_hex else fmtFloat, i_out )
@@ -0,0 +1,146 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Binary output of the operators as NumPy or HDF5 files, and the corresponding reader.
+##
+import io
+import os
+import json
+import numpy
+from . import Files
+from . import Cache
+
+# HDF5 output is optional
+try:
+  import h5py
+except ImportError:
+  h5py = None
+
+# version of the binary format
+VERSION = 1
+
+##
+# Converts the given nested input to a numpy array.
+#
+# @param i_in nested input (lists, sympy matrices or numpy arrays).
+# @param i_dtype data type of the array, e.g., numpy.float64 or numpy.int64.
+# @return numpy array.
+##
+def array( i_in,
+           i_dtype ):
+  return numpy.ascontiguousarray( numpy.array( i_in, dtype=object ).astype( i_dtype ) )
+
+##
+# Derives the meta data of an operator set.
+#
+# @param i_ops operators: list of tuples (name, numpy array).
+# @param i_attrs attributes of the set, e.g., element type, degree and basis ordering.
+# @return meta data.
+##
+def meta( i_ops,
+          i_attrs ):
+  l_meta = dict( i_attrs )
+  l_meta['generator'] = { 'name':    'edge_pre',
+                          'version': Cache.version(),
+                          'format':  VERSION }
+
+  l_meta['operators'] = {}
+  for l_na, l_op in i_ops:
+    l_meta['operators'][l_na] = { 'shape': list( l_op.shape ),
+                                  'dtype': str( l_op.dtype ) }
+
+  return l_meta
+
+##
+# Writes an operator set as NumPy files, one per operator, and a JSON file with the meta data.
+#
+# @param i_pathMeta path of the JSON file.
+# @param i_ops operators: list of tuples (name, path of the NumPy file, numpy array).
+# @param i_attrs attributes of the set.
+##
+def writeNpy( i_pathMeta,
+              i_ops,
+              i_attrs ):
+  l_meta = meta( [ ( l_na, l_op ) for l_na, l_pa, l_op in i_ops ], i_attrs )
+
+  for l_na, l_pa, l_op in i_ops:
+    l_bytes = io.BytesIO()
+    numpy.save( l_bytes, l_op, allow_pickle=False )
+    Files.writeAtomic( l_pa, l_bytes.getvalue() )
+
+    # files are relative to the meta data
+    l_meta['operators'][l_na]['file'] = os.path.relpath( l_pa, os.path.dirname( os.path.abspath(i_pathMeta) ) )
+
+  Files.writeAtomic( i_pathMeta, json.dumps( l_meta, indent=2, sort_keys=True ) )
+
+##
+# Writes an operator set as a single HDF5 file, the meta data is stored in the attributes.
+#
+# @param i_path path of the HDF5 file.
+# @param i_ops operators: list of tuples (name, numpy array).
+# @param i_attrs attributes of the set.
+##
+def writeHdf5( i_path,
+               i_ops,
+               i_attrs ):
+  if( h5py == None ):
+    raise ImportError( 'the HDF5 output requires h5py' )
+
+  l_meta = meta( i_ops, i_attrs )
+
+  l_bytes = io.BytesIO()
+  with h5py.File( l_bytes, 'w' ) as l_fi:
+    l_fi.attrs['meta'] = json.dumps( l_meta, sort_keys=True )
+    for l_na, l_op in i_ops:
+      l_fi.create_dataset( l_na, data=l_op )
+
+  Files.writeAtomic( i_path, l_bytes.getvalue() )
+
+##
+# Reads an operator set, written by writeNpy or writeHdf5.
+#
+# @param i_path path of the JSON file (NumPy files) or the HDF5 file.
+# @return 1) operators: dictionary, mapping the names to numpy arrays, 2) meta data.
+##
+def read( i_path ):
+  l_ops = {}
+
+  if( i_path.endswith('.json') ):
+    with open( i_path, 'r' ) as l_fi:
+      l_meta = json.load( l_fi )
+
+    l_dir = os.path.dirname( os.path.abspath(i_path) )
+    for l_na, l_op in l_meta['operators'].items():
+      l_ops[l_na] = numpy.load( os.path.join( l_dir, l_op['file'] ), allow_pickle=False )
+  else:
+    if( h5py == None ):
+      raise ImportError( 'reading HDF5 files requires h5py' )
+
+    with h5py.File( i_path, 'r' ) as l_fi:
+      l_meta = json.loads( l_fi.attrs['meta'] )
+      for l_na in l_meta['operators']:
+        l_ops[l_na] = l_fi[l_na][()]
+
+  # check the operators against the meta data
+  for l_na, l_op in l_meta['operators'].items():
+    assert( list( l_ops[l_na].shape ) == l_op['shape'] ), 'shape mismatch of ' + l_na
+    assert( str( l_ops[l_na].dtype ) == l_op['dtype'] ), 'dtype mismatch of ' + l_na
+
+  return l_ops, l_meta
@@ -0,0 +1,226 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Persistent, content-addressed cache of pre-processed data.
+##
+import os
+import glob
+import json
+import time
+import pickle
+import hashlib
+import logging
+import threading
+from . import Files
+
+##
+# Derives the version of the edge_pre sources, used to invalidate cached results.
+#
+# @return hash of all (non-test) python sources of the edge_pre package.
+##
+def version():
+  l_dir = os.path.dirname( os.path.dirname( os.path.abspath(__file__) ) )
+
+  l_hash = hashlib.sha256()
+  for l_pa in sorted( glob.glob( l_dir + '/**/*.py', recursive=True ) ):
+    if( os.path.basename(l_pa).startswith('test') ):
+      continue
+    l_hash.update( os.path.relpath( l_pa, l_dir ).encode() )
+    with open( l_pa, 'rb' ) as l_fi:
+      l_hash.update( l_fi.read() )
+
+  return l_hash.hexdigest()
+
+class Cache:
+  ##
+  # Constructor of the content-addressed on-disk cache.
+  #
+  # @param i_dir directory of the cache, None disables caching.
+  # @param i_maxBytes maximum size of the cache in bytes, None for unlimited size.
+  ##
+  def __init__( self,
+                i_dir,
+                i_maxBytes = None ):
+    self.m_dir = i_dir
+    self.m_maxBytes = i_maxBytes
+    self.m_version = version()
+
+    # serializes stores and prunes of concurrent threads, e.g., the drivers of edge_pre.run.Parallel
+    self.m_lock = threading.RLock()
+
+    if( self.m_dir != None and not os.path.exists( self.m_dir ) ):
+      os.makedirs( self.m_dir )
+
+  ##
+  # Derives the key of an entry.
+  #
+  # @param i_meta meta data of the entry (e.g., element type, degree, operator and backend).
+  # @return key.
+  ##
+  def key( self,
+           i_meta ):
+    l_meta = dict( i_meta )
+    l_meta['version'] = self.m_version
+
+    return hashlib.sha256( json.dumps( l_meta, sort_keys=True ).encode() ).hexdigest()
+
+  ##
+  # Looks up an entry of the cache.
+  #
+  # @param i_meta meta data of the entry (e.g., element type, degree, operator and backend).
+  # @return 1) true if the entry is present, 2) entry (None if not present).
+  ##
+  def lookup( self,
+              i_meta ):
+    if( self.m_dir == None ):
+      return False, None
+
+    l_path = self.m_dir + '/' + self.key( i_meta ) + '.pkl'
+
+    # hit: update the access time for the eviction policy
+    if( os.path.exists( l_path ) ):
+      try:
+        with open( l_path, 'rb' ) as l_fi:
+          l_val = pickle.load( l_fi )
+        os.utime( l_path )
+        logging.debug( 'cache hit: ' + str(i_meta) )
+        return True, l_val
+      except ( OSError, EOFError, pickle.UnpicklingError ):
+        logging.warning( 'ignoring corrupt cache entry: ' + l_path )
+
+    return False, None
+
+  ##
+  # Stores an entry in the cache.
+  #
+  # @param i_meta meta data of the entry (e.g., element type, degree, operator and backend).
+  # @param i_val entry.
+  ##
+  def store( self,
+             i_meta,
+             i_val ):
+    if( self.m_dir == None ):
+      return
+
+    l_key = self.key( i_meta )
+
+    l_meta = dict( i_meta )
+    l_meta['version'] = self.m_version
+    l_meta['created'] = time.time()
+    l_val = pickle.dumps( i_val, protocol=pickle.HIGHEST_PROTOCOL )
+
+    with self.m_lock:
+      Files.writeAtomic( self.m_dir + '/' + l_key + '.pkl', l_val )
+      Files.writeAtomic( self.m_dir + '/' + l_key + '.json', json.dumps( l_meta, sort_keys=True ) )
+
+      if( self.m_maxBytes != None ):
+        self.prune( self.m_maxBytes )
+
+  ##
+  # Gets an entry of the cache. If not present, the entry is computed and stored.
+  #
+  # @param i_meta meta data of the entry (e.g., element type, degree, operator and backend).
+  # @param i_fun function computing the entry.
+  # @return entry.
+  ##
+  def get( self,
+           i_meta,
+           i_fun ):
+    l_hit, l_val = self.lookup( i_meta )
+
+    if( not l_hit ):
+      l_val = i_fun()
+      self.store( i_meta, l_val )
+
+    return l_val
+
+  ##
+  # Lists the entries of the cache.
+  #   Entries removed by other processes while listing are skipped.
+  #
+  # @return list of dictionaries, containing the meta data, key, size in bytes and last access of the entries.
+  ##
+  def entries( self ):
+    l_entries = []
+
+    for l_pa in glob.glob( self.m_dir + '/*.pkl' ):
+      l_key = os.path.basename( l_pa )[:-4]
+
+      l_meta = {}
+      try:
+        if( os.path.exists( self.m_dir + '/' + l_key + '.json' ) ):
+          with open( self.m_dir + '/' + l_key + '.json' ) as l_fi:
+            l_meta = json.load( l_fi )
+
+        l_meta['key'] = l_key
+        l_meta['size'] = os.path.getsize( l_pa )
+        l_meta['access'] = os.path.getmtime( l_pa )
+      except FileNotFoundError:
+        continue
+
+      l_entries = l_entries + [ l_meta ]
+
+    return sorted( l_entries, key=lambda i_en: i_en['access'] )
+
+  ##
+  # Removes an entry of the cache.
+  #
+  # @param i_key key of the entry.
+  ##
+  def remove( self,
+              i_key ):
+    for l_ext in ['.pkl', '.json']:
+      try:
+        os.remove( self.m_dir + '/' + i_key + l_ext )
+      except FileNotFoundError:
+        pass
+
+  ##
+  # Prunes the cache.
+  #   Entries are evicted in least recently used order until the cache fits the given size.
+  #
+  # @param i_maxBytes maximum size of the cache in bytes, None for unlimited size.
+  # @param i_stale if true, entries of other source versions are removed.
+  # @return number of removed entries.
+  ##
+  def prune( self,
+             i_maxBytes = None,
+             i_stale = False ):
+    with self.m_lock:
+      l_entries = self.entries()
+      l_nRm = 0
+
+      if( i_stale ):
+        for l_en in l_entries:
+          if( l_en.get('version') != self.m_version ):
+            self.remove( l_en['key'] )
+            l_nRm = l_nRm + 1
+        l_entries = [ l_en for l_en in l_entries if l_en.get('version') == self.m_version ]
+
+      if( i_maxBytes != None ):
+        l_size = sum( [ l_en['size'] for l_en in l_entries ] )
+        for l_en in l_entries:
+          if( l_size <= i_maxBytes ):
+            break
+          self.remove( l_en['key'] )
+          l_size = l_size - l_en['size']
+          l_nRm = l_nRm + 1
+
+    return l_nRm
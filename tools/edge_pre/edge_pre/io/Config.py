@@ -37,6 +37,10 @@ class Config:
     self.m_degs = []
     self.m_types = []
     self.m_out = {}
+    self.m_backend = 'symbolic'
+    self.m_mode = 'exact'
+    self.m_validate = {}
+    self.m_cache = {}
     l_conf = l_xml.getroot()
 
     # degrees
@@ -50,10 +54,54 @@ class Config:
     # output directories
     l_out = l_conf.find('out_dirs')
     if l_out is not None:
-      for l_ot in ['dg', 'subcell', 'plots']:
+      for l_ot in ['dg', 'subcell', 'plots', 'report']:
         if l_out.find(l_ot) is not None:
           self.m_out[l_ot] = l_out.find(l_ot).text
 
+    # output format
+    self.m_out['format'] = 'csv'
+    if l_conf.find('out_format') is not None:
+      self.m_out['format'] = l_conf.find('out_format').text.strip()
+    assert( self.m_out['format'] in ['csv', 'csv_hex', 'npy', 'hdf5'] ), 'unknown output format: ' + self.m_out['format']
+
+    # plots of the basis, sub-grids and matrices
+    self.m_out['plot'] = False
+    if l_conf.find('plot') is not None:
+      self.m_out['plot'] = l_conf.find('plot').text.strip().lower() in ['1', 'true', 'yes']
+
+    # integration backend
+    if l_conf.find('backend') is not None:
+      self.m_backend = l_conf.find('backend').text.strip()
+    assert( self.m_backend in ['symbolic', 'quadrature', 'monomial'] ), 'unknown backend: ' + self.m_backend
+
+    # arithmetic: exact or float, the floating point mode uses quadrature rules for all integrals
+    if l_conf.find('mode') is not None:
+      self.m_mode = l_conf.find('mode').text.strip()
+    assert( self.m_mode in ['exact', 'float'] ), 'unknown mode: ' + self.m_mode
+    if( self.m_mode == 'float' ):
+      assert( l_conf.find('backend') is None or self.m_backend == 'quadrature' ), 'the float mode requires the quadrature backend'
+      self.m_backend = 'float'
+
+    # validation of the float mode against an exact backend
+    l_val = l_conf.find('validate')
+    if l_val is not None:
+      assert( self.m_mode == 'float' ), 'the validation requires the float mode'
+      self.m_validate['degs'] = [ l_de for l_de in self.m_degs ]
+      if l_val.find('degs') is not None:
+        self.m_validate['degs'] = [ int(l_de.text) for l_de in l_val.find('degs').findall('deg') ]
+      self.m_validate['backend'] = 'monomial'
+      if l_val.find('backend') is not None:
+        self.m_validate['backend'] = l_val.find('backend').text.strip()
+      assert( self.m_validate['backend'] in ['symbolic', 'monomial'] ), 'validation requires an exact backend: ' + self.m_validate['backend']
+
+    # cache of the pre-processed data
+    l_cache = l_conf.find('cache')
+    if l_cache is not None:
+      if l_cache.find('dir') is not None:
+        self.m_cache['dir'] = l_cache.find('dir').text.strip()
+      if l_cache.find('max_mb') is not None:
+        self.m_cache['max_bytes'] = int( float( l_cache.find('max_mb').text ) * 1024**2 )
+
     self.print()
 
   ##
@@ -71,6 +119,16 @@ class Config:
       l_types = l_types + ' ' + l_ty
     logging.info( '    types:' + l_types )
     logging.info( '    out_dirs:' )
-    for l_ot in ['dg', 'subcell', 'plots']:
+    for l_ot in ['dg', 'subcell', 'plots', 'report']:
       if l_ot in self.m_out:
         logging.info( '      ' + l_ot + ': ' + self.m_out[l_ot] )
+    logging.info( '    out_format: ' + self.m_out['format'] )
+    logging.info( '    plot: ' + str(self.m_out['plot']) )
+    logging.info( '  backend: ' + self.m_backend )
+    logging.info( '  mode: ' + self.m_mode )
+    if 'degs' in self.m_validate:
+      logging.info( '  validate: ' + self.m_validate['backend'] + ', degs: ' + ' '.join( [ str(l_de) for l_de in self.m_validate['degs'] ] ) )
+    if 'dir' in self.m_cache:
+      logging.info( '  cache: ' + self.m_cache['dir'] )
+      if 'max_bytes' in self.m_cache:
+        logging.info( '    max size (bytes): ' + str(self.m_cache['max_bytes']) )
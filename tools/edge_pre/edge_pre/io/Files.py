@@ -0,0 +1,67 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Helper functions for files.
+##
+import os
+import tempfile
+import contextlib
+
+# umask of the process, applied to the permissions of atomically written files
+UMASK = os.umask( 0 )
+os.umask( UMASK )
+
+##
+# Opens a temporary file for writing, which atomically replaces the given file once it is closed without errors.
+#
+# @param i_path path of the file.
+# @param i_mode mode of the file, 'w' (text) or 'wb' (binary).
+# @param i_buffer size of the write buffer in bytes, data is written to disk in chunks of this size.
+# @return open file.
+##
+@contextlib.contextmanager
+def openAtomic( i_path,
+                i_mode = 'w',
+                i_buffer = 2**20 ):
+  l_fd, l_tmp = tempfile.mkstemp( dir=os.path.dirname( os.path.abspath(i_path) ), prefix='.tmp_' )
+  try:
+    # mkstemp creates owner-only files, use the permissions of open instead
+    os.fchmod( l_fd, 0o666 & ~UMASK )
+    with os.fdopen( l_fd, i_mode, buffering=i_buffer ) as l_fi:
+      yield l_fi
+    os.replace( l_tmp, i_path )
+  finally:
+    # only present if the file was not written completely
+    if( os.path.exists( l_tmp ) ):
+      os.remove( l_tmp )
+
+##
+# Writes the given data atomically by replacing the file with a completely written temporary file.
+#
+# @param i_path path of the file.
+# @param i_data string or bytes, which are written.
+##
+def writeAtomic( i_path,
+                 i_data ):
+  if( isinstance( i_data, str ) ):
+    i_data = i_data.encode()
+
+  with openAtomic( i_path, 'wb' ) as l_fi:
+    l_fi.write( i_data )
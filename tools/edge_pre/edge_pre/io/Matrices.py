@@ -20,47 +20,43 @@
 # @section DESCRIPTION
 # Plots matrices.
 ##
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot
-from matplotlib.backends.backend_pdf import PdfPages
-from matplotlib.ticker import MaxNLocator
 import numpy
+from . import Plot
+
+##
+# Derives the sparsity pattern of a given matrix.
+#
+# @param i_mat matrix (sympy matrix, nested list or numpy array).
+# @return boolean numpy array, true for non-zeros.
+##
+def pattern( i_mat ):
+  return numpy.array( numpy.array( i_mat, dtype=object ) != 0, dtype=bool )
 
 ##
 # Plots the sparsity pattern of a given matrix
 #
-# @param i_mat matrix, which is plotted.
+# @param i_pat sparsity pattern, see pattern(...).
 # @param i_out output path.
 ##
-def sparsity( i_mat, i_out ):
-  # open pdf
-  with PdfPages(i_out) as l_pdf:
-    # create local copy of matrix
-    l_mat = numpy.matrix( i_mat )
-
-    # create image by including color channels
-    l_pat = numpy.ones( l_mat.shape + (3,) )
-
-    # assign black to non-zeros
-    l_pat[ abs(l_mat) > 0 ] = [0,0,0]
+def sparsity( i_pat, i_out ):
+  l_mpl = Plot.matplotlib()
 
-    # create figure
-    l_ax =  matplotlib.pyplot.figure().gca()
+  # create figure
+  l_ax =  l_mpl.pyplot.figure().gca()
 
-    # plot the image
-    l_ax.imshow( l_pat,  interpolation='nearest' )
+  # plot the image, non-zeros are black
+  l_ax.imshow( i_pat, cmap='binary', vmin=0, vmax=1, interpolation='nearest' )
 
-    # add number of non-zeros to title
-    l_nnz = numpy.count_nonzero( l_mat )
-    matplotlib.pyplot.title( '#non-zero: '+str(l_nnz) )
+  # add number of non-zeros to title
+  l_nnz = numpy.count_nonzero( i_pat )
+  l_mpl.pyplot.title( '#non-zero: '+str(l_nnz) )
 
-    # enforce int labels
-    l_ax.xaxis.set_major_locator(MaxNLocator(integer=True))
-    l_ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+  # enforce int labels
+  l_ax.xaxis.set_major_locator(l_mpl.ticker.MaxNLocator(integer=True))
+  l_ax.yaxis.set_major_locator(l_mpl.ticker.MaxNLocator(integer=True))
 
-    # save figure
-    l_pdf.savefig()
+  # save figure
+  l_mpl.pyplot.savefig( i_out, format='pdf' )
 
-    # shutdown pyplot
-    matplotlib.pyplot.close()
\ No newline at end of file
+  # shutdown pyplot
+  l_mpl.pyplot.close()
@@ -0,0 +1,56 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Helper functions for plotting.
+##
+import numpy
+import sympy
+
+##
+# Imports matplotlib for plotting.
+# matplotlib is an optional dependency, only required if plots are requested,
+# and is therefore imported lazily by the plot functions through this helper.
+# The non-interactive Agg backend is selected, since all plots are written to files.
+#
+# @return matplotlib with the submodules pyplot, path, ticker and backends.backend_pdf imported.
+##
+def matplotlib():
+  import matplotlib
+  matplotlib.use('Agg')
+  import matplotlib.pyplot
+  import matplotlib.path
+  import matplotlib.ticker
+  import matplotlib.backends.backend_pdf
+
+  return matplotlib
+
+##
+# Evaluates basis functions at the given sampling points through a single, vectorized evaluator.
+#
+# @param i_syms symbols used in basis.
+# @param i_funs basis functions.
+# @param i_crds coordinates of the sampling points, one numpy array per symbol.
+# @return numpy array with the values. [*][]: basis function, []*[]: shape of the coordinates.
+##
+def sample( i_syms, i_funs, i_crds ):
+  l_eval = sympy.lambdify( i_syms, i_funs, 'numpy' )
+
+  # constant functions evaluate to scalars
+  return numpy.array( [ numpy.broadcast_to( l_va, i_crds[0].shape ) for l_va in l_eval( *i_crds ) ], dtype=numpy.float64 )
@@ -21,6 +21,8 @@
 # Unit tests for the conversion of arrays to string.
 ##
 import unittest
+import io
+import numpy
 from . import ArrStr
 
 class TestArrStr( unittest.TestCase ):
@@ -90,3 +92,38 @@ class TestArrStr( unittest.TestCase ):
 
 """
     self.assertEqual( l_str, l_strUt )
+
+  ##
+  # Tests streaming of the arrays to an open file.
+  ##
+  def test_stream(self):
+    l_dat = [
+              [ [0.1, 2.0], [1.0/3.0, -4.5] ],
+              [ [1e-20, 7.0], [8.0, 9.0] ]
+            ]
+
+    l_out = io.StringIO()
+    self.assertEqual( ArrStr.float3d( l_dat, l_out ), None )
+    self.assertEqual( l_out.getvalue(), ArrStr.float3d( l_dat ) )
+    self.assertEqual( l_out.getvalue(),
+"""0.1,2.0,
+0.3333333333333333,-4.5,
+
+1e-20,7.0,
+8.0,9.0,
+
+""" )
+
+    # shortest representation round-trips
+    l_vals = [ float(l_en) for l_en in ArrStr.float2d( l_dat[0] ).replace( '\n', '' ).split(',')[:-1] ]
+    self.assertEqual( l_vals, [ 0.1, 2.0, 1.0/3.0, -4.5 ] )
+
+    # hexadecimal floating point literals
+    l_out = io.StringIO()
+    ArrStr.float2d( l_dat[0], l_out, True )
+    self.assertEqual( l_out.getvalue(), "0x1.999999999999ap-4,0x1.0000000000000p+1,\n0x1.5555555555555p-2,-0x1.2000000000000p+2,\n" )
+
+    # integral numpy arrays
+    l_out = io.StringIO()
+    ArrStr.int2d( numpy.array( [ [1, 2], [3, 4] ], dtype=numpy.int64 ), l_out )
+    self.assertEqual( l_out.getvalue(), "1,2,\n3,4,\n" )
@@ -0,0 +1,82 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Tests the binary output of the operators.
+##
+import unittest
+import tempfile
+import shutil
+import os
+import numpy
+import sympy
+from . import Binary
+
+class TestBinary( unittest.TestCase ):
+  def setUp(self):
+    self.m_dir = tempfile.mkdtemp()
+
+    self.m_ops = [ ( 'mass',  Binary.array( sympy.Matrix( [ [1, 0], [0, sympy.Rational(1,3)] ] ).tolist(), numpy.float64 ) ),
+                   ( 'stiff', Binary.array( [ [ [0, 0], [2, 0] ] ], numpy.float64 ) ),
+                   ( 'scsv',  Binary.array( [ [0, 1], [1, 2], [2, 3] ], numpy.int64 ) ) ]
+    self.m_attrs = { 'type': 'line', 'degree': 1, 'basis': { 'name': 'Line', 'degs': [ [0], [1] ] } }
+
+  def tearDown(self):
+    shutil.rmtree( self.m_dir )
+
+  ##
+  # Checks that the operators and the meta data were read correctly.
+  #
+  # @param i_ops read operators.
+  # @param i_meta read meta data.
+  ##
+  def check( self,
+             i_ops,
+             i_meta ):
+    self.assertEqual( sorted( i_ops.keys() ), [ 'mass', 'scsv', 'stiff' ] )
+    for l_na, l_op in self.m_ops:
+      self.assertEqual( i_ops[l_na].dtype, l_op.dtype )
+      self.assertTrue( numpy.array_equal( i_ops[l_na], l_op ) )
+
+    self.assertEqual( i_ops['mass'][1, 1], 1.0/3.0 )
+    self.assertEqual( i_meta['operators']['stiff']['shape'], [1, 2, 2] )
+    self.assertEqual( i_meta['operators']['scsv']['dtype'], 'int64' )
+    self.assertEqual( i_meta['basis']['degs'], [ [0], [1] ] )
+    self.assertEqual( i_meta['generator']['format'], Binary.VERSION )
+
+  ##
+  # Tests writing and reading NumPy files.
+  ##
+  def test_npy(self):
+    l_ops = [ ( l_na, self.m_dir + '/line_1_' + l_na + '.npy', l_op ) for l_na, l_op in self.m_ops ]
+    Binary.writeNpy( self.m_dir + '/line_1_dg.json', l_ops, self.m_attrs )
+
+    self.assertTrue( os.path.exists( self.m_dir + '/line_1_mass.npy' ) )
+    self.assertTrue( numpy.array_equal( numpy.load( self.m_dir + '/line_1_scsv.npy' ), self.m_ops[2][1] ) )
+
+    self.check( *Binary.read( self.m_dir + '/line_1_dg.json' ) )
+
+  ##
+  # Tests writing and reading HDF5 files.
+  ##
+  @unittest.skipIf( Binary.h5py == None, 'h5py is not available' )
+  def test_hdf5(self):
+    Binary.writeHdf5( self.m_dir + '/line_1_dg.h5', self.m_ops, self.m_attrs )
+
+    self.check( *Binary.read( self.m_dir + '/line_1_dg.h5' ) )
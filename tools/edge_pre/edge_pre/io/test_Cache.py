@@ -0,0 +1,125 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Tests the cache of pre-processed data.
+##
+import unittest
+import tempfile
+import shutil
+import os
+import threading
+from . import Cache
+
+class TestCache( unittest.TestCase ):
+  def setUp(self):
+    self.m_dir = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree( self.m_dir )
+
+  ##
+  # Tests computation and reuse of entries.
+  ##
+  def test_get(self):
+    l_cache = Cache.Cache( self.m_dir )
+    l_calls = []
+    l_fun = lambda: l_calls.append( 1 ) or [ 1, 2, 3 ]
+
+    l_meta = { 'type': 'tria3', 'deg': 2, 'op': 'mass', 'backend': 'symbolic' }
+    self.assertEqual( l_cache.get( l_meta, l_fun ), [ 1, 2, 3 ] )
+    self.assertEqual( l_cache.get( l_meta, l_fun ), [ 1, 2, 3 ] )
+    self.assertEqual( len(l_calls), 1 )
+
+    # new cache object on the same directory
+    l_cache = Cache.Cache( self.m_dir )
+    self.assertEqual( l_cache.get( l_meta, l_fun ), [ 1, 2, 3 ] )
+    self.assertEqual( len(l_calls), 1 )
+
+    # other degree
+    l_meta['deg'] = 3
+    l_cache.get( l_meta, l_fun )
+    self.assertEqual( len(l_calls), 2 )
+
+    # entries
+    l_entries = l_cache.entries()
+    self.assertEqual( len(l_entries), 2 )
+    self.assertEqual( sorted( [ l_en['deg'] for l_en in l_entries ] ), [2, 3] )
+
+    # disabled cache
+    l_cache = Cache.Cache( None )
+    l_cache.get( l_meta, l_fun )
+    self.assertEqual( len(l_calls), 3 )
+
+  ##
+  # Tests the pruning of the cache.
+  ##
+  def test_prune(self):
+    l_cache = Cache.Cache( self.m_dir )
+
+    for l_de in range(4):
+      l_cache.get( { 'deg': l_de }, lambda: bytes( 1000 ) )
+      os.utime( self.m_dir + '/' + l_cache.key( { 'deg': l_de } ) + '.pkl', ( l_de, l_de ) )
+
+    # access of the first entry
+    l_cache.get( { 'deg': 0 }, lambda: None )
+
+    # evict least recently used entries
+    l_size = sum( [ l_en['size'] for l_en in l_cache.entries() ] )
+    self.assertEqual( l_cache.prune( l_size // 2 ), 2 )
+    self.assertEqual( sorted( [ l_en['deg'] for l_en in l_cache.entries() ] ), [0, 3] )
+
+    # stale entries
+    l_cache.m_version = 'other'
+    self.assertEqual( l_cache.prune( None, True ), 2 )
+    self.assertEqual( l_cache.entries(), [] )
+
+    # size-based eviction on insertion
+    l_cache = Cache.Cache( self.m_dir, 1500 )
+    for l_de in range(4):
+      l_cache.get( { 'deg': l_de }, lambda: bytes( 1000 ) )
+    self.assertEqual( len(l_cache.entries()), 1 )
+
+  ##
+  # Tests concurrent stores with size-based eviction, including a second cache instance on the same directory.
+  ##
+  def test_threads(self):
+    l_caches = [ Cache.Cache( self.m_dir, 2500 ), Cache.Cache( self.m_dir, 2500 ) ]
+    l_errs = [ None ] * 6
+
+    ##
+    # Stores entries in the cache.
+    #
+    # @param i_th id of the thread.
+    ##
+    def store( i_th ):
+      try:
+        for l_de in range(20):
+          l_caches[i_th % 2].store( { 'thread': i_th, 'deg': l_de }, bytes( 1000 ) )
+      except Exception as l_ex:
+        l_errs[i_th] = l_ex
+
+    l_threads = [ threading.Thread( target=store, args=( l_th, ) ) for l_th in range(6) ]
+    for l_th in l_threads:
+      l_th.start()
+    for l_th in l_threads:
+      l_th.join()
+
+    self.assertEqual( l_errs, [ None ] * 6 )
+    self.assertLessEqual( sum( [ l_en['size'] for l_en in l_caches[0].entries() ] ), 2500 )
@@ -0,0 +1,65 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Tests the helper functions for files.
+##
+import unittest
+import tempfile
+import shutil
+import os
+from . import Files
+
+class TestFiles( unittest.TestCase ):
+  def setUp(self):
+    self.m_dir = tempfile.mkdtemp()
+
+  def tearDown(self):
+    shutil.rmtree( self.m_dir )
+
+  ##
+  # Tests the atomic writing of files.
+  ##
+  def test_writeAtomic(self):
+    l_path = self.m_dir + '/data.csv'
+    Files.writeAtomic( l_path, 'a,b\n' )
+    self.assertEqual( open( l_path ).read(), 'a,b\n' )
+
+    # permissions follow the umask as for open
+    self.assertEqual( os.stat( l_path ).st_mode & 0o777, 0o666 & ~Files.UMASK )
+
+    # replace existing file
+    Files.writeAtomic( l_path, b'c,d\n' )
+    self.assertEqual( open( l_path ).read(), 'c,d\n' )
+    self.assertEqual( os.listdir( self.m_dir ), [ 'data.csv' ] )
+
+  ##
+  # Tests that failed writes leave the existing file and no temporary files behind.
+  ##
+  def test_openAtomicError(self):
+    l_path = self.m_dir + '/data.csv'
+    Files.writeAtomic( l_path, 'a,b\n' )
+
+    with self.assertRaises( KeyboardInterrupt ):
+      with Files.openAtomic( l_path ) as l_fi:
+        l_fi.write( 'partial' )
+        raise KeyboardInterrupt()
+
+    self.assertEqual( open( l_path ).read(), 'a,b\n' )
+    self.assertEqual( os.listdir( self.m_dir ), [ 'data.csv' ] )
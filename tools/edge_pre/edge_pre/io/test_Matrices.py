@@ -0,0 +1,61 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Tests the plots of matrices.
+##
+import unittest
+import tempfile
+import shutil
+import os
+import numpy
+import sympy
+from . import Matrices
+
+class TestMatrices( unittest.TestCase ):
+  ##
+  # Tests the derivation of sparsity patterns.
+  ##
+  def test_pattern(self):
+    l_ref = [ [ True,  False, True  ],
+              [ False, False, True  ] ]
+
+    # sympy matrix
+    l_mat = sympy.Matrix( [ [ sympy.Rational(1, 3), 0, -1 ],
+                            [ 0,                    0,  sympy.sqrt(2) ] ] )
+    l_pat = Matrices.pattern( l_mat )
+    self.assertEqual( l_pat.dtype, bool )
+    self.assertEqual( l_pat.tolist(), l_ref )
+
+    # numpy array
+    l_pat = Matrices.pattern( numpy.array( [ [ 0.5, 0.0, -1E-300 ],
+                                             [ 0.0, 0.0,  2.0    ] ] ) )
+    self.assertEqual( l_pat.tolist(), l_ref )
+
+  ##
+  # Tests the plot of a sparsity pattern.
+  ##
+  def test_sparsity(self):
+    l_dir = tempfile.mkdtemp()
+    try:
+      l_path = os.path.join( l_dir, 'mass.pdf' )
+      Matrices.sparsity( Matrices.pattern( sympy.eye(4) ), l_path )
+      self.assertGreater( os.path.getsize( l_path ), 0 )
+    finally:
+      shutil.rmtree( l_dir )
@@ -0,0 +1,47 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Tests the helper functions for plotting.
+##
+import unittest
+import numpy
+from . import Plot
+import edge_pre.dg.basis.Line
+
+class TestPlot( unittest.TestCase ):
+  ##
+  # Tests the vectorized evaluation of basis functions.
+  ##
+  def test_sample(self):
+    l_syms, l_basis = edge_pre.dg.basis.Line.gen( 2 )
+
+    l_xi = numpy.array( [ [0, 0.25], [0.5, 1] ] )
+    l_vals = Plot.sample( l_syms, l_basis, [ l_xi ] )
+
+    self.assertEqual( l_vals.shape, (3, 2, 2) )
+    for l_ba in range(3):
+      for l_en in range(4):
+        l_co = l_xi.flat[l_en]
+        self.assertAlmostEqual( l_vals[l_ba].flat[l_en], float( l_basis[l_ba].subs( l_syms[0], l_co ) ) )
+
+    # constant functions are broadcasted
+    l_vals = Plot.sample( l_syms, [ 1 ], [ l_xi ] )
+    self.assertEqual( l_vals.shape, (1, 2, 2) )
+    self.assertTrue( numpy.array_equal( l_vals[0], numpy.ones( (2, 2) ) ) )
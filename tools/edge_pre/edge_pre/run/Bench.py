@@ -0,0 +1,350 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Benchmarks of the operator generation.
+##
+import io
+import os
+import sys
+import json
+import time
+import glob
+import socket
+import platform
+import statistics
+import subprocess
+import logging
+import numpy
+import sympy
+from sympy.core.cache import clear_cache
+import edge_pre.io.ArrStr
+import edge_pre.io.Cache
+import edge_pre.io.Files
+import edge_pre.int.Monomial
+import edge_pre.int.Restrict
+import edge_pre.int.Tensor
+from . import Pipeline
+
+# version of the history files
+VERSION = 1
+
+##
+# Sets up the benchmark of a pipeline stage, whose dependencies are evaluated in advance.
+#
+# @param i_name name of the stage.
+# @param i_deps names of the stages, the benchmarked stage depends on.
+# @return function, which sets up the benchmark for a type, degree and backend.
+##
+def stage( i_name,
+           i_deps ):
+  ##
+  # Sets up the benchmark.
+  #
+  # @param i_ty element type.
+  # @param i_deg polynomial degree.
+  # @param i_backend integration backend.
+  # @return function, which is timed.
+  ##
+  def setup( i_ty,
+             i_deg,
+             i_backend ):
+    l_pipe = Pipeline.Pipeline( i_ty, i_deg, i_backend )
+    for l_de in i_deps:
+      l_pipe.get( l_de )
+
+    # the stage is called directly, bypassing the memoization
+    return l_pipe.m_stages[i_name]
+
+  return setup
+
+##
+# Sets up the benchmark of the basis generation.
+#
+# @param i_ty element type.
+# @param i_deg polynomial degree.
+# @param i_backend integration backend (unused).
+# @return function, which is timed.
+##
+def basis( i_ty,
+           i_deg,
+           i_backend ):
+  return lambda: Pipeline.BASES[i_ty].gen( i_deg )
+
+##
+# Sets up the benchmark of an ArrStr writer, streaming to memory.
+#   Floating point data are random matrices, matching the number of basis functions and the number of stiffness and flux matrices.
+#   Integer data are the sub-cells' vertices and face-adjacent sub-cells.
+#
+# @param i_fun ArrStr writer.
+# @return function, which sets up the benchmark for a type, degree and backend.
+##
+def arrStr( i_fun ):
+  ##
+  # Sets up the benchmark.
+  #
+  # @param i_ty element type.
+  # @param i_deg polynomial degree.
+  # @param i_backend integration backend.
+  # @return function, which is timed.
+  ##
+  def setup( i_ty,
+             i_deg,
+             i_backend ):
+    l_pipe = Pipeline.Pipeline( i_ty, i_deg, i_backend )
+    l_nBas = len( Pipeline.BASES[i_ty].gen( i_deg )[1] )
+    l_nMats = l_pipe.m_elTy.n_dims + l_pipe.m_elTy.n_fas
+
+    l_rng = numpy.random.default_rng( 0 )
+    if( i_fun == edge_pre.io.ArrStr.float2d ):
+      l_data = l_rng.random( (l_nBas, l_nBas) ).tolist()
+    elif( i_fun == edge_pre.io.ArrStr.float3d ):
+      l_data = l_rng.random( (l_nMats, l_nBas, l_nBas) ).tolist()
+    else:
+      l_data = sum( l_pipe.get('scSv'), [] ) + sum( l_pipe.get('scSfSc'), [] )
+
+    return lambda: i_fun( l_data, io.StringIO() )
+
+  return setup
+
+# benchmarks: name -> setup function
+BENCHES = { 'basis':          basis,
+            'mass':           stage( 'mass',    [ 'basis', 'trafos' ] ),
+            'stiff':          stage( 'stiff',   [ 'basis', 'trafos' ] ),
+            'flux':           stage( 'flux',    [ 'basis', 'trafos' ] ),
+            'scatter':        stage( 'scatter', [ 'basis', 'trafos', 'affSc' ] ),
+            'gather':         stage( 'gather',  [ 'basis', 'trafos', 'affSc', 'scatter' ] ),
+            'grid.svs':       stage( 'svs',     [] ),
+            'grid.scSv':      stage( 'scSv',    [] ),
+            'grid.scSfSc':    stage( 'scSfSc',  [] ),
+            'grid.scTySf':    stage( 'scTySf',  [] ),
+            'grid.scDgAd':    stage( 'scDgAd',  [] ),
+            'arrstr.float2d': arrStr( edge_pre.io.ArrStr.float2d ),
+            'arrstr.float3d': arrStr( edge_pre.io.ArrStr.float3d ),
+            'arrstr.int2d':   arrStr( edge_pre.io.ArrStr.int2d ) }
+
+##
+# Selects benchmarks by their names or prefixes, e.g., grid selects all grid.* benchmarks.
+#
+# @param i_sels names or prefixes, None selects all benchmarks.
+# @return names of the selected benchmarks.
+##
+def select( i_sels ):
+  if( i_sels == None ):
+    return list( BENCHES.keys() )
+
+  return [ l_na for l_na in BENCHES if any( [ l_na == l_se or l_na.startswith( l_se+'.' ) for l_se in i_sels ] ) ]
+
+##
+# Clears sympy's cache and the memos of the integration layer, such that every call starts cold.
+##
+def clearCaches():
+  clear_cache()
+  edge_pre.int.Monomial.moment.cache_clear()
+  edge_pre.int.Restrict.memo.cache_clear()
+  edge_pre.int.Tensor.ops1d.cache_clear()
+
+##
+# Times a function. All caches are cleared before every call, see clearCaches, and only the calls are timed.
+#   Fast functions are called repeatedly within a repetition, such that a repetition takes at least i_min seconds.
+#
+# @param i_fun function, which is timed.
+# @param i_nReps maximum number of repetitions.
+# @param i_budget time budget in seconds, no further repetitions are started once exceeded.
+# @param i_min minimum duration of a repetition in seconds, including the clearing of the caches.
+# @return 1) wall times per call of the repetitions in seconds, 2) number of calls per repetition.
+##
+def measure( i_fun,
+             i_nReps,
+             i_budget,
+             i_min = 0.02 ):
+  l_times = []
+  l_nCalls = 1
+  l_total = 0
+
+  while( len(l_times) < i_nReps and l_total < i_budget ):
+    l_wall = time.perf_counter()
+    l_time = 0
+    for l_ca in range(l_nCalls):
+      clearCaches()
+      l_start = time.perf_counter()
+      i_fun()
+      l_time = l_time + time.perf_counter() - l_start
+    l_wall = time.perf_counter() - l_wall
+    l_total = l_total + l_wall
+
+    # calibrate the number of calls with the first repetition, which is discarded; the clearing of the caches counts towards the minimum duration
+    if( len(l_times) == 0 and l_nCalls == 1 and l_wall < i_min ):
+      l_nCalls = min( int( i_min / max( l_wall, 1E-9 ) ) + 1, 10**6 )
+      continue
+
+    l_times = l_times + [ l_time / l_nCalls ]
+
+  return l_times, l_nCalls
+
+##
+# Runs the benchmarks.
+#   The degrees of a benchmark and type are processed in increasing order, higher degrees are skipped once a repetition exceeds the budget.
+#
+# @param i_names names of the benchmarks.
+# @param i_types element types.
+# @param i_degs polynomial degrees.
+# @param i_backend integration backend.
+# @param i_nReps maximum number of repetitions.
+# @param i_budget time budget in seconds per benchmark, type and degree.
+# @return results: list of dictionaries.
+##
+def run( i_names,
+         i_types,
+         i_degs,
+         i_backend,
+         i_nReps,
+         i_budget ):
+  l_res = []
+
+  for l_na in i_names:
+    for l_ty in i_types:
+      for l_de in sorted( i_degs ):
+        l_fun = BENCHES[l_na]( l_ty, l_de, i_backend )
+        l_times, l_nCalls = measure( l_fun, i_nReps, i_budget )
+
+        l_res = l_res + [ { 'bench':   l_na,
+                            'type':    l_ty,
+                            'deg':     l_de,
+                            'backend': i_backend,
+                            'reps':    len(l_times),
+                            'calls':   l_nCalls,
+                            'min':     min(l_times),
+                            'median':  statistics.median(l_times),
+                            'max':     max(l_times) } ]
+        logging.info( '{:<16} {:<8} {:>2} {:>12.6f} s'.format( l_na, l_ty, l_de, statistics.median(l_times) ) )
+
+        if( min(l_times) > i_budget ):
+          logging.info( '  skipping higher degrees of ' + l_na + ' for ' + l_ty + ', budget exceeded' )
+          break
+
+  return l_res
+
+##
+# Derives information on the machine and the sources of a run.
+#
+# @return information.
+##
+def machine():
+  l_dir = os.path.dirname( os.path.abspath(__file__) )
+
+  # commit of the sources, if available
+  try:
+    l_rev = subprocess.run( [ 'git', 'rev-parse', 'HEAD' ],
+                            cwd = l_dir,
+                            capture_output = True,
+                            text = True,
+                            check = True ).stdout.strip()
+  except ( OSError, subprocess.CalledProcessError ):
+    l_rev = None
+
+  return { 'host':     socket.gethostname(),
+           'platform': platform.platform(),
+           'cpu':      platform.processor(),
+           'python':   platform.python_version(),
+           'sympy':    sympy.__version__,
+           'numpy':    numpy.__version__,
+           'commit':   l_rev,
+           'sources':  edge_pre.io.Cache.version() }
+
+##
+# Writes the results of a run to a new file in the history.
+#
+# @param i_dir directory of the history.
+# @param i_res results of the run.
+# @param i_args arguments of the run.
+# @return path of the history file.
+##
+def write( i_dir,
+           i_res,
+           i_args ):
+  os.makedirs( i_dir, exist_ok=True )
+  l_path = os.path.join( i_dir, 'bench_' + time.strftime( '%Y%m%d_%H%M%S' ) + '.json' )
+
+  edge_pre.io.Files.writeAtomic( l_path, json.dumps( { 'format':  VERSION,
+                                                       'time':    time.time(),
+                                                       'machine': machine(),
+                                                       'args':    i_args,
+                                                       'results': i_res }, indent=2, sort_keys=True ) )
+
+  return l_path
+
+##
+# Reads a history file.
+#   Directories are resolved to their latest history file.
+#
+# @param i_path path of the history file or directory.
+# @param i_excl path of a history file, which is excluded when resolving directories.
+# @return results.
+##
+def read( i_path,
+          i_excl = None ):
+  if( os.path.isdir( i_path ) ):
+    l_paths = sorted( glob.glob( os.path.join( i_path, 'bench_*.json' ) ) )
+    l_paths = [ l_pa for l_pa in l_paths if i_excl == None or os.path.abspath(l_pa) != os.path.abspath(i_excl) ]
+    assert( len(l_paths) > 0 ), 'no history files in ' + i_path
+    i_path = l_paths[-1]
+
+  with open( i_path, 'r' ) as l_fi:
+    l_hist = json.load( l_fi )
+  assert( l_hist['format'] == VERSION ), 'unsupported format of ' + i_path
+
+  logging.info( 'baseline: ' + i_path )
+  return l_hist['results']
+
+##
+# Compares results against a baseline, using the median times.
+#
+# @param i_base results of the baseline.
+# @param i_res results, which are compared.
+# @param i_thres relative threshold, e.g., 0.1 flags results which are more than 10% slower or faster.
+# @param i_floor absolute threshold in seconds, differences below are considered noise.
+# @return list of tuples: 1) benchmark, type, degree and backend, 2) time of the baseline, 3) time, 4) relative change, 5) verdict (regression, improvement or unchanged).
+##
+def compare( i_base,
+             i_res,
+             i_thres,
+             i_floor ):
+  l_base = dict( [ ( ( l_re['bench'], l_re['type'], l_re['deg'], l_re['backend'] ), l_re['median'] ) for l_re in i_base ] )
+
+  l_comps = []
+  for l_re in i_res:
+    l_key = ( l_re['bench'], l_re['type'], l_re['deg'], l_re['backend'] )
+    if( l_key not in l_base ):
+      continue
+
+    l_old = l_base[l_key]
+    l_new = l_re['median']
+    l_rel = ( l_new - l_old ) / max( l_old, sys.float_info.min )
+
+    l_verd = 'unchanged'
+    if( abs( l_new - l_old ) > i_floor ):
+      if( l_rel > i_thres ):
+        l_verd = 'regression'
+      elif( l_rel < -i_thres ):
+        l_verd = 'improvement'
+
+    l_comps = l_comps + [ ( l_key, l_old, l_new, l_rel, l_verd ) ]
+
+  return l_comps
@@ -0,0 +1,318 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Parallel execution of the pre-processing pipelines.
+##
+import logging
+import multiprocessing
+import concurrent.futures
+from sympy.core.cache import clear_cache
+from . import Pipeline
+
+# stages, which depend on the basis only
+STAGES_BASIS = [ 'scDgAd', 'affSc', 'sfIntRaw', 'svs', 'scSv', 'scSfSc', 'scTySf', 'mass', 'stiff', 'flux' ]
+
+# stages, which depend on the sub-cell mappings
+STAGES_SC = [ 'scatter', 'scatterSurf' ]
+
+# stages, which depend on the scatter matrix
+STAGES_SCATTER = [ 'gather' ]
+
+# stages, which are derived from the others when writing the output
+STAGES_OUT = [ 'massFact', 'massInv', 'stiffV', 'stiffT', 'fluxL', 'fluxN', 'fluxT', 'sfInt' ]
+
+##
+# Computes a stage or a part of a stage in a worker.
+#
+# @param i_spec specification of the pipeline: type, degree and backend.
+# @param i_vals results of the stages, the computation depends on.
+# @param i_name name of the stage.
+# @param i_id id of the part, None if the entire stage is computed.
+# @param i_prof profiler of the stages, None if disabled.
+# @return 1) result, 2) records of the profiler.
+##
+def task( i_spec,
+          i_vals,
+          i_name,
+          i_id,
+          i_prof ):
+  # clear sympy cache to avoid memory issues
+  clear_cache()
+
+  l_pipe = Pipeline.Pipeline( *i_spec, i_prof=i_prof )
+  l_pipe.m_vals.update( i_vals )
+
+  if( i_id == None ):
+    l_val = l_pipe.get( i_name )
+  else:
+    l_val = l_pipe.part( i_name, i_id )
+
+  return l_val, records( i_prof )
+
+##
+# Derives the records of a profiler.
+#
+# @param i_prof profiler, None if disabled.
+# @return records.
+##
+def records( i_prof ):
+  if( i_prof == None ):
+    return []
+  return i_prof.m_recs
+
+##
+# Derives the remaining stages and writes the output in a worker.
+#
+# @param i_spec specification of the pipeline: type, degree and backend.
+# @param i_vals results of the stages.
+# @param i_out output directories.
+# @param i_prof profiler of the stages, None if disabled.
+# @return 1) results of the derived stages, 2) plotting jobs (empty if disabled), 3) records of the profiler.
+##
+def finish( i_spec,
+            i_vals,
+            i_out,
+            i_prof ):
+  clear_cache()
+
+  l_pipe = Pipeline.Pipeline( *i_spec, i_prof=i_prof )
+  l_pipe.m_vals.update( i_vals )
+
+  # write DG and sub-cell structures
+  l_pipe.writeDg( i_out['dg'], i_out['format'] )
+  l_pipe.writeSc( i_out['subcell'], i_out['format'] )
+
+  # jobs, plotting basis, sub-grid and matrices
+  l_plots = []
+  if( i_out['plot'] ):
+    l_plots = l_pipe.plots( i_out['plots'] )
+
+  return dict( [ ( l_na, l_pipe.get(l_na) ) for l_na in STAGES_OUT ] ), l_plots, records( i_prof )
+
+##
+# Executes a plotting job in a worker.
+#
+# @param i_job plotting job: 1) plotting function, 2) arguments.
+##
+def draw( i_job ):
+  i_job[0]( *i_job[1] )
+
+##
+# Executes plotting jobs, which are independent of each other.
+#
+# @param i_jobs plotting jobs, see Pipeline.plots.
+# @param i_nJobs number of worker processes, the jobs are executed in the calling process if 1.
+##
+def plot( i_jobs,
+          i_nJobs ):
+  logging.info( 'plotting ' + str(len(i_jobs)) + ' figures' )
+
+  if( i_nJobs <= 1 ):
+    for l_jo in i_jobs:
+      draw( l_jo )
+    return
+
+  l_ctx = multiprocessing.get_context( 'spawn' )
+  with concurrent.futures.ProcessPoolExecutor( max_workers=i_nJobs, mp_context=l_ctx ) as l_pool:
+    # raise exceptions of the jobs
+    for l_re in l_pool.map( draw, i_jobs ):
+      pass
+
+class Driver:
+  ##
+  # Constructor of the driver, which submits the tasks of a single pipeline.
+  #
+  # @param i_pool process pool, executing the tasks.
+  # @param i_ty element type.
+  # @param i_deg polynomial degree.
+  # @param i_backend integration backend.
+  # @param i_cache cache of the stages' results, None if disabled.
+  # @param i_out output directories.
+  # @param i_prof profiler of the stages, None if disabled.
+  ##
+  def __init__( self,
+                i_pool,
+                i_ty,
+                i_deg,
+                i_backend,
+                i_cache,
+                i_out,
+                i_prof = None ):
+    self.m_pool = i_pool
+    self.m_spec = ( i_ty, i_deg, i_backend )
+    self.m_cache = i_cache
+    self.m_out = i_out
+    self.m_prof = i_prof
+
+    # local pipeline, holding the results
+    self.m_pipe = Pipeline.Pipeline( *self.m_spec )
+
+    # pending stages: 1) futures, 2) ids of the parts (None if not split)
+    self.m_pending = {}
+
+    # plotting jobs, derived when writing the output
+    self.m_plots = []
+
+  ##
+  # Looks up the cached result of a stage.
+  #
+  # @param i_name name of the stage.
+  # @return true if the result was found in the cache.
+  ##
+  def lookup( self,
+              i_name ):
+    if( self.m_cache == None ):
+      return False
+
+    l_hit, l_val = self.m_cache.lookup( self.m_pipe.meta( i_name ) )
+    if( l_hit ):
+      self.m_pipe.m_vals[i_name] = l_val
+
+    return l_hit
+
+  ##
+  # Submits the tasks of a stage, if not cached.
+  #
+  # @param i_name name of the stage.
+  # @param i_deps names of the stages, the stage depends on.
+  ##
+  def submit( self,
+              i_name,
+              i_deps ):
+    if( self.lookup( i_name ) ):
+      return
+
+    l_vals = dict( [ ( l_de, self.m_pipe.m_vals[l_de] ) for l_de in i_deps ] )
+    l_ids = self.m_pipe.parts( i_name )
+
+    if( l_ids == None ):
+      l_futs = [ self.m_pool.submit( task, self.m_spec, l_vals, i_name, None, self.m_prof ) ]
+    else:
+      l_futs = [ self.m_pool.submit( task, self.m_spec, l_vals, i_name, l_id, self.m_prof ) for l_id in l_ids ]
+
+    self.m_pending[i_name] = ( l_futs, l_ids )
+
+  ##
+  # Waits for the tasks of a stage and stores the result.
+  #
+  # @param i_name name of the stage.
+  ##
+  def resolve( self,
+               i_name ):
+    if( i_name not in self.m_pending ):
+      return
+
+    l_futs, l_ids = self.m_pending.pop( i_name )
+    l_res = []
+    for l_fu in l_futs:
+      l_va, l_recs = l_fu.result()
+      l_res = l_res + [ l_va ]
+      if( self.m_prof != None ):
+        self.m_prof.add( l_recs )
+
+    if( l_ids == None ):
+      l_val = l_res[0]
+    else:
+      l_val = self.m_pipe.merge( i_name, l_res )
+
+    self.m_pipe.m_vals[i_name] = l_val
+    if( self.m_cache != None ):
+      self.m_cache.store( self.m_pipe.meta( i_name ), l_val )
+
+  ##
+  # Runs the pipeline.
+  ##
+  def run( self ):
+    logging.info( 'processing element type ' + self.m_spec[0] + ' with polynomial degree ' + str(self.m_spec[1]) )
+
+    # basis
+    self.submit( 'basis', [] )
+    self.resolve( 'basis' )
+
+    # stages depending on the basis
+    for l_na in STAGES_BASIS:
+      self.submit( l_na, ['basis'] )
+
+    # stages depending on the sub-cell mappings
+    self.resolve( 'affSc' )
+    self.resolve( 'scDgAd' )
+    for l_na in STAGES_SC:
+      self.submit( l_na, ['basis', 'affSc', 'scDgAd'] )
+
+    # stages depending on the scatter matrix
+    self.resolve( 'scatter' )
+    for l_na in STAGES_SCATTER:
+      self.submit( l_na, ['basis', 'affSc', 'scatter'] )
+
+    for l_na in STAGES_BASIS + STAGES_SC + STAGES_SCATTER:
+      self.resolve( l_na )
+
+    # derived stages and output
+    for l_na in STAGES_OUT:
+      self.lookup( l_na )
+    l_outs, self.m_plots, l_recs = self.m_pool.submit( finish, self.m_spec, self.m_pipe.m_vals, self.m_out, self.m_prof ).result()
+    if( self.m_prof != None ):
+      self.m_prof.add( l_recs )
+
+    if( self.m_cache != None ):
+      for l_na in STAGES_OUT:
+        self.m_cache.store( self.m_pipe.meta( l_na ), l_outs[l_na] )
+
+    logging.info( 'finished element type ' + self.m_spec[0] + ' with polynomial degree ' + str(self.m_spec[1]) )
+
+##
+# Runs the pipelines of all element types and polynomial degrees in parallel.
+#   Each pipeline is driven by a thread, which submits independent stages (or their parts) as tasks to a shared pool of worker processes.
+#   If enabled, the plots are drawn by a separate pool, once all operators are written.
+#
+# @param i_types element types.
+# @param i_degs polynomial degrees.
+# @param i_backend integration backend.
+# @param i_cache cache of the stages' results, None if disabled.
+# @param i_out output directories.
+# @param i_nJobs number of worker processes.
+# @param i_prof profiler of the stages, None if disabled.
+##
+def run( i_types,
+         i_degs,
+         i_backend,
+         i_cache,
+         i_out,
+         i_nJobs,
+         i_prof = None ):
+  # spawned workers do not inherit locks of the driver threads
+  l_ctx = multiprocessing.get_context( 'spawn' )
+
+  with concurrent.futures.ProcessPoolExecutor( max_workers=i_nJobs, mp_context=l_ctx ) as l_pool:
+    l_drivers = []
+    for l_ty in i_types:
+      for l_de in i_degs:
+        l_drivers = l_drivers + [ Driver( l_pool, l_ty, l_de, i_backend, i_cache, i_out, i_prof ) ]
+
+    with concurrent.futures.ThreadPoolExecutor( max_workers=len(l_drivers) ) as l_threads:
+      l_futs = [ l_threads.submit( l_dr.run ) for l_dr in l_drivers ]
+
+      # raise exceptions of the drivers
+      for l_fu in l_futs:
+        l_fu.result()
+
+  # plot basis, sub-grids and matrices
+  if( i_out['plot'] ):
+    plot( sum( [ l_dr.m_plots for l_dr in l_drivers ], [] ), i_nJobs )
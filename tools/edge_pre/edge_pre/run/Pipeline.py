@@ -0,0 +1,978 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Pre-processing pipeline of a single element type and polynomial degree.
+##
+import os
+import logging
+import contextlib
+import numpy
+import sympy
+import edge_pre.int.Scalar
+import edge_pre.int.LinAlg
+import edge_pre.int.Matrices
+import edge_pre.int.Monomial
+import edge_pre.int.Tensor
+import edge_pre.int.Quadrature
+import edge_pre.sc.ops.Project
+import edge_pre.sc.ops.Symmetry
+import edge_pre.io.ArrStr
+import edge_pre.io.Files
+import edge_pre.io.Binary
+import edge_pre.io.Matrices
+import edge_pre.dg.basis.Mod
+import edge_pre.dg.basis.Line
+import edge_pre.dg.basis.Quad
+import edge_pre.dg.basis.Tria
+import edge_pre.dg.basis.Hex
+import edge_pre.dg.basis.Tet
+import edge_pre.sc.grid.Generic
+import edge_pre.sc.grid.Line
+import edge_pre.sc.grid.Quad
+import edge_pre.sc.grid.Tria
+import edge_pre.sc.grid.Hex
+import edge_pre.sc.grid.Tet
+import edge_pre.types.Line
+import edge_pre.types.Quad
+import edge_pre.types.Tria
+import edge_pre.types.Hex
+import edge_pre.types.Tet
+
+# element types
+TYPES = { 'line':   edge_pre.types.Line.Line,
+          'quad4r': edge_pre.types.Quad.Quad,
+          'tria3':  edge_pre.types.Tria.Tria,
+          'hex8r':  edge_pre.types.Hex.Hex,
+          'tet4':   edge_pre.types.Tet.Tet }
+
+# face types of the element types
+TYPES_FA = { 'line':   None,
+             'quad4r': 'line',
+             'tria3':  'line',
+             'hex8r':  'quad4r',
+             'tet4':   'tria3' }
+
+# bases of the element types
+BASES = { 'line':   edge_pre.dg.basis.Line,
+          'quad4r': edge_pre.dg.basis.Quad,
+          'tria3':  edge_pre.dg.basis.Tria,
+          'hex8r':  edge_pre.dg.basis.Hex,
+          'tet4':   edge_pre.dg.basis.Tet }
+
+# sub-grids of the element types
+GRIDS = { 'line':   edge_pre.sc.grid.Line,
+          'quad4r': edge_pre.sc.grid.Quad,
+          'tria3':  edge_pre.sc.grid.Tria,
+          'hex8r':  edge_pre.sc.grid.Hex,
+          'tet4':   edge_pre.sc.grid.Tet }
+
+class Pipeline:
+  ##
+  # Constructor of the pre-processing pipeline for one element type and polynomial degree.
+  #   All stages are evaluated lazily and only once.
+  #
+  # @param i_ty element type.
+  # @param i_deg polynomial degree.
+  # @param i_backend integration backend (symbolic, quadrature or monomial) or float, which runs all stages in floating point arithmetic.
+  # @param i_cache optional cache of the stages' results.
+  # @param i_prev optional pipeline of the same element type and backend for a lower degree, whose integrals are reused.
+  # @param i_prof optional profiler of the stages, see edge_pre.run.Profile.
+  ##
+  def __init__( self,
+                i_ty,
+                i_deg,
+                i_backend = 'symbolic',
+                i_cache = None,
+                i_prev = None,
+                i_prof = None ):
+    self.m_ty = i_ty
+    self.m_deg = i_deg
+    self.m_backend = i_backend
+    self.m_cache = i_cache
+    self.m_prof = i_prof
+
+    # lower-degree pipeline
+    self.m_prev = None
+    if( i_prev != None ):
+      assert( i_prev.m_ty == i_ty and i_prev.m_backend == i_backend and i_prev.m_deg < i_deg )
+      self.m_prev = i_prev
+
+    # element type
+    self.m_elTy = TYPES[i_ty]( i_deg )
+
+    # quadrature rules are used by the quadrature backend and the floating point mode
+    self.m_quad = ( i_backend in ['quadrature', 'float'] )
+
+    # floating point mode: sub-cell maps, sub-face integrals and volumes in floating point arithmetic as well
+    self.m_float = ( i_backend == 'float' )
+
+    # use sum factorization for tensor-product bases
+    self.m_tensor = ( i_backend == 'monomial' and i_ty in ['quad4r', 'hex8r'] )
+
+    # results of the evaluated stages
+    self.m_vals = {}
+
+    # stages
+    self.m_stages = { 'basis':       self.basis,
+                      'trafos':      self.trafos,
+                      'scDgAd':      self.scDgAd,
+                      'affSc':       self.affSc,
+                      'sfIntRaw':    self.sfIntRaw,
+                      'svs':         self.svs,
+                      'scSv':        self.scSv,
+                      'scSfSc':      self.scSfSc,
+                      'scTySf':      self.scTySf,
+                      'scatterSurf': self.scatterSurf,
+                      'mass':        self.mass,
+                      'massFact':    self.massFact,
+                      'massInv':     self.massInv,
+                      'stiff':       self.stiff,
+                      'flux':        self.flux,
+                      'stiffV':      self.stiffV,
+                      'stiffT':      self.stiffT,
+                      'fluxL':       self.fluxL,
+                      'fluxN':       self.fluxN,
+                      'fluxT':       self.fluxT,
+                      'scatter':     self.scatter,
+                      'gather':      self.gather,
+                      'sfInt':       self.sfInt }
+
+    # cheap stages, which are not cached
+    self.m_volatile = [ 'trafos' ]
+
+  ##
+  # Derives the meta data of a stage, used as key of the cache.
+  #
+  # @param i_name name of the stage.
+  # @return meta data.
+  ##
+  def meta( self,
+            i_name ):
+    return { 'type':    self.m_ty,
+             'deg':     self.m_deg,
+             'op':      i_name,
+             'backend': self.m_backend }
+
+  ##
+  # Profiles a stage, if a profiler is attached.
+  #
+  # @param i_name name of the stage.
+  # @return context of the profiled stage.
+  ##
+  def stage( self,
+             i_name ):
+    if( self.m_prof == None ):
+      return contextlib.nullcontext()
+    return self.m_prof.stage( self.m_ty, self.m_deg, i_name )
+
+  ##
+  # Gets the result of a stage, evaluates the stage if required.
+  #
+  # @param i_name name of the stage.
+  # @return result of the stage.
+  ##
+  def get( self,
+           i_name ):
+    if( i_name not in self.m_vals ):
+      with self.stage( i_name ):
+        if( self.m_cache == None or i_name in self.m_volatile ):
+          self.m_vals[i_name] = self.m_stages[i_name]()
+        else:
+          self.m_vals[i_name] = self.m_cache.get( self.meta( i_name ),
+                                                  self.m_stages[i_name] )
+
+    return self.m_vals[i_name]
+
+  ##
+  # Derives the independent parts of a stage.
+  #
+  # @param i_name name of the stage.
+  # @return ids of the parts, None if the stage is not split.
+  ##
+  def parts( self,
+             i_name ):
+    if( i_name == 'stiff' ):
+      return list( range(self.m_elTy.n_dims) )
+    elif( i_name == 'flux' and self.m_ty != 'line' ):
+      return list( range(self.m_elTy.n_fas) ) + [ 'ori' ]
+    elif( i_name == 'scatterSurf' ):
+      # local faces, which are not derived through symmetries
+      l_syms = self.scatterSurfSyms()
+      return [ l_fa for l_fa in range(self.m_elTy.n_fas) if l_syms[l_fa] == None ]
+
+    return None
+
+  ##
+  # Computes a part of a stage.
+  #
+  # @param i_name name of the stage.
+  # @param i_id id of the part.
+  # @return result of the part.
+  ##
+  def part( self,
+            i_name,
+            i_id ):
+    with self.stage( i_name ):
+      if( i_name == 'stiff' ):
+        return self.stiffDis( [i_id] )[0]
+      elif( i_name == 'flux' ):
+        if( i_id == 'ori' ):
+          return self.fluxFas( self.get('trafos')[2], [] )
+        return self.fluxFas( [], [ self.get('trafos')[3][i_id] ] )
+      elif( i_name == 'scatterSurf' ):
+        return self.scatterSurfId( i_id )
+
+    assert( False ), 'stage ' + i_name + ' has no parts'
+
+  ##
+  # Merges the parts of a stage.
+  #
+  # @param i_name name of the stage.
+  # @param i_parts results of the parts, ordered as the ids.
+  # @return result of the stage.
+  ##
+  def merge( self,
+             i_name,
+             i_parts ):
+    if( i_name == 'flux' ):
+      # the last part holds the face mass matrix and orientations
+      return [ l_pa[0][0] for l_pa in i_parts[:-1] ], i_parts[-1][1], i_parts[-1][2]
+    elif( i_name == 'scatterSurf' ):
+      return self.scatterSurfDer( dict( zip( self.parts('scatterSurf'), i_parts ) ) )
+
+    return list( i_parts )
+
+  ##
+  # Derives the result of a stage of the lower-degree pipeline, which is reused for the hierarchical bases.
+  #   Only the symbolic backend integrates the entries one by one and benefits from the reuse.
+  #
+  # @param i_name name of the stage.
+  # @return 1) positions of the lower-degree element basis in the element basis, 2) positions of the lower-degree face basis in the face basis, 3) result of the stage; None if nothing is reused.
+  ##
+  def prev( self,
+            i_name ):
+    if( self.m_prev == None or self.m_backend != 'symbolic' ):
+      return None
+
+    l_idsEl = BASES[self.m_ty].embed( self.m_prev.m_deg, self.m_deg )
+    l_idsFa = None
+    if( self.m_ty != 'line' ):
+      l_idsFa = BASES[ TYPES_FA[self.m_ty] ].embed( self.m_prev.m_deg, self.m_deg )
+
+    return l_idsEl, l_idsFa, self.m_prev.get( i_name )
+
+  ##
+  # Derives the symbols of the face parametrization, used by the sub-face integration.
+  #
+  # @return symbols.
+  ##
+  def symsSf( self ):
+    return [ sympy.symbols('chi_'+str(l_di)) for l_di in range(self.m_elTy.n_dims-1) ]
+
+  ##
+  # Derives the face and element bases.
+  #
+  # @return 1) face symbols, 2) face basis, 3) element symbols, 4) element basis.
+  ##
+  def basis( self ):
+    # get element basis
+    l_symsEl, l_basisEl = BASES[self.m_ty].gen( self.m_deg )
+
+    # line elements have point-faces
+    if( self.m_ty == 'line' ):
+      return None, None, l_symsEl, l_basisEl
+
+    # get face basis
+    l_symsFa, l_basisFa = BASES[ TYPES_FA[self.m_ty] ].gen( self.m_deg )
+
+    # unify bases
+    l_symsEl, l_basisEl = edge_pre.dg.basis.Mod.unify( l_symsFa, l_basisFa, l_symsEl, l_basisEl )
+
+    return l_symsFa, l_basisFa, l_symsEl, l_basisEl
+
+  ##
+  # Derives the integration intervals and face trafos.
+  #
+  # @return 1) face integration intervals, 2) element integration intervals, 3) face to face trafos, 4) face to element trafos.
+  ##
+  def trafos( self ):
+    l_symsFa, l_basisFa, l_symsEl, l_basisEl = self.get('basis')
+
+    if( self.m_ty == 'line' ):
+      l_intFa = None
+      l_intEl = self.m_elTy.intEl( l_symsEl[0] )
+    else:
+      l_intFa = TYPES[ TYPES_FA[self.m_ty] ]( self.m_deg ).intEl( l_symsFa )
+      l_intEl = self.m_elTy.intEl( l_symsEl )
+
+    return l_intFa, l_intEl, self.m_elTy.faToFa( l_symsFa ), self.m_elTy.faToEl( l_symsFa )
+
+  ##
+  # Derives the sub-cell reorderings.
+  #
+  # @return sub-cell reorderings.
+  ##
+  def scDgAd( self ):
+    # set dummy sub-cell reordering
+    if( self.m_ty == 'line' ):
+      return [ [0] ]
+
+    return GRIDS[self.m_ty].scDgAd( self.m_deg )
+
+  ##
+  # Derives the affine mappings of the sub-cells.
+  #
+  # @return 1) matrices A, 2) vectors b, 3) absolute values of Jacobi determinant of the mappings x = A xi + b.
+  ##
+  def affSc( self ):
+    l_affSc = GRIDS[self.m_ty].affSc( self.m_deg )
+
+    if( self.m_float ):
+      l_affSc = [ [ numpy.asarray( l_ar, dtype=numpy.float64 ) for l_ar in l_af ] for l_af in l_affSc ]
+
+    return l_affSc
+
+  ##
+  # Derives the sub-face integration matrices (not scaled by the inverse mass matrix).
+  #
+  # @return sub-face integration matrices, one per face.
+  ##
+  def sfIntRaw( self ):
+    l_symsEl, l_basisEl = self.get('basis')[2:4]
+
+    l_sfInt = []
+
+    if( self.m_ty == 'line' ):
+      for l_fa in [0,1]:
+        if( self.m_float ):
+          l_pt = numpy.array( [ [ float( self.m_elTy.ves[l_fa][0] ) ] ] )
+          l_sfInt = l_sfInt + [ edge_pre.int.Quadrature.evaluate( l_symsEl, l_basisEl, l_pt ).transpose() ]
+        else:
+          l_sfInt = l_sfInt + [ edge_pre.int.Matrices.subs( [(l_symsEl[0], self.m_elTy.ves[l_fa][0])],
+                                                            l_basisEl ) ]
+      return l_sfInt
+
+    l_subsSfDg, l_intSfDg = GRIDS[self.m_ty].intSfDg( self.m_deg, self.symsSf(), l_symsEl )
+
+    if( self.m_float ):
+      for l_fa in range(self.m_elTy.n_fas):
+        l_sfInt = l_sfInt + [ edge_pre.int.Quadrature.sfInt( l_symsEl,
+                                                             l_basisEl,
+                                                             l_subsSfDg[l_fa],
+                                                             l_intSfDg[l_fa],
+                                                             self.m_deg ) ]
+      return l_sfInt
+
+    # integration of the sub-faces, the quadrature backend uses the exact integrals of the monomial backend
+    l_intL = edge_pre.int.Matrices.intL
+    l_tensor = False
+    if( self.m_backend in ['monomial', 'quadrature'] ):
+      l_intL = edge_pre.int.Monomial.intL
+      l_tensor = ( self.m_ty in ['quad4r', 'hex8r'] )
+
+    for l_fa in range(self.m_elTy.n_fas):
+      if( l_tensor ):
+        l_sfInt = l_sfInt + [ edge_pre.int.Tensor.sfInt( self.m_deg, l_symsEl, l_subsSfDg[l_fa], l_intSfDg[l_fa] ) ]
+      else:
+        l_basisElSubs = edge_pre.int.Matrices.subsAll( l_subsSfDg[l_fa], l_basisEl )
+        l_sfInt = l_sfInt + [ l_intL( l_intSfDg[l_fa], l_basisElSubs ) ]
+
+    return l_sfInt
+
+  ##
+  # Derives the coordinates of the sub-vertices.
+  #
+  # @return coordinates of the sub-vertices.
+  ##
+  def svs( self ):
+    l_svs = GRIDS[self.m_ty].svs( self.m_deg )
+
+    if( self.m_float ):
+      l_svs = numpy.array( l_svs, dtype=numpy.float64 ).tolist()
+
+    return l_svs
+
+  ##
+  # Derives the sub-vertices adjacent to the sub-cells.
+  #
+  # @return 1) inner, 2) send and 3) recv sub-cells.
+  ##
+  def scSv( self ):
+    return GRIDS[self.m_ty].scSv( self.m_deg )
+
+  ##
+  # Derives the sub-cells adjacent to the sub-cells.
+  #
+  # @return 1) inner, 2) send and 3) recv sub-cells.
+  ##
+  def scSfSc( self ):
+    return GRIDS[self.m_ty].scSfSc( self.m_deg )
+
+  ##
+  # Derives the types of the sub-cells' faces.
+  #
+  # @return 1) inner and 2) send sub-cells.
+  ##
+  def scTySf( self ):
+    return GRIDS[self.m_ty].scTySf( self.m_deg )
+
+  ##
+  # Gets the scatter operator.
+  #
+  # @return scatter operator (DG -> sub-cell) of the sub-grid's interface.
+  ##
+  def scatterOp( self ):
+    if( self.m_quad ):
+      # the basis is integrated exactly on the affine sub-cells
+      l_rule = edge_pre.int.Quadrature.rule( self.m_ty, self.m_deg )
+      return lambda i_syms, i_basis, i_int, i_affs: edge_pre.int.Quadrature.scatter( i_syms, i_basis, l_rule, i_affs[0], i_affs[1] )
+
+    if( self.m_tensor ):
+      l_op = edge_pre.int.Tensor.scatter
+    elif( self.m_backend == 'monomial' ):
+      l_op = lambda i_syms, i_basis, i_int, i_maps, i_aDets: edge_pre.int.Monomial.scatter( self.m_ty, i_syms, i_basis, i_maps, i_aDets )
+    else:
+      l_op = edge_pre.sc.ops.Project.scatter
+
+    # the exact backends operate on symbolic mappings
+    return lambda i_syms, i_basis, i_int, i_affs: l_op( i_syms,
+                                                        i_basis,
+                                                        i_int,
+                                                        edge_pre.sc.grid.Generic.maps( i_syms, i_affs[0], i_affs[1] ),
+                                                        [ sympy.Rational( l_de ) for l_de in i_affs[2] ] )
+
+  ##
+  # Derives the symmetries of the reference element, which map the DG surface sub-cells of the first face onto those of the other faces.
+  #   Only the exact backends use the symmetries, since the derived scatter matrices are identical to the integrated ones in exact arithmetic only.
+  #
+  # @return per face: None if the face's scatter matrix is computed, otherwise 1) matrix A, 2) vector b of the symmetry, 3) ids of the first face's sub-cells mapped onto the face's sub-cells.
+  ##
+  def scatterSurfSyms( self ):
+    l_syms = [ None ] * self.m_elTy.n_fas
+
+    if( self.m_quad ):
+      return l_syms
+
+    l_box = self.m_ty in [ 'line', 'quad4r', 'hex8r' ]
+    l_affSc = self.get('affSc')
+
+    # vertices of the DG surface sub-cells, per face
+    l_ves = [ edge_pre.sc.ops.Symmetry.vertices( l_affSc[0][2][l_fa],
+                                                 l_affSc[1][2][l_fa],
+                                                 self.m_elTy.ves ) for l_fa in range(self.m_elTy.n_fas) ]
+
+    l_affs = edge_pre.sc.ops.Symmetry.affines( self.m_elTy.ves, l_box )
+
+    for l_fa in range(1, self.m_elTy.n_fas):
+      for l_a, l_b in l_affs[1:]:
+        l_ids = edge_pre.sc.ops.Symmetry.match( l_a, l_b, l_ves[0], l_ves[l_fa] )
+        if( l_ids != None ):
+          l_syms[l_fa] = ( l_a, l_b, l_ids )
+          break
+
+    return l_syms
+
+  ##
+  # Derives a scatter matrix for the DG surface sub-cells of a local face.
+  #
+  # @param i_fa id of the local face.
+  # @return scatter matrix.
+  ##
+  def scatterSurfId( self,
+                     i_fa ):
+    l_symsEl, l_basisEl = self.get('basis')[2:4]
+    l_intEl = self.get('trafos')[1]
+
+    return self.scatterOp()( l_symsEl,\
+                             l_basisEl,\
+                             l_intEl,\
+                             [ l_af[2][i_fa] for l_af in self.get('affSc') ] )
+
+  ##
+  # Derives all scatter matrices for DG surface sub-cells from the ones of the local faces.
+  #   The remaining local faces are given by symmetries of the reference element: B(A x + b) = T B(x) yields the transformed first face's matrix with reordered columns.
+  #   The remote faces only differ from the local ones in the order of their sub-cells, given by scDgAd, and are derived by column permutations.
+  #
+  # @param i_scatterFas scatter matrices of the local faces, which are not derived through symmetries.
+  # @return scatter matrices, local faces first, followed by remote faces with the vertex orientation as slowest dimension.
+  ##
+  def scatterSurfDer( self,
+                      i_scatterFas ):
+    l_symsEl, l_basisEl = self.get('basis')[2:4]
+    l_box = self.m_ty in [ 'line', 'quad4r', 'hex8r' ]
+
+    # transformations of the basis, per derived face
+    l_syms = self.scatterSurfSyms()
+    l_fas = [ l_fa for l_fa in range(self.m_elTy.n_fas) if l_syms[l_fa] != None ]
+    l_trafos = {}
+    if( len(l_fas) > 0 ):
+      l_trafos = edge_pre.sc.ops.Symmetry.trafos( l_symsEl,
+                                                  l_basisEl,
+                                                  self.m_deg,
+                                                  l_box,
+                                                  [ l_syms[l_fa][0:2] for l_fa in l_fas ] )
+      l_trafos = dict( zip( l_fas, l_trafos ) )
+
+    # local faces
+    l_scatter = []
+    for l_fa, l_sy in enumerate( l_syms ):
+      if( l_sy == None ):
+        l_scatter = l_scatter + [ i_scatterFas[l_fa] ]
+      else:
+        l_scatter = l_scatter + [ ( l_trafos[l_fa] * l_scatter[0] )[:, l_sy[2]] ]
+
+    # remote faces
+    for l_ve in self.get('scDgAd'):
+      for l_fa in range(self.m_elTy.n_fas):
+        l_scatter = l_scatter + [ l_scatter[l_fa][:, l_ve] ]
+
+    return l_scatter
+
+  ##
+  # Derives the scatter matrices for DG surface sub-cells.
+  #
+  # @return scatter matrices, local faces first, followed by remote faces with the vertex orientation as slowest dimension.
+  ##
+  def scatterSurf( self ):
+    return self.scatterSurfDer( dict( [ ( l_fa, self.scatterSurfId( l_fa ) ) for l_fa in self.parts('scatterSurf') ] ) )
+
+  ##
+  # Derives the quadrature rules of the quadrature backend.
+  #
+  # @return 1) rule of the element, 2) rule of the faces.
+  ##
+  def rules( self ):
+    # integrate products of two basis functions exactly
+    l_ruleEl = edge_pre.int.Quadrature.rule( self.m_ty, 2*self.m_deg )
+    l_ruleFa = None
+    if( self.m_ty != 'line' ):
+      l_ruleFa = edge_pre.int.Quadrature.rule( TYPES_FA[self.m_ty], 2*self.m_deg )
+
+    return l_ruleEl, l_ruleFa
+
+  ##
+  # Derives the mass matrix.
+  #
+  # @return mass matrix.
+  ##
+  def mass( self ):
+    l_symsEl, l_basisEl = self.get('basis')[2:4]
+
+    if( self.m_tensor ):
+      return edge_pre.int.Tensor.mass( self.m_deg, len(l_symsEl) )
+    elif( self.m_quad ):
+      return edge_pre.int.Quadrature.mass( l_symsEl, l_basisEl, self.rules()[0] )
+    elif( self.m_backend == 'monomial' ):
+      return edge_pre.int.Monomial.mass( self.m_ty, l_symsEl, l_basisEl )
+    else:
+      l_prev = self.prev('mass')
+      if( l_prev != None ):
+        l_prev = ( l_prev[0], l_prev[2] )
+
+      return edge_pre.int.Matrices.mass( self.get('trafos')[1],
+                                         l_basisEl,
+                                         l_prev,
+                                         BASES[self.m_ty].orth( self.m_deg ) )
+
+  ##
+  # Derives the factorization of the mass matrix, used for all multiplications with the inverse.
+  #
+  # @return factorization of the mass matrix.
+  ##
+  def massFact( self ):
+    return edge_pre.int.LinAlg.Factor( self.get('mass') )
+
+  ##
+  # Derives the inverse mass matrix.
+  #
+  # @return inverse mass matrix.
+  ##
+  def massInv( self ):
+    return self.get('massFact').inv()
+
+  ##
+  # Derives the stiffness matrices for the given dimensions.
+  #
+  # @param i_dis dimensions of the derivatives.
+  # @return stiffness matrices, one per given dimension.
+  ##
+  def stiffDis( self,
+                i_dis ):
+    l_symsEl, l_basisEl = self.get('basis')[2:4]
+
+    if( self.m_tensor ):
+      return edge_pre.int.Tensor.stiff( self.m_deg, len(l_symsEl), i_dis )
+    elif( self.m_quad ):
+      return edge_pre.int.Quadrature.stiff( l_symsEl,
+                                            l_basisEl,
+                                            self.rules()[0],
+                                            i_dis )
+    elif( self.m_backend == 'monomial' ):
+      return edge_pre.int.Monomial.stiff( self.m_ty,
+                                          l_symsEl,
+                                          l_basisEl,
+                                          i_dis )
+    else:
+      l_prev = self.prev('stiff')
+      if( l_prev != None ):
+        l_prev = ( l_prev[0], [ l_prev[2][l_di] for l_di in i_dis ] )
+
+      return edge_pre.int.Matrices.stiff( [ l_symsEl[l_di] for l_di in i_dis ],
+                                          l_basisEl,
+                                          self.get('trafos')[1],
+                                          l_prev,
+                                          BASES[self.m_ty].orth( self.m_deg ) )
+
+  ##
+  # Derives the stiffness matrices.
+  #
+  # @return stiffness matrices, one per dimension.
+  ##
+  def stiff( self ):
+    return self.stiffDis( self.parts('stiff') )
+
+  ##
+  # Derives the flux matrices for the given face trafos.
+  #
+  # @param i_faToFa mapping of face coordinates to adjacent element in dependency of the vertex orientation.
+  # @param i_faToEl mapping from face-coordinate to volume coordinates in dependency of the face.
+  # @param i_prev optional lower-degree flux matrices for the same trafos, as derived by prev.
+  # @return 1) matrices for the projection to/from face-basis, 2) face mass-matrix, 3) matrices for neighboring face-orientation and mirroring.
+  ##
+  def fluxFas( self,
+               i_faToFa,
+               i_faToEl,
+               i_prev = None ):
+    l_symsFa, l_basisFa, l_symsEl, l_basisEl = self.get('basis')
+
+    if( self.m_tensor ):
+      return edge_pre.int.Tensor.flux( self.m_deg,
+                                       l_symsFa,
+                                       i_faToFa,
+                                       i_faToEl )
+    elif( self.m_quad ):
+      return edge_pre.int.Quadrature.flux( l_basisFa,
+                                           l_basisEl,
+                                           l_symsFa,
+                                           l_symsEl,
+                                           self.rules()[1],
+                                           i_faToFa,
+                                           i_faToEl )
+    elif( self.m_backend == 'monomial' ):
+      return edge_pre.int.Monomial.flux( l_basisFa,
+                                         l_basisEl,
+                                         l_symsFa,
+                                         l_symsEl,
+                                         TYPES_FA[self.m_ty],
+                                         i_faToFa,
+                                         i_faToEl )
+    else:
+      # line elements have point-faces without a basis
+      l_orthFa = None
+      if( self.m_ty != 'line' ):
+        l_orthFa = BASES[ TYPES_FA[self.m_ty] ].orth( self.m_deg )
+
+      return edge_pre.int.Matrices.flux( l_basisFa,
+                                         l_basisEl,
+                                         l_symsFa,
+                                         l_symsEl,
+                                         self.get('trafos')[0],
+                                         i_faToFa,
+                                         i_faToEl,
+                                         i_prev,
+                                         l_orthFa )
+
+  ##
+  # Derives the flux matrices.
+  #
+  # @return 1) matrices for the projection to/from face-basis, 2) face mass-matrix, 3) matrices for neighboring face-orientation and mirroring.
+  ##
+  def flux( self ):
+    # line elements have nothing to reuse
+    l_prev = None
+    if( self.m_ty != 'line' ):
+      l_prev = self.prev('flux')
+
+    return self.fluxFas( self.get('trafos')[2], self.get('trafos')[3], l_prev )
+
+  ##
+  # Derives the stifness volume matrices, stiffness matrices multiplied by inverse mass matrix.
+  #
+  # @return stiffness volume matrices.
+  ##
+  def stiffV( self ):
+    return [ self.get('massFact').mulInv( l_st ) for l_st in self.get('stiff') ]
+
+  ##
+  # Derives the stiffness time matrices, transposed stiffness matrices multiplied by inverse mass matrix (after transposing).
+  #
+  # @return stiffness time matrices.
+  ##
+  def stiffT( self ):
+    return [ self.get('massFact').mulInv( l_st.transpose() ) for l_st in self.get('stiff') ]
+
+  ##
+  # Derives single step projection and surface int for local contribution.
+  #
+  # @return local flux matrices.
+  ##
+  def fluxL( self ):
+    l_flux = self.get('flux')
+
+    # premultiply first projection with diagonal face mass matrix
+    return [ l_mat @ l_flux[1] for l_mat in l_flux[0] ]
+
+  ##
+  # Derives single step projection and surface int for neigh contribution.
+  #
+  # @return neighboring flux matrices.
+  ##
+  def fluxN( self ):
+    l_flux = self.get('flux')
+
+    l_fluxN = []
+    # Remark: vertices are slowest dim, since our adjacency ordering prevents all but the first case for non-periodic meshes
+    for l_ve in range( len(l_flux[2]) ):
+      for l_fa in range( len(l_flux[0]) ):
+        l_fluxN = l_fluxN + [ l_flux[0][l_fa] @ l_flux[2][l_ve] ]
+
+    return l_fluxN
+
+  ##
+  # Derives the back basis-change, pre-multiplied by the inverse mass matrix.
+  #
+  # @return transposed flux matrices.
+  ##
+  def fluxT( self ):
+    return [ self.get('massFact').mulInv( l_mat.transpose() ) for l_mat in self.get('flux')[0] ]
+
+  ##
+  # Derives the scatter matrix.
+  #
+  # @return scatter matrix.
+  ##
+  def scatter( self ):
+    l_symsEl, l_basisEl = self.get('basis')[2:4]
+
+    # inner and send sub-cells
+    l_affs = [ numpy.concatenate( l_af[0:2] ) for l_af in self.get('affSc') ]
+
+    return self.scatterOp()( l_symsEl,\
+                             l_basisEl,\
+                             self.get('trafos')[1],\
+                             l_affs )
+
+  ##
+  # Derives the gather matrix.
+  #
+  # @return gather matrix.
+  ##
+  def gather( self ):
+    l_aDets = self.get('affSc')[2]
+
+    # volumes of the sub-cells
+    if( self.m_float ):
+      l_volRef = numpy.sum( self.rules()[0][1] )
+      l_vols = l_volRef * numpy.concatenate( l_aDets[0:2] )
+    else:
+      l_volRef = edge_pre.int.Scalar.int( 1, self.get('trafos')[1] )[0]
+      l_vols = [ l_volRef * sympy.Rational( l_de ) for l_de in numpy.concatenate( l_aDets[0:2] ) ]
+
+    return edge_pre.sc.ops.Project.gatherOp( self.get('scatter'), l_vols )
+
+  ##
+  # Derives the sub-face integration matrices, scaled with the inverse mass matrix.
+  #
+  # @return sub-face integration matrices.
+  ##
+  def sfInt( self ):
+    l_sfInt = []
+
+    for l_sf in self.get('sfIntRaw'):
+      if( self.m_quad ):
+        l_sf = numpy.array( l_sf.tolist(), dtype=numpy.float64 )
+      l_sfInt = l_sfInt + [ self.get('massFact').mulInv( l_sf ) ]
+
+    return l_sfInt
+
+  ##
+  # Derives the path of an output file.
+  #
+  # @param i_dir output directory.
+  # @param i_name name of the data.
+  # @param i_ext file extension.
+  # @return path.
+  ##
+  def path( self,
+            i_dir,
+            i_name,
+            i_ext = 'csv' ):
+    l_dir = i_dir + '/' + self.m_ty + '/' + str(self.m_deg) + '/'
+    if not os.path.exists(l_dir):
+      os.makedirs(l_dir, exist_ok=True)
+
+    return l_dir + self.m_ty + '_' + str(self.m_deg) + '_' + i_name + '.' + i_ext
+
+  ##
+  # Writes an operator set in the given format.
+  #
+  # @param i_dir output directory.
+  # @param i_set name of the set, e.g., dg or sc.
+  # @param i_ops operators: list of tuples 1) name, 2) data, 3) ArrStr-function, which converts the data to CSV.
+  # @param i_format output format: csv (one file per operator), csv_hex (csv with hexadecimal floating point literals), npy (one file per operator and a JSON file with the meta data) or hdf5 (one file per set).
+  ##
+  def write( self,
+             i_dir,
+             i_set,
+             i_ops,
+             i_format = 'csv' ):
+    l_ints = [ edge_pre.io.ArrStr.int2d, edge_pre.io.ArrStr.int3d ]
+
+    # stream the CSV files row by row
+    if( i_format in [ 'csv', 'csv_hex' ] ):
+      for l_na, l_da, l_fu in i_ops:
+        with edge_pre.io.Files.openAtomic( self.path( i_dir, l_na ) ) as l_fi:
+          if( l_fu in l_ints ):
+            l_fu( l_da, l_fi )
+          else:
+            l_fu( l_da, l_fi, i_format == 'csv_hex' )
+      return
+
+    # convert to numpy arrays
+    l_ops = []
+    for l_na, l_da, l_fu in i_ops:
+      l_dtype = numpy.float64
+      if( l_fu in l_ints ):
+        l_dtype = numpy.int64
+      l_ops = l_ops + [ ( l_na, edge_pre.io.Binary.array( l_da, l_dtype ) ) ]
+
+    # meta data, the basis is ordered by the degrees of the functions
+    l_attrs = { 'type':    self.m_ty,
+                'degree':  self.m_deg,
+                'backend': self.m_backend,
+                'set':     i_set,
+                'basis':   { 'name': BASES[self.m_ty].__name__.split('.')[-1],
+                             'degs': [ [ l_bo for l_we, l_bo in l_or ] for l_or in BASES[self.m_ty].orth( self.m_deg ) ] } }
+
+    if( i_format == 'npy' ):
+      edge_pre.io.Binary.writeNpy( self.path( i_dir, i_set, 'json' ),
+                                   [ ( l_na, self.path( i_dir, l_na, 'npy' ), l_op ) for l_na, l_op in l_ops ],
+                                   l_attrs )
+    elif( i_format == 'hdf5' ):
+      edge_pre.io.Binary.writeHdf5( self.path( i_dir, i_set, 'h5' ),
+                                    l_ops,
+                                    l_attrs )
+    else:
+      assert( False ), 'unknown output format: ' + i_format
+
+  ##
+  # Writes the DG structures.
+  #
+  # @param i_dir output directory.
+  # @param i_format output format.
+  ##
+  def writeDg( self,
+               i_dir,
+               i_format = 'csv' ):
+    with self.stage( 'writeDg' ):
+      # mass matrix
+      l_ops = [ ( 'mass', self.get('mass').tolist(), edge_pre.io.ArrStr.float2d ) ]
+
+      # stiffness and flux matrices
+      for l_na in [ 'stiffV', 'stiffT', 'fluxL', 'fluxN', 'fluxT' ]:
+        l_ops = l_ops + [ ( l_na, [ l_ma.tolist() for l_ma in self.get(l_na) ], edge_pre.io.ArrStr.float3d ) ]
+
+      self.write( i_dir, 'dg', l_ops, i_format )
+
+  ##
+  # Writes the sub-cell structures.
+  #
+  # @param i_dir output directory.
+  # @param i_format output format.
+  ##
+  def writeSc( self,
+               i_dir,
+               i_format = 'csv' ):
+    with self.stage( 'writeSc' ):
+      l_scSvIn, l_scSvSend, l_scSvRecv = self.get('scSv')
+      l_scSfScIn, l_scSfScSend, l_scSfScRecv = self.get('scSfSc')
+      l_scTySfIn, l_scTySfSend = self.get('scTySf')
+
+      l_ops = [ # vertex coords
+                ( 'svcrds',      self.get('svs'),                                          edge_pre.io.ArrStr.float2d ),
+                # sub-cells' vertices
+                ( 'scsv',        l_scSvIn+l_scSvSend+l_scSvRecv,                           edge_pre.io.ArrStr.int2d   ),
+                # sub-cells adjacent to the sub-cells' faces
+                ( 'scsfsc',      l_scSfScIn+l_scSfScSend+l_scSfScRecv,                     edge_pre.io.ArrStr.int2d   ),
+                # types of the sub-cells' faces
+                ( 'sctysf',      l_scTySfIn+l_scTySfSend,                                  edge_pre.io.ArrStr.int2d   ),
+                # sub-cell reordering
+                ( 'scdgad',      self.get('scDgAd'),                                       edge_pre.io.ArrStr.int2d   ),
+                # scatter matrix
+                ( 'scatter',     self.get('scatter').tolist(),                             edge_pre.io.ArrStr.float2d ),
+                # scatter surf matrices
+                ( 'scattersurf', [ l_ss.tolist() for l_ss in self.get('scatterSurf') ],    edge_pre.io.ArrStr.float3d ),
+                # gather matrix
+                ( 'gather',      self.get('gather').tolist(),                              edge_pre.io.ArrStr.float2d ),
+                # sub-face integration matrices
+                ( 'sfint',       [ l_sf.tolist() for l_sf in self.get('sfInt') ],          edge_pre.io.ArrStr.float3d ) ]
+
+      self.write( i_dir, 'sc', l_ops, i_format )
+
+  ##
+  # Derives the jobs, which plot the basis, sub-grid and sparsity patterns of the DG matrices.
+  #   The jobs only hold picklable data, e.g., sparsity patterns as numpy arrays, and are executed by edge_pre.run.Parallel.plot.
+  #
+  # @param i_dir output directory.
+  # @return list of jobs: 1) plotting function, 2) arguments.
+  ##
+  def plots( self,
+             i_dir ):
+    l_jobs = []
+    l_symsEl, l_basisEl = self.get('basis')[2:4]
+
+    # plot basis
+    if( self.m_ty in ['line', 'quad4r', 'tria3'] ):
+      l_jobs = l_jobs + [ ( BASES[self.m_ty].plot, ( self.path( i_dir, 'basis', 'pdf' ),
+                                                     l_symsEl,
+                                                     l_basisEl ) ) ]
+
+    # plot sub-grid
+    if( self.m_ty in ['line', 'quad4r', 'tria3'] ):
+      l_scSvIn, l_scSvSend = self.get('scSv')[0:2]
+      l_jobs = l_jobs + [ ( GRIDS[self.m_ty].plot, ( self.path( i_dir, 'subgrid', 'pdf' ),
+                                                     self.get('svs'),
+                                                     l_scSvIn,
+                                                     l_scSvSend ) ) ]
+    elif( self.m_ty == 'hex8r' ):
+      l_jobs = l_jobs + [ ( GRIDS[self.m_ty].plot, ( self.path( i_dir, 'subgrid', 'pdf' ),
+                                                     self.m_deg ) ) ]
+
+    # plot mass matrix
+    l_jobs = l_jobs + [ ( edge_pre.io.Matrices.sparsity, ( edge_pre.io.Matrices.pattern( self.get('mass') ),
+                                                           self.path( i_dir, 'mass', 'pdf' ) ) ) ]
+
+    # plot stiffness and flux matrices
+    for l_na in [ 'stiffV', 'stiffT', 'fluxL', 'fluxN', 'fluxT' ]:
+      for l_ma in range( len(self.get(l_na)) ):
+        l_jobs = l_jobs + [ ( edge_pre.io.Matrices.sparsity, ( edge_pre.io.Matrices.pattern( self.get(l_na)[l_ma] ),
+                                                               self.path( i_dir, l_na+str(l_ma), 'pdf' ) ) ) ]
+
+    return l_jobs
@@ -0,0 +1,255 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Profiling of the pre-processing stages.
+##
+import os
+import sys
+import csv
+import json
+import time
+import cProfile
+import resource
+import threading
+import contextlib
+import sympy.core.cache
+import edge_pre.io.Files
+
+# columns of the report
+COLUMNS = [ 'type', 'deg', 'stage', 'calls', 'wall', 'cpu', 'peak_rss', 'sympy_cache' ]
+
+##
+# Resets the peak resident set size of the process, if supported by the OS (Linux).
+##
+def resetPeak():
+  try:
+    with open( '/proc/self/clear_refs', 'w' ) as l_fi:
+      l_fi.write( '5' )
+  except OSError:
+    pass
+
+##
+# Derives the peak resident set size of the process since the last reset.
+#   Falls back to the peak since the start of the process, if /proc is not available.
+#
+# @return peak resident set size in bytes.
+##
+def peak():
+  try:
+    with open( '/proc/self/status', 'r' ) as l_fi:
+      for l_li in l_fi:
+        if( l_li.startswith( 'VmHWM:' ) ):
+          return int( l_li.split()[1] ) * 1024
+  except OSError:
+    pass
+
+  # kilobytes on Linux, bytes on macOS
+  l_peak = resource.getrusage( resource.RUSAGE_SELF ).ru_maxrss
+  if( sys.platform.startswith( 'linux' ) ):
+    l_peak = l_peak * 1024
+
+  return l_peak
+
+##
+# Derives the number of entries in sympy's caches.
+#
+# @return number of entries.
+##
+def cacheSize():
+  return sum( [ l_fu.cache_info().currsize for l_fu in sympy.core.cache.CACHE ] )
+
+class Profiler:
+  ##
+  # Constructor of the profiler, which records wall time, CPU time, peak resident set size and size of sympy's cache per stage.
+  #   Nested stages are excluded from the times of the enclosing stage, the peaks include them.
+  #
+  # @param i_dirProf directory for the cProfile stats of the stages, None disables cProfile.
+  ##
+  def __init__( self,
+                i_dirProf = None ):
+    self.m_dirProf = i_dirProf
+    if( self.m_dirProf != None ):
+      os.makedirs( self.m_dirProf, exist_ok=True )
+
+    # records of the finished stages
+    self.m_recs = []
+    self.m_lock = threading.Lock()
+
+    # stages in progress, innermost last
+    self.m_stack = []
+
+  ##
+  # Pickles the profiler without its records, e.g., to profile stages in worker processes.
+  #
+  # @return state of the profiler.
+  ##
+  def __getstate__( self ):
+    return { 'm_dirProf': self.m_dirProf }
+
+  ##
+  # Unpickles the profiler.
+  #
+  # @param i_state state of the profiler.
+  ##
+  def __setstate__( self,
+                    i_state ):
+    self.__init__( i_state['m_dirProf'] )
+
+  ##
+  # Profiles a stage.
+  #
+  # @param i_ty element type.
+  # @param i_deg polynomial degree.
+  # @param i_name name of the stage.
+  ##
+  @contextlib.contextmanager
+  def stage( self,
+             i_ty,
+             i_deg,
+             i_name ):
+    # pause the enclosing stage
+    if( len(self.m_stack) > 0 ):
+      l_outer = self.m_stack[-1]
+      l_outer['peak'] = max( l_outer['peak'], peak() )
+      if( l_outer['prof'] != None ):
+        l_outer['prof'].disable()
+    resetPeak()
+
+    l_st = { 'peak':  0,
+             'inner': [ 0, 0 ],
+             'prof':  None }
+    if( self.m_dirProf != None ):
+      l_st['prof'] = cProfile.Profile()
+    self.m_stack.append( l_st )
+
+    l_wall = time.perf_counter()
+    l_cpu = time.process_time()
+    if( l_st['prof'] != None ):
+      l_st['prof'].enable()
+
+    try:
+      yield
+    finally:
+      if( l_st['prof'] != None ):
+        l_st['prof'].disable()
+      l_wall = time.perf_counter() - l_wall
+      l_cpu = time.process_time() - l_cpu
+      l_peak = max( l_st['peak'], peak() )
+      self.m_stack.pop()
+
+      self.add( [ { 'type':        i_ty,
+                    'deg':         i_deg,
+                    'stage':       i_name,
+                    'calls':       1,
+                    'wall':        l_wall - l_st['inner'][0],
+                    'cpu':         l_cpu  - l_st['inner'][1],
+                    'peak_rss':    l_peak,
+                    'sympy_cache': cacheSize() } ] )
+
+      if( l_st['prof'] != None ):
+        l_st['prof'].dump_stats( os.path.join( self.m_dirProf,
+                                               i_ty + '_' + str(i_deg) + '_' + i_name + '_' + str(os.getpid()) + '_' + str(len(self.m_recs)) + '.prof' ) )
+
+      # resume the enclosing stage
+      if( len(self.m_stack) > 0 ):
+        l_outer = self.m_stack[-1]
+        l_outer['inner'][0] = l_outer['inner'][0] + l_wall
+        l_outer['inner'][1] = l_outer['inner'][1] + l_cpu
+        l_outer['peak'] = max( l_outer['peak'], l_peak )
+        if( l_outer['prof'] != None ):
+          l_outer['prof'].enable()
+
+  ##
+  # Adds records, e.g., of stages profiled in other processes.
+  #
+  # @param i_recs records.
+  ##
+  def add( self,
+           i_recs ):
+    with self.m_lock:
+      self.m_recs = self.m_recs + list( i_recs )
+
+  ##
+  # Aggregates the records per element type, degree and stage.
+  #   Times and calls are summed up, the maximum is used for the peak and the size of the cache.
+  #
+  # @return aggregated records, in the order of their first occurrence.
+  ##
+  def rows( self ):
+    l_rows = {}
+    for l_re in self.m_recs:
+      l_key = ( l_re['type'], l_re['deg'], l_re['stage'] )
+      if( l_key not in l_rows ):
+        l_rows[l_key] = dict( l_re )
+      else:
+        l_row = l_rows[l_key]
+        for l_co in [ 'calls', 'wall', 'cpu' ]:
+          l_row[l_co] = l_row[l_co] + l_re[l_co]
+        for l_co in [ 'peak_rss', 'sympy_cache' ]:
+          l_row[l_co] = max( l_row[l_co], l_re[l_co] )
+
+    return list( l_rows.values() )
+
+  ##
+  # Writes the report as JSON and CSV file.
+  #
+  # @param i_path path of the report without extension.
+  # @param i_run information on the run, e.g., configuration and total wall time, stored in the JSON file.
+  ##
+  def write( self,
+             i_path,
+             i_run ):
+    l_rows = self.rows()
+
+    edge_pre.io.Files.writeAtomic( i_path + '.json', json.dumps( { 'run':    i_run,
+                                                       'stages': l_rows }, indent=2, sort_keys=True ) )
+
+    with edge_pre.io.Files.openAtomic( i_path + '.csv' ) as l_fi:
+      l_wr = csv.DictWriter( l_fi, fieldnames=COLUMNS, lineterminator='\n' )
+      l_wr.writeheader()
+      for l_row in l_rows:
+        l_wr.writerow( l_row )
+
+  ##
+  # Formats the summary table of the stages.
+  #
+  # @return lines of the table.
+  ##
+  def summary( self ):
+    l_fmt = '{:<8} {:>4} {:<12} {:>6} {:>10} {:>10} {:>10} {:>8}'
+    l_lines = [ l_fmt.format( 'type', 'deg', 'stage', 'calls', 'wall (s)', 'cpu (s)', 'rss (MiB)', 'cache' ) ]
+
+    l_wall = 0
+    l_cpu = 0
+    for l_row in self.rows():
+      l_lines = l_lines + [ l_fmt.format( l_row['type'],
+                                          l_row['deg'],
+                                          l_row['stage'],
+                                          l_row['calls'],
+                                          '{:.3f}'.format( l_row['wall'] ),
+                                          '{:.3f}'.format( l_row['cpu'] ),
+                                          '{:.1f}'.format( l_row['peak_rss'] / 1024.0**2 ),
+                                          l_row['sympy_cache'] ) ]
+      l_wall = l_wall + l_row['wall']
+      l_cpu = l_cpu + l_row['cpu']
+
+    l_lines = l_lines + [ l_fmt.format( 'total', '', '', '', '{:.3f}'.format( l_wall ), '{:.3f}'.format( l_cpu ), '', '' ) ]
+
+    return l_lines
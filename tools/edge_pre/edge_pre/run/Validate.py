@@ -0,0 +1,186 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Validation of the float mode against the exact backends.
+##
+import csv
+import json
+import logging
+import numpy
+import sympy.core.cache
+import edge_pre.io.Binary
+import edge_pre.io.Files
+from . import Pipeline
+
+# written operators: 1) name of the output, 2) stage
+OPS = [ ( 'mass',        'mass'        ),
+        ( 'stiffV',      'stiffV'      ),
+        ( 'stiffT',      'stiffT'      ),
+        ( 'fluxL',       'fluxL'       ),
+        ( 'fluxN',       'fluxN'       ),
+        ( 'fluxT',       'fluxT'       ),
+        ( 'svcrds',      'svs'         ),
+        ( 'scatter',     'scatter'     ),
+        ( 'scattersurf', 'scatterSurf' ),
+        ( 'gather',      'gather'      ),
+        ( 'sfint',       'sfInt'       ) ]
+
+# columns of the report
+COLUMNS = [ 'type', 'deg', 'op', 'max_abs', 'max_rel', 'ok' ]
+
+# default tolerance of the maximum relative error
+TOL = 1E-10
+
+##
+# Converts the result of a stage to a floating point array.
+#
+# @param i_val result of the stage: matrix, list of matrices or nested lists.
+# @return numpy array.
+##
+def array( i_val ):
+  if( isinstance( i_val, list ) and len(i_val) > 0 and hasattr( i_val[0], 'tolist' ) ):
+    i_val = [ l_va.tolist() for l_va in i_val ]
+  elif( hasattr( i_val, 'tolist' ) ):
+    i_val = i_val.tolist()
+
+  return edge_pre.io.Binary.array( i_val, numpy.float64 )
+
+##
+# Derives the errors of a floating point operator w.r.t. the exact one.
+#   The relative error is the maximum absolute error, divided by the maximum absolute entry of the exact operator.
+#
+# @param i_float floating point operator.
+# @param i_exact exact operator.
+# @return 1) maximum absolute error, 2) maximum relative error.
+##
+def errors( i_float,
+            i_exact ):
+  l_float = array( i_float )
+  l_exact = array( i_exact )
+  assert( l_float.shape == l_exact.shape ), 'shape mismatch: ' + str(l_float.shape) + ' vs. ' + str(l_exact.shape)
+
+  if( l_exact.size == 0 ):
+    return 0.0, 0.0
+
+  l_abs = float( numpy.max( numpy.abs( l_float - l_exact ) ) )
+  l_max = float( numpy.max( numpy.abs( l_exact ) ) )
+
+  l_rel = l_abs
+  if( l_max > 0 ):
+    l_rel = l_abs / l_max
+
+  return l_abs, l_rel
+
+##
+# Compares the operators of the float mode to those of an exact backend for one element type and degree.
+#
+# @param i_ty element type.
+# @param i_deg polynomial degree.
+# @param i_backend exact backend (symbolic or monomial).
+# @param i_cache optional cache of the stages' results.
+# @param i_tol tolerance of the maximum relative error.
+# @return rows of the report, one per operator.
+##
+def validate( i_ty,
+              i_deg,
+              i_backend = 'monomial',
+              i_cache = None,
+              i_tol = TOL ):
+  assert( i_backend in ['symbolic', 'monomial'] ), 'validation requires an exact backend: ' + i_backend
+
+  l_float = Pipeline.Pipeline( i_ty, i_deg, 'float', i_cache )
+  l_exact = Pipeline.Pipeline( i_ty, i_deg, i_backend, i_cache )
+
+  l_rows = []
+  for l_na, l_st in OPS:
+    l_abs, l_rel = errors( l_float.get(l_st), l_exact.get(l_st) )
+    l_rows = l_rows + [ { 'type':    i_ty,
+                          'deg':     i_deg,
+                          'op':      l_na,
+                          'max_abs': l_abs,
+                          'max_rel': l_rel,
+                          'ok':      l_rel <= i_tol } ]
+
+  return l_rows
+
+##
+# Compares the operators of the float mode to those of an exact backend.
+#
+# @param i_types element types.
+# @param i_degs polynomial degrees, which should be low for the exact backend.
+# @param i_backend exact backend (symbolic or monomial).
+# @param i_cache optional cache of the stages' results.
+# @param i_tol tolerance of the maximum relative error.
+# @return rows of the report, one per element type, degree and operator.
+##
+def run( i_types,
+         i_degs,
+         i_backend = 'monomial',
+         i_cache = None,
+         i_tol = TOL ):
+  l_rows = []
+
+  for l_ty in i_types:
+    for l_de in i_degs:
+      logging.info( 'validating the float mode: ' + l_ty + ', degree ' + str(l_de) + ', ' + i_backend )
+      sympy.core.cache.clear_cache()
+
+      l_rows = l_rows + validate( l_ty, l_de, i_backend, i_cache, i_tol )
+
+  return l_rows
+
+##
+# Writes the report of the validation as JSON and CSV file.
+#
+# @param i_path path of the report without extension.
+# @param i_rows rows of the report.
+# @param i_run information on the run, e.g., the exact backend and tolerance.
+##
+def write( i_path,
+           i_rows,
+           i_run ):
+  edge_pre.io.Files.writeAtomic( i_path + '.json', json.dumps( { 'run': i_run,
+                                                                 'ops': i_rows }, indent=2, sort_keys=True ) )
+
+  with edge_pre.io.Files.openAtomic( i_path + '.csv' ) as l_fi:
+    l_wr = csv.DictWriter( l_fi, fieldnames=COLUMNS, lineterminator='\n' )
+    l_wr.writeheader()
+    for l_row in i_rows:
+      l_wr.writerow( l_row )
+
+##
+# Formats the summary table of the validation.
+#
+# @param i_rows rows of the report.
+# @return lines of the table.
+##
+def summary( i_rows ):
+  l_fmt = '{:<8} {:>4} {:<12} {:>10} {:>10} {:>4}'
+  l_lines = [ l_fmt.format( 'type', 'deg', 'op', 'max abs', 'max rel', 'ok' ) ]
+
+  for l_row in i_rows:
+    l_lines = l_lines + [ l_fmt.format( l_row['type'],
+                                        l_row['deg'],
+                                        l_row['op'],
+                                        '{:.2e}'.format( l_row['max_abs'] ),
+                                        '{:.2e}'.format( l_row['max_rel'] ),
+                                        'yes' if l_row['ok'] else 'NO' ) ]
+
+  return l_lines
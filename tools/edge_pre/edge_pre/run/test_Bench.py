@@ -0,0 +1,114 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Tests the benchmarks of the operator generation.
+##
+import unittest
+import tempfile
+import shutil
+import os
+import time
+import sympy
+import edge_pre.int.Restrict
+from . import Bench
+
+class TestBench( unittest.TestCase ):
+  ##
+  # Tests the selection of benchmarks.
+  ##
+  def test_select(self):
+    self.assertEqual( Bench.select( None ), list( Bench.BENCHES.keys() ) )
+    self.assertEqual( Bench.select( [ 'mass', 'arrstr' ] ), [ 'mass', 'arrstr.float2d', 'arrstr.float3d', 'arrstr.int2d' ] )
+    self.assertEqual( Bench.select( [ 'grid.scSv' ] ), [ 'grid.scSv' ] )
+    self.assertEqual( Bench.select( [ 'gr' ] ), [] )
+
+  ##
+  # Tests the timing of functions.
+  ##
+  def test_measure(self):
+    # slow functions are called once per repetition
+    l_times, l_nCalls = Bench.measure( lambda: time.sleep( 0.03 ), 2, 100 )
+    self.assertEqual( l_nCalls, 1 )
+    self.assertEqual( len(l_times), 2 )
+    self.assertGreaterEqual( min(l_times), 0.03 )
+
+    # fast functions are called repeatedly
+    l_times, l_nCalls = Bench.measure( lambda: None, 3, 100 )
+    self.assertGreater( l_nCalls, 1 )
+    self.assertEqual( len(l_times), 3 )
+
+    # budget
+    l_times, l_nCalls = Bench.measure( lambda: time.sleep( 0.03 ), 10, 0.05 )
+    self.assertEqual( len(l_times), 2 )
+
+    # every call starts with cold caches
+    l_size = [ 0 ]
+    ##
+    # Fills the memo of the restrictions and records its largest size at the start of a call.
+    ##
+    def fill():
+      l_size[0] = max( l_size[0], edge_pre.int.Restrict.memo.cache_info().currsize )
+      edge_pre.int.Restrict.restrict( [ sympy.Symbol('x')**2 ], [ sympy.Symbol('x') ], [ 2 ] )
+    Bench.measure( fill, 3, 100 )
+    self.assertEqual( l_size[0], 0 )
+
+  ##
+  # Tests the comparison against a baseline.
+  ##
+  def test_compare(self):
+    l_base = [ { 'bench': 'mass',  'type': 'tria3', 'deg': 1, 'backend': 'symbolic', 'median': 1.0 },
+               { 'bench': 'stiff', 'type': 'tria3', 'deg': 1, 'backend': 'symbolic', 'median': 1.0 },
+               { 'bench': 'flux',  'type': 'tria3', 'deg': 1, 'backend': 'symbolic', 'median': 1.0 },
+               { 'bench': 'basis', 'type': 'tria3', 'deg': 1, 'backend': 'symbolic', 'median': 1E-4 } ]
+    l_res = [ { 'bench': 'mass',  'type': 'tria3', 'deg': 1, 'backend': 'symbolic', 'median': 1.5 },
+              { 'bench': 'stiff', 'type': 'tria3', 'deg': 1, 'backend': 'symbolic', 'median': 0.5 },
+              { 'bench': 'flux',  'type': 'tria3', 'deg': 1, 'backend': 'symbolic', 'median': 1.05 },
+              { 'bench': 'basis', 'type': 'tria3', 'deg': 1, 'backend': 'symbolic', 'median': 3E-4 },
+              { 'bench': 'mass',  'type': 'tria3', 'deg': 2, 'backend': 'symbolic', 'median': 9.0 } ]
+
+    l_comps = Bench.compare( l_base, l_res, 0.1, 1E-3 )
+    self.assertEqual( [ l_co[4] for l_co in l_comps ], [ 'regression', 'improvement', 'unchanged', 'unchanged' ] )
+    self.assertAlmostEqual( l_comps[0][3], 0.5 )
+
+    # without floor, the basis is flagged
+    l_comps = Bench.compare( l_base, l_res, 0.1, 0 )
+    self.assertEqual( l_comps[3][4], 'regression' )
+
+  ##
+  # Tests running the benchmarks and the history.
+  ##
+  def test_history(self):
+    l_res = Bench.run( [ 'basis', 'grid.scSv', 'arrstr.float3d' ], [ 'line' ], [ 1, 0 ], 'symbolic', 1, 10 )
+    self.assertEqual( [ ( l_re['bench'], l_re['deg'] ) for l_re in l_res ],
+                      [ ( 'basis', 0 ), ( 'basis', 1 ), ( 'grid.scSv', 0 ), ( 'grid.scSv', 1 ), ( 'arrstr.float3d', 0 ), ( 'arrstr.float3d', 1 ) ] )
+
+    l_dir = tempfile.mkdtemp()
+    try:
+      l_path0 = Bench.write( l_dir, l_res[:2], { 'reps': 1 } )
+      os.rename( l_path0, os.path.join( l_dir, 'bench_0.json' ) )
+      l_path1 = Bench.write( l_dir, l_res, { 'reps': 1 } )
+
+      self.assertEqual( Bench.read( l_path1 ), l_res )
+
+      # directories resolve to the latest file, excluding the given one
+      self.assertEqual( Bench.read( l_dir ), l_res )
+      self.assertEqual( Bench.read( l_dir, l_path1 ), l_res[:2] )
+    finally:
+      shutil.rmtree( l_dir )
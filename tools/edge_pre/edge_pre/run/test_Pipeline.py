@@ -0,0 +1,94 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Tests the pre-processing pipeline.
+##
+import unittest
+from . import Pipeline
+
+class TestPipeline( unittest.TestCase ):
+  ##
+  # Tests that merging the independent parts of stages reproduces the stages.
+  ##
+  def test_parts(self):
+    for l_ty in [ 'quad4r', 'tria3' ]:
+      l_pipe = Pipeline.Pipeline( l_ty, 1, 'monomial' )
+      for l_na in [ 'stiff', 'flux' ]:
+        l_ids = l_pipe.parts( l_na )
+        self.assertNotEqual( l_ids, None )
+
+        l_merged = l_pipe.merge( l_na, [ l_pipe.part( l_na, l_id ) for l_id in l_ids ] )
+        l_ref = l_pipe.get( l_na )
+
+        self.assertEqual( str(l_merged), str(l_ref) )
+
+    # line elements are not split
+    l_pipe = Pipeline.Pipeline( 'line', 1, 'monomial' )
+    self.assertEqual( l_pipe.parts( 'flux' ), None )
+
+  ##
+  # Tests the reuse of lower-degree integrals.
+  ##
+  def test_prev(self):
+    for l_ty in [ 'line', 'tria3' ]:
+      l_prev = Pipeline.Pipeline( l_ty, 1 )
+      l_pipe = Pipeline.Pipeline( l_ty, 2, i_prev=l_prev )
+      l_ref  = Pipeline.Pipeline( l_ty, 2 )
+
+      for l_na in [ 'mass', 'stiff', 'flux' ]:
+        self.assertEqual( str(l_pipe.get(l_na)), str(l_ref.get(l_na)) )
+
+  ##
+  # Tests the derivation of the DG surface scatter matrices through symmetries and column permutations.
+  ##
+  def test_scatterSurf(self):
+    for l_ty in [ 'quad4r', 'tria3', 'tet4' ]:
+      l_pipe = Pipeline.Pipeline( l_ty, 1, 'monomial' )
+      l_nFas = l_pipe.m_elTy.n_fas
+
+      # only the first face is integrated
+      self.assertEqual( l_pipe.parts( 'scatterSurf' ), [0] )
+
+      l_scatter = l_pipe.get( 'scatterSurf' )
+      self.assertEqual( len(l_scatter), l_nFas * ( 1 + len(l_pipe.get('scDgAd')) ) )
+
+      # local faces
+      for l_fa in range(l_nFas):
+        self.assertEqual( l_scatter[l_fa], l_pipe.scatterSurfId( l_fa ) )
+
+      # remote faces
+      for l_ve, l_ids in enumerate( l_pipe.get('scDgAd') ):
+        for l_fa in range(l_nFas):
+          for l_co, l_id in enumerate( l_ids ):
+            self.assertEqual( l_scatter[ (l_ve+1)*l_nFas + l_fa ][:, l_co], l_scatter[l_fa][:, l_id] )
+
+    # the quadrature backend integrates all local faces
+    l_pipe = Pipeline.Pipeline( 'tria3', 1, 'quadrature' )
+    self.assertEqual( l_pipe.parts( 'scatterSurf' ), [0, 1, 2] )
+
+  ##
+  # Tests that the quadrature backend integrates the sub-faces exactly.
+  ##
+  def test_sfIntRaw(self):
+    for l_ty in [ 'line', 'quad4r', 'tria3' ]:
+      l_ref = Pipeline.Pipeline( l_ty, 1 ).get( 'sfIntRaw' )
+      l_quad = Pipeline.Pipeline( l_ty, 1, 'quadrature' ).get( 'sfIntRaw' )
+
+      self.assertEqual( str(l_quad), str(l_ref) )
@@ -0,0 +1,122 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Tests the profiling of the pre-processing stages.
+##
+import unittest
+import tempfile
+import shutil
+import os
+import csv
+import json
+import time
+import pickle
+import resource
+import unittest.mock
+from . import Profile
+
+class TestProfile( unittest.TestCase ):
+  ##
+  # Tests the profiling of nested stages.
+  ##
+  def test_stage(self):
+    l_prof = Profile.Profiler()
+
+    with l_prof.stage( 'tria3', 2, 'outer' ):
+      time.sleep( 0.05 )
+      with l_prof.stage( 'tria3', 2, 'inner' ):
+        time.sleep( 0.1 )
+        l_data = bytearray( 32 * 1024**2 )
+      del l_data
+
+    self.assertEqual( [ l_re['stage'] for l_re in l_prof.m_recs ], [ 'inner', 'outer' ] )
+    l_inner, l_outer = l_prof.m_recs
+
+    # the times of the outer stage exclude the inner one
+    self.assertGreaterEqual( l_inner['wall'], 0.1 )
+    self.assertGreaterEqual( l_outer['wall'], 0.05 )
+    self.assertLess( l_outer['wall'], 0.1 )
+
+    # the peak of the outer stage includes the inner one
+    self.assertGreaterEqual( l_inner['peak_rss'], 32 * 1024**2 )
+    self.assertGreaterEqual( l_outer['peak_rss'], l_inner['peak_rss'] )
+
+  ##
+  # Tests the aggregation and the written report.
+  ##
+  def test_write(self):
+    l_prof = Profile.Profiler()
+    l_prof.add( [ { 'type': 'tet4', 'deg': 1, 'stage': 'flux', 'calls': 1, 'wall': 1.0, 'cpu': 0.5, 'peak_rss': 10, 'sympy_cache': 3 },
+                  { 'type': 'tet4', 'deg': 1, 'stage': 'mass', 'calls': 1, 'wall': 2.0, 'cpu': 2.0, 'peak_rss': 20, 'sympy_cache': 1 },
+                  { 'type': 'tet4', 'deg': 1, 'stage': 'flux', 'calls': 1, 'wall': 1.5, 'cpu': 1.0, 'peak_rss': 5,  'sympy_cache': 7 } ] )
+
+    l_rows = l_prof.rows()
+    self.assertEqual( len(l_rows), 2 )
+    self.assertEqual( l_rows[0], { 'type': 'tet4', 'deg': 1, 'stage': 'flux', 'calls': 2, 'wall': 2.5, 'cpu': 1.5, 'peak_rss': 10, 'sympy_cache': 7 } )
+    self.assertEqual( len( l_prof.summary() ), 4 )
+
+    l_dir = tempfile.mkdtemp()
+    try:
+      l_path = os.path.join( l_dir, 'report' )
+      l_prof.write( l_path, { 'jobs': 1 } )
+
+      with open( l_path + '.json', 'r' ) as l_fi:
+        l_rep = json.load( l_fi )
+      self.assertEqual( l_rep['run'], { 'jobs': 1 } )
+      self.assertEqual( l_rep['stages'], l_rows )
+
+      with open( l_path + '.csv', 'r' ) as l_fi:
+        l_csv = list( csv.DictReader( l_fi ) )
+      self.assertEqual( [ l_ro['stage'] for l_ro in l_csv ], [ 'flux', 'mass' ] )
+      self.assertEqual( float( l_csv[1]['wall'] ), 2.0 )
+    finally:
+      shutil.rmtree( l_dir )
+
+  ##
+  # Tests the cProfile stats and the pickling for worker processes.
+  ##
+  def test_cprofile(self):
+    l_dir = tempfile.mkdtemp()
+    try:
+      l_prof = Profile.Profiler( l_dir )
+      with l_prof.stage( 'line', 0, 'outer' ):
+        with l_prof.stage( 'line', 0, 'inner' ):
+          sum( range(1000) )
+      self.assertEqual( len( os.listdir( l_dir ) ), 2 )
+
+      # records are not pickled
+      l_copy = pickle.loads( pickle.dumps( l_prof ) )
+      self.assertEqual( l_copy.m_dirProf, l_dir )
+      self.assertEqual( l_copy.m_recs, [] )
+    finally:
+      shutil.rmtree( l_dir )
+
+  ##
+  # Tests the units of the peak memory without /proc.
+  ##
+  def test_peak(self):
+    l_usage = unittest.mock.Mock( ru_maxrss=1000 )
+
+    with unittest.mock.patch( 'builtins.open', side_effect=OSError ), \
+         unittest.mock.patch.object( resource, 'getrusage', return_value=l_usage ):
+      with unittest.mock.patch( 'sys.platform', 'linux' ):
+        self.assertEqual( Profile.peak(), 1000*1024 )
+      with unittest.mock.patch( 'sys.platform', 'darwin' ):
+        self.assertEqual( Profile.peak(), 1000 )
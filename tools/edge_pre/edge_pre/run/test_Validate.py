@@ -0,0 +1,82 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Tests the validation of the float mode.
+##
+import unittest
+import tempfile
+import shutil
+import os
+import csv
+import json
+import numpy
+import sympy
+from . import Validate
+
+class TestValidate( unittest.TestCase ):
+  ##
+  # Tests the errors of floating point operators w.r.t. exact ones.
+  ##
+  def test_errors(self):
+    l_exact = sympy.Matrix( [ [ sympy.Rational(1,3), 2 ], [ 0, -4 ] ] )
+    l_float = numpy.array( [ [ 1.0/3, 2 ], [ 0, -4+1E-12 ] ] )
+
+    l_abs, l_rel = Validate.errors( l_float, l_exact )
+    self.assertAlmostEqual( l_abs, 1E-12, delta=1E-15 )
+    self.assertAlmostEqual( l_rel, 1E-12/4, delta=1E-15 )
+
+    # lists of matrices
+    l_abs, l_rel = Validate.errors( [ l_float, l_float ], [ l_exact, l_exact ] )
+    self.assertAlmostEqual( l_rel, 1E-12/4, delta=1E-15 )
+
+    # zero operators use absolute errors
+    self.assertEqual( Validate.errors( numpy.zeros( (2,2) ), sympy.zeros( 2, 2 ) ), ( 0.0, 0.0 ) )
+
+    with self.assertRaises( AssertionError ):
+      Validate.errors( l_float, sympy.Matrix( [ [ 1, 2 ] ] ) )
+
+  ##
+  # Tests the validation of the float mode and the report.
+  ##
+  def test_run(self):
+    l_rows = Validate.run( [ 'line', 'tria3' ], [ 1 ] )
+    self.assertEqual( len(l_rows), 2 * len(Validate.OPS) )
+
+    for l_row in l_rows:
+      self.assertTrue( l_row['ok'], str(l_row) )
+      self.assertLess( l_row['max_rel'], 1E-13 )
+
+    self.assertEqual( len( Validate.summary( l_rows ) ), len(l_rows)+1 )
+
+    l_dir = tempfile.mkdtemp()
+    try:
+      l_path = os.path.join( l_dir, 'validate' )
+      Validate.write( l_path, l_rows, { 'backend': 'monomial' } )
+
+      with open( l_path + '.json', 'r' ) as l_fi:
+        l_json = json.load( l_fi )
+      self.assertEqual( l_json['run']['backend'], 'monomial' )
+      self.assertEqual( len(l_json['ops']), len(l_rows) )
+
+      with open( l_path + '.csv', 'r' ) as l_fi:
+        l_csv = list( csv.DictReader( l_fi ) )
+      self.assertEqual( [ l_row['op'] for l_row in l_csv ], [ l_row['op'] for l_row in l_rows ] )
+    finally:
+      shutil.rmtree( l_dir )
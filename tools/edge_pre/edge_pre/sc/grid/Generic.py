@@ -20,6 +20,7 @@
 # @section DESCRIPTION
 # Generic derivation of sub-grid information.
 ##
+import numpy
 import sympy
 
 ##
@@ -36,6 +37,13 @@ def scSfSc( i_scSfSvIn,
   # combine all sub-cells
   l_scSfSv = i_scSfSvIn+i_scSfSvSend+i_scSfSvRecv
 
+  # sub-cells adjacent to the faces, faces are identified by their sorted and unique sub-vertices
+  l_faSc = {}
+  for l_c2 in range(len(l_scSfSv)):
+    for l_f2 in l_scSfSv[l_c2]:
+      l_key = tuple( sorted( set(l_f2) ) )
+      l_faSc[l_key] = l_faSc.get( l_key, [] ) + [l_c2]
+
   # resulting adjacency
   l_scSfSc = []
 
@@ -49,14 +57,10 @@ def scSfSc( i_scSfSvIn,
       if( l_f1 == [-1 for l_en in range(len(l_f1)) ] ):
         l_scSfSc[-1] = l_scSfSc[-1] + [-1]
       else:
-        # iterate over all other sub-cells
-        for l_c2 in range(len(l_scSfSv)):
+        # all other sub-cells sharing the face's vertices
+        for l_c2 in l_faSc[ tuple( sorted( set(l_f1) ) ) ]:
           if( l_c1 != l_c2 ):
-            # iterate over faces of other sub-cell
-            for l_f2 in l_scSfSv[l_c2]:
-              # check that this is neither and undefined face and set the vertices match
-              if set(l_f1) == set(l_f2):
-                l_scSfSc[-1] = l_scSfSc[-1] + [l_c2]
+            l_scSfSc[-1] = l_scSfSc[-1] + [ l_c2 ]
 
   # split by inner, send, receive
   return l_scSfSc[0:len(i_scSfSvIn)],\
@@ -64,54 +68,98 @@ def scSfSc( i_scSfSvIn,
          l_scSfSc[len(i_scSfSvIn) + len(i_scSfSvSend) : ]
 
 ##
-# Integration intervals for the sub-cells
+# Derives the affine mappings x = A xi + b from the reference element to the sub-cells.
+#   The sub-cells are affine images of the reference element, thus A and b follow from the sub-cells' vertices at the reference element's origin and unit points.
 #
-# @param i_deg polynomial degree.
 # @param i_ty element type.
-# @param i_syms symbols.
-# @param i_shape shape functions.
+# @param i_ves positions of the vertices in the sub-cells' vertex lists, which are the images of the reference element's origin and unit points (one per dimension).
 # @param i_svs sub-vertex coords.
 # @param i_scSv sub-vertex ids, adjacent to sub-cells (list of 2: inner, send).
 # @param i_scSfScRecv sub-cells adjacent to sub-cells (face as bridge) for recv-elements.
-# @return 1) mappings, 2) absolute values of Jacobi determinant.
+# @return 1) matrices A, 2) vectors b, 3) absolute values of Jacobi determinant. Each is a list of 3 (inner, send, recv) rational numpy arrays, recv is stored per DG-face.
 ##
-def intSc( i_deg, i_ty, i_syms, i_shape, i_svs, i_scSv, i_scSfScRecv ):
-  # get sub-cell coords
-  for l_ty in range(2):
-    for l_sc in range(len(i_scSv[l_ty])):
-      for l_sv in range(len(i_scSv[l_ty][l_sc])):
-        i_scSv[l_ty][l_sc][l_sv] = i_svs[ i_scSv[l_ty][l_sc][l_sv] ]
+def affSc( i_ty, i_ves, i_svs, i_scSv, i_scSfScRecv ):
+  l_svs = numpy.array( i_svs, dtype=object )
 
-  # derive mappings from reference to sub-cell
-  l_maps = [[],[],[]]
+  l_As, l_bs = [], []
   for l_ty in range(2):
-    for l_sc in i_scSv[l_ty]:
-      l_maps[l_ty] = l_maps[l_ty] + [ refToPhy( l_sc, i_shape ) ]
+    # coords of the sub-cells' vertices at the reference element's origin and unit points
+    l_ids = numpy.array( i_scSv[l_ty], dtype=numpy.int64 ).reshape( (-1, i_ty.n_ves) )
+    l_pts = l_svs[ l_ids[:, i_ves] ]
 
-  # compute determinants of jacobian
-  l_aDets = [[],[],[]]
-  for l_ty in range(2):
-    for l_ma in range(len(l_maps[l_ty])):
-      l_aDets[l_ty] = l_aDets[l_ty] + [ absJacDet( i_syms, l_maps[l_ty][l_ma] ) ]
-
-  l_mapsFlat   = l_maps[0] + l_maps[1]
-  l_aDetsFlat = l_aDets[0] + l_aDets[1]
-
-  for l_fa in range(i_ty.n_fas):
-    # add empty lists for this face
-    l_maps[2] = l_maps[2] + [[]]
-    l_aDets[2] = l_aDets[2] + [[]]
-
-    for l_sc in range(i_ty.n_sfs):
-      l_scId = i_scSfScRecv[l_fa*i_ty.n_sfs + l_sc][0]
-      l_maps[2][-1]  = l_maps[2][-1]  + [ l_mapsFlat[ l_scId ]  ]
-      l_aDets[2][-1] = l_aDets[2][-1] + [ l_aDetsFlat[ l_scId ] ]
-
-  # simplify mappings
-  for l_ty in range( len(l_maps) ):
-    for l_ma in range( len(l_maps[l_ty]) ):
-      for l_di in range( len(l_maps[l_ty][l_ma]) ):
-        l_maps[l_ty][l_ma][l_di] = sympy.simplify( l_maps[l_ty][l_ma][l_di] )
+    l_bs = l_bs + [ l_pts[:, 0, :] ]
+    l_As = l_As + [ ( l_pts[:, 1:, :] - l_pts[:, :1, :] ).transpose( (0, 2, 1) ) ]
+
+  # receive sub-cells are given by the adjacent send sub-cells
+  l_ids = [ l_sc[0] for l_sc in i_scSfScRecv[0:i_ty.n_fas*i_ty.n_sfs] ]
+  l_ids = numpy.array( l_ids, dtype=numpy.int64 ).reshape( (i_ty.n_fas, i_ty.n_sfs) )
+
+  l_As = l_As + [ numpy.concatenate( l_As )[ l_ids ] ]
+  l_bs = l_bs + [ numpy.concatenate( l_bs )[ l_ids ] ]
+
+  return l_As, l_bs, [ absDets( l_ma ) for l_ma in l_As ]
+
+##
+# Computes the absolute values of the determinants for a batch of matrices.
+#
+# @param i_mats numpy array of matrices with up to three rows and columns. [*][][]: matrix.
+# @return numpy array of absolute determinants.
+##
+def absDets( i_mats ):
+  l_a = i_mats
+
+  if( l_a.shape[-1] == 1 ):
+    l_dets = l_a[..., 0, 0]
+  elif( l_a.shape[-1] == 2 ):
+    l_dets = l_a[..., 0, 0] * l_a[..., 1, 1] - l_a[..., 0, 1] * l_a[..., 1, 0]
+  else:
+    assert( l_a.shape[-1] == 3 )
+    l_dets =   l_a[..., 0, 0] * ( l_a[..., 1, 1] * l_a[..., 2, 2] - l_a[..., 1, 2] * l_a[..., 2, 1] ) \
+             - l_a[..., 0, 1] * ( l_a[..., 1, 0] * l_a[..., 2, 2] - l_a[..., 1, 2] * l_a[..., 2, 0] ) \
+             + l_a[..., 0, 2] * ( l_a[..., 1, 0] * l_a[..., 2, 1] - l_a[..., 1, 1] * l_a[..., 2, 0] )
+
+  return numpy.abs( l_dets )
+
+##
+# Derives symbolic mappings from affine ones.
+#
+# @param i_syms symbols.
+# @param i_As matrices A of the affine mappings. [*][][]: sub-cell.
+# @param i_bs vectors b of the affine mappings. [*][]: sub-cell.
+# @return symbolic mappings. [*][]: sub-cell, [][*]: dimension.
+##
+def maps( i_syms, i_As, i_bs ):
+  l_maps = []
+
+  for l_sc in range(len(i_bs)):
+    l_maps = l_maps + [[]]
+    for l_d0 in range(len(i_syms)):
+      l_map = sympy.Rational( i_bs[l_sc][l_d0] )
+      for l_d1 in range(len(i_syms)):
+        l_map = l_map + sympy.Rational( i_As[l_sc][l_d0][l_d1] ) * i_syms[l_d1]
+      l_maps[-1] = l_maps[-1] + [ l_map ]
+
+  return l_maps
+
+##
+# Integration intervals for the sub-cells
+#
+# @param i_syms symbols.
+# @param i_affSc affine mappings of the sub-cells, given by affSc.
+# @return 1) mappings, 2) absolute values of Jacobi determinant.
+##
+def intSc( i_syms, i_affSc ):
+  l_As, l_bs, l_aDets = i_affSc
+
+  # symbolic mappings, stored per DG-face for the receive sub-cells
+  l_maps = [ maps( i_syms, l_As[0], l_bs[0] ),
+             maps( i_syms, l_As[1], l_bs[1] ),
+             [ maps( i_syms, l_As[2][l_fa], l_bs[2][l_fa] ) for l_fa in range(len(l_bs[2])) ] ]
+
+  # rational determinants
+  l_aDets = [ [ sympy.Rational( l_de ) for l_de in l_aDets[0] ],
+              [ sympy.Rational( l_de ) for l_de in l_aDets[1] ],
+              [ [ sympy.Rational( l_de ) for l_de in l_fa ] for l_fa in l_aDets[2] ] ]
 
   return l_maps, l_aDets
 
@@ -21,13 +21,12 @@
 # Sub-grids for hexes.
 ##
 import fractions
+import numpy
 import edge_pre.types.Hex
 from . import Generic
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot
-import matplotlib.backends.backend_pdf
+from . import Lattice
 import math
+import edge_pre.io.Plot
 
 ##
 # Generates vertices of the sub-grid for the given polynomial degree.
@@ -45,13 +44,9 @@ def svs( i_deg ):
   l_inc = [ fractions.Fraction( l_in, l_ty.n_ses ) for l_in in l_inc ]
 
   # vertices
-  l_svs = []
-  for l_e3 in range(l_ty.n_ses+1):
-    for l_e2 in range(l_ty.n_ses+1):
-      for l_e1 in range(l_ty.n_ses+1):
-        l_svs = l_svs + [ [ l_ty.ves[0][0]+ l_e1*l_inc[0],
-                            l_ty.ves[0][1]+ l_e2*l_inc[1],
-                            l_ty.ves[0][2]+ l_e3*l_inc[2] ] ]
+  l_svs = Lattice.coords( Lattice.box( 3, l_ty.n_ses ),
+                          l_ty.ves[0],
+                          l_inc )
 
   return l_svs
 
@@ -268,25 +263,12 @@ def scSfSc( i_deg ):
   return l_scSfScIn, l_scSfScSend, l_scSfScRecv
 
 ##
-# Integration intervals for the sub-cells
+# Affine mappings of the sub-cells.
 #
 # @param i_deg polynomial degree.
-# @param i_syms symbols.
-# @return 1) mappings, 2) absolute values of Jacobi determinant.
+# @return 1) matrices A, 2) vectors b, 3) absolute values of Jacobi determinant of the mappings x = A xi + b.
 ##
-def intSc( i_deg, i_syms ):
-  assert( len(i_syms) == 3 )
-
-  # hex shape functions
-  l_shape = [ (1 - i_syms[0]) * (1 - i_syms[1]) * (1 - i_syms[2]),
-               i_syms[0]      * (1 - i_syms[1]) * (1 - i_syms[2]),
-               i_syms[0]      *  i_syms[1]      * (1 - i_syms[2]),
-              (1 - i_syms[0]) *  i_syms[1]      * (1 - i_syms[2]),
-              (1 - i_syms[0]) * (1 - i_syms[1]) *  i_syms[2],
-               i_syms[0]      * (1 - i_syms[1]) *  i_syms[2],
-               i_syms[0]      *  i_syms[1]      *  i_syms[2],
-              (1 - i_syms[0]) *  i_syms[1]      *  i_syms[2] ]
-
+def affSc( i_deg ):
   # get sub-cell coords
   l_svs = svs( i_deg )
   l_scSv = scSv( i_deg )[0:2]
@@ -296,7 +278,20 @@ def intSc( i_deg, i_syms ):
 
   l_ty = edge_pre.types.Hex.Hex( i_deg )
 
-  return Generic.intSc( i_deg, l_ty, i_syms, l_shape, l_svs, l_scSv[0:2], l_scSfSc[2] )
+  # images of the reference element's origin and unit points: dimension-wise vertices 0 (origin), 1 (xi_0=1), 2 (xi_1=1) and 4 (xi_2=1)
+  return Generic.affSc( l_ty, [ 0, 1, 2, 4 ], l_svs, l_scSv[0:2], l_scSfSc[2] )
+
+##
+# Integration intervals for the sub-cells
+#
+# @param i_deg polynomial degree.
+# @param i_syms symbols.
+# @return 1) mappings, 2) absolute values of Jacobi determinant.
+##
+def intSc( i_deg, i_syms ):
+  assert( len(i_syms) == 3 )
+
+  return Generic.intSc( i_syms, affSc( i_deg ) )
 
 ##
 # Derives the integration intervals for the sub-faces at the DG-faces.
@@ -409,19 +404,11 @@ def scTySf( i_deg ):
   # set inner sub-cell types
   l_scTySfIn = [ [12, 13, 14, 15, 16, 17 ] for _ in range(l_ty.n_scs_in) ]
 
-  l_scSfSc = scSfSc(i_deg)[1]
-
-  l_scTySfSend = []
+  l_scSfSc = numpy.array( scSfSc(i_deg)[1], dtype=numpy.int64 ).reshape( (-1, 6) )
 
-  # iterate over send sub-cells and set types based on adjacency info
-  for l_sc1 in l_scSfSc:
-    # init with DG
-    l_scTySfSend = l_scTySfSend + [ [ 0, 1, 2, 3, 4, 5 ] ]
-
-    # set inner if not a DG sub-face
-    for l_sc2 in range(len(l_sc1)):
-      if( l_sc1[l_sc2] < l_ty.n_scs ):
-        l_scTySfSend[-1][l_sc2] = l_scTySfSend[-1][l_sc2] + 12
+  # init with DG and set inner if not a DG sub-face, based on the adjacency info of all send sub-cells
+  l_scTySfSend = numpy.arange( 6 ) + 12 * ( l_scSfSc < l_ty.n_scs )
+  l_scTySfSend = l_scTySfSend.tolist()
 
   return l_scTySfIn, l_scTySfSend
 
@@ -547,6 +534,8 @@ def scDgAd( i_deg ):
 # @param i_deg degree.
 ##
 def plot( i_out, i_deg ):
+  l_mpl = edge_pre.io.Plot.matplotlib()
+
   ##
   # Defines a path for the given sub-cell.
   #
@@ -554,18 +543,18 @@ def plot( i_out, i_deg ):
   # @param i_scSv vertices adjacent to the sub-cell.
   ##
   def path( i_ves, i_scSv ):
-    l_code = [ matplotlib.path.Path.MOVETO,
-               matplotlib.path.Path.LINETO,
-               matplotlib.path.Path.LINETO,
-               matplotlib.path.Path.LINETO,
-               matplotlib.path.Path.CLOSEPOLY ]
-
-    l_path = matplotlib.path.Path( [ i_ves[ i_scSv[0] ][0:2],
-                                     i_ves[ i_scSv[1] ][0:2],
-                                     i_ves[ i_scSv[3] ][0:2],
-                                     i_ves[ i_scSv[2] ][0:2],
-                                     i_ves[ i_scSv[0] ][0:2] ],
-                                     l_code )
+    l_code = [ l_mpl.path.Path.MOVETO,
+               l_mpl.path.Path.LINETO,
+               l_mpl.path.Path.LINETO,
+               l_mpl.path.Path.LINETO,
+               l_mpl.path.Path.CLOSEPOLY ]
+
+    l_path = l_mpl.path.Path( [ i_ves[ i_scSv[0] ][0:2],
+                                i_ves[ i_scSv[1] ][0:2],
+                                i_ves[ i_scSv[3] ][0:2],
+                                i_ves[ i_scSv[2] ][0:2],
+                                i_ves[ i_scSv[0] ][0:2] ],
+                                l_code )
     return l_path
 
   ##
@@ -618,14 +607,14 @@ def plot( i_out, i_deg ):
   l_ty = edge_pre.types.Hex.Hex( i_deg )
 
   # output pdf
-  l_pdf = matplotlib.backends.backend_pdf.PdfPages( i_out )
+  l_pdf = l_mpl.backends.backend_pdf.PdfPages( i_out )
 
   # iterate over z-dimension
   for l_z in range(l_ty.n_ses):
-    l_fig = matplotlib.pyplot.figure( figsize=(l_size, l_size) )
+    l_fig = l_mpl.pyplot.figure( figsize=(l_size, l_size) )
     if( i_deg > 1 ):
-      matplotlib.pyplot.suptitle( 'Hex is sliced in z-direction. Shown are ids of sub-cells above the slice.' )
-    matplotlib.pyplot.title( 'z-slice #'+str(l_z) )
+      l_mpl.pyplot.suptitle( 'Hex is sliced in z-direction. Shown are ids of sub-cells above the slice.' )
+    l_mpl.pyplot.title( 'z-slice #'+str(l_z) )
 
     l_plt = l_fig.add_subplot(111)
     l_plt.set_aspect(1)
@@ -634,14 +623,14 @@ def plot( i_out, i_deg ):
     for l_in in l_scSv[0]:
       # only plot sub-cell, which are part of the slice
       if zSlice( l_z, l_in[0:4] ):
-        l_patch = matplotlib.patches.PathPatch( path(l_svs, l_in), lw=2, facecolor='white' )
+        l_patch = l_mpl.patches.PathPatch( path(l_svs, l_in), lw=2, facecolor='white' )
         l_plt.add_patch( l_patch )
         annotate( str(l_id), l_svs, l_in, 'black', l_plt )
       l_id = l_id + 1
     for l_se in l_scSv[1]:
       # only plot sub-cell, which are part of the slice
       if zSlice( l_z, l_se[0:4] ):
-        l_patch = matplotlib.patches.PathPatch( path(l_svs, l_se), lw=2, facecolor='black', edgecolor='white' )
+        l_patch = l_mpl.patches.PathPatch( path(l_svs, l_se), lw=2, facecolor='black', edgecolor='white' )
         l_plt.add_patch( l_patch )
         annotate( str(l_id), l_svs, l_se, 'white', l_plt )
       l_id = l_id + 1
@@ -649,4 +638,4 @@ def plot( i_out, i_deg ):
     # save plot
     l_pdf.savefig( l_fig )
   l_pdf.close()
-  matplotlib.pyplot.close()
+  l_mpl.pyplot.close()
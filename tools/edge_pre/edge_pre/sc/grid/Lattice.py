@@ -0,0 +1,121 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Integer lattices of the sub-grids.
+##
+import numpy
+
+##
+# Generates the integer lattice points of a box [0, i_n]^d.
+#   The first dimension runs fastest.
+#
+# @param i_nDims number of dimensions d.
+# @param i_n number of lattice intervals per dimension.
+# @return numpy array containing the lattice points. [*][]: point, [][*]: dimension.
+##
+def box( i_nDims,
+         i_n ):
+  # the last dimension of numpy's indices runs fastest
+  l_pts = numpy.indices( [i_n+1] * i_nDims ).reshape( i_nDims, -1 ).T
+
+  # reverse the dimensions, such that the first one runs fastest
+  l_pts = l_pts[ :, ::-1 ]
+
+  return numpy.ascontiguousarray( l_pts )
+
+##
+# Generates the integer lattice points of a simplex { e >= 0 : e_1 + ... + e_d <= i_n }.
+#   The first dimension runs fastest.
+#
+# @param i_nDims number of dimensions d.
+# @param i_n number of lattice intervals per edge.
+# @return numpy array containing the lattice points. [*][]: point, [][*]: dimension.
+##
+def simplex( i_nDims,
+             i_n ):
+  l_pts = box( i_nDims, i_n )
+
+  return l_pts[ l_pts.sum( axis=1 ) <= i_n ]
+
+##
+# Number of lattice points in a simplex, given by the binomial coefficient (i_n+d choose d).
+#
+# @param i_nDims number of dimensions d.
+# @param i_n number of lattice intervals per edge, scalar or numpy array.
+# @return number of lattice points.
+##
+def nSimplex( i_nDims,
+              i_n ):
+  l_count = i_n * 0 + 1
+  for l_di in range( 1, i_nDims+1 ):
+    l_count = l_count * (i_n+l_di) // l_di
+
+  return l_count
+
+##
+# Derives the mono-indices of lattice points in a box, matching the ordering of box(...).
+#
+# @param i_pts numpy array of lattice points. [*][]: point, [][*]: dimension.
+# @param i_n number of lattice intervals per dimension.
+# @return numpy array of mono-indices.
+##
+def monoBox( i_pts,
+             i_n ):
+  l_pts = numpy.asarray( i_pts )
+  l_ids = numpy.zeros( l_pts.shape[:-1], dtype=numpy.int64 )
+
+  for l_di in reversed( range( l_pts.shape[-1] ) ):
+    l_ids = l_ids * (i_n+1) + l_pts[..., l_di]
+
+  return l_ids
+
+##
+# Derives the mono-indices of lattice points in a simplex, matching the ordering of simplex(...).
+#   All points preceding a point are counted arithmetically, dimension by dimension:
+#   Points with a smaller last coordinate form a difference of two simplices, the remaining ones a lower-dimensional simplex.
+#
+# @param i_pts numpy array of lattice points. [*][]: point, [][*]: dimension.
+# @param i_n number of lattice intervals per edge.
+# @return numpy array of mono-indices.
+##
+def monoSimplex( i_pts,
+                 i_n ):
+  l_pts = numpy.asarray( i_pts )
+  l_ids = numpy.zeros( l_pts.shape[:-1], dtype=numpy.int64 )
+  l_rem = l_ids + i_n
+
+  for l_di in reversed( range( l_pts.shape[-1] ) ):
+    l_ids = l_ids + nSimplex( l_di+1, l_rem ) - nSimplex( l_di+1, l_rem - l_pts[..., l_di] )
+    l_rem = l_rem - l_pts[..., l_di]
+
+  return l_ids
+
+##
+# Converts lattice points to rational coordinates.
+#
+# @param i_pts numpy array of lattice points. [*][]: point, [][*]: dimension.
+# @param i_orig coordinates of the lattice's origin.
+# @param i_inc increments from one lattice point to the next, per dimension.
+# @return list containing the coordinates of the points. [*][]: point, [][*]: dimension.
+##
+def coords( i_pts,
+            i_orig,
+            i_inc ):
+  return [ [ i_orig[l_di] + l_en * i_inc[l_di] for l_di, l_en in enumerate( l_pt ) ] for l_pt in i_pts.tolist() ]
@@ -23,9 +23,8 @@
 import fractions
 import edge_pre.types.Line
 from . import Generic
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot
+from . import Lattice
+import edge_pre.io.Plot
 
 ##
 # Generates vertices of the sub-grid for the given polynomial degree.
@@ -41,9 +40,9 @@ def svs( i_deg ):
   l_inc = fractions.Fraction( l_inc, l_ty.n_scs )
 
   # vertices
-  l_svs = [ [ l_ty.ves[0][0] ] ]
-  while( l_svs[-1][0] != l_ty.ves[1][0] ):
-    l_svs = l_svs + [ [ l_svs[-1][0] + l_inc ] ]
+  l_svs = Lattice.coords( Lattice.box( 1, l_ty.n_scs ),
+                          l_ty.ves[0],
+                          [ l_inc ] )
 
   return l_svs
 
@@ -148,19 +147,12 @@ def scTySf( i_deg ):
   return l_scTySfIn, l_scTySfSend
 
 ##
-# Integration intervals for the sub-cells
+# Affine mappings of the sub-cells.
 #
 # @param i_deg polynomial degree.
-# @param i_syms symbols.
-# @return 1) mappings, 2) absolute values of Jacobi determinant.
+# @return 1) matrices A, 2) vectors b, 3) absolute values of Jacobi determinant of the mappings x = A xi + b.
 ##
-def intSc( i_deg, i_syms ):
-  assert( len(i_syms) == 1 )
-
-  # line shape functions
-  l_shape = [ 1 - i_syms[0],
-              i_syms[0] ]
-
+def affSc( i_deg ):
   # get sub-cell coords
   l_svs = svs( i_deg )
   l_scSv = scSv( i_deg )[0:2]
@@ -170,7 +162,20 @@ def intSc( i_deg, i_syms ):
 
   l_ty = edge_pre.types.Line.Line( i_deg )
 
-  return Generic.intSc( i_deg, l_ty, i_syms, l_shape, l_svs, l_scSv[0:2], l_scSfSc[2] )
+  # images of the reference element's origin and unit points: vertices 0 (origin) and 1 (xi_0=1)
+  return Generic.affSc( l_ty, [ 0, 1 ], l_svs, l_scSv[0:2], l_scSfSc[2] )
+
+##
+# Integration intervals for the sub-cells
+#
+# @param i_deg polynomial degree.
+# @param i_syms symbols.
+# @return 1) mappings, 2) absolute values of Jacobi determinant.
+##
+def intSc( i_deg, i_syms ):
+  assert( len(i_syms) == 1 )
+
+  return Generic.intSc( i_syms, affSc( i_deg ) )
 
 ##
 # Plots the sub-grid.
@@ -181,7 +186,9 @@ def intSc( i_deg, i_syms ):
 # @param i_scSvSend sub-vertices adjacent to send sub-cells.
 ##
 def plot( i_out, i_svs, i_scSvIn, i_scSvSend ):
-  l_fig = matplotlib.pyplot.figure()
+  l_mpl = edge_pre.io.Plot.matplotlib()
+
+  l_fig = l_mpl.pyplot.figure()
   l_plt = l_fig.add_subplot(111)
   l_plt.set_aspect(1)
 
@@ -192,18 +199,18 @@ def plot( i_out, i_svs, i_scSvIn, i_scSvSend ):
   # @param i_scSv vertices adjacent to the sub-cell.
   ##
   def path( i_ves, i_scSv ):
-    l_code = [ matplotlib.path.Path.MOVETO,
-               matplotlib.path.Path.LINETO,
-               matplotlib.path.Path.LINETO,
-               matplotlib.path.Path.LINETO,
-               matplotlib.path.Path.CLOSEPOLY ]
-
-    l_path = matplotlib.path.Path( [ i_svs[ i_scSv[0] ] + [0],
-                                     i_svs[ i_scSv[1] ] + [0],
-                                     i_svs[ i_scSv[1] ] + [0.1],
-                                     i_svs[ i_scSv[0] ] + [0.1],
-                                     i_svs[ i_scSv[0] ] + [0] ],
-                                     l_code )
+    l_code = [ l_mpl.path.Path.MOVETO,
+               l_mpl.path.Path.LINETO,
+               l_mpl.path.Path.LINETO,
+               l_mpl.path.Path.LINETO,
+               l_mpl.path.Path.CLOSEPOLY ]
+
+    l_path = l_mpl.path.Path( [ i_svs[ i_scSv[0] ] + [0],
+                                i_svs[ i_scSv[1] ] + [0],
+                                i_svs[ i_scSv[1] ] + [0.1],
+                                i_svs[ i_scSv[0] ] + [0.1],
+                                i_svs[ i_scSv[0] ] + [0] ],
+                                l_code )
 
     return l_path
 
@@ -229,16 +236,16 @@ def plot( i_out, i_svs, i_scSvIn, i_scSvSend ):
 
   l_id = 0
   for l_in in i_scSvIn:
-    l_patch = matplotlib.patches.PathPatch( path(i_svs, l_in), lw=2, facecolor='white' )
+    l_patch = l_mpl.patches.PathPatch( path(i_svs, l_in), lw=2, facecolor='white' )
     l_plt.add_patch( l_patch )
     annotate( str(l_id), i_svs, l_in, 'black', l_plt )
     l_id = l_id + 1
   for l_se in i_scSvSend:
-    l_patch = matplotlib.patches.PathPatch( path(i_svs, l_se), lw=2, facecolor='black' )
+    l_patch = l_mpl.patches.PathPatch( path(i_svs, l_se), lw=2, facecolor='black' )
     l_plt.add_patch( l_patch )
     annotate( str(l_id), i_svs, l_se, 'white', l_plt )
     l_id = l_id + 1
 
   # save plot
   l_fig.savefig( i_out )
-  matplotlib.pyplot.close()
+  l_mpl.pyplot.close()
@@ -21,9 +21,11 @@
 # Sub-grids for tets.
 ##
 from fractions import Fraction as Fra
+import numpy
 import sympy
 import edge_pre.types.Tet
 from . import Generic
+from . import Lattice
 
 ##
 # Generates vertices of the sub-grid for the given polynomial degree.
@@ -41,38 +43,24 @@ def svs( i_deg ):
   l_inc = Fra( l_inc, l_ty.n_ses )
 
   # vertices
-  l_svs = []
-  for l_e3 in range(l_ty.n_ses+1):
-    for l_e2 in range(l_ty.n_ses+1 - l_e3):
-      for l_e1 in range(l_ty.n_ses+1 - l_e3 - l_e2):
-        l_svs = l_svs + [ [ l_ty.ves[0][0] + l_e1*l_inc,
-                            l_ty.ves[0][1] + l_e2*l_inc,
-                            l_ty.ves[0][2] + l_e3*l_inc ] ]
+  l_svs = Lattice.coords( Lattice.simplex( 3, l_ty.n_ses ),
+                          l_ty.ves[0],
+                          [ l_inc, l_inc, l_inc ] )
 
   return l_svs
 
 ##
-# Derives the sub-tets in an element, separated by their tet-type.
+# Derives the vertex ids of the sub-tets in an element, separated by their tet-type.
+#   All sub-tets of a type are generated at once by evaluating their vertices on the lattice points of the hexes.
 #
 # @param i_deg polynomial degree.
-# @return 1) vertices of sub-cells per hex, sorted dimension-wise. Per entry by (up, down, H1, H2, H3, H4), empty list if not part of the element.
-#         2) (i,j,k) -> mono indices.
+# @return vertex ids of sub-cells per hex, sorted dimension-wise. Per entry by (up, down, H1, H2, H3, H4), empty list if not part of the element.
 ##
-def subTets( i_deg ):
+def subTetIds( i_deg ):
   l_ty = edge_pre.types.Tet.Tet( i_deg )
 
-  # get sub-vertices
-  l_svs = svs( i_deg )
-
-  # assemble mono-indices
-  l_mono = {}
-  l_id = 0
-  for l_e3 in range(l_ty.n_ses+1):
-    for l_e2 in range(l_ty.n_ses+1 - l_e3):
-      for l_e1 in range(l_ty.n_ses+1 - l_e3 - l_e2):
-        l_mono[ (l_e1, l_e2, l_e3) ] = l_id
-        l_id = l_id + 1
-
+  # lattice points of the hexes (first vertex), sorted dimension-wise
+  l_hes = Lattice.simplex( 3, l_ty.n_ses-1 )
 
   ##
   # Upward-pointing tetrahedron.
@@ -95,16 +83,16 @@ def subTets( i_deg ):
   # @param i_j index j.
   # @param i_k index k.
   # @param i_l index l.
-  # @return vertices of the sub-cell.
+  # @return lattice points of the sub-cell's vertices.
   ##
   def tetUp( i_j,
              i_k,
              i_l ):
     l_ves = []
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j,   i_k,   i_l  ) ] ]  ]
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j+1, i_k,   i_l  ) ] ]  ]
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j,   i_k+1, i_l  ) ] ]  ]
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j,   i_k,   i_l+1) ] ]  ]
+    l_ves = l_ves + [  (i_j,   i_k,   i_l  )  ]
+    l_ves = l_ves + [  (i_j+1, i_k,   i_l  )  ]
+    l_ves = l_ves + [  (i_j,   i_k+1, i_l  )  ]
+    l_ves = l_ves + [  (i_j,   i_k,   i_l+1)  ]
     return l_ves
 
   ##
@@ -128,16 +116,16 @@ def subTets( i_deg ):
   # @param i_j index j.
   # @param i_k index k.
   # @param i_l index l.
-  # @return vertices of the sub-cell.
+  # @return lattice points of the sub-cell's vertices.
   ##
   def tetDo( i_j,
              i_k,
              i_l ):
     l_ves = []
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j+1, i_k,   i_l+1) ] ]  ]
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j+1, i_k+1, i_l+1) ] ]  ]
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j+1, i_k+1, i_l  ) ] ]  ]
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j,   i_k+1, i_l+1) ] ]  ]
+    l_ves = l_ves + [  (i_j+1, i_k,   i_l+1)  ]
+    l_ves = l_ves + [  (i_j+1, i_k+1, i_l+1)  ]
+    l_ves = l_ves + [  (i_j+1, i_k+1, i_l  )  ]
+    l_ves = l_ves + [  (i_j,   i_k+1, i_l+1)  ]
     return l_ves
 
   ##
@@ -161,16 +149,16 @@ def subTets( i_deg ):
   # @param i_j index j.
   # @param i_k index k.
   # @param i_l index l.
-  # @return vertices of the sub-cell.
+  # @return lattice points of the sub-cell's vertices.
   ##
   def tetH1( i_j,
              i_k,
              i_l ):
     l_ves = []
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j+1, i_k,   i_l  ) ] ]  ]
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j+1, i_k+1, i_l  ) ] ]  ]
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j,   i_k+1, i_l  ) ] ]  ]
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j,   i_k+1, i_l+1) ] ]  ]
+    l_ves = l_ves + [  (i_j+1, i_k,   i_l  )  ]
+    l_ves = l_ves + [  (i_j+1, i_k+1, i_l  )  ]
+    l_ves = l_ves + [  (i_j,   i_k+1, i_l  )  ]
+    l_ves = l_ves + [  (i_j,   i_k+1, i_l+1)  ]
     return l_ves
 
   ##
@@ -194,16 +182,16 @@ def subTets( i_deg ):
   # @param i_j index j.
   # @param i_k index k.
   # @param i_l index l.
-  # @return vertices of the sub-cell.
+  # @return lattice points of the sub-cell's vertices.
   ##
   def tetH2( i_j,
              i_k,
              i_l ):
     l_ves = []
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j+1, i_k,   i_l  ) ] ]  ]
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j+1, i_k,   i_l+1) ] ]  ]
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j,   i_k+1, i_l+1) ] ]  ]
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j,   i_k,   i_l+1) ] ]  ]
+    l_ves = l_ves + [  (i_j+1, i_k,   i_l  )  ]
+    l_ves = l_ves + [  (i_j+1, i_k,   i_l+1)  ]
+    l_ves = l_ves + [  (i_j,   i_k+1, i_l+1)  ]
+    l_ves = l_ves + [  (i_j,   i_k,   i_l+1)  ]
     return l_ves
 
   ##
@@ -227,16 +215,16 @@ def subTets( i_deg ):
   # @param i_j index j.
   # @param i_k index k.
   # @param i_l index l.
-  # @return vertices of the sub-cell.
+  # @return lattice points of the sub-cell's vertices.
   ##
   def tetH3( i_j,
              i_k,
              i_l ):
     l_ves = []
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j,   i_k+1, i_l  ) ] ]  ]
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j,   i_k+1, i_l+1) ] ]  ]
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j,   i_k,   i_l+1) ] ]  ]
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j+1, i_k,   i_l  ) ] ]  ]
+    l_ves = l_ves + [  (i_j,   i_k+1, i_l  )  ]
+    l_ves = l_ves + [  (i_j,   i_k+1, i_l+1)  ]
+    l_ves = l_ves + [  (i_j,   i_k,   i_l+1)  ]
+    l_ves = l_ves + [  (i_j+1, i_k,   i_l  )  ]
     return l_ves
 
   ##
@@ -260,37 +248,65 @@ def subTets( i_deg ):
   # @param i_j index j.
   # @param i_k index k.
   # @param i_l index l.
-  # @return vertices of the sub-cell.
+  # @return lattice points of the sub-cell's vertices.
   ##
   def tetH4( i_j,
              i_k,
              i_l ):
     l_ves = []
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j+1, i_k,   i_l  ) ] ]  ]
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j+1, i_k+1, i_l  ) ] ]  ]
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j,   i_k+1, i_l+1) ] ]  ]
-    l_ves = l_ves + [  l_svs[ l_mono[ (i_j+1, i_k,   i_l+1) ] ]  ]
+    l_ves = l_ves + [  (i_j+1, i_k,   i_l  )  ]
+    l_ves = l_ves + [  (i_j+1, i_k+1, i_l  )  ]
+    l_ves = l_ves + [  (i_j,   i_k+1, i_l+1)  ]
+    l_ves = l_ves + [  (i_j+1, i_k,   i_l+1)  ]
     return l_ves
 
-  # generate sub-cell tets
+  # derive the vertex ids of all sub-cells, separated by type
+  l_ids = []
+  for l_te in [ tetUp, tetDo, tetH1, tetH2, tetH3, tetH4 ]:
+    l_pts = l_te( l_hes[:, 0], l_hes[:, 1], l_hes[:, 2] )
+    l_pts = numpy.stack( [ numpy.stack( l_pt, axis=1 ) for l_pt in l_pts ], axis=1 )
+    l_ids = l_ids + [ Lattice.monoSimplex( l_pts, l_ty.n_ses ).tolist() ]
+
+  # the downward-pointing tet and the octahedron holes fit into the element only if the hex is sufficiently far from the fourth face
+  l_sums = l_hes.sum( axis=1 ).tolist()
+
   l_subTets = []
+  for l_he in range(len(l_hes)):
+    l_subTets = l_subTets + [ [ l_ids[0][l_he] ] ]
+
+    if( l_sums[l_he] + 3 <= l_ty.n_ses ):
+      l_subTets[-1] = l_subTets[-1] + [ l_ids[1][l_he] ]
+    else:
+      l_subTets[-1] = l_subTets[-1] + [ [] ]
+
+    if( l_sums[l_he] + 2 <= l_ty.n_ses ):
+      l_subTets[-1] = l_subTets[-1] + [ l_ids[l_te][l_he] for l_te in range(2, 6) ]
+    else:
+      l_subTets[-1] = l_subTets[-1] + [ [], [], [], [] ]
+
+  return l_subTets
+
+##
+# Derives the sub-tets in an element, separated by their tet-type.
+#
+# @param i_deg polynomial degree.
+# @return 1) vertices of sub-cells per hex, sorted dimension-wise. Per entry by (up, down, H1, H2, H3, H4), empty list if not part of the element.
+#         2) (i,j,k) -> mono indices.
+##
+def subTets( i_deg ):
+  l_ty = edge_pre.types.Tet.Tet( i_deg )
+
+  # get sub-vertices
+  l_svs = svs( i_deg )
+
+  # assemble mono-indices
+  l_mono = {}
+  for l_id, l_pt in enumerate( Lattice.simplex( 3, l_ty.n_ses ).tolist() ):
+    l_mono[ tuple(l_pt) ] = l_id
+
+  # convert the vertex ids to coordinates
+  l_subTets = [ [ [ l_svs[l_ve] for l_ve in l_sc ] for l_sc in l_he ] for l_he in subTetIds( i_deg ) ]
 
-  for l_e3 in range(l_ty.n_ses):
-    for l_e2 in range(l_ty.n_ses - l_e3):
-      for l_e1 in range(l_ty.n_ses - l_e3 - l_e2):
-        l_subTets = l_subTets + [ [ tetUp(l_e1, l_e2, l_e3) ] ]
-    
-        if(l_e1+1, l_e2+1, l_e3+1) in l_mono.keys():
-          l_subTets[-1] = l_subTets[-1] + [ tetDo(l_e1, l_e2, l_e3) ]
-        else:
-          l_subTets[-1] = l_subTets[-1] + [ [] ]
-        if(l_e1+1, l_e2+1, l_e3) in l_mono.keys():
-          l_subTets[-1] = l_subTets[-1] + [ tetH1(l_e1, l_e2, l_e3) ]
-          l_subTets[-1] = l_subTets[-1] + [ tetH2(l_e1, l_e2, l_e3) ]
-          l_subTets[-1] = l_subTets[-1] + [ tetH3(l_e1, l_e2, l_e3) ]
-          l_subTets[-1] = l_subTets[-1] + [ tetH4(l_e1, l_e2, l_e3) ]
-        else:
-          l_subTets[-1] = l_subTets[-1] + [ [], [], [], [] ]
   return l_subTets, l_mono
 
 ##
@@ -300,88 +316,47 @@ def subTets( i_deg ):
 # @return three lists (inner, send, recv sub-cells) containing the vertex ids of the sub-cells.
 ##
 def scSv( i_deg ):
-  # get sub-vertices
-  l_svs = svs( i_deg )
+  l_ty = edge_pre.types.Tet.Tet( i_deg )
+
+  # get lattice points of the sub-vertices
+  l_pts = Lattice.simplex( 3, l_ty.n_ses )
 
   # get sub-tets
-  l_subTets = subTets( i_deg )[0]
+  l_subTets = subTetIds( i_deg )
 
   # determine vertices at the DG surface
-  l_svsBnd = [ [], [], [], [] ]
-  for l_sv in l_svs:
-    # fist face
-    if( l_sv[2] == 0 ):
-      l_svsBnd[0] = l_svsBnd[0] + [l_sv]
-    # second face
-    if( l_sv[1] == 0 ):
-      l_svsBnd[1] = l_svsBnd[1] + [l_sv]
-    # third face
-    if( l_sv[0] == 0 ):
-      l_svsBnd[2] = l_svsBnd[2] + [l_sv]
-    # fourth face
-    if( l_sv[0] == sympy.sympify(1)-l_sv[1]-l_sv[2]):
-      l_svsBnd[3] = l_svsBnd[3] + [l_sv]
+  l_svsBnd = numpy.stack( [ l_pts[:, 2] == 0,                      # first face
+                            l_pts[:, 1] == 0,                      # second face
+                            l_pts[:, 0] == 0,                      # third face
+                            l_pts.sum( axis=1 ) == l_ty.n_ses ] ) # fourth face
 
   # make sure that the sizes match
-  assert( len(l_svsBnd[0]) == len(l_svsBnd[1]) )
-  assert( len(l_svsBnd[0]) == len(l_svsBnd[2]) )
-  assert( len(l_svsBnd[0]) == len(l_svsBnd[3]) )
+  assert( numpy.all( l_svsBnd.sum( axis=1 ) == l_svsBnd[0].sum() ) )
 
-  ##
-  # Determines the DG-faces of a sub-cell
-  #
-  # @return list of indices of DG-faces, empty if inner-sub-cell
-  ##
-  def dgFaces( i_svs ):
-    l_dgFaces = []
-
-    # iterate over DG-faces
-    for l_dg in range(4):
-      # count number of sub-vertices, which are part of the DG-face
-      l_count = 0
-      for l_sv in i_svs:
-        if l_sv in l_svsBnd[l_dg]:
-          l_count = l_count+1
-      # three vertices per DG-face at most
-      assert( l_count <= 3 )
-
-      # add DG-face, if shared with sub-cell
-      if( l_count == 3):
-        l_dgFaces = l_dgFaces + [ l_dg ]
-    return l_dgFaces
+  # flatten the existing sub-tets
+  l_scs = [ l_sc for l_he in l_subTets for l_sc in l_he if l_sc != [] ]
 
-  ##
-  # Gets the vertex ids of the given sub-vertices.
-  #
-  # @param i_svCoords coordinates of the vertices.
-  # @return ids of the vertices.
-  ##
-  def getSvIds( i_svCoords ):
-    l_ids = []
-    for l_sv in i_svCoords:
-      assert( l_sv in l_svs )
-      l_ids = l_ids + [ l_svs.index( l_sv ) ]
-    return l_ids
+  # count number of sub-vertices, which are part of the DG-faces
+  l_counts = l_svsBnd[:, numpy.array( l_scs, dtype=numpy.int64 ) ].sum( axis=2 )
+
+  # three vertices per DG-face at most
+  assert( numpy.all( l_counts <= 3 ) )
 
   # define empty inner, send- and receive sub-cells
   l_scSvIn, l_scSvSendFa = [], [ [], [], [], [] ]
 
   # determine inner and send
-  for l_he in l_subTets:
-    for l_sc in l_he:
-      # ignore non-existent tets
-      if l_sc == []: continue
-
-      l_dgFaces = dgFaces( l_sc )
-
-      # if empty: inner
-      if len(l_dgFaces) == 0:
-        l_scSvIn = l_scSvIn + [ getSvIds(l_sc) ]
-        getSvIds( l_sc )
-      # otherwise send
-      else:
-        for l_fa in l_dgFaces:
-          l_scSvSendFa[l_fa] = l_scSvSendFa[l_fa] + [ getSvIds(l_sc) ]
+  for l_id, l_sc in enumerate( l_scs ):
+    # DG-faces shared with sub-cell
+    l_dgFaces = numpy.flatnonzero( l_counts[:, l_id] == 3 ).tolist()
+
+    # if empty: inner
+    if len(l_dgFaces) == 0:
+      l_scSvIn = l_scSvIn + [ l_sc ]
+    # otherwise send
+    else:
+      for l_fa in l_dgFaces:
+        l_scSvSendFa[l_fa] = l_scSvSendFa[l_fa] + [ list(l_sc) ]
 
   # check sizes
   assert( i_deg == 0 or
@@ -394,9 +369,11 @@ def scSv( i_deg ):
 
   # unify send sub-cells (removes duplicates at edges and vertices)
   l_scSvSend = []
+  l_unique = set()
   for l_fa in l_scSvSendFa:
     for l_sc in l_fa:
-      if l_sc not in l_scSvSend:
+      if tuple(l_sc) not in l_unique:
+        l_unique.add( tuple(l_sc) )
         l_scSvSend = l_scSvSend + [l_sc]
 
   # determine receive sub-cells
@@ -405,7 +382,7 @@ def scSv( i_deg ):
     for l_se in l_scSvSendFa[l_fa]:
       l_scSvRecv = l_scSvRecv + [[]]
       for l_sv in l_se:
-        if( l_svs[l_sv] in l_svsBnd[l_fa] ):
+        if( l_svsBnd[l_fa][l_sv] ):
           l_scSvRecv[-1] = l_scSvRecv[-1] + [l_sv]
       # check for all three vertices
       assert( len(l_scSvRecv[-1]) == 3)
@@ -420,8 +397,6 @@ def scSv( i_deg ):
         l_scSvRecv[-1][2] = l_tmp
 
   # perform transpose of hex-order for first and third face, following the element's face coords
-  l_ty = edge_pre.types.Tet.Tet( i_deg )
-
   for l_fa in [0,2]:
     l_trans = []
     for l_e1 in range(l_ty.n_ses):
@@ -498,21 +473,12 @@ def scSfSc( i_deg ):
   return l_scSfScIn, l_scSfScSend, l_scSfScRecv
 
 ##
-# Integration intervals for the sub-cells
+# Affine mappings of the sub-cells.
 #
 # @param i_deg polynomial degree.
-# @param i_syms symbols.
-# @return 1) mappings, 2) absolute values of Jacobi determinant.
+# @return 1) matrices A, 2) vectors b, 3) absolute values of Jacobi determinant of the mappings x = A xi + b.
 ##
-def intSc( i_deg, i_syms ):
-  assert( len(i_syms) == 3 )
-
-  # Tetrahedral shape functions
-  l_shape = [ 1 - i_syms[0] - i_syms[1] - i_syms[2],
-              i_syms[0],
-              i_syms[1],
-              i_syms[2] ]
-  
+def affSc( i_deg ):
   # get sub-cell coords
   l_svs = svs( i_deg )
   l_scSv = scSv( i_deg )[0:2]
@@ -522,7 +488,20 @@ def intSc( i_deg, i_syms ):
 
   l_ty = edge_pre.types.Tet.Tet( i_deg )
 
-  return Generic.intSc( i_deg, l_ty, i_syms, l_shape, l_svs, l_scSv[0:2], l_scSfSc[2] )
+  # images of the reference element's origin and unit points: vertices 0 (origin), 1 (xi_0=1), 2 (xi_1=1) and 3 (xi_2=1)
+  return Generic.affSc( l_ty, [ 0, 1, 2, 3 ], l_svs, l_scSv[0:2], l_scSfSc[2] )
+
+##
+# Integration intervals for the sub-cells
+#
+# @param i_deg polynomial degree.
+# @param i_syms symbols.
+# @return 1) mappings, 2) absolute values of Jacobi determinant.
+##
+def intSc( i_deg, i_syms ):
+  assert( len(i_syms) == 3 )
+
+  return Generic.intSc( i_syms, affSc( i_deg ) )
 
 ##
 # Derives the integration intervals for the sub-faces at the DG-faces.
@@ -658,86 +637,68 @@ def scTySf( i_deg ):
   if( i_deg == 0 ):
     return [], [ [0,1,2,3] ]
 
-  # get sub-vertices
-  l_svs = svs( i_deg )
+  l_nSes = edge_pre.types.Tet.Tet( i_deg ).n_ses
+
+  # get lattice points of the sub-vertices
+  l_pts = Lattice.simplex( 3, l_nSes )
 
   # get sub-faces
   l_scSfSvIn, l_scSfSvSend, l_scSfSvRecv = scSfSv( i_deg )
 
-  # define normals
-  l_normals = []
-  l_normals = l_normals + [ sympy.Matrix( [0,0,1] )                ]
-  l_normals = l_normals + [ sympy.Matrix( [0,1,0] )                ]
-  l_normals = l_normals + [ sympy.Matrix( [1,0,0] )                ]
-  l_normals = l_normals + [ sympy.Matrix( [-sympy.sqrt(Fra(1,3)),
-                                           -sympy.sqrt(Fra(1,3)),
-                                           -sympy.sqrt(Fra(1,3))] ) ]
-  l_normals = l_normals + [ sympy.Matrix( [-sympy.sqrt(Fra(1,2)),
-                                           -sympy.sqrt(Fra(1,2)),
-                                            0] )                   ]
-  l_normals = l_normals + [ sympy.Matrix( [-sympy.sqrt(Fra(1,2)),
-                                            0,
-                                           -sympy.sqrt(Fra(1,2))] ) ]
+  # define integer normals: DG-faces 0-3, add-faces 0-1
+  l_normals = [ [ 0,  0,  1],
+                [ 0,  1,  0],
+                [ 1,  0,  0],
+                [-1, -1, -1],
+                [-1, -1,  0],
+                [-1,  0, -1] ]
+
+  # lookup table for the directions of the normals, each component is -1, 0 or 1: 1) type of normal, 2) 1 if same direction, 0 if opposite
+  l_lookup = numpy.full( (27, 2), -1, dtype=numpy.int64 )
+  for l_no in range(len(l_normals)):
+    for l_ri in range(2):
+      l_dir = numpy.array( l_normals[l_no] ) * (2*l_ri-1)
+      l_lookup[ numpy.dot( l_dir+1, [9, 3, 1] ) ] = [ l_no, l_ri ]
 
   # define empty sub-cell types
   l_scTySf = [[], []]
 
   # iterate over sub-faces
   for l_ty in range(2):
-    for l_sc in [l_scSfSvIn, l_scSfSvSend][l_ty]:
-      # add empty list
-      l_scTySf[l_ty] = l_scTySf[l_ty] + [[]]
-
-      for l_sf in l_sc:
-        # assemble three points
-        l_or = sympy.Matrix( l_svs[ l_sf[0] ] )
-        l_p0 = sympy.Matrix( l_svs[ l_sf[1] ] )
-        l_p1 = sympy.Matrix( l_svs[ l_sf[2] ] )
-
-        # assemble edges
-        l_e0 = l_p0 - l_or
-        l_e1 = l_p1 - l_or
-
-        # compute normalized cross product
-        l_cr = l_e0.cross( l_e1 ).normalized()
-
-        # determine type of normal
-        for l_no in range(len(l_normals)):
-          if l_cr   == l_normals[l_no]:
-            l_ri = 1
-            break
-          elif l_cr == -l_normals[l_no]:
-            l_ri = 0
-            break
-          # make sure we found the correct normal
-          assert( l_no != len(l_normals)-1 )
-
-        # determine if this a partial DG face
-        l_pd = 0
-
-        if l_ty == 1:
-          # bottom
-          if(   l_or[2] == 0 and l_p0[2] == 0 and l_p1[2] == 0 ):
-            assert( l_no == 0 )
-            l_pd = 1
-          elif( l_or[1] == 0 and l_p0[1] == 0 and l_p1[1] == 0 ):
-            assert( l_no == 1 )
-            l_pd = 1
-          elif( l_or[0] == 0 and l_p0[0] == 0 and l_p1[0] == 0 ):
-            assert( l_no == 2)
-            l_pd = 1
-          elif( l_or[0] == sympy.sympify(1)-l_or[1]-l_or[2] and
-                l_p0[0] == sympy.sympify(1)-l_p0[1]-l_p0[2] and
-                l_p1[0] == sympy.sympify(1)-l_p1[1]-l_p1[2] ):
-            assert( l_no == 3 )
-            l_pd = 1
-
-        # add sub-cell type
-        if l_pd == 0:
-          l_scTySf[l_ty][-1] = l_scTySf[l_ty][-1] + [ 8 + l_ri * 6 +  l_no ]
-        else:
-          assert( l_no < 4 )
-          l_scTySf[l_ty][-1] = l_scTySf[l_ty][-1] + [ 0 + l_ri * 4 +  l_no ]
+    l_sfs = numpy.array( [l_scSfSvIn, l_scSfSvSend][l_ty], dtype=numpy.int64 ).reshape( (-1, 4, 3) )
+
+    # assemble three points per sub-face: [*][][][]: sub-cell, [][*][][]: sub-face, [][][*][]: point, [][][][*]: dimension
+    l_sfPts = l_pts[ l_sfs ]
+
+    # compute the integer cross product of the edges, normalized by the greatest common divisor
+    l_cr = numpy.cross( l_sfPts[:, :, 1] - l_sfPts[:, :, 0],
+                        l_sfPts[:, :, 2] - l_sfPts[:, :, 0] )
+    l_cr = l_cr // numpy.gcd.reduce( l_cr, axis=2 )[:, :, numpy.newaxis]
+
+    # determine type of normal
+    l_no, l_ri = numpy.moveaxis( l_lookup[ numpy.dot( l_cr+1, [9, 3, 1] ) ], 2, 0 )
+
+    # make sure we found the correct normals
+    assert( numpy.all( l_no != -1 ) )
+
+    # determine if this a partial DG face
+    l_pd = numpy.zeros( l_no.shape, dtype=bool )
+
+    if l_ty == 1:
+      # all three points at bottom, second face, third face or fourth face
+      l_dg = numpy.stack( [ l_sfPts[:, :, :, 2] == 0,
+                            l_sfPts[:, :, :, 1] == 0,
+                            l_sfPts[:, :, :, 0] == 0,
+                            l_sfPts.sum( axis=3 ) == l_nSes ] ).all( axis=3 )
+      l_pd = l_dg.any( axis=0 )
+
+      # the normal is the one of the first matching DG-face
+      assert( numpy.all( l_no[l_pd] == l_dg.argmax( axis=0 )[l_pd] ) )
+
+    # add sub-cell types
+    l_scTySf[l_ty] = numpy.where( l_pd,
+                                  0 + l_ri * 4 + l_no,
+                                  8 + l_ri * 6 + l_no ).tolist()
 
   return l_scTySf[0], l_scTySf[1]
 
@@ -23,11 +23,10 @@
 import fractions
 import sympy
 import edge_pre.types.Tria
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot
 from . import Generic
+from . import Lattice
 import math
+import edge_pre.io.Plot
 
 ##
 # Generates vertices of the sub-grid for the given polynomial degree.
@@ -44,11 +43,9 @@ def svs( i_deg ):
   l_inc = fractions.Fraction( l_inc, l_ty.n_sfs )
 
   # vertices
-  l_svs = []
-  for l_f2 in range(l_ty.n_sfs+1):
-    for l_f1 in range(l_ty.n_sfs+1 - l_f2):
-      l_svs = l_svs + [ [ l_ty.ves[0][0] + l_f1*l_inc,
-                          l_ty.ves[0][1] + l_f2*l_inc ] ]
+  l_svs = Lattice.coords( Lattice.simplex( 2, l_ty.n_sfs ),
+                          l_ty.ves[0],
+                          [ l_inc, l_inc ] )
 
   return l_svs
 
@@ -190,20 +187,12 @@ def scSfSc( i_deg ):
   return l_scSfScIn, l_scSfScSend, l_scSfScRecv
 
 ##
-# Integration intervals for the sub-cells
+# Affine mappings of the sub-cells.
 #
 # @param i_deg polynomial degree.
-# @param i_syms symbols.
-# @return 1) mappings, 2) absolute values of Jacobi determinant.
+# @return 1) matrices A, 2) vectors b, 3) absolute values of Jacobi determinant of the mappings x = A xi + b.
 ##
-def intSc( i_deg, i_syms ):
-  assert( len(i_syms) == 2 )
-
-  # tria shape functions
-  l_shape = [ 1 - i_syms[0] - i_syms[1],
-              i_syms[0],
-              i_syms[1] ]
-
+def affSc( i_deg ):
   # get sub-cell coords
   l_svs = svs( i_deg )
   l_scSv = scSv( i_deg )[0:2]
@@ -213,7 +202,20 @@ def intSc( i_deg, i_syms ):
 
   l_ty = edge_pre.types.Tria.Tria( i_deg )
 
-  return Generic.intSc( i_deg, l_ty, i_syms, l_shape, l_svs, l_scSv[0:2], l_scSfSc[2] )
+  # images of the reference element's origin and unit points: vertices 0 (origin), 1 (xi_0=1) and 2 (xi_1=1)
+  return Generic.affSc( l_ty, [ 0, 1, 2 ], l_svs, l_scSv[0:2], l_scSfSc[2] )
+
+##
+# Integration intervals for the sub-cells
+#
+# @param i_deg polynomial degree.
+# @param i_syms symbols.
+# @return 1) mappings, 2) absolute values of Jacobi determinant.
+##
+def intSc( i_deg, i_syms ):
+  assert( len(i_syms) == 2 )
+
+  return Generic.intSc( i_syms, affSc( i_deg ) )
 
 ##
 # Derives the integration intervals for the sub-faces at the DG-faces.
@@ -363,8 +365,10 @@ def scDgAd( i_deg ):
 # @param i_scSvSend sub-vertices adjacent to send sub-cells.
 ##
 def plot( i_out, i_svs, i_scSvIn, i_scSvSend ):
+  l_mpl = edge_pre.io.Plot.matplotlib()
+
   l_size = max( int( math.sqrt( len( i_scSvIn)+len(i_scSvSend) ) ) - 1, 3 )
-  l_fig = matplotlib.pyplot.figure( figsize=(l_size, l_size) )
+  l_fig = l_mpl.pyplot.figure( figsize=(l_size, l_size) )
 
   l_plt = l_fig.add_subplot(111)
   l_plt.set_aspect(1)
@@ -376,16 +380,16 @@ def plot( i_out, i_svs, i_scSvIn, i_scSvSend ):
   # @param i_scSv vertices adjacent to the sub-cell.
   ##
   def path( i_ves, i_scSv ):
-    l_code = [ matplotlib.path.Path.MOVETO,
-               matplotlib.path.Path.LINETO,
-               matplotlib.path.Path.LINETO,
-               matplotlib.path.Path.CLOSEPOLY ]
-
-    l_path = matplotlib.path.Path( [ i_svs[ i_scSv[0] ],
-                                     i_svs[ i_scSv[1] ],
-                                     i_svs[ i_scSv[2] ],
-                                     i_svs[ i_scSv[0] ] ],
-                                     l_code )
+    l_code = [ l_mpl.path.Path.MOVETO,
+               l_mpl.path.Path.LINETO,
+               l_mpl.path.Path.LINETO,
+               l_mpl.path.Path.CLOSEPOLY ]
+
+    l_path = l_mpl.path.Path( [ i_svs[ i_scSv[0] ],
+                                i_svs[ i_scSv[1] ],
+                                i_svs[ i_scSv[2] ],
+                                i_svs[ i_scSv[0] ] ],
+                                l_code )
     return l_path
 
   ##
@@ -411,16 +415,16 @@ def plot( i_out, i_svs, i_scSvIn, i_scSvSend ):
 
   l_id = 0
   for l_in in i_scSvIn:
-    l_patch = matplotlib.patches.PathPatch( path(i_svs, l_in), lw=2, facecolor='white' )
+    l_patch = l_mpl.patches.PathPatch( path(i_svs, l_in), lw=2, facecolor='white' )
     l_plt.add_patch( l_patch )
     annotate( str(l_id), i_svs, l_in, 'black', l_plt )
     l_id = l_id + 1
   for l_se in i_scSvSend:
-    l_patch = matplotlib.patches.PathPatch( path(i_svs, l_se), lw=2, facecolor='black', edgecolor='white' )
+    l_patch = l_mpl.patches.PathPatch( path(i_svs, l_se), lw=2, facecolor='black', edgecolor='white' )
     l_plt.add_patch( l_patch )
     annotate( str(l_id), i_svs, l_se, 'white', l_plt )
     l_id = l_id + 1
 
   # save plot
   l_fig.savefig( i_out )
-  matplotlib.pyplot.close()
+  l_mpl.pyplot.close()
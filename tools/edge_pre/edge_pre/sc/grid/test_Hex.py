@@ -461,6 +461,43 @@ class TestGridHex( unittest.TestCase ):
 
     self.assertEqual( l_scSfScRecv[33], [9, -1, -1, -1, -1, -1] )
 
+  ##
+  # Tests the affine mappings of the sub-cells.
+  ##
+  def test_affSc(self):
+    l_As, l_bs, l_aDets = Hex.affSc( 1 )
+
+    # inner sub-cell
+    self.assertEqual( l_As[0].tolist(), [ [ [Fra(1,3), 0,        0       ],
+                                            [0,        Fra(1,3), 0       ],
+                                            [0,        0,        Fra(1,3)] ] ] )
+    self.assertEqual( l_bs[0].tolist(), [ [Fra(1,3), Fra(1,3), Fra(1,3)] ] )
+
+    # send sub-cells are axis-aligned as well and cover the remaining volume
+    self.assertEqual( len(l_bs[1]), 26 )
+    for l_ma in l_As[1]:
+      self.assertEqual( l_ma.tolist(), l_As[0][0].tolist() )
+    self.assertEqual( sum( l_aDets[0] ) + sum( l_aDets[1] ), 1 )
+
+    # receive sub-cells, the first face is the bottom face
+    self.assertEqual( l_bs[2].shape, (6, 9, 3) )
+    for l_sc in range(9):
+      self.assertEqual( l_bs[2][0][l_sc][2], 0 )
+      self.assertEqual( l_aDets[2][0][l_sc], Fra(1,27) )
+
+  ##
+  # Tests the symbolic integration intervals of the sub-cells.
+  ##
+  def test_intSc(self):
+    l_xi0, l_xi1, l_xi2 = sympy.symbols('xi_0 xi_1 xi_2')
+    l_maps, l_absDets = Hex.intSc( 1, [l_xi0, l_xi1, l_xi2] )
+
+    self.assertEqual( l_maps[0], [ [ l_xi0/3 + Fra(1,3), l_xi1/3 + Fra(1,3), l_xi2/3 + Fra(1,3) ] ] )
+    self.assertEqual( l_absDets[0], [ sympy.Rational(1,27) ] )
+    self.assertEqual( l_maps[1][0], [ l_xi0/3, l_xi1/3, l_xi2/3 ] )
+    self.assertEqual( len(l_maps[2]), 6 )
+    self.assertEqual( len(l_maps[2][0]), 9 )
+
   ##
   # Tests integration intervals for DG sub-faces.
   ##
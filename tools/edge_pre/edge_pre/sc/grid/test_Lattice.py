@@ -0,0 +1,80 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Unit tests for the integer lattices of the sub-grids.
+##
+import unittest
+import fractions
+import numpy
+from . import Lattice
+
+class TestGridLattice( unittest.TestCase ):
+  ##
+  # Tests generation of lattice points.
+  ##
+  def test_pts(self):
+    # box, first dimension runs fastest
+    l_pts = Lattice.box( 2, 1 )
+    self.assertEqual( l_pts.tolist(), [ [0,0], [1,0], [0,1], [1,1] ] )
+
+    l_pts = Lattice.box( 3, 2 )
+    self.assertEqual( len(l_pts), 27 )
+    self.assertEqual( l_pts[5].tolist(), [2,1,0] )
+    self.assertEqual( l_pts[9].tolist(), [0,0,1] )
+
+    # simplex
+    l_pts = Lattice.simplex( 2, 2 )
+    self.assertEqual( l_pts.tolist(), [ [0,0], [1,0], [2,0], [0,1], [1,1], [0,2] ] )
+
+    l_pts = Lattice.simplex( 3, 1 )
+    self.assertEqual( l_pts.tolist(), [ [0,0,0], [1,0,0], [0,1,0], [0,0,1] ] )
+
+    for l_nd in range(1, 4):
+      for l_n in range(0, 7):
+        self.assertEqual( len( Lattice.simplex( l_nd, l_n ) ), Lattice.nSimplex( l_nd, l_n ) )
+
+  ##
+  # Tests the arithmetic mono-indices.
+  ##
+  def test_mono(self):
+    for l_nd in range(1, 4):
+      for l_n in range(0, 7):
+        l_pts = Lattice.box( l_nd, l_n )
+        self.assertEqual( Lattice.monoBox( l_pts, l_n ).tolist(), list(range(len(l_pts))) )
+
+        l_pts = Lattice.simplex( l_nd, l_n )
+        self.assertEqual( Lattice.monoSimplex( l_pts, l_n ).tolist(), list(range(len(l_pts))) )
+
+    # single points and additional leading dimensions
+    self.assertEqual( Lattice.monoSimplex( [1,1,0], 2 ), 4 )
+    self.assertEqual( Lattice.monoSimplex( [ [ [0,0,2], [0,1,1] ] ], 2 ).tolist(), [ [9, 8] ] )
+
+  ##
+  # Tests the conversion to rational coordinates.
+  ##
+  def test_coords(self):
+    l_svs = Lattice.coords( Lattice.simplex( 2, 3 ),
+                            [ 0, 0 ],
+                            [ fractions.Fraction(1, 3), fractions.Fraction(1, 3) ] )
+
+    self.assertEqual( len(l_svs), 10 )
+    self.assertEqual( l_svs[1], [ fractions.Fraction(1, 3), 0 ] )
+    self.assertEqual( l_svs[8], [ fractions.Fraction(1, 3), fractions.Fraction(2, 3) ] )
+    self.assertEqual( type(l_svs[8][1]), fractions.Fraction )
@@ -524,6 +524,12 @@ class TestGridTet( unittest.TestCase ):
     self.assertEqual( l_scTySfSend[12], [12,  1, 19, 14] ),
     self.assertEqual( l_scTySfSend[18], [ 8,  9,  2,  3] ),
 
+    # partial DG-faces are part of send sub-cells only, one per sub-face of the DG-faces
+    for l_de in range(1, 5):
+      l_scTySfIn, l_scTySfSend = Tet.scTySf( l_de )
+      self.assertEqual( sum( [ l_ty < 8 for l_sc in l_scTySfIn   for l_ty in l_sc ] ), 0 )
+      self.assertEqual( sum( [ l_ty < 8 for l_sc in l_scTySfSend for l_ty in l_sc ] ), 4 * (2*l_de+1)**2 )
+
   ##
   # Tests the sub-cell reordering for sub-cells at face of adjacent elements
   ##
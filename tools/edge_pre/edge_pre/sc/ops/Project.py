@@ -21,7 +21,9 @@
 # Projection operators.
 ##
 import sympy
+import numpy
 import edge_pre.int.Scalar
+import edge_pre.int.Restrict
 
 ##
 # Derives the scatter operator (DG -> sub-cell)
@@ -46,26 +48,73 @@ def scatter( i_syms,
   # compute entries
   for l_co in range(len(i_maps)):
     l_scVol = l_refVol * i_aDets[l_co]
-    for l_ro in range(len(i_basis)):
-      # assemble basis
-      l_basis = i_basis[l_ro]
-
-      # assemble substitutions
-      l_subs = {}
-      for l_di in range( len(i_int) ):
-        l_subs[ i_syms[l_di] ] = i_maps[l_co][l_di]
 
-      # substitute
-      l_basis = l_basis.subs( l_subs, simultaneous=True )
+    # restrict basis to the sub-cell
+    l_basis = edge_pre.int.Restrict.restrict( i_basis, i_syms[0:len(i_int)], i_maps[l_co][0:len(i_int)] )
 
+    for l_ro in range(len(i_basis)):
       # intergrate basis for sub-cell
-      l_mat[l_ro, l_co] = edge_pre.int.Scalar.int( l_basis, i_int )[0]
+      l_mat[l_ro, l_co] = edge_pre.int.Scalar.int( l_basis[l_ro], i_int )[0]
       l_mat[l_ro, l_co] = l_mat[l_ro, l_co] * i_aDets[l_co]
       # devide by sub-cell volume (integration vs. average)
       l_mat[l_ro, l_co] = l_mat[l_ro, l_co] / l_scVol
 
   return l_mat
 
+##
+# Derives the gather operator (sub-cell -> DG) from the scatter operator.
+#   The least-squares fit of the sub-cell averages, constrained by conservation, leads to the KKT system
+#
+#     | 2 S S^T    -S v |   | G^T    |   | 2 S  |
+#     |                 | * |        | = |      |
+#     | -(S v)^T    0   |   | lambda |   | -v^T |
+#
+#   with the scatter matrix S and the sub-cell volumes v.
+#   The system is solved through a single LU factorization for all right-hand sides, either in exact rational (sympy) or in floating point (numpy) arithmetic.
+#
+# @param i_scatter scatter matrix (#basis x #sub-cells), sympy matrix (exact) or numpy array (float).
+# @param i_vols volumes of the sub-cells.
+# @return gather matrix (#sub-cells x #basis).
+##
+def gatherOp( i_scatter,
+              i_vols ):
+  l_nBa = i_scatter.shape[0]
+  l_nSc = i_scatter.shape[1]
+
+  if( isinstance( i_scatter, numpy.ndarray ) ):
+    l_vols = numpy.array( [ float(l_vo) for l_vo in i_vols ] )
+
+    l_aL = numpy.zeros( (l_nBa+1, l_nBa+1) )
+    l_aR = numpy.zeros( (l_nBa+1, l_nSc) )
+    l_sv = i_scatter @ l_vols
+  else:
+    l_vols = sympy.Matrix( i_vols )
+
+    l_aL = sympy.zeros( l_nBa+1, l_nBa+1 )
+    l_aR = sympy.zeros( l_nBa+1, l_nSc )
+    l_sv = i_scatter * l_vols
+
+  # least squares part: sum of the outer products of the sub-cell averages
+  l_aL[0:l_nBa, 0:l_nBa] = 2 * ( i_scatter @ i_scatter.T )
+  l_aR[0:l_nBa, :] = 2 * i_scatter
+
+  # lagrange multiplier part, integrals over the entire DG element
+  for l_rc in range(l_nBa):
+    l_aL[ l_nBa, l_rc ] = -l_sv[l_rc]
+    l_aL[ l_rc, l_nBa ] = -l_sv[l_rc]
+  for l_sc in range(l_nSc):
+    l_aR[ l_nBa, l_sc ] = -l_vols[l_sc]
+
+  # determine gather operator
+  if( isinstance( i_scatter, numpy.ndarray ) ):
+    l_gather = numpy.linalg.solve( l_aL, l_aR )
+  else:
+    l_gather = l_aL.LUsolve( l_aR )
+  l_gather = l_gather[0:l_nBa, :]
+
+  # derivation is assuming DG DOFs and sub-cell DOFs as column-vectors -> transpose
+  return l_gather.T
+
 ##
 # Derives the gather operator (sub-cell -> DG)
 #
@@ -80,71 +129,8 @@ def gather( i_syms,
             i_int,
             i_maps,
             i_aDets ):
-  # left matrix Al
-  l_aL = sympy.zeros( len(i_basis)+1, len(i_basis)+1 )
-
-  # assemble substitutions
-  l_subs = []
-  for l_sc in range(len(i_maps)):
-    l_subs = l_subs + [ {} ]
-    for l_di in range( len(i_syms) ):
-      l_subs[-1][ i_syms[l_di] ] = i_maps[l_sc][l_di]
-
   # volume of the reference element
   l_volRef = edge_pre.int.Scalar.int( 1, i_int )[0]
 
-  # least squares part of Al
-  for l_sc in range(len(i_maps)):
-    l_scVol = l_volRef * i_aDets[l_sc]
-
-    for l_ro in range(len(i_basis)):
-      for l_co in range(len(i_basis)):
-        # integrands
-        l_int0 = i_basis[l_ro].subs( l_subs[l_sc], simultaneous=True )
-        l_int1 = i_basis[l_co].subs( l_subs[l_sc], simultaneous=True )
-
-        # sum product over all sub-cells
-        l_cont =   edge_pre.int.Scalar.int( l_int0, i_int )[0] \
-                 * edge_pre.int.Scalar.int( l_int1, i_int )[0]
-        # scale
-        l_cont = l_cont * i_aDets[l_sc]**2
-        l_cont = l_cont * 2
-        l_cont = l_cont / l_scVol**2
-
-        # add sub-cell contribution
-        l_aL[l_ro, l_co] = l_aL[l_ro, l_co] + l_cont
-
-  # lagrange multiplier part of Al
-  for l_rc in range(len(i_basis)):
-    # integrate over entire DG element, by adding sub-intervals
-    for l_sc in range(len(i_maps)):
-      l_scInt = edge_pre.int.Scalar.int( i_basis[l_rc].subs( l_subs[l_sc], simultaneous=True ), i_int )[0]
-      l_scInt = l_scInt * i_aDets[l_sc]
-
-      l_aL[ len(i_basis), l_rc ] =  l_aL[ len(i_basis), l_rc ] - l_scInt
-    # symmetry for last column
-    l_aL[ l_rc, len(i_basis) ] = l_aL[ len(i_basis), l_rc ]
-
-  # right matrix Ar
-  l_aR = sympy.zeros( len(i_basis)+1, len(i_maps) )
-
-  # least squares part is scaled scatter matrix
-  l_aR[0:len(i_basis), :] = scatter( i_syms,\
-                                     i_basis,\
-                                     i_int,\
-                                     i_maps,\
-                                     i_aDets )
-  l_aR = l_aR * 2
-
-  # lagrange multiplier part of Ar
-  for l_sc in range(len(i_maps)):
-    l_aR[len(i_basis),l_sc] = -l_volRef * i_aDets[l_sc]
-
-  # determine gather operator
-  l_gather = l_aL.inv() * l_aR
-  l_gather = l_gather[0:len(i_basis), :]
-
-  # derivation is assuming DG DOFs and sub-cell DOFs as column-vectors -> transpose
-  l_gather = l_gather.T
-
-  return l_gather
+  return gatherOp( scatter( i_syms, i_basis, i_int, i_maps, i_aDets ),
+                   [ l_volRef * l_de for l_de in i_aDets ] )
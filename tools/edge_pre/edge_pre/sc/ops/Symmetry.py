@@ -0,0 +1,175 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Symmetries of the reference elements, used to derive operators of faces from each other.
+##
+import itertools
+import fractions
+import numpy
+import sympy
+import sympy.polys.matrices
+import edge_pre.int.Monomial
+import edge_pre.sc.grid.Lattice
+
+##
+# Derives the symmetries of a reference element as affine mappings x -> A x + b.
+#   Simplices are mapped onto themselves by every permutation of their vertices.
+#   Boxes are mapped onto themselves by the signed permutations of their axes w.r.t. the center.
+#   The identity is the first symmetry.
+#
+# @param i_ves vertices of the reference element.
+# @param i_box true if the reference element is a box (line, quad, hex), false if it is a simplex (line, tria, tet).
+# @return list of symmetries: 1) matrix A, 2) vector b; rational numpy arrays.
+##
+def affines( i_ves,
+             i_box ):
+  l_ves = numpy.array( [ [ fractions.Fraction(l_co) for l_co in l_ve ] for l_ve in i_ves ], dtype=object )
+  l_nDims = l_ves.shape[1]
+
+  l_affs = []
+
+  if( i_box ):
+    l_ce = l_ves.sum( axis=0 ) / len(l_ves)
+
+    for l_pe in itertools.permutations( range(l_nDims) ):
+      for l_si in itertools.product( [1, -1], repeat=l_nDims ):
+        l_a = numpy.full( (l_nDims, l_nDims), fractions.Fraction(0), dtype=object )
+        for l_di in range(l_nDims):
+          l_a[l_di, l_pe[l_di]] = fractions.Fraction( l_si[l_di] )
+
+        l_affs = l_affs + [ ( l_a, l_ce - l_a.dot( l_ce ) ) ]
+  else:
+    # the reference simplices are spanned by the origin and the unit points
+    assert( len(l_ves) == l_nDims+1 )
+    assert( numpy.all( l_ves[1:] - l_ves[0] == numpy.eye( l_nDims, dtype=int ) ) )
+
+    for l_pe in itertools.permutations( range(len(l_ves)) ):
+      l_b = l_ves[ l_pe[0] ]
+      l_a = ( l_ves[ list(l_pe[1:]) ] - l_b ).T
+
+      l_affs = l_affs + [ ( l_a, l_b ) ]
+
+  return l_affs
+
+##
+# Derives the vertices of sub-cells, given by their affine mappings.
+#
+# @param i_As matrices A of the affine mappings x = A xi + b. [*][][]: sub-cell.
+# @param i_bs vectors b of the affine mappings. [*][]: sub-cell.
+# @param i_ves vertices of the reference element.
+# @return vertices of the sub-cells. [*][]: sub-cell, [][*]: vertex (tuple of coordinates).
+##
+def vertices( i_As,
+              i_bs,
+              i_ves ):
+  l_ves = numpy.array( i_ves, dtype=object )
+
+  return [ [ tuple( l_ve ) for l_ve in ( l_ves.dot( l_a.T ) + l_b ).tolist() ] for l_a, l_b in zip( i_As, i_bs ) ]
+
+##
+# Matches sub-cells, mapped by an affine symmetry, to other sub-cells.
+#
+# @param i_A matrix A of the symmetry x -> A x + b.
+# @param i_b vector b of the symmetry.
+# @param i_src vertices of the source sub-cells.
+# @param i_dst vertices of the destination sub-cells.
+# @return for every destination sub-cell the id of the source sub-cell, which is mapped onto it; None if the symmetry does not map the sub-cells onto each other.
+##
+def match( i_A,
+           i_b,
+           i_src,
+           i_dst ):
+  # destination sub-cells, identified by their vertices
+  l_dst = {}
+  for l_id, l_sc in enumerate( i_dst ):
+    l_dst[ frozenset(l_sc) ] = l_id
+
+  l_ids = [ None ] * len(i_dst)
+
+  for l_id, l_sc in enumerate( i_src ):
+    l_sc = frozenset( [ tuple( ( i_A.dot( numpy.array( l_ve, dtype=object ) ) + i_b ).tolist() ) for l_ve in l_sc ] )
+    if( l_sc not in l_dst ):
+      return None
+    l_ids[ l_dst[l_sc] ] = l_id
+
+  if( None in l_ids ):
+    return None
+
+  return l_ids
+
+##
+# Derives the transformations T of a basis under affine symmetries, given by B(A x + b) = T B(x).
+#   The basis is evaluated exactly at a unisolvent set of lattice points, the transformations of all symmetries follow from a single LU solve.
+#
+# @param i_syms symbols.
+# @param i_basis basis functions.
+# @param i_deg polynomial degree of the basis.
+# @param i_box true if the basis is a tensor-product basis on a box, false if it is a complete basis on a simplex.
+# @param i_affs symmetries: 1) matrix A, 2) vector b.
+# @return transformations T (#basis x #basis), one per symmetry.
+##
+def trafos( i_syms,
+            i_basis,
+            i_deg,
+            i_box,
+            i_affs ):
+  l_nDims = len(i_syms)
+  l_nBas = len(i_basis)
+
+  # unisolvent lattice points
+  if( i_box ):
+    l_pts = edge_pre.sc.grid.Lattice.box( l_nDims, i_deg )
+  else:
+    l_pts = edge_pre.sc.grid.Lattice.simplex( l_nDims, i_deg )
+  l_pts = edge_pre.sc.grid.Lattice.coords( l_pts,
+                                           [ 0 ] * l_nDims,
+                                           [ fractions.Fraction(1, i_deg+1) ] * l_nDims )
+  assert( len(l_pts) == l_nBas )
+
+  l_polys = edge_pre.int.Monomial.expand( i_syms, i_basis )
+
+  ##
+  # Evaluates the basis at the given point.
+  #
+  # @param i_pt point.
+  # @return values of the basis functions.
+  ##
+  def evaluate( i_pt ):
+    l_vals = []
+    for l_po in l_polys:
+      l_val = fractions.Fraction(0)
+      for l_ex, l_co in l_po.items():
+        l_mo = l_co
+        for l_di in range(l_nDims):
+          l_mo = l_mo * i_pt[l_di]**l_ex[l_di]
+        l_val = l_val + l_mo
+      l_vals = l_vals + [ sympy.Rational( l_val.numerator, l_val.denominator ) ]
+    return l_vals
+
+  # basis at the points: V, basis at the mapped points: W, one block of columns per symmetry
+  l_v = sympy.Matrix( [ evaluate( l_pt ) for l_pt in l_pts ] )
+  l_w = sympy.Matrix( [ sum( [ evaluate( ( l_a.dot( numpy.array( l_pt, dtype=object ) ) + l_b ).tolist() ) for l_a, l_b in i_affs ], [] ) for l_pt in l_pts ] )
+
+  # W = V T^T
+  l_v = sympy.polys.matrices.DomainMatrix.from_Matrix( l_v ).convert_to( sympy.QQ )
+  l_w = sympy.polys.matrices.DomainMatrix.from_Matrix( l_w ).convert_to( sympy.QQ )
+  l_t = l_v.lu_solve( l_w ).to_Matrix()
+
+  return [ l_t[:, l_sy*l_nBas:(l_sy+1)*l_nBas].T for l_sy in range(len(i_affs)) ]
@@ -30,6 +30,7 @@ import edge_pre.sc.grid.Tet
 import edge_pre.dg.basis.Tet
 from fractions import Fraction as Fra
 import sympy
+import numpy
 
 class TestProject( unittest.TestCase ):
   ##
@@ -251,4 +252,39 @@ class TestProject( unittest.TestCase ):
                                    l_mapsSc[0]+l_mapsSc[1],
                                    l_detsSc[0]+l_detsSc[1] )
 
-      self.assertEqual( l_scatter*l_gather, sympy.eye(len(l_basis)) )
\ No newline at end of file
+      self.assertEqual( l_scatter*l_gather, sympy.eye(len(l_basis)) )
+
+  ##
+  # Tests the gather operator in exact and floating point arithmetic.
+  ##
+  def test_gatherOp(self):
+    l_syms, l_basis = edge_pre.dg.basis.Line.gen( 2 )
+    l_int = [ (l_syms[0], 0, 1) ]
+
+    # five sub-cells of varying size
+    l_bnds = [ 0, Fra(1,10), Fra(3,10), Fra(1,2), Fra(4,5), 1 ]
+    l_maps = [ [ l_bnds[l_sc] + (l_bnds[l_sc+1]-l_bnds[l_sc]) * l_syms[0] ] for l_sc in range(5) ]
+    l_dets = [ sympy.Rational( l_bnds[l_sc+1]-l_bnds[l_sc] ) for l_sc in range(5) ]
+
+    l_scatter = Project.scatter( l_syms, l_basis, l_int, l_maps, l_dets )
+
+    # reference: KKT system of the sub-cell averages, integrated directly and solved through the inverse
+    l_nBa = len(l_basis)
+    l_avgs = sympy.Matrix( [ [ sympy.integrate( l_ba, (l_syms[0], l_bnds[l_sc], l_bnds[l_sc+1]) ) / l_dets[l_sc] for l_sc in range(5) ] for l_ba in l_basis ] )
+    l_aL = sympy.zeros( l_nBa+1, l_nBa+1 )
+    l_aL[0:l_nBa, 0:l_nBa] = 2 * l_avgs * l_avgs.T
+    for l_ba in range(l_nBa):
+      l_aL[l_nBa, l_ba] = -sympy.integrate( l_basis[l_ba], (l_syms[0], 0, 1) )
+      l_aL[l_ba, l_nBa] = l_aL[l_nBa, l_ba]
+    l_aR = sympy.zeros( l_nBa+1, 5 )
+    l_aR[0:l_nBa, :] = 2 * l_avgs
+    l_aR[l_nBa, :] = -sympy.Matrix( [ l_dets ] )
+    l_ref = ( l_aL.inv() * l_aR )[0:l_nBa, :].T
+
+    l_gather = Project.gatherOp( l_scatter, l_dets )
+    self.assertEqual( l_gather, l_ref )
+    self.assertEqual( Project.gather( l_syms, l_basis, l_int, l_maps, l_dets ), l_ref )
+    self.assertEqual( l_scatter*l_gather, sympy.eye(len(l_basis)) )
+
+    l_gatherFl = Project.gatherOp( numpy.array( l_scatter.tolist(), dtype=numpy.float64 ), l_dets )
+    self.assertTrue( numpy.allclose( l_gatherFl, numpy.array( l_gather.tolist(), dtype=numpy.float64 ), rtol=1E-12, atol=1E-12 ) )
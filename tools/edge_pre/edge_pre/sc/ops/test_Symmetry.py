@@ -0,0 +1,91 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Unit tests for the symmetries of the reference elements.
+##
+import unittest
+from fractions import Fraction as Fra
+import numpy
+import sympy
+from . import Symmetry
+import edge_pre.types.Tria
+import edge_pre.types.Hex
+import edge_pre.types.Tet
+import edge_pre.dg.basis.Tria
+import edge_pre.sc.grid.Tria
+
+class TestSymmetry( unittest.TestCase ):
+  ##
+  # Tests the symmetries of the reference elements.
+  ##
+  def test_affines(self):
+    for l_ty, l_box, l_nSys in [ ( edge_pre.types.Tria.Tria( 1 ), False, 6  ),
+                                 ( edge_pre.types.Tet.Tet( 1 ),   False, 24 ),
+                                 ( edge_pre.types.Hex.Hex( 1 ),   True,  48 ) ]:
+      l_affs = Symmetry.affines( l_ty.ves, l_box )
+      self.assertEqual( len(l_affs), l_nSys )
+
+      # identity first
+      self.assertEqual( l_affs[0][0].tolist(), numpy.eye( len(l_ty.ves[0]), dtype=int ).tolist() )
+      self.assertEqual( l_affs[0][1].tolist(), [0] * len(l_ty.ves[0]) )
+
+      # vertices are mapped onto vertices
+      l_ves = set( [ tuple(l_ve) for l_ve in l_ty.ves ] )
+      for l_a, l_b in l_affs:
+        self.assertEqual( set( Symmetry.vertices( [l_a], [l_b], l_ty.ves )[0] ), l_ves )
+
+  ##
+  # Tests matching of sub-cells through symmetries.
+  ##
+  def test_match(self):
+    l_ty = edge_pre.types.Tria.Tria( 1 )
+    l_As, l_bs = edge_pre.sc.grid.Tria.affSc( 1 )[0:2]
+
+    l_ves = [ Symmetry.vertices( l_As[2][l_fa], l_bs[2][l_fa], l_ty.ves ) for l_fa in range(3) ]
+
+    # identity
+    l_a, l_b = Symmetry.affines( l_ty.ves, False )[0]
+    self.assertEqual( Symmetry.match( l_a, l_b, l_ves[0], l_ves[0] ), [0, 1, 2] )
+    self.assertEqual( Symmetry.match( l_a, l_b, l_ves[0], l_ves[1] ), None )
+
+    # reflection x <-> y maps the first face (y=0) onto the third one (x=0)
+    l_a = numpy.array( [ [0, 1], [1, 0] ], dtype=object )
+    l_b = numpy.array( [ 0, 0 ], dtype=object )
+    self.assertEqual( Symmetry.match( l_a, l_b, l_ves[0], l_ves[2] ), [2, 1, 0] )
+
+  ##
+  # Tests the transformations of a basis.
+  ##
+  def test_trafos(self):
+    l_syms, l_basis = edge_pre.dg.basis.Tria.gen( 2 )
+    l_affs = Symmetry.affines( edge_pre.types.Tria.Tria( 2 ).ves, False )
+
+    l_trafos = Symmetry.trafos( l_syms, l_basis, 2, False, l_affs )
+    self.assertEqual( len(l_trafos), 6 )
+    self.assertEqual( l_trafos[0], sympy.eye( len(l_basis) ) )
+
+    # B(A x + b) = T B(x)
+    for ( l_a, l_b ), l_tr in zip( l_affs, l_trafos ):
+      l_subs = {}
+      for l_di in range(2):
+        l_subs[ l_syms[l_di] ] = sum( [ l_a[l_di][l_d2] * l_syms[l_d2] for l_d2 in range(2) ] ) + l_b[l_di]
+      l_mapped = sympy.Matrix( [ sympy.sympify(l_ba).xreplace( l_subs ) for l_ba in l_basis ] )
+
+      self.assertEqual( sympy.expand( l_mapped - l_tr * sympy.Matrix( l_basis ) ), sympy.zeros( len(l_basis), 1 ) )
@@ -0,0 +1,89 @@
+##
+# @file This file is part of EDGE.
+#
+# @author Alexander Breuer (anbreuer AT ucsd.edu)
+#
+# @section LICENSE
+# Copyright (c) 2018, Regents of the University of California
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice, this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice, this list of conditions and the following disclaimer in the documentation and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors may be used to endorse or promote products derived from this software without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+#
+# @section DESCRIPTION
+# Tests the conversion of EDGEpre's arrays to C++.
+##
+import unittest
+import tempfile
+import shutil
+import struct
+import os
+import cpp
+
+class TestCpp( unittest.TestCase ):
+  ##
+  # Tests the packing of decimal and hexadecimal entries.
+  ##
+  def test_pack(self):
+    l_dec = cpp.parse( '0.3333333333333333,-1.0,\n0.125,3.0,\n' )[1]
+    l_hex = cpp.parse( '0x1.5555555555555p-2,-0x1.0000000000000p+0,\n0x1.0000000000000p-3,0x1.8000000000000p+1,\n' )[1]
+
+    self.assertEqual( cpp.pack( l_hex, 'double', [] ), cpp.pack( l_dec, 'double', [] ) )
+    self.assertEqual( cpp.pack( l_hex, 'double', [] ), struct.pack( '<4d', 1.0/3, -1, 0.125, 3 ) )
+
+    # integers and limits
+    l_int = cpp.parse( '1,-1,\n' )[1]
+    self.assertEqual( cpp.pack( l_int,
+                                'unsigned short',
+                                [ [ '-1', 'std::numeric_limits< unsigned short >::max()' ] ] ),
+                      struct.pack( '<2H', 1, 65535 ) )
+
+  ##
+  # Tests the emission of the data through the assembler.
+  ##
+  def test_generate(self):
+    l_csv = '0x1.5555555555555p-2,-0x1.0000000000000p+0,\n\n0x1.0000000000000p-3,0x1.8000000000000p+1,\n\n'
+
+    # typed array, defined by the bit patterns of the entries
+    l_cpp, l_bin = cpp.generate( l_csv, 'dg', 'mass', 'double', [], 'bytes' )
+    self.assertEqual( l_bin, None )
+    self.assertIn( 'extern double const   g_mass[2][1][2];', l_cpp )
+    self.assertIn( '_ZN4edge3pre2dg6g_massE:', l_cpp )
+    self.assertIn( '.8byte 0x3fd5555555555555,0xbff0000000000000,0x3fc0000000000000,0x4008000000000000', l_cpp )
+    self.assertNotIn( 'reinterpret_cast', l_cpp )
+
+    # the binary file is referenced by its name
+    l_cpp, l_bin = cpp.generate( l_csv, 'dg', 'mass', 'double', [], 'incbin', '/some/dir/mass.bin' )
+    self.assertEqual( l_bin, struct.pack( '<4d', 1.0/3, -1, 0.125, 3 ) )
+    self.assertIn( '.incbin \\"mass.bin\\"', l_cpp )
+    self.assertNotIn( '/some/dir', l_cpp )
+
+  ##
+  # Tests the atomic writing of the converted files.
+  ##
+  def test_writeAtomic(self):
+    l_dir = tempfile.mkdtemp()
+    l_path = l_dir + '/mass.cpp'
+
+    cpp.writeAtomic( l_path, 'int a;\n' )
+    cpp.writeAtomic( l_dir + '/mass.bin', b'\x00\x01' )
+    self.assertEqual( open( l_path ).read(), 'int a;\n' )
+    self.assertEqual( open( l_dir + '/mass.bin', 'rb' ).read(), b'\x00\x01' )
+
+    # permissions follow the umask as for open
+    self.assertEqual( os.stat( l_path ).st_mode & 0o777, 0o666 & ~cpp.UMASK )
+
+    # failed writes leave the existing file and no temporary files behind
+    with self.assertRaises( TypeError ):
+      cpp.writeAtomic( l_path, None )
+    self.assertEqual( open( l_path ).read(), 'int a;\n' )
+    self.assertEqual( sorted( os.listdir( l_dir ) ), [ 'mass.bin', 'mass.cpp' ] )
+
+    shutil.rmtree( l_dir )